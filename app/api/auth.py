@@ -4,6 +4,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
 
 from app.database.database import get_db
+from app.api.dependencies import CurrentUserDep
 from app.schemas.users import (
     UserCreate,
     UserLogin,
@@ -12,11 +13,14 @@ from app.schemas.users import (
     PasswordChange
 )
 from app.services.auth import AuthService
+from app.utils.passwords import password_hasher
 from app.exceptions.users import (
     UserAlreadyExistsException,
     InvalidCredentialsException,
-    InvalidPasswordException
+    InvalidPasswordException,
+    PasswordHashingBusyException
 )
+from app.exceptions.base import PasswordHashingBusyHTTPError
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -41,6 +45,8 @@ async def register_user(
             status_code=status.HTTP_409_CONFLICT,
             detail=str(e)
         )
+    except PasswordHashingBusyException:
+        raise PasswordHashingBusyHTTPError()
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -72,6 +78,8 @@ async def login_user(
             detail="Неверный email или пароль",
             headers={"WWW-Authenticate": "Bearer"}
         )
+    except PasswordHashingBusyException:
+        raise PasswordHashingBusyHTTPError()
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -97,6 +105,8 @@ async def login_user_json(
             detail="Неверный email или пароль",
             headers={"WWW-Authenticate": "Bearer"}
         )
+    except PasswordHashingBusyException:
+        raise PasswordHashingBusyHTTPError()
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -106,20 +116,20 @@ async def login_user_json(
 
 @router.post("/refresh-token", response_model=Token)
 async def refresh_token(
-    current_user_id: int = Depends(lambda: 1),  # Заглушка - в реальном приложении брать из токена
+    current_user: CurrentUserDep,
     db: AsyncSession = Depends(get_db)
 ):
     """
     Обновление токена
     """
     service = AuthService(db)
-    return await service.refresh_token(current_user_id)
+    return await service.refresh_token(current_user.id)
 
 
 @router.post("/change-password")
 async def change_password(
     password_data: PasswordChange,
-    current_user_id: int = Depends(lambda: 1),  # Заглушка
+    current_user: CurrentUserDep,
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -127,12 +137,14 @@ async def change_password(
     """
     service = AuthService(db)
     try:
-        return await service.change_password(current_user_id, password_data)
+        return await service.change_password(current_user.id, password_data)
     except InvalidPasswordException as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
+    except PasswordHashingBusyException:
+        raise PasswordHashingBusyHTTPError()
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -141,15 +153,11 @@ async def change_password(
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_current_user(
-    current_user_id: int = Depends(lambda: 1),  # Заглушка
-    db: AsyncSession = Depends(get_db)
-):
+async def get_current_user(current_user: CurrentUserDep):
     """
     Получение информации о текущем пользователе
     """
-    service = AuthService(db)
-    return await service.get_current_user(current_user_id)
+    return current_user
 
 
 @router.post("/logout")
@@ -165,4 +173,11 @@ async def auth_health():
     """
     Проверка здоровья модуля аутентификации
     """
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+@router.get("/metrics/password-hashing")
+async def password_hashing_metrics():
+    """
+    Состояние пула хэширования паролей: очередь, отказы, время ожидания
+    """
+    return password_hasher.stats()
@@ -0,0 +1,52 @@
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.database import get_db, get_read_db
+from app.schemas.cities import CityDistanceResponse, CityResponse
+from app.services.cities import CityService
+from app.exceptions import CityNotFoundException
+
+router = APIRouter(prefix="/cities", tags=["cities"])
+
+
+@router.get("/", response_model=List[CityResponse])
+async def get_cities(
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Справочник городов с координатами
+    """
+    service = CityService(db)
+    return await service.get_cities()
+
+
+@router.get("/resolve", response_model=CityResponse)
+async def resolve_city(
+    name: str = Query(..., min_length=1, max_length=50, description="Название в любом написании: СПб, питер, ..."),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Канонический город по варианту написания
+    """
+    service = CityService(db)
+    try:
+        return await service.resolve(name)
+    except CityNotFoundException as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+
+
+@router.get("/near", response_model=List[CityDistanceResponse])
+async def get_cities_near(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(..., gt=0, le=1000),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Города в радиусе radius_km от точки, ближайшие первыми
+    """
+    service = CityService(db)
+    return await service.get_near(lat, lon, radius_km)
@@ -1,16 +1,24 @@
 from typing import Annotated
 
-from fastapi import Depends, Request
+from fastapi import Depends, Query, Request
 from pydantic import BaseModel, Field
 
-from app.database.database import async_session_maker
+from app.database.database import async_session_maker, read_session_maker
 from app.exceptions.auth import (
+    InactiveUserHTTPError,
     InvalidJWTTokenError,
     InvalidTokenHTTPError,
+    JWTTokenExpiredError,
+    JWTTokenExpiredHTTPError,
     NoAccessTokenHTTPError,
+    UserNotFoundHTTPError,
 )
+from app.exceptions.users import UserNotFoundException
+from app.exceptions.base import InvalidCursorHTTPError
+from app.schemas.users import UserResponse
 from app.services.auth import AuthService
 from app.database.db_manager import DBManager
+from app.utils.pagination import decode_cursor
 
 
 class PaginationParams(BaseModel):
@@ -21,8 +29,51 @@ class PaginationParams(BaseModel):
 PaginationDep = Annotated[PaginationParams, Depends()]
 
 
+def get_cursor(
+    cursor: str | None = Query(None, description="Курсор следующей страницы (заголовок X-Next-Cursor)")
+) -> int | None:
+    """ID последней записи предыдущей страницы для keyset-пагинации"""
+    if cursor is None:
+        return None
+    try:
+        key = decode_cursor(cursor)
+    except ValueError:
+        raise InvalidCursorHTTPError
+    if len(key) != 1 or not isinstance(key[0], int):
+        raise InvalidCursorHTTPError
+    return key[0]
+
+
+CursorDep = Annotated[int | None, Depends(get_cursor)]
+
+
+def get_score_cursor(
+    cursor: str | None = Query(None, description="Курсор следующей страницы (заголовок X-Next-Cursor)")
+) -> tuple[float, int] | None:
+    """(оценка, id) последней записи предыдущей страницы ранжированной выдачи"""
+    if cursor is None:
+        return None
+    try:
+        key = decode_cursor(cursor)
+    except ValueError:
+        raise InvalidCursorHTTPError
+    if (
+        len(key) != 2
+        or not isinstance(key[0], (int, float)) or isinstance(key[0], bool)
+        or not isinstance(key[1], int) or isinstance(key[1], bool)
+    ):
+        raise InvalidCursorHTTPError
+    return float(key[0]), key[1]
+
+
+ScoreCursorDep = Annotated[tuple[float, int] | None, Depends(get_score_cursor)]
+
+
 def get_token(request: Request) -> str:
-    token = request.cookies.get("access_token", None)
+    # Заголовок Authorization: Bearer <token>, затем cookie access_token
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        token = request.cookies.get("access_token", None)
     if token is None:
         raise NoAccessTokenHTTPError
     return token
@@ -31,6 +82,8 @@ def get_token(request: Request) -> str:
 def get_current_user_id(token: str = Depends(get_token)) -> int:
     try:
         data = AuthService.decode_token(token)
+    except JWTTokenExpiredError:
+        raise JWTTokenExpiredHTTPError
     except InvalidJWTTokenError:
         raise InvalidTokenHTTPError
     return data["user_id"]
@@ -39,6 +92,21 @@ def get_current_user_id(token: str = Depends(get_token)) -> int:
 UserIdDep = Annotated[int, Depends(get_current_user_id)]
 
 
+async def get_current_user(user_id: UserIdDep) -> UserResponse:
+    # Сессия открывает соединение только при промахе кэша пользователей
+    async with read_session_maker() as session:
+        try:
+            user = await AuthService(session).get_current_user(user_id)
+        except UserNotFoundException:
+            raise UserNotFoundHTTPError
+    if not user.is_active:
+        raise InactiveUserHTTPError
+    return user
+
+
+CurrentUserDep = Annotated[UserResponse, Depends(get_current_user)]
+
+
 async def get_db():
     async with DBManager(session_factory=async_session_maker) as db:
         yield db
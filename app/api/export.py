@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+from app.api.dependencies import CurrentUserDep
+from app.schemas.export import ExportFormat, ExportTable
+from app.services.export import stream_export
+from app.utils.ndjson import NDJSON_MEDIA_TYPE
+
+router = APIRouter(prefix="/export", tags=["export"])
+
+MEDIA_TYPES = {
+    ExportFormat.ndjson: NDJSON_MEDIA_TYPE,
+    ExportFormat.csv: "text/csv; charset=utf-8",
+}
+
+
+@router.get("/{table}")
+async def export_table(
+    table: ExportTable,
+    current_user: CurrentUserDep,
+    format: ExportFormat = Query(ExportFormat.ndjson, description="Формат выгрузки")
+):
+    """
+    Потоковая выгрузка всей таблицы в NDJSON или CSV.
+
+    Строки читаются из БД пачками по EXPORT_CHUNK_SIZE и сразу отправляются
+    клиенту, поэтому память не растет с размером таблицы.
+    """
+    return StreamingResponse(
+        stream_export(table, format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{table.value}.{format.value}"'}
+    )
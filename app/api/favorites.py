@@ -1,9 +1,11 @@
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.database.database import get_db
+from app.database.database import get_db, get_read_db
+from app.api.dependencies import CursorDep
 from app.schemas.favorites import FavoriteCreate, FavoriteUpdate, FavoriteResponse
 from app.services.favorites import FavoriteService
+from app.utils.serialization import list_response
 from app.exceptions import FavoriteNotFoundException, FavoriteAlreadyExistsException
 
 router = APIRouter(prefix="/favorites", tags=["favorites"])
@@ -26,12 +28,14 @@ async def create_favorite(
 
 @router.get("/", response_model=List[FavoriteResponse])
 async def get_all_favorites(
+    after_id: CursorDep,
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     service = FavoriteService(db)
-    return await service.get_all_favorites(skip, limit)
+    items = await service.get_all_favorites(skip, limit, after_id)
+    return list_response(FavoriteResponse, items, limit)
 
 
 @router.get("/{favorite_id}", response_model=FavoriteResponse)
@@ -98,7 +102,7 @@ async def delete_favorite(
 @router.get("/role/{role_id}", response_model=List[FavoriteResponse])
 async def get_favorites_by_role(
     role_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     service = FavoriteService(db)
     return await service.get_favorites_by_role(role_id)
\ No newline at end of file
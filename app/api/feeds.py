@@ -0,0 +1,40 @@
+from typing import List
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.database import get_db
+from app.schemas.profiles import ProfileResponse
+from app.schemas.jobs import JobCreate
+from app.services.feeds import FeedService
+from app.services.jobs import JobService
+
+router = APIRouter(prefix="/feed", tags=["feed"])
+
+
+@router.get("/{user_id}", response_model=List[ProfileResponse])
+async def get_feed(
+    user_id: int,
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Следующие карточки для свайпа из заранее собранной очереди
+    """
+    service = FeedService(db)
+    cards, needs_refill = await service.get_cards(user_id, limit)
+    if needs_refill:
+        # Пополнение - задача в очереди jobs; ключ не дает поставить вторую, пока первая ждет
+        await JobService(db).enqueue(JobCreate(type="feeds.refill", payload={"user_id": user_id}, key=str(user_id)))
+    return cards
+
+
+@router.post("/{user_id}/reset")
+async def reset_feed(
+    user_id: int,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Сброс очереди ленты (уже показанные анкеты не вернутся)
+    """
+    service = FeedService(db)
+    await service.reset(user_id)
+    return {"message": "Feed reset successfully"}
@@ -0,0 +1,60 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.dependencies import CurrentUserDep
+from app.database.database import get_db, get_read_db
+from app.schemas.jobs import JobCreate, JobResponse
+from app.services.jobs import JobService
+from app.exceptions import JobNotFoundException, UnknownJobTypeException
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+@router.post("/", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def enqueue_job(
+    job_data: JobCreate,
+    current_user: CurrentUserDep,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Постановка служебной задачи в очередь: stats.rebuild, search.rebuild,
+    feeds.refill, users.cleanup_inactive, jobs.purge
+    """
+    service = JobService(db)
+    try:
+        return await service.enqueue(job_data)
+    except UnknownJobTypeException as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+@router.get("/metrics")
+async def job_metrics(
+    current_user: CurrentUserDep,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Глубина очереди по типам задач и счетчики исполнителя
+    """
+    service = JobService(db)
+    return await service.get_metrics()
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: int,
+    current_user: CurrentUserDep,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Состояние задачи: статус, попытки, результат или последняя ошибка
+    """
+    service = JobService(db)
+    try:
+        return await service.get_job(job_id)
+    except JobNotFoundException as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
@@ -1,10 +1,19 @@
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.database.database import get_db
-from app.schemas.likes import LikeCreate, LikeUpdate, LikeResponse
+from app.database.database import get_db, get_read_db
+from app.api.dependencies import CursorDep
+from app.schemas.likes import LikeCreate, LikeUpdate, LikeResponse, MatchResponse, ProfileLikeResponse
 from app.services.likes import LikeService
-from app.exceptions import LikeNotFoundException, LikeAlreadyExistsException
+from app.utils.serialization import list_response
+from app.exceptions import (
+    LikeNotFoundException,
+    LikeAlreadyExistsException,
+    ProfileLikeNotFoundException,
+    ProfileLikeAlreadyExistsException,
+    InvalidLikeException,
+    ProfileNotFoundException
+)
 
 router = APIRouter(prefix="/likes", tags=["likes"])
 
@@ -26,12 +35,14 @@ async def create_like(
 
 @router.get("/", response_model=List[LikeResponse])
 async def get_all_likes(
+    after_id: CursorDep,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     service = LikeService(db)
-    return await service.get_all_likes(skip, limit)
+    items = await service.get_all_likes(skip, limit, after_id)
+    return list_response(LikeResponse, items, limit)
 
 
 @router.get("/{like_id}", response_model=LikeResponse)
@@ -98,7 +109,7 @@ async def delete_like(
 @router.get("/role/{role_id}", response_model=List[LikeResponse])
 async def get_likes_by_role(
     role_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     service = LikeService(db)
     return await service.get_likes_by_role(role_id)
@@ -106,7 +117,7 @@ async def get_likes_by_role(
 
 @router.get("/me/made", response_model=List[LikeResponse])
 async def get_likes_i_made(
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     service = LikeService(db)
     return await service.get_likes_i_made()
@@ -114,7 +125,7 @@ async def get_likes_i_made(
 
 @router.get("/me/received", response_model=List[LikeResponse])
 async def get_likes_i_received(
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     service = LikeService(db)
     return await service.get_likes_i_received()
@@ -123,7 +134,70 @@ async def get_likes_i_received(
 @router.get("/status/{me_liked}", response_model=List[LikeResponse])
 async def get_likes_by_status(
     me_liked: bool,
+    db: AsyncSession = Depends(get_read_db)
+):
+    service = LikeService(db)
+    return await service.get_likes_by_status(me_liked)
+
+
+@router.post(
+    "/{liker_profile_id}/{liked_profile_id}",
+    response_model=ProfileLikeResponse,
+    status_code=status.HTTP_201_CREATED
+)
+async def like_profile(
+    liker_profile_id: int,
+    liked_profile_id: int,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Лайк профиля liked_profile_id от профиля liker_profile_id. Если встречный
+    лайк уже есть, в той же транзакции создается мэтч (matched = true).
+    """
+    service = LikeService(db)
+    try:
+        return await service.like_profile(liker_profile_id, liked_profile_id)
+    except InvalidLikeException as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except ProfileNotFoundException as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except ProfileLikeAlreadyExistsException as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+
+
+@router.delete("/{liker_profile_id}/{liked_profile_id}")
+async def unlike_profile(
+    liker_profile_id: int,
+    liked_profile_id: int,
     db: AsyncSession = Depends(get_db)
 ):
     service = LikeService(db)
-    return await service.get_likes_by_status(me_liked)
\ No newline at end of file
+    try:
+        return await service.unlike_profile(liker_profile_id, liked_profile_id)
+    except ProfileLikeNotFoundException as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+
+
+@router.get("/matches/{profile_id}", response_model=List[MatchResponse])
+async def get_matches(
+    profile_id: int,
+    after_id: CursorDep,
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Мэтчи профиля в порядке появления, следующая страница - по курсору из X-Next-Cursor"""
+    service = LikeService(db)
+    items = await service.get_matches(profile_id, limit, after_id)
+    return list_response(MatchResponse, items, limit)
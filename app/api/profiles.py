@@ -1,9 +1,19 @@
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from typing import List, Literal, Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.database.database import get_db
-from app.schemas.profiles import ProfileCreate, ProfileUpdate, ProfileResponse
+from app.database.database import get_db, get_read_db
+from app.api.dependencies import CursorDep, ScoreCursorDep
+from app.schemas.profiles import (
+    ProfileCreate, ProfileUpdate, ProfileResponse, ProfileImportReport, RankedProfileResponse
+)
+from app.services.feeds import push_new_profile_task
+from app.services.profile_cache import profile_cache
+from app.services.profile_import import ProfileImportService
 from app.services.profiles import ProfileService
+from app.utils.http_cache import not_modified_response, set_cache_headers
+from app.utils.ndjson import NDJSON_MEDIA_TYPE, iter_lines
+from app.utils.pagination import set_next_cursor
+from app.utils.serialization import list_response
 from app.exceptions import (
     ProfileNotFoundException, 
     ProfileAlreadyExistsException,
@@ -16,11 +26,12 @@ router = APIRouter(prefix="/profiles", tags=["profiles"])
 @router.post("/", response_model=ProfileResponse, status_code=status.HTTP_201_CREATED)
 async def create_profile(
     profile_data: ProfileCreate,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db)
 ):
     service = ProfileService(db)
     try:
-        return await service.create_profile(profile_data)
+        profile = await service.create_profile(profile_data)
     except ProfileAlreadyExistsException as e:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -32,60 +43,128 @@ async def create_profile(
             detail=str(e)
         )
 
+    # Новая анкета сразу попадает в ленты пользователей, чьи фильтры ее пропускают
+    background_tasks.add_task(push_new_profile_task, profile.id)
+    return profile
+
+
+@router.post(
+    "/import",
+    response_model=ProfileImportReport,
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                NDJSON_MEDIA_TYPE: {"schema": {"$ref": "#/components/schemas/ProfileCreate"}},
+                "text/csv": {"schema": {"type": "string"}},
+            },
+        }
+    },
+)
+async def import_profiles(
+    request: Request,
+    batch_size: Optional[int] = Query(None, ge=1, le=10000, description="Записей в одной транзакции"),
+    resume_from: int = Query(0, ge=0, description="checkpoint из отчета прерванного импорта"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Импорт профилей из NDJSON (application/x-ndjson) или CSV (text/csv,
+    первая строка - заголовок). Тело читается потоком, записи вставляются
+    пачками; дубликаты и ошибки проверки перечислены в отчете.
+    """
+    service = ProfileImportService(db)
+    csv_format = request.headers.get("content-type", "").startswith("text/csv")
+    return await service.import_profiles(
+        iter_lines(request.stream()),
+        csv_format=csv_format,
+        batch_size=batch_size,
+        resume_from=resume_from
+    )
+
 
 @router.get("/", response_model=List[ProfileResponse])
 async def get_all_profiles(
+    after_id: CursorDep,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     service = ProfileService(db)
-    return await service.get_all_profiles(skip, limit)
+    items = await service.get_all_profiles(skip, limit, after_id)
+    return list_response(ProfileResponse, items, limit)
 
 
 @router.get("/{profile_id}", response_model=ProfileResponse)
 async def get_profile(
     profile_id: int,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db)
 ):
     service = ProfileService(db)
     try:
-        return await service.get_profile(profile_id)
+        # Сначала только версия: при совпадении ETag профиль не загружается
+        version = await service.get_profile_version(id=profile_id)
+        not_modified = not_modified_response(request, version)
+        if not_modified is not None:
+            return not_modified
+        profile = await service.get_profile(profile_id)
     except ProfileNotFoundException as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
+    set_cache_headers(response, version)
+    return profile
 
 
 @router.get("/user/{user_id}", response_model=ProfileResponse)
 async def get_profile_by_user_id(
     user_id: int,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db)
 ):
     service = ProfileService(db)
     try:
-        return await service.get_profile_by_user_id(user_id)
+        # Сначала только версия: при совпадении ETag профиль не загружается
+        version = await service.get_profile_version(user_id=user_id)
+        not_modified = not_modified_response(request, version)
+        if not_modified is not None:
+            return not_modified
+        profile = await service.get_profile_by_user_id(user_id)
     except ProfileNotFoundException as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
+    set_cache_headers(response, version)
+    return profile
 
 
 @router.get("/username/{username}", response_model=ProfileResponse)
 async def get_profile_by_username(
     username: str,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db)
 ):
     service = ProfileService(db)
     try:
-        return await service.get_profile_by_username(username)
+        # Сначала только версия: при совпадении ETag профиль не загружается
+        version = await service.get_profile_version(username=username)
+        not_modified = not_modified_response(request, version)
+        if not_modified is not None:
+            return not_modified
+        profile = await service.get_profile_by_username(username)
     except ProfileNotFoundException as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
+    set_cache_headers(response, version)
+    return profile
 
 
 @router.put("/{profile_id}", response_model=ProfileResponse)
@@ -127,7 +206,7 @@ async def delete_profile(
 @router.get("/role/{role_id}", response_model=List[ProfileResponse])
 async def get_profiles_by_role(
     role_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     service = ProfileService(db)
     return await service.get_profiles_by_role(role_id)
@@ -142,7 +221,11 @@ async def search_profiles(
     tags: Optional[str] = Query(None, max_length=100),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    db: AsyncSession = Depends(get_db)
+    exclude_seen_by: Optional[int] = Query(None, description="ID пользователя: без профилей, которые он уже видел"),
+    radius_km: Optional[float] = Query(None, gt=0, le=1000, description="Радиус от lat/lon или от города city, км"),
+    lat: Optional[float] = Query(None, ge=-90, le=90),
+    lon: Optional[float] = Query(None, ge=-180, le=180),
+    db: AsyncSession = Depends(get_read_db)
 ):
     service = ProfileService(db)
     try:
@@ -153,10 +236,121 @@ async def search_profiles(
             city=city,
             tags=tags,
             skip=skip,
-            limit=limit
+            limit=limit,
+            exclude_seen_by=exclude_seen_by,
+            radius_km=radius_km,
+            lat=lat,
+            lon=lon
+        )
+    except InvalidProfileDataException as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+@router.get("/search/ranked", response_model=List[RankedProfileResponse])
+async def search_profiles_ranked(
+    response: Response,
+    after: ScoreCursorDep,
+    viewer_id: int = Query(..., description="ID профиля, для которого считается совместимость"),
+    min_age: Optional[int] = Query(None, ge=18, le=120),
+    max_age: Optional[int] = Query(None, ge=18, le=120),
+    gender: Optional[str] = Query(None, max_length=20),
+    city: Optional[str] = Query(None, max_length=30),
+    tags: Optional[str] = Query(None, max_length=100, description="Теги через запятую, нужны все"),
+    radius_km: Optional[float] = Query(None, gt=0, le=1000, description="Радиус от lat/lon или от города city, км"),
+    lat: Optional[float] = Query(None, ge=-90, le=90),
+    lon: Optional[float] = Query(None, ge=-180, le=180),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Поиск по тем же условиям, что /search/, упорядоченный по совместимости
+    (общие теги, возраст, город, новизна, встречный лайк). Курсор следующей
+    страницы - в X-Next-Cursor.
+    """
+    service = ProfileService(db)
+    try:
+        items = await service.search_ranked(
+            viewer_id,
+            min_age=min_age,
+            max_age=max_age,
+            gender=gender,
+            city=city,
+            tags=tags,
+            radius_km=radius_km,
+            lat=lat,
+            lon=lon,
+            limit=limit,
+            after=after
+        )
+    except ProfileNotFoundException as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
         )
     except InvalidProfileDataException as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
-        )
\ No newline at end of file
+        )
+    set_next_cursor(response, items, limit, key=lambda item: (item.score, item.id))
+    return items
+
+
+@router.get("/search/text", response_model=List[ProfileResponse])
+async def search_profiles_text(
+    q: str = Query(..., min_length=1, max_length=100, description="Слова для поиска по описанию, тегам и городу"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_read_db)
+):
+    service = ProfileService(db)
+    return await service.search_profiles_text(q, skip, limit)
+
+@router.get("/tags/search", response_model=List[ProfileResponse])
+async def search_profiles_by_tags(
+    response: Response,
+    after_id: CursorDep,
+    tags: str = Query(..., min_length=1, max_length=100, description="Теги через запятую"),
+    mode: Literal["all", "any"] = Query("all", description="all - все теги (AND), any - любой из тегов (OR)"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_read_db)
+):
+    service = ProfileService(db)
+    try:
+        items = await service.search_by_tags(tags, mode == "all", limit, after_id)
+    except InvalidProfileDataException as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    set_next_cursor(response, items, limit)
+    return items
+
+
+@router.get("/{profile_id}/similar", response_model=List[ProfileResponse])
+async def get_similar_profiles(
+    profile_id: int,
+    min_shared: int = Query(1, ge=1, le=20, description="Минимальное число общих тегов"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_read_db)
+):
+    service = ProfileService(db)
+    try:
+        return await service.get_similar_by_tags(profile_id, min_shared, skip, limit)
+    except ProfileNotFoundException as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+
+
+@router.get("/metrics/cache")
+async def profile_cache_metrics():
+    """
+    Состояние кэша профилей: размер, попадания, промахи, вытеснения
+    """
+    return profile_cache.stats()
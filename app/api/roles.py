@@ -1,9 +1,12 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.database.database import get_db
+from app.database.database import get_db, get_read_db
+from app.api.dependencies import CursorDep
 from app.schemas.roles import RoleCreate, RoleUpdate, RoleResponse, RoleWithUsersResponse
 from app.services.roles import RoleService
+from app.utils.http_cache import not_modified_response, set_cache_headers
+from app.utils.pagination import set_next_cursor
 from app.exceptions import (
     RoleNotFoundException, 
     RoleAlreadyExistsException,
@@ -30,12 +33,22 @@ async def create_role(
 
 @router.get("/", response_model=List[RoleResponse])
 async def get_all_roles(
+    request: Request,
+    response: Response,
+    after_id: CursorDep,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     service = RoleService(db)
-    return await service.get_all_roles(skip, limit)
+    version = await service.get_roles_version()
+    not_modified = not_modified_response(request, version)
+    if not_modified is not None:
+        return not_modified
+    items = await service.get_all_roles(skip, limit, after_id)
+    set_next_cursor(response, items, limit)
+    set_cache_headers(response, version)
+    return items
 
 
 @router.get("/{role_id}", response_model=RoleResponse)
@@ -117,7 +130,7 @@ async def search_roles(
     name: str = Query(..., min_length=1, max_length=50, description="Название роли для поиска"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     service = RoleService(db)
     return await service.search_roles(name, skip, limit)
@@ -0,0 +1,57 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.database import get_db, get_read_db
+from app.schemas.seen import SeenProfileCheck, SeenProfilesAdd, SeenProfilesResponse
+from app.services.seen import SeenProfilesService
+
+router = APIRouter(prefix="/seen", tags=["seen"])
+
+
+@router.post("/{user_id}", response_model=SeenProfilesResponse)
+async def mark_seen(
+    user_id: int,
+    data: SeenProfilesAdd,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Добавление профилей в историю свайпов пользователя
+    """
+    service = SeenProfilesService(db)
+    return await service.mark_seen(user_id, data.profile_ids)
+
+
+@router.get("/{user_id}", response_model=SeenProfilesResponse)
+async def get_seen_stats(
+    user_id: int,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Сколько профилей пользователь уже видел
+    """
+    service = SeenProfilesService(db)
+    return await service.get_stats(user_id)
+
+
+@router.get("/{user_id}/{profile_id}", response_model=SeenProfileCheck)
+async def is_seen(
+    user_id: int,
+    profile_id: int,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Видел ли пользователь профиль
+    """
+    service = SeenProfilesService(db)
+    return await service.is_seen(user_id, profile_id)
+
+
+@router.delete("/{user_id}")
+async def clear_seen(
+    user_id: int,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Очистка истории свайпов (профили снова попадут в поиск и ленту)
+    """
+    service = SeenProfilesService(db)
+    return await service.clear(user_id)
@@ -1,16 +1,24 @@
+import json
 from typing import List, Optional, Dict, Any
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.database.database import get_db
+from app.database.database import get_db, get_read_db
+from app.api.dependencies import CursorDep
 from app.schemas.user_filters import (
     UserFilterCreate, 
     UserFilterUpdate, 
     UserFilterResponse,
     FilterStatsResponse,
-    BulkFilterCreate
+    BulkFilterCreate,
+    BulkFilterReport,
+    InterestedUsersResponse
 )
+from app.schemas.profiles import ProfileResponse
 from app.services.user_filters import UserFilterService
+from app.utils.ndjson import NDJSON_MEDIA_TYPE, iter_lines
+from app.utils.serialization import list_response
 from app.exceptions import (
+    ProfileNotFoundException,
     UserFilterNotFoundException,
     UserFilterAlreadyExistsException,
     InvalidFilterDataException
@@ -18,6 +26,9 @@ from app.exceptions import (
 
 router = APIRouter(prefix="/user-filters", tags=["user-filters"])
 
+# Ссылки на схемы в components OpenAPI для описания тела /bulk
+SCHEMA_REF = "#/components/schemas/{model}"
+
 
 @router.post("/", response_model=UserFilterResponse, status_code=status.HTTP_201_CREATED)
 async def create_filter(
@@ -39,29 +50,69 @@ async def create_filter(
         )
 
 
-@router.post("/bulk", response_model=List[UserFilterResponse], status_code=status.HTTP_201_CREATED)
+async def _iterate(items: List[Any]):
+    for item in items:
+        yield item
+
+
+@router.post(
+    "/bulk",
+    response_model=BulkFilterReport,
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": BulkFilterCreate.model_json_schema(ref_template=SCHEMA_REF)
+                },
+                NDJSON_MEDIA_TYPE: {
+                    "schema": UserFilterCreate.model_json_schema(ref_template=SCHEMA_REF)
+                },
+            },
+        }
+    },
+)
 async def create_filters_bulk(
-    bulk_data: BulkFilterCreate,
+    request: Request,
     db: AsyncSession = Depends(get_db)
 ):
+    """
+    Массовое создание фильтров.
+
+    Принимает JSON {"filters": [...]} или поток NDJSON (Content-Type:
+    application/x-ndjson, один фильтр на строку) - NDJSON читается по мере
+    загрузки. Ошибка в строке не отменяет остальные: в ответе статус каждой строки.
+    """
     service = UserFilterService(db)
+    if request.headers.get("content-type", "").startswith(NDJSON_MEDIA_TYPE):
+        return await service.create_filters_bulk(iter_lines(request.stream()))
+
     try:
-        return await service.create_filters_bulk(bulk_data)
-    except UserFilterAlreadyExistsException as e:
+        body = json.loads(await request.body())
+    except ValueError:
         raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail=str(e)
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Request body must be valid JSON"
+        )
+    if not isinstance(body, dict) or not isinstance(body.get("filters"), list):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail='Request body must contain a "filters" list'
         )
+    return await service.create_filters_bulk(_iterate(body["filters"]))
 
 
 @router.get("/", response_model=List[UserFilterResponse])
 async def get_all_filters(
+    after_id: CursorDep,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     service = UserFilterService(db)
-    return await service.get_all_filters(skip, limit)
+    items = await service.get_all_filters(skip, limit, after_id)
+    return list_response(UserFilterResponse, items, limit)
 
 
 @router.get("/{filter_id}", response_model=UserFilterResponse)
@@ -94,6 +145,41 @@ async def get_filter_by_user(
         )
 
 
+@router.get("/user/{user_id}/profiles", response_model=List[ProfileResponse])
+async def get_matching_profiles(
+    user_id: int,
+    after_id: CursorDep,
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Профили под фильтр пользователя, курсор следующей страницы - в X-Next-Cursor"""
+    service = UserFilterService(db)
+    try:
+        items = await service.get_matching_profiles(user_id, limit, after_id)
+    except UserFilterNotFoundException as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    return list_response(ProfileResponse, items, limit)
+
+
+@router.get("/interested/{profile_id}", response_model=InterestedUsersResponse)
+async def get_interested_users(
+    profile_id: int,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Пользователи, чьи фильтры пропускают профиль (для уведомлений о новых анкетах)"""
+    service = UserFilterService(db)
+    try:
+        return await service.get_interested_users(profile_id)
+    except ProfileNotFoundException as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+
+
 @router.put("/{filter_id}", response_model=UserFilterResponse)
 async def update_filter(
     filter_id: int,
@@ -148,7 +234,7 @@ async def delete_filter_by_user(
 @router.get("/role/{role_id}", response_model=List[UserFilterResponse])
 async def get_filters_by_role(
     role_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     service = UserFilterService(db)
     return await service.get_filters_by_role(role_id)
@@ -160,7 +246,7 @@ async def search_filters(
     city_filter: Optional[str] = Query(None, max_length=30),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     service = UserFilterService(db)
     return await service.search_filters(
@@ -174,7 +260,7 @@ async def search_filters(
 @router.get("/gender/{gender}", response_model=List[UserFilterResponse])
 async def get_filters_by_gender(
     gender: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     service = UserFilterService(db)
     return await service.get_filters_by_gender(gender)
@@ -183,7 +269,7 @@ async def get_filters_by_gender(
 @router.get("/city/{city}", response_model=List[UserFilterResponse])
 async def get_filters_by_city(
     city: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     service = UserFilterService(db)
     return await service.get_filters_by_city(city)
@@ -191,7 +277,7 @@ async def get_filters_by_city(
 
 @router.get("/stats/", response_model=FilterStatsResponse)
 async def get_filter_stats(
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     service = UserFilterService(db)
     return await service.get_filter_stats()
@@ -202,7 +288,7 @@ async def get_users_by_filter_criteria(
     user_id: int,
     gender: str,
     city: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     service = UserFilterService(db)
     return await service.get_users_by_filter_criteria(gender, city)
\ No newline at end of file
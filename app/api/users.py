@@ -1,9 +1,10 @@
 # app/api/users.py
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 
-from app.database.database import get_db
+from app.database.database import get_db, get_read_db
+from app.api.dependencies import CurrentUserDep, CursorDep
 from app.schemas.users import (
     UserCreate, 
     UserUpdate, 
@@ -11,14 +12,18 @@ from app.schemas.users import (
     UserWithRoleResponse,
     UserLogin,
     Token,
-    PasswordChange
+    PasswordChange,
+    UserStatsResponse
 )
 from app.services.users import UserService
+from app.utils.pagination import set_next_cursor
 from app.exceptions.users import (
     UserNotFoundException,
     UserAlreadyExistsException,
-    InvalidCredentialsException
+    InvalidCredentialsException,
+    PasswordHashingBusyException
 )
+from app.exceptions.base import PasswordHashingBusyHTTPError
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -37,6 +42,8 @@ async def register_user(
             status_code=status.HTTP_409_CONFLICT,
             detail=str(e)
         )
+    except PasswordHashingBusyException:
+        raise PasswordHashingBusyHTTPError()
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -58,17 +65,32 @@ async def login_user(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Неверный email или пароль"
         )
+    except PasswordHashingBusyException:
+        raise PasswordHashingBusyHTTPError()
 
 
 @router.get("/", response_model=List[UserResponse])
 async def get_all_users(
+    response: Response,
+    after_id: CursorDep,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Получение всех пользователей"""
     service = UserService(db)
-    return await service.get_all_users(skip, limit)
+    items = await service.get_all_users(skip, limit, after_id)
+    set_next_cursor(response, items, limit)
+    return items
+
+
+@router.get("/stats/", response_model=UserStatsResponse)
+async def get_user_stats(
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Статистика пользователей: всего, активные, по ролям"""
+    service = UserService(db)
+    return await service.get_user_stats()
 
 
 @router.get("/{user_id}", response_model=UserWithRoleResponse)
@@ -107,6 +129,8 @@ async def update_user(
             status_code=status.HTTP_409_CONFLICT,
             detail=str(e)
         )
+    except PasswordHashingBusyException:
+        raise PasswordHashingBusyHTTPError()
 
 
 @router.delete("/{user_id}")
@@ -144,14 +168,15 @@ async def get_user_by_email(
 @router.post("/change-password")
 async def change_password(
     password_data: PasswordChange,
+    current_user: CurrentUserDep,
     db: AsyncSession = Depends(get_db)
 ):
     """Смена пароля (требует аутентификации)"""
-    # В реальном приложении здесь нужно получить текущего пользователя из токена
-    current_user_id = 1  # Заглушка
     service = UserService(db)
     try:
-        return await service.change_password(current_user_id, password_data)
+        return await service.change_password(current_user.id, password_data)
+    except PasswordHashingBusyException:
+        raise PasswordHashingBusyHTTPError()
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -11,11 +11,88 @@ class Settings:
         "sqlite+aiosqlite:///./dating_app.db"
     )
     
+    # Профиль движка БД: "default" (SQL в лог, настройки SQLite по умолчанию)
+    # или "production" (WAL, PRAGMA-настройки и пул соединений)
+    DB_PROFILE: str = os.getenv("DB_PROFILE", "default")
+    DB_ECHO: bool = os.getenv("DB_ECHO", "").lower() in ("1", "true", "yes")
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_READ_POOL_SIZE: int = int(os.getenv("DB_READ_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "5"))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+    
+    # PRAGMA для профиля production
+    SQLITE_JOURNAL_MODE: str = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_CACHE_SIZE_KB: int = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
+    SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    SQLITE_TEMP_STORE: str = os.getenv("SQLITE_TEMP_STORE", "MEMORY")
+    
     # JWT настройки
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-change-this-in-production")
     ALGORITHM: str = os.getenv("ALGORITHM", "HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
     
+    # Кэши аутентификации: проверенные токены (до их exp) и текущие
+    # пользователи (на AUTH_USER_CACHE_TTL секунд)
+    AUTH_TOKEN_CACHE_SIZE: int = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "10000"))
+    AUTH_USER_CACHE_SIZE: int = int(os.getenv("AUTH_USER_CACHE_SIZE", "10000"))
+    AUTH_USER_CACHE_TTL: float = float(os.getenv("AUTH_USER_CACHE_TTL", "30"))
+    
+    # Кэш профилей по id, user_id и username: сколько профилей и на сколько секунд
+    PROFILE_CACHE_SIZE: int = int(os.getenv("PROFILE_CACHE_SIZE", "10000"))
+    PROFILE_CACHE_TTL: float = float(os.getenv("PROFILE_CACHE_TTL", "60"))
+    
+    # Пул потоков для bcrypt: число потоков (по умолчанию по числу ядер, не
+    # больше 4), длина очереди и время ожидания места в очереди (сек);
+    # 0 потоков - хэширование прямо в event loop
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+    PASSWORD_HASH_QUEUE_SIZE: int = int(os.getenv("PASSWORD_HASH_QUEUE_SIZE", "64"))
+    PASSWORD_HASH_QUEUE_TIMEOUT: float = float(os.getenv("PASSWORD_HASH_QUEUE_TIMEOUT", "5"))
+    
+    # Поиск по тегам через полнотекстовый индекс FTS5 вместо ilike
+    SEARCH_USE_FTS: bool = os.getenv("SEARCH_USE_FTS", "true").lower() in ("1", "true", "yes")
+    
+    # Поиск без просмотренных профилей: наибольшая пачка дочитываемых ID
+    SEEN_SCAN_BATCH: int = int(os.getenv("SEEN_SCAN_BATCH", "2000"))
+    
+    # Снимок профилей для фильтров: сколько самых частых тегов хранится битами
+    PROFILE_MATRIX_TAG_BITS: int = int(os.getenv("PROFILE_MATRIX_TAG_BITS", "256"))
+    
+    # Ранжирование поиска: веса признаков совместимости (app/utils/scoring.py)
+    RANKING_WEIGHTS: str = os.getenv("RANKING_WEIGHTS", "tags:3,age:2,city:2,recency:1,reciprocal:4")
+    
+    # Лента анкет
+    FEED_QUEUE_SIZE: int = int(os.getenv("FEED_QUEUE_SIZE", "200"))
+    FEED_REFILL_THRESHOLD: int = int(os.getenv("FEED_REFILL_THRESHOLD", "20"))
+    FEED_SCAN_WINDOW: int = int(os.getenv("FEED_SCAN_WINDOW", "2000"))
+    FEED_REFILL_WINDOWS: int = int(os.getenv("FEED_REFILL_WINDOWS", "10"))
+    
+    # Импорт профилей: строк в одной транзакции
+    PROFILE_IMPORT_BATCH_SIZE: int = int(os.getenv("PROFILE_IMPORT_BATCH_SIZE", "1000"))
+    
+    # Выгрузка таблиц /export: строк в одной пачке чтения и кодирования
+    EXPORT_CHUNK_SIZE: int = int(os.getenv("EXPORT_CHUNK_SIZE", "1000"))
+    
+    # Фоновые задачи (таблица jobs): запуск обработчика в процессе приложения
+    # (false - задачи выполняет отдельный `python manage.py run-jobs`),
+    # одновременных задач каждого типа, опрос очереди (сек), попытки и пауза
+    # перед первым повтором (сек, удваивается с каждой попыткой)
+    JOB_RUNNER_ENABLED: bool = os.getenv("JOB_RUNNER_ENABLED", "true").lower() in ("1", "true", "yes")
+    JOB_CONCURRENCY: str = os.getenv(
+        "JOB_CONCURRENCY",
+        "stats.rebuild:1,search.rebuild:1,feeds.refill:4,users.cleanup_inactive:1,jobs.purge:1"
+    )
+    JOB_POLL_INTERVAL: float = float(os.getenv("JOB_POLL_INTERVAL", "1"))
+    JOB_MAX_ATTEMPTS: int = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+    JOB_RETRY_DELAY: float = float(os.getenv("JOB_RETRY_DELAY", "5"))
+    JOB_SHUTDOWN_TIMEOUT: float = float(os.getenv("JOB_SHUTDOWN_TIMEOUT", "10"))
+    # Сколько часов хранить завершенные задачи (задача jobs.purge)
+    JOB_RETENTION_HOURS: int = int(os.getenv("JOB_RETENTION_HOURS", "24"))
+    # Неактивные пользователи удаляются через столько дней после деактивации
+    INACTIVE_USER_RETENTION_DAYS: int = int(os.getenv("INACTIVE_USER_RETENTION_DAYS", "30"))
+    
     # Метод для получения URL БД (если нужен)
     @property
     def get_db_url(self):
@@ -1,31 +1,139 @@
 # app/database/database.py
-import os
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+import asyncio
+from typing import Dict
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
-from dotenv import load_dotenv
 
-load_dotenv()
+from app.config import settings
+
+# URL базы данных берется только из Settings
+DATABASE_URL = settings.DATABASE_URL
+
+PRODUCTION_PROFILE = "production"
+
+WRITE_ENGINE = "write"
+READ_ENGINE = "read"
+
+
+def sqlite_pragmas() -> dict:
+    """PRAGMA, выполняемые на каждом новом соединении в профиле production"""
+    return {
+        # WAL: читатели не блокируют писателя и наоборот
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        # В режиме WAL NORMAL безопасен и не делает fsync на каждый коммит
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        # Отрицательное значение - размер кэша в KiB, а не в страницах
+        "cache_size": -settings.SQLITE_CACHE_SIZE_KB,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        "temp_store": settings.SQLITE_TEMP_STORE,
+    }
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    for name, value in sqlite_pragmas().items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+
+def _set_query_only(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA query_only=ON")
+    cursor.close()
+
+
+def make_engine(url: str, profile: str | None = None, read_only: bool = False, **kwargs) -> AsyncEngine:
+    """
+    Создание асинхронного движка по профилю из настроек.
+
+    default - прежнее поведение: SQL в лог и настройки SQLite по умолчанию.
+    production - без echo, PRAGMA из sqlite_pragmas() и пул заданного размера.
+    """
+    profile = profile or settings.DB_PROFILE
+    is_sqlite = url.startswith("sqlite")
+    # In-memory SQLite работает на StaticPool, размер пула к нему не применим
+    is_pooled = ":memory:" not in url and "poolclass" not in kwargs
+    options = {
+        "echo": settings.DB_ECHO if profile == PRODUCTION_PROFILE else True,
+        "connect_args": {"check_same_thread": False} if is_sqlite else {},
+    }
+    if is_pooled:
+        options["pool_pre_ping"] = settings.DB_POOL_PRE_PING
+    if is_pooled and profile == PRODUCTION_PROFILE:
+        options.update(
+            pool_size=settings.DB_READ_POOL_SIZE if read_only else settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+        )
+    options.update(kwargs)
+
+    new_engine = create_async_engine(url, **options)
+    if is_sqlite and profile == PRODUCTION_PROFILE:
+        event.listen(new_engine.sync_engine, "connect", _set_sqlite_pragmas)
+        if read_only:
+            event.listen(new_engine.sync_engine, "connect", _set_query_only)
+    return new_engine
+
+
+# Движки, общие для всего процесса
+_engines: Dict[str, AsyncEngine] = {}
+
+
+def get_engine(kind: str = WRITE_ENGINE) -> AsyncEngine:
+    """
+    Общий для процесса движок: write для транзакций с записью, read для чтения.
+
+    В профиле production движок чтения имеет свой пул соединений с PRAGMA
+    query_only; в профиле default оба вида используют один движок.
+    """
+    if kind not in _engines:
+        if kind == READ_ENGINE and settings.DB_PROFILE != PRODUCTION_PROFILE:
+            _engines[kind] = get_engine(WRITE_ENGINE)
+        else:
+            _engines[kind] = make_engine(settings.DATABASE_URL, read_only=kind == READ_ENGINE)
+    return _engines[kind]
+
+
+async def warm_up_engines() -> None:
+    """
+    Прогрев пулов при старте: открываем соединения заранее, чтобы первый
+    запрос после деплоя не платил за подключение и выполнение PRAGMA.
+    """
+    async def ping(current: AsyncEngine) -> None:
+        async with current.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    for current in set(_engines.values()):
+        size = current.pool.size() if hasattr(current.pool, "size") else 1
+        await asyncio.gather(*(ping(current) for _ in range(size)))
+
+
+async def dispose_engines() -> None:
+    """Закрытие всех соединений при остановке приложения"""
+    for current in set(_engines.values()):
+        await current.dispose()
 
-# Получаем URL базы данных из переменных окружения
-DATABASE_URL = os.getenv(
-    "DATABASE_URL",
-    "sqlite+aiosqlite:///./dating_app.db"  # SQLite по умолчанию
-)
 
 # Создаем асинхронный движок
-engine = create_async_engine(
-    DATABASE_URL,
-    echo=True,  # Показывать SQL запросы (для отладки)
-    connect_args={"check_same_thread": False}  # Для SQLite
-)
+engine = get_engine(WRITE_ENGINE)
+read_engine = get_engine(READ_ENGINE)
 
-# Создаем фабрику сессий
+# Создаем фабрики сессий
 async_session_maker = async_sessionmaker(
     engine,
     class_=AsyncSession,
     expire_on_commit=False
 )
 
+read_session_maker = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False
+)
+
 # Базовый класс для всех моделей
 Base = declarative_base()
 
@@ -44,8 +152,14 @@ async def get_db():
             await session.close()
 
 
+async def get_read_db():
+    """Зависимость для FastAPI для получения сессии только на чтение"""
+    async with read_session_maker() as session:
+        yield session
+
+
 # Функция для создания таблиц
 async def create_tables():
     """Создание всех таблиц в базе данных"""
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
\ No newline at end of file
+        await conn.run_sync(Base.metadata.create_all)
@@ -1,6 +1,14 @@
 # app/exceptions/__init__.py
+from .cities import CityNotFoundException
 from .favorites import FavoriteNotFoundException, FavoriteAlreadyExistsException
-from .likes import LikeNotFoundException, LikeAlreadyExistsException
+from .jobs import JobNotFoundException, UnknownJobTypeException
+from .likes import (
+    LikeNotFoundException,
+    LikeAlreadyExistsException,
+    ProfileLikeNotFoundException,
+    ProfileLikeAlreadyExistsException,
+    InvalidLikeException
+)
 from .profiles import (
     ProfileNotFoundException, 
     ProfileAlreadyExistsException, 
@@ -21,14 +29,21 @@ from .users import (
     UserAlreadyExistsException,
     InvalidCredentialsException,
     InvalidPasswordException,
-    UnauthorizedException
+    UnauthorizedException,
+    PasswordHashingBusyException
 )
 
 __all__ = [
+    "CityNotFoundException",
     "FavoriteNotFoundException",
     "FavoriteAlreadyExistsException",
+    "JobNotFoundException",
+    "UnknownJobTypeException",
     "LikeNotFoundException",
     "LikeAlreadyExistsException",
+    "ProfileLikeNotFoundException",
+    "ProfileLikeAlreadyExistsException",
+    "InvalidLikeException",
     "ProfileNotFoundException",
     "ProfileAlreadyExistsException",
     "InvalidProfileDataException",
@@ -43,4 +58,5 @@ __all__ = [
     "InvalidCredentialsException",
     "InvalidPasswordException",
     "UnauthorizedException",
+    "PasswordHashingBusyException",
 ]
\ No newline at end of file
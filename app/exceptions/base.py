@@ -23,6 +23,25 @@ class ObjectNotFoundError(MyAppError):
 class ObjectAlreadyExistsError(MyAppError):
     detail = "Похожий объект уже существует"
 
+    def __init__(self, field: str | None = None):
+        super().__init__()
+        # Колонка, по которой сработало ограничение UNIQUE
+        self.field = field
+
 
 class InvalidDateRangeError(MyAppError):
     detail = "Дата заезда не может быть позже даты выезда"
+
+
+class InvalidCursorHTTPError(MyAppHTTPError):
+    status_code = 400
+    detail = "Неверный курсор пагинации"
+
+
+class PasswordHashingBusyHTTPError(MyAppHTTPError):
+    status_code = 503
+    detail = "Сервер перегружен, повторите попытку позже"
+
+    def __init__(self):
+        super().__init__()
+        self.headers = {"Retry-After": "1"}
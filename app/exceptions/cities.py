@@ -0,0 +1,4 @@
+class CityNotFoundException(Exception):
+    def __init__(self, name: str):
+        super().__init__(f"City {name} not found")
+        self.name = name
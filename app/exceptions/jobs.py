@@ -0,0 +1,10 @@
+class JobNotFoundException(Exception):
+    def __init__(self, job_id: int):
+        super().__init__(f"Job with id {job_id} not found")
+        self.job_id = job_id
+
+
+class UnknownJobTypeException(Exception):
+    def __init__(self, job_type: str):
+        super().__init__(f"Unknown job type {job_type}")
+        self.job_type = job_type
@@ -11,4 +11,22 @@ class LikeNotFoundException(Exception):
 class LikeAlreadyExistsException(Exception):
     def __init__(self, profile_id: int):
         super().__init__(f"Like with profile_id {profile_id} already exists")
-        self.profile_id = profile_id
\ No newline at end of file
+        self.profile_id = profile_id
+
+class ProfileLikeNotFoundException(Exception):
+    def __init__(self, liker_profile_id: int, liked_profile_id: int):
+        super().__init__(f"Profile {liker_profile_id} has not liked profile {liked_profile_id}")
+        self.liker_profile_id = liker_profile_id
+        self.liked_profile_id = liked_profile_id
+
+
+class ProfileLikeAlreadyExistsException(Exception):
+    def __init__(self, liker_profile_id: int, liked_profile_id: int):
+        super().__init__(f"Profile {liker_profile_id} already liked profile {liked_profile_id}")
+        self.liker_profile_id = liker_profile_id
+        self.liked_profile_id = liked_profile_id
+
+
+class InvalidLikeException(Exception):
+    def __init__(self, message: str):
+        super().__init__(message)
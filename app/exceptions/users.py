@@ -26,4 +26,8 @@ class InvalidPasswordException(Exception):
 
 class UnauthorizedException(Exception):
     def __init__(self, message: str = "Not authorized"):
-        super().__init__(message)
\ No newline at end of file
+        super().__init__(message)
+
+class PasswordHashingBusyException(Exception):
+    def __init__(self, message: str = "Password hashing queue is full, try again later"):
+        super().__init__(message)
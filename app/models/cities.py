@@ -0,0 +1,70 @@
+from sqlalchemy import String, Float, ForeignKey, DDL, event
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database.database import Base
+from app.utils.cities import DEFAULT_CITIES, city_key
+
+
+class CityModel(Base):
+    __tablename__ = "cities"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    # Каноническое название, которое записывается в profiles.city и user_filters.city_filter
+    name: Mapped[str] = mapped_column(String(30), unique=True, nullable=False)
+    latitude: Mapped[float] = mapped_column(Float, nullable=False)
+    longitude: Mapped[float] = mapped_column(Float, nullable=False)
+
+
+class CityAliasModel(Base):
+    __tablename__ = "city_aliases"
+    # Ключ варианта написания (app.utils.cities.city_key)
+    alias: Mapped[str] = mapped_column(String(50), primary_key=True)
+    city_id: Mapped[int] = mapped_column(ForeignKey("cities.id", ondelete="CASCADE"), index=True, nullable=False)
+
+
+# Пространственный индекс R*Tree по координатам городов (точка - прямоугольник
+# нулевого размера), синхронизируется с cities триггерами
+CITIES_RTREE_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS cities_rtree USING rtree(id, min_lat, max_lat, min_lon, max_lon)
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS cities_rtree_ai AFTER INSERT ON cities BEGIN
+        INSERT INTO cities_rtree(id, min_lat, max_lat, min_lon, max_lon)
+        VALUES (new.id, new.latitude, new.latitude, new.longitude, new.longitude);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS cities_rtree_ad AFTER DELETE ON cities BEGIN
+        DELETE FROM cities_rtree WHERE id = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS cities_rtree_au AFTER UPDATE OF latitude, longitude ON cities BEGIN
+        UPDATE cities_rtree
+        SET min_lat = new.latitude, max_lat = new.latitude, min_lon = new.longitude, max_lon = new.longitude
+        WHERE id = new.id;
+    END
+    """,
+]
+
+
+def default_city_rows():
+    """Строки cities и city_aliases для справочника по умолчанию"""
+    cities = []
+    aliases = []
+    for city_id, (name, latitude, longitude, variants) in enumerate(DEFAULT_CITIES, start=1):
+        cities.append({"id": city_id, "name": name, "latitude": latitude, "longitude": longitude})
+        keys = {city_key(name)} | {city_key(variant) for variant in variants}
+        aliases.extend({"alias": key, "city_id": city_id} for key in sorted(keys))
+    return cities, aliases
+
+
+def _seed_cities(target, connection, **kw) -> None:
+    cities, aliases = default_city_rows()
+    connection.execute(CityModel.__table__.insert(), cities)
+    connection.execute(CityAliasModel.__table__.insert(), aliases)
+
+
+for statement in CITIES_RTREE_DDL:
+    event.listen(CityModel.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+# city_aliases создается после cities, к этому моменту триггеры R*Tree уже есть
+event.listen(CityAliasModel.__table__, "after_create", _seed_cities)
@@ -15,5 +15,5 @@ class FavoriteModel(Base):
     contact: Mapped[str] = mapped_column(String(20), nullable=False)
     is_mutual: Mapped[bool] = mapped_column(Boolean, nullable=False)
 
-    role_id: Mapped[int] = mapped_column(ForeignKey("roles.id"), nullable=False)
+    role_id: Mapped[int] = mapped_column(ForeignKey("roles.id"), index=True, nullable=False)
     role: Mapped["RoleModel"] = relationship(back_populates="favorites")
\ No newline at end of file
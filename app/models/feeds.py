@@ -0,0 +1,20 @@
+from datetime import datetime
+
+from sqlalchemy import Integer, LargeBinary, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database.database import Base
+
+
+class FeedModel(Base):
+    __tablename__ = "feeds"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    user_id: Mapped[int] = mapped_column(Integer, unique=True, nullable=False)
+    # Очередь ID профилей-кандидатов в порядке показа (uint32, см. app.utils.id_arrays)
+    queue: Mapped[bytes] = mapped_column(LargeBinary, default=b"", nullable=False)
+    # Сколько карточек из очереди уже выдано
+    position: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    # Уже показанные профили из предыдущих очередей
+    seen: Mapped[bytes] = mapped_column(LargeBinary, default=b"", nullable=False)
+    # Максимальный ID профиля, просмотренный при наполнении очереди
+    watermark: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -0,0 +1,40 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import JSON, String, Integer, Text, DateTime, Index, text
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database.database import Base
+
+# Состояния задачи: queued -> running -> done, либо снова queued (повтор
+# после ошибки) и failed, когда попытки кончились
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+
+class JobModel(Base):
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # Выборка следующих задач и глубина очереди по типам
+        Index("ix_jobs_status_type_run_at", "status", "type", "run_at"),
+        # Одна ожидающая задача на ключ: повторная постановка не плодит дубликаты
+        Index(
+            "ix_jobs_queued_key", "type", "key",
+            unique=True, sqlite_where=text("status = 'queued' AND key IS NOT NULL")
+        ),
+    )
+    id: Mapped[int] = mapped_column(primary_key=True)
+    type: Mapped[str] = mapped_column(String(50), nullable=False)
+    key: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    payload: Mapped[Dict[str, Any]] = mapped_column(JSON, default=dict, nullable=False)
+    status: Mapped[str] = mapped_column(String(20), default=JOB_QUEUED, nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    max_attempts: Mapped[int] = mapped_column(Integer, default=3, nullable=False)
+    # Не раньше этого времени задачу можно взять (отложенный запуск и паузы между повторами)
+    run_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    result: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON, nullable=True)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
@@ -1,6 +1,7 @@
+from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import String, Integer, Boolean, ForeignKey
+from sqlalchemy import String, Integer, Boolean, ForeignKey, Index, DateTime, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database.database import Base
 
@@ -10,10 +11,42 @@ if TYPE_CHECKING:
 
 class LikeModel(Base):
     __tablename__ = "likes"
+    __table_args__ = (
+        # Покрывающий индекс для выборок по me_liked и исключения лайкнутых из ленты
+        Index("ix_likes_me_liked_profile", "me_liked", "like_profile_id"),
+    )
     id: Mapped[int] = mapped_column(primary_key=True)
     like_profile_id: Mapped[int] = mapped_column(Integer, unique=True, nullable=False)
     contact: Mapped[str] = mapped_column(String(20), nullable=False)
     me_liked: Mapped[bool] = mapped_column(Boolean, nullable=False)
 
-    role_id: Mapped[int] = mapped_column(ForeignKey("roles.id"), nullable=False)
-    role: Mapped["RoleModel"] = relationship(back_populates="likes")
\ No newline at end of file
+    role_id: Mapped[int] = mapped_column(ForeignKey("roles.id"), index=True, nullable=False)
+    role: Mapped["RoleModel"] = relationship(back_populates="likes")
+
+
+class ProfileLikeModel(Base):
+    """Лайк одного профиля другим, ключ - (кто лайкнул, кого)"""
+    __tablename__ = "profile_likes"
+    __table_args__ = (
+        # Обратный индекс: кто лайкнул профиль
+        Index("ix_profile_likes_liked_liker", "liked_profile_id", "liker_profile_id"),
+        # Строка целиком лежит в B-дереве первичного ключа, без отдельного rowid
+        {"sqlite_with_rowid": False},
+    )
+    liker_profile_id: Mapped[int] = mapped_column(ForeignKey("profiles.id", ondelete="CASCADE"), primary_key=True)
+    liked_profile_id: Mapped[int] = mapped_column(ForeignKey("profiles.id", ondelete="CASCADE"), primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class MatchModel(Base):
+    """Взаимный лайк: по строке на каждого из двух участников"""
+    __tablename__ = "matches"
+    __table_args__ = (
+        UniqueConstraint("profile_id", "matched_profile_id"),
+        # Keyset-страница мэтчей профиля по (profile_id, id) без сортировки
+        Index("ix_matches_profile_id", "profile_id", "id"),
+    )
+    id: Mapped[int] = mapped_column(primary_key=True)
+    profile_id: Mapped[int] = mapped_column(ForeignKey("profiles.id", ondelete="CASCADE"), nullable=False)
+    matched_profile_id: Mapped[int] = mapped_column(ForeignKey("profiles.id", ondelete="CASCADE"), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
@@ -1,6 +1,7 @@
+from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import String, Integer, Boolean, ForeignKey
+from sqlalchemy import String, Integer, Boolean, ForeignKey, Index, DDL, DateTime, event, literal_column
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database.database import Base
 
@@ -10,6 +11,10 @@ if TYPE_CHECKING:
 
 class ProfileModel(Base):
     __tablename__ = "profiles"
+    __table_args__ = (
+        # search_profiles: gender =, city =, диапазон age
+        Index("ix_profiles_gender_city_age", "gender", "city", "age"),
+    )
     id: Mapped[int] = mapped_column(primary_key=True)
     user_id: Mapped[int] = mapped_column(Integer, unique=True, nullable=False)
     username: Mapped[str] = mapped_column(String(50), unique=True, nullable=False)
@@ -19,6 +24,51 @@ class ProfileModel(Base):
     description: Mapped[str] = mapped_column(String(100), nullable=False)
     tags: Mapped[str] = mapped_column(String(100), nullable=False)
     photo: Mapped[str] = mapped_column(String(200), nullable=False)
+    # Версия строки для ETag: увеличивается при каждом UPDATE
+    revision: Mapped[int] = mapped_column(
+        Integer, default=1, onupdate=literal_column("revision + 1"), server_default="1", nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
-    role_id: Mapped[int] = mapped_column(ForeignKey("roles.id"), nullable=False)
-    role: Mapped["RoleModel"] = relationship(back_populates="profiles")
\ No newline at end of file
+    role_id: Mapped[int] = mapped_column(ForeignKey("roles.id"), index=True, nullable=False)
+    role: Mapped["RoleModel"] = relationship(back_populates="profiles")
+
+
+# Полнотекстовый индекс FTS5 по описанию, тегам и городу (external content:
+# текст хранится только в profiles, индекс синхронизируется триггерами)
+PROFILES_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS profiles_fts USING fts5(
+        description, tags, city,
+        content='profiles', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS profiles_fts_ai AFTER INSERT ON profiles BEGIN
+        INSERT INTO profiles_fts(rowid, description, tags, city)
+        VALUES (new.id, new.description, new.tags, new.city);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS profiles_fts_ad AFTER DELETE ON profiles BEGIN
+        INSERT INTO profiles_fts(profiles_fts, rowid, description, tags, city)
+        VALUES ('delete', old.id, old.description, old.tags, old.city);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS profiles_fts_au AFTER UPDATE OF description, tags, city ON profiles BEGIN
+        INSERT INTO profiles_fts(profiles_fts, rowid, description, tags, city)
+        VALUES ('delete', old.id, old.description, old.tags, old.city);
+        INSERT INTO profiles_fts(rowid, description, tags, city)
+        VALUES (new.id, new.description, new.tags, new.city);
+    END
+    """,
+]
+
+for statement in PROFILES_FTS_DDL:
+    event.listen(
+        ProfileModel.__table__,
+        "after_create",
+        DDL(statement).execute_if(dialect="sqlite")
+    )
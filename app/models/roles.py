@@ -1,7 +1,8 @@
 # В models/roles.py добавьте relationship для user_filters
+from datetime import datetime
 from typing import TYPE_CHECKING, List
 
-from sqlalchemy import String, Integer, Boolean, ForeignKey
+from sqlalchemy import String, Integer, Boolean, ForeignKey, DateTime, literal_column
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database.database import Base
 
@@ -18,6 +19,11 @@ class RoleModel(Base):
 
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String(50), unique=True, nullable=False)
+    # Версия строки для ETag: увеличивается при каждом UPDATE
+    revision: Mapped[int] = mapped_column(
+        Integer, default=1, onupdate=literal_column("revision + 1"), server_default="1", nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
     users: Mapped[List["UserModel"]] = relationship(back_populates="role")
     profiles: Mapped[List["ProfileModel"]] = relationship(back_populates="role")
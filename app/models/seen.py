@@ -0,0 +1,14 @@
+from datetime import datetime
+
+from sqlalchemy import Integer, LargeBinary, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database.database import Base
+
+
+class SeenProfilesModel(Base):
+    __tablename__ = "seen_profiles"
+    user_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    # Просмотренные пользователем профили, сжатое множество (см. app.utils.id_arrays.pack_id_set)
+    ids: Mapped[bytes] = mapped_column(LargeBinary, default=b"", nullable=False)
+    count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -0,0 +1,122 @@
+from sqlalchemy import String, Integer, DDL, event
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database.database import Base
+from app.models.profiles import ProfileModel
+from app.models.user_filters import User_filterModel
+from app.models.users import UserModel
+
+# Имена счетчиков; key - значение группировки ('' для итогов)
+USERS_TOTAL = "users.total"
+USERS_ACTIVE = "users.active"
+USERS_BY_ROLE = "users.by_role"
+FILTERS_TOTAL = "filters.total"
+FILTERS_BY_GENDER = "filters.by_gender"
+FILTERS_BY_CITY = "filters.by_city"
+# Версия данных профилей: растет при каждой записи в profiles. Снимки в
+# памяти процессов (индекс тегов, ProfileMatrix) сверяют с ней свою версию
+PROFILES_VERSION = "profiles.version"
+
+
+class StatCounterModel(Base):
+    __tablename__ = "stat_counters"
+    name: Mapped[str] = mapped_column(String(30), primary_key=True)
+    key: Mapped[str] = mapped_column(String(50), primary_key=True, default="")
+    value: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+
+# Счетчики обновляются триггерами в той же транзакции, что и запись в
+# users/user_filters, включая пакетные вставки и удаления
+USERS_STATS_DDL = [
+    """
+    CREATE TRIGGER IF NOT EXISTS users_stats_ai AFTER INSERT ON users BEGIN
+        INSERT INTO stat_counters(name, key, value)
+        VALUES ('users.total', '', 1), ('users.active', '', new.is_active), ('users.by_role', new.role_id, 1)
+        ON CONFLICT(name, key) DO UPDATE SET value = value + excluded.value;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS users_stats_ad AFTER DELETE ON users BEGIN
+        INSERT INTO stat_counters(name, key, value)
+        VALUES ('users.total', '', -1), ('users.active', '', -old.is_active), ('users.by_role', old.role_id, -1)
+        ON CONFLICT(name, key) DO UPDATE SET value = value + excluded.value;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS users_stats_au AFTER UPDATE OF is_active, role_id ON users BEGIN
+        INSERT INTO stat_counters(name, key, value)
+        VALUES ('users.active', '', new.is_active - old.is_active),
+               ('users.by_role', old.role_id, -1), ('users.by_role', new.role_id, 1)
+        ON CONFLICT(name, key) DO UPDATE SET value = value + excluded.value;
+    END
+    """,
+]
+
+FILTERS_STATS_DDL = [
+    """
+    CREATE TRIGGER IF NOT EXISTS user_filters_stats_ai AFTER INSERT ON user_filters BEGIN
+        INSERT INTO stat_counters(name, key, value)
+        VALUES ('filters.total', '', 1), ('filters.by_gender', new.gender_filter, 1),
+               ('filters.by_city', new.city_filter, 1)
+        ON CONFLICT(name, key) DO UPDATE SET value = value + excluded.value;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS user_filters_stats_ad AFTER DELETE ON user_filters BEGIN
+        INSERT INTO stat_counters(name, key, value)
+        VALUES ('filters.total', '', -1), ('filters.by_gender', old.gender_filter, -1),
+               ('filters.by_city', old.city_filter, -1)
+        ON CONFLICT(name, key) DO UPDATE SET value = value + excluded.value;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS user_filters_stats_au AFTER UPDATE OF gender_filter, city_filter ON user_filters BEGIN
+        INSERT INTO stat_counters(name, key, value)
+        VALUES ('filters.by_gender', old.gender_filter, -1), ('filters.by_gender', new.gender_filter, 1),
+               ('filters.by_city', old.city_filter, -1), ('filters.by_city', new.city_filter, 1)
+        ON CONFLICT(name, key) DO UPDATE SET value = value + excluded.value;
+    END
+    """,
+]
+
+PROFILES_VERSION_DDL = [
+    """
+    CREATE TRIGGER IF NOT EXISTS profiles_version_ai AFTER INSERT ON profiles BEGIN
+        INSERT INTO stat_counters(name, key, value) VALUES ('profiles.version', '', 1)
+        ON CONFLICT(name, key) DO UPDATE SET value = value + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS profiles_version_au AFTER UPDATE ON profiles BEGIN
+        INSERT INTO stat_counters(name, key, value) VALUES ('profiles.version', '', 1)
+        ON CONFLICT(name, key) DO UPDATE SET value = value + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS profiles_version_ad AFTER DELETE ON profiles BEGIN
+        INSERT INTO stat_counters(name, key, value) VALUES ('profiles.version', '', 1)
+        ON CONFLICT(name, key) DO UPDATE SET value = value + 1;
+    END
+    """,
+]
+
+# Полный пересчет счетчиков из таблиц (manage.py rebuild-stats); версия
+# профилей не пересчитывается - она только растет
+STATS_REBUILD_SQL = [
+    "DELETE FROM stat_counters WHERE name != 'profiles.version'",
+    "INSERT INTO stat_counters(name, key, value) SELECT 'users.total', '', count(*) FROM users",
+    "INSERT INTO stat_counters(name, key, value) SELECT 'users.active', '', count(*) FROM users WHERE is_active = 1",
+    "INSERT INTO stat_counters(name, key, value) SELECT 'users.by_role', role_id, count(*) FROM users GROUP BY role_id",
+    "INSERT INTO stat_counters(name, key, value) SELECT 'filters.total', '', count(*) FROM user_filters",
+    "INSERT INTO stat_counters(name, key, value) SELECT 'filters.by_gender', gender_filter, count(*) "
+    "FROM user_filters GROUP BY gender_filter",
+    "INSERT INTO stat_counters(name, key, value) SELECT 'filters.by_city', city_filter, count(*) "
+    "FROM user_filters GROUP BY city_filter",
+]
+
+for table, statements in (
+    (UserModel.__table__, USERS_STATS_DDL),
+    (User_filterModel.__table__, FILTERS_STATS_DDL),
+    (ProfileModel.__table__, PROFILES_VERSION_DDL),
+):
+    for statement in statements:
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="sqlite"))
@@ -0,0 +1,19 @@
+from sqlalchemy import String, Integer, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database.database import Base
+
+
+class TagModel(Base):
+    __tablename__ = "tags"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str] = mapped_column(String(50), unique=True, nullable=False)
+
+
+class ProfileTagModel(Base):
+    __tablename__ = "profile_tags"
+    __table_args__ = (
+        # Обратный индекс: профили по тегу
+        Index("ix_profile_tags_tag_profile", "tag_id", "profile_id"),
+    )
+    profile_id: Mapped[int] = mapped_column(ForeignKey("profiles.id", ondelete="CASCADE"), primary_key=True)
+    tag_id: Mapped[int] = mapped_column(ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True)
@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 
-from sqlalchemy import String, Integer, Boolean, ForeignKey
+from sqlalchemy import String, Integer, Boolean, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database.database import Base
 
@@ -10,10 +10,15 @@ if TYPE_CHECKING:
 
 class User_filterModel(Base):
     __tablename__ = "user_filters"
+    __table_args__ = (
+        # get_users_by_filters и обратный поиск get_user_ids_for_profile (покрывающий)
+        Index("ix_user_filters_gender_city_user", "gender_filter", "city_filter", "user_id"),
+        Index("ix_user_filters_city", "city_filter"),
+    )
     id: Mapped[int] = mapped_column(primary_key=True)
     user_id: Mapped[int] = mapped_column(Integer, unique=True, nullable=False)
     gender_filter: Mapped[str] = mapped_column(String(20), nullable=False)
     city_filter: Mapped[str] = mapped_column(String(30), nullable=False)
 
-    role_id: Mapped[int] = mapped_column(ForeignKey("roles.id"), nullable=False)
+    role_id: Mapped[int] = mapped_column(ForeignKey("roles.id"), index=True, nullable=False)
     role: Mapped["RoleModel"] = relationship(back_populates="user_filters")
\ No newline at end of file
@@ -1,19 +1,176 @@
+from typing import Any, AsyncIterator, Dict, Generic, Iterable, List, Optional, Sequence, Type, TypeVar
+
 from pydantic import BaseModel
-from sqlalchemy import delete, insert, select, update
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Row
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
 from app.database.database import Base
 from app.exceptions.base import ObjectAlreadyExistsError
 
+ModelT = TypeVar("ModelT", bound=Base)
+
+# Сколько строк отправлять в одном INSERT (лимит параметров SQLite - 32766)
+UPSERT_CHUNK_SIZE = 500
+
+
+def unique_violation(exc: IntegrityError) -> Optional[str]:
+    """Колонка из ошибки "UNIQUE constraint failed: table.column" или None для других ошибок"""
+    message = str(exc.orig)
+    prefix = "UNIQUE constraint failed: "
+    if not message.startswith(prefix):
+        return None
+    return message[len(prefix):].split(",")[0].strip().split(".")[-1]
 
-class BaseRepository:
-    model: Base = None
-    schema: BaseModel = None
 
-    def __init__(self, session):
+class BaseRepository(Generic[ModelT]):
+    """
+    Общие операции над одной таблицей.
+
+    Репозитории не делают commit: изменения отправляются в БД через flush, а
+    транзакцию один раз фиксирует сервис (unit of work) в конце операции.
+    """
+    model: Type[ModelT] = None
+    schema: Type[BaseModel] = None
+
+    def __init__(self, session: AsyncSession):
         self.session = session
 
+    async def create(self, data: BaseModel) -> ModelT:
+        stmt = insert(self.model).values(**data.model_dump()).returning(self.model)
+        result = await self._execute_unique(stmt)
+        return result.scalar_one()
+
+    async def get_by_id(self, obj_id: int) -> Optional[ModelT]:
+        # Сначала identity map сессии, запрос только если объекта там нет
+        return await self.session.get(self.model, obj_id)
+
+    async def get_many(self, ids: Iterable[int]) -> List[ModelT]:
+        """Объекты по списку ID одним запросом IN (порядок не гарантируется)"""
+        ids = list(ids)
+        if not ids:
+            return []
+        result = await self.session.execute(select(self.model).where(self.model.id.in_(ids)))
+        return result.scalars().all()
+
+    async def get_all(
+        self, skip: int = 0, limit: int = 100, after_id: Optional[int] = None
+    ) -> List[ModelT]:
+        query = self._page(select(self.model), skip, limit, after_id)
+        result = await self.session.execute(query)
+        return result.scalars().all()
+
+    async def get_all_rows(
+        self, skip: int = 0, limit: int = 100, after_id: Optional[int] = None
+    ) -> List[Row]:
+        """Та же страница, что get_all, но строками-кортежами всех колонок"""
+        query = self._page(select(*self.model.__table__.columns), skip, limit, after_id)
+        result = await self.session.execute(query)
+        return result.all()
+
+    def _page(self, query, skip: int, limit: int, after_id: Optional[int]):
+        query = query.order_by(self.model.id)
+        # Keyset-пагинация: страница по индексу PK без пропуска skip строк
+        if after_id is not None:
+            query = query.where(self.model.id > after_id)
+        else:
+            query = query.offset(skip)
+        return query.limit(limit)
+
+    async def get_columns(self, columns: Sequence, *filters, limit: Optional[int] = None) -> List[Row]:
+        """Только нужные колонки: строки-кортежи без создания ORM-объектов"""
+        query = select(*columns).where(*filters)
+        if limit is not None:
+            query = query.limit(limit)
+        result = await self.session.execute(query)
+        return result.all()
+
+    async def stream_columns(self, columns: Sequence, chunk_size: int = 1000) -> AsyncIterator[List[Row]]:
+        """
+        Вся таблица пачками по chunk_size строк через серверный курсор:
+        в памяти одновременно только одна пачка, независимо от размера таблицы.
+        """
+        query = select(*columns).order_by(self.model.id).execution_options(yield_per=chunk_size)
+        result = await self.session.stream(query)
+        async for rows in result.partitions(chunk_size):
+            yield rows
+
+    async def get_version(self, **filter_by) -> Optional[Row]:
+        """
+        (id, revision, updated_at) одной строки для условного GET - без
+        загрузки ORM-объекта. Только для моделей с колонками revision и updated_at.
+        """
+        query = select(self.model.id, self.model.revision, self.model.updated_at).filter_by(**filter_by)
+        result = await self.session.execute(query)
+        return result.one_or_none()
+
+    async def get_table_version(self) -> Row:
+        """(count, max(id), max(updated_at)) всей таблицы для условного GET списков"""
+        query = select(func.count(), func.max(self.model.id), func.max(self.model.updated_at))
+        result = await self.session.execute(query)
+        return result.one()
+
+    async def exists(self, *filters, **filter_by) -> bool:
+        query = select(self.model.id).where(*filters).filter_by(**filter_by)
+        result = await self.session.execute(select(query.exists()))
+        return bool(result.scalar())
+
+    async def update(self, obj_id: int, data: BaseModel) -> Optional[ModelT]:
+        values = data.model_dump(exclude_unset=True)
+        if not values:
+            return await self.get_by_id(obj_id)
+        stmt = (
+            update(self.model)
+            .where(self.model.id == obj_id)
+            .values(**values)
+            .returning(self.model)
+        )
+        result = await self._execute_unique(stmt)
+        return result.scalar_one_or_none()
+
+    async def delete(self, obj_id: int) -> bool:
+        stmt = delete(self.model).where(self.model.id == obj_id)
+        result = await self.session.execute(stmt)
+        return result.rowcount > 0
+
+    async def upsert_many(
+        self,
+        rows: List[Dict[str, Any]],
+        index_elements: Sequence[str],
+        update_columns: Optional[Sequence[str]] = None
+    ) -> int:
+        """
+        Массовая вставка с ON CONFLICT: при конфликте по index_elements
+        обновляются update_columns (или строка пропускается, если их нет).
+        """
+        for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+            stmt = sqlite_insert(self.model).values(rows[start:start + UPSERT_CHUNK_SIZE])
+            if update_columns:
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=index_elements,
+                    set_={name: stmt.excluded[name] for name in update_columns}
+                )
+            else:
+                stmt = stmt.on_conflict_do_nothing(index_elements=index_elements)
+            await self.session.execute(stmt)
+        return len(rows)
+
+    async def _execute_unique(self, stmt):
+        """
+        Выполнение INSERT/UPDATE без предварительной проверки уникальности:
+        нарушение UNIQUE превращается в ObjectAlreadyExistsError с именем колонки.
+        """
+        try:
+            return await self.session.execute(stmt)
+        except IntegrityError as exc:
+            field = unique_violation(exc)
+            if field is None:
+                raise
+            raise ObjectAlreadyExistsError(field) from exc
+
     async def get_filtered(
         self,
         limit: int | None = None,
@@ -37,10 +194,6 @@ class BaseRepository:
 
         return result
 
-    async def get_all(self, *args, **kwargs) -> list[BaseModel]:
-        """Возращает все записи в БД из связаной таблицы"""
-        return await self.get_filtered(*args, **kwargs)
-
     async def get_one_or_none(self, **filter_by) -> None | BaseModel:
         query = select(self.model).filter_by(**filter_by)
 
@@ -77,7 +230,7 @@ class BaseRepository:
         # print(add_stmt.compile(compile_kwargs={"literal_binds": True}))
         await self.session.execute(add_stmt)
 
-    async def delete(self, *filters, **filter_by) -> None:
+    async def delete_filtered(self, *filters, **filter_by) -> None:
         delete_stmt = delete(self.model)
         if filters:
             delete_stmt = delete_stmt.where(*filters)
@@ -85,7 +238,6 @@ class BaseRepository:
             delete_stmt = delete_stmt.filter_by(**filter_by)
 
         await self.session.execute(delete_stmt)
-        await self.session.commit()
 
     async def edit(
         self, data: BaseModel, exclude_unset: bool = False, **filter_by
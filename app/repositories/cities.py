@@ -0,0 +1,38 @@
+from typing import List
+from sqlalchemy import select, table, column
+from sqlalchemy.engine import Row
+from app.models.cities import CityModel, CityAliasModel
+from app.repositories.base import BaseRepository
+
+# Виртуальная таблица R*Tree (app.models.cities.CITIES_RTREE_DDL)
+cities_rtree = table(
+    "cities_rtree", column("id"), column("min_lat"), column("max_lat"), column("min_lon"), column("max_lon")
+)
+
+
+class CityRepository(BaseRepository[CityModel]):
+    model = CityModel
+
+    async def get_all_cities(self) -> List[Row]:
+        result = await self.session.execute(
+            select(CityModel.id, CityModel.name, CityModel.latitude, CityModel.longitude).order_by(CityModel.name)
+        )
+        return result.all()
+
+    async def get_all_aliases(self) -> List[Row]:
+        result = await self.session.execute(select(CityAliasModel.alias, CityAliasModel.city_id))
+        return result.all()
+
+    async def get_in_box(self, min_lat: float, max_lat: float, min_lon: float, max_lon: float) -> List[Row]:
+        """Города внутри прямоугольника координат - поиск по R*Tree, без сканирования cities"""
+        result = await self.session.execute(
+            select(CityModel.id, CityModel.name, CityModel.latitude, CityModel.longitude)
+            .join(cities_rtree, cities_rtree.c.id == CityModel.id)
+            .where(
+                cities_rtree.c.max_lat >= min_lat,
+                cities_rtree.c.min_lat <= max_lat,
+                cities_rtree.c.max_lon >= min_lon,
+                cities_rtree.c.min_lon <= max_lon,
+            )
+        )
+        return result.all()
@@ -0,0 +1,145 @@
+from typing import List, Optional, Tuple
+from sqlalchemy import LargeBinary, cast, select, update, func
+from app.models.feeds import FeedModel
+from app.models.likes import ProfileLikeModel
+from app.models.profiles import ProfileModel
+from app.repositories.base import BaseRepository, UPSERT_CHUNK_SIZE
+from app.utils.id_arrays import pack_ids
+
+
+class FeedRepository(BaseRepository[FeedModel]):
+    model = FeedModel
+
+    async def create(self, user_id: int) -> FeedModel:
+        feed = FeedModel(user_id=user_id, queue=b"", position=0, seen=b"", watermark=0)
+        self.session.add(feed)
+        await self.session.flush()
+        return feed
+
+    async def get_by_user_id(self, user_id: int) -> Optional[FeedModel]:
+        result = await self.session.execute(
+            select(FeedModel).where(FeedModel.user_id == user_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_by_user_ids(self, user_ids: List[int]) -> List[FeedModel]:
+        feeds = []
+        for start in range(0, len(user_ids), UPSERT_CHUNK_SIZE):
+            result = await self.session.execute(
+                select(FeedModel).where(FeedModel.user_id.in_(user_ids[start:start + UPSERT_CHUNK_SIZE]))
+            )
+            feeds.extend(result.scalars().all())
+        return feeds
+
+    async def advance(self, feed_id: int, count: int) -> Optional[Tuple[int, bytes]]:
+        """
+        Забирает count карточек: сдвиг позиции и чтение очереди одним UPDATE
+        ... RETURNING, поэтому параллельные запросы получают разные срезы.
+        Возвращает новую позицию и очередь, из которой выданы карточки
+        [position - count, position); позиция может уйти за конец очереди.
+        """
+        stmt = (
+            update(FeedModel)
+            .where(FeedModel.id == feed_id)
+            .values(position=FeedModel.position + count)
+            .returning(FeedModel.position, FeedModel.queue)
+        )
+        result = await self.session.execute(stmt)
+        return result.one_or_none()
+
+    async def save(
+        self,
+        feed_id: int,
+        expected_position: int,
+        queue: bytes,
+        seen: bytes,
+        watermark: int
+    ) -> bool:
+        # Оптимистичная блокировка: если за время пересборки карточки были выданы,
+        # запись не обновится и пересборку нужно повторить
+        stmt = (
+            update(FeedModel)
+            .where(FeedModel.id == feed_id, FeedModel.position == expected_position)
+            .values(queue=queue, position=0, seen=seen, watermark=watermark)
+        )
+        result = await self.session.execute(stmt)
+        return result.rowcount > 0
+
+    async def push_profile(self, user_ids: List[int], profile_id: int) -> int:
+        """
+        Дописывает профиль в конец очередей пользователей (конкатенация BLOB в
+        UPDATE, без чтения очередей). Ленты, чей watermark уже прошел
+        profile_id, не трогаются: при пополнении профиль в них уже рассмотрен.
+        Возвращает число обновленных лент.
+        """
+        updated = 0
+        for start in range(0, len(user_ids), UPSERT_CHUNK_SIZE):
+            stmt = (
+                update(FeedModel)
+                .where(
+                    FeedModel.user_id.in_(user_ids[start:start + UPSERT_CHUNK_SIZE]),
+                    FeedModel.watermark < profile_id
+                )
+                # || в SQLite возвращает TEXT с теми же байтами, CAST возвращает тип BLOB
+                .values(queue=cast(FeedModel.queue.op("||")(pack_ids([profile_id])), LargeBinary))
+            )
+            result = await self.session.execute(stmt)
+            updated += result.rowcount
+        return updated
+
+    async def get_candidates(
+        self,
+        user_id: int,
+        watermark: int,
+        window: int,
+        limit: int,
+        gender: Optional[str] = None,
+        city: Optional[str] = None,
+        profile_id: Optional[int] = None
+    ) -> Tuple[List[Tuple[int, str, int]], int]:
+        """
+        Кандидаты для ленты из окна профилей с id > watermark.
+        Профили, которые лайкнул профиль зрителя profile_id, исключаются.
+
+        Просматривается не больше window строк по первичному ключу, поэтому
+        пополнение очереди никогда не сканирует всю таблицу profiles.
+        Возвращает (id, city, age) кандидатов и новый watermark.
+        """
+        scan = (
+            select(ProfileModel.id, ProfileModel.user_id, ProfileModel.gender,
+                   ProfileModel.city, ProfileModel.age)
+            .where(ProfileModel.id > watermark)
+            .order_by(ProfileModel.id)
+            .limit(window)
+            .subquery()
+        )
+
+        window_result = await self.session.execute(select(func.max(scan.c.id)))
+        window_max = window_result.scalar()
+        if window_max is None:
+            return [], watermark
+
+        query = (
+            select(scan.c.id, scan.c.city, scan.c.age)
+            .where(scan.c.user_id != user_id)
+        )
+        if profile_id is not None:
+            # Лайки зрителя читаются по первичному ключу (liker, liked)
+            liked = (
+                select(ProfileLikeModel.liked_profile_id)
+                .where(ProfileLikeModel.liker_profile_id == profile_id)
+            )
+            query = query.where(scan.c.id.not_in(liked))
+        if gender:
+            query = query.where(scan.c.gender == gender)
+        if city:
+            query = query.where(scan.c.city == city)
+        query = query.order_by(scan.c.id).limit(limit)
+
+        result = await self.session.execute(query)
+        candidates = [tuple(row) for row in result.all()]
+
+        # Если очередь заполнилась раньше конца окна, продолжаем с последнего взятого
+        if len(candidates) == limit:
+            return candidates, candidates[-1][0]
+        return candidates, window_max
@@ -0,0 +1,139 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from sqlalchemy import case, delete, func, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from app.models.jobs import JobModel, JOB_DONE, JOB_FAILED, JOB_QUEUED, JOB_RUNNING
+from app.repositories.base import BaseRepository
+
+
+class JobRepository(BaseRepository[JobModel]):
+    """Очередь фоновых задач в таблице jobs"""
+    model = JobModel
+
+    async def enqueue(
+        self,
+        job_type: str,
+        payload: Dict[str, Any],
+        run_at: datetime,
+        max_attempts: int,
+        key: Optional[str] = None
+    ) -> Optional[int]:
+        """
+        Новая задача. Возвращает ее id или None, если задача того же типа с
+        тем же key уже ждет в очереди.
+        """
+        stmt = (
+            sqlite_insert(JobModel)
+            .values(
+                type=job_type, key=key, payload=payload, status=JOB_QUEUED, attempts=0,
+                max_attempts=max_attempts, run_at=run_at, created_at=datetime.utcnow()
+            )
+            .on_conflict_do_nothing()
+            .returning(JobModel.id)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def get_pending_by_key(self, job_type: str, key: str) -> Optional[JobModel]:
+        """Последняя незавершенная (ожидающая или выполняемая) задача типа job_type с key"""
+        result = await self.session.execute(
+            select(JobModel)
+            .where(
+                JobModel.status.in_([JOB_QUEUED, JOB_RUNNING]),
+                JobModel.type == job_type,
+                JobModel.key == key
+            )
+            .order_by(JobModel.id.desc())
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+
+    async def claim(self, job_type: str, limit: int, now: datetime) -> List[JobModel]:
+        """
+        Берет до limit готовых задач типа job_type: статус running и попытка
+        засчитываются одним UPDATE ... RETURNING, без окна между выборкой и
+        пометкой, в которое задачу мог бы взять кто-то еще.
+        """
+        ready = (
+            select(JobModel.id)
+            .where(JobModel.status == JOB_QUEUED, JobModel.type == job_type, JobModel.run_at <= now)
+            .order_by(JobModel.run_at)
+            .limit(limit)
+        )
+        stmt = (
+            update(JobModel)
+            .where(JobModel.id.in_(ready.scalar_subquery()))
+            .values(status=JOB_RUNNING, attempts=JobModel.attempts + 1, started_at=now)
+            .returning(JobModel)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
+
+    async def complete(self, job_id: int, result: Optional[Dict[str, Any]]) -> None:
+        await self.session.execute(
+            update(JobModel)
+            .where(JobModel.id == job_id)
+            .values(status=JOB_DONE, result=result, finished_at=datetime.utcnow())
+        )
+
+    async def fail(self, job_id: int, error: str, retry_at: Optional[datetime]) -> None:
+        """Ошибка задачи: повтор в retry_at или окончательный отказ, если retry_at нет"""
+        values = {"last_error": error}
+        if retry_at is None:
+            values.update(status=JOB_FAILED, finished_at=datetime.utcnow())
+        else:
+            values.update(status=JOB_QUEUED, run_at=retry_at)
+        await self.session.execute(update(JobModel).where(JobModel.id == job_id).values(**values))
+
+    async def requeue_running(self) -> int:
+        """
+        Возвращает в очередь задачи, прерванные остановкой процесса; попытка,
+        засчитанная при захвате, не возвращается.
+        """
+        result = await self.session.execute(
+            update(JobModel)
+            .where(JobModel.status == JOB_RUNNING)
+            .values(status=JOB_QUEUED, run_at=datetime.utcnow())
+        )
+        return result.rowcount
+
+    async def get_depth(self, now: datetime) -> List[Dict[str, Any]]:
+        """
+        Глубина очереди по типам: ожидающие (из них готовые к запуску),
+        выполняемые, провалившиеся и возраст самой старой готовой задачи.
+        Выполненные задачи не считаются - их читать пришлось бы все.
+        """
+        stmt = (
+            select(
+                JobModel.type,
+                JobModel.status,
+                func.count(),
+                func.sum(case((JobModel.run_at <= now, 1), else_=0)),
+                func.min(JobModel.run_at),
+            )
+            .where(JobModel.status.in_([JOB_QUEUED, JOB_RUNNING, JOB_FAILED]))
+            .group_by(JobModel.status, JobModel.type)
+        )
+        result = await self.session.execute(stmt)
+        depth: Dict[str, Dict[str, Any]] = {}
+        for job_type, status, count, due, oldest in result.all():
+            row = depth.setdefault(
+                job_type, {"type": job_type, JOB_QUEUED: 0, "ready": 0, JOB_RUNNING: 0, JOB_FAILED: 0,
+                           "oldest_ready_seconds": 0.0}
+            )
+            row[status] = count
+            if status == JOB_QUEUED:
+                row["ready"] = due or 0
+                if due:
+                    row["oldest_ready_seconds"] = round(max((now - oldest).total_seconds(), 0.0), 3)
+        return sorted(depth.values(), key=lambda row: row["type"])
+
+    async def purge_finished(self, before: datetime) -> int:
+        """Удаляет выполненные и провалившиеся задачи, завершенные раньше before"""
+        result = await self.session.execute(
+            delete(JobModel).where(
+                JobModel.status.in_([JOB_DONE, JOB_FAILED]),
+                JobModel.finished_at < before
+            )
+        )
+        return result.rowcount
@@ -1,71 +1,123 @@
 from typing import List, Optional
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete, update, and_
-from app.models.likes import LikeModel
-from app.schemas.likes import LikeCreate, LikeUpdate
+from sqlalchemy import and_, delete, insert, or_, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Row
+from app.models.likes import LikeModel, MatchModel, ProfileLikeModel
+from app.repositories.base import BaseRepository
 
 
-class LikeRepository:
-    def __init__(self, session: AsyncSession):
-        self.session = session
+class LikeRepository(BaseRepository[LikeModel]):
+    model = LikeModel
 
-    async def create(self, like_data: LikeCreate) -> LikeModel:
-        like = LikeModel(**like_data.dict())
-        self.session.add(like)
-        await self.session.commit()
-        await self.session.refresh(like)
-        return like
-
-    async def get_by_id(self, like_id: int) -> Optional[LikeModel]:
+    async def get_by_profile_id(self, profile_id: int) -> Optional[LikeModel]:
         result = await self.session.execute(
-            select(LikeModel).where(LikeModel.id == like_id)
+            select(LikeModel).where(LikeModel.like_profile_id == profile_id)
         )
         return result.scalar_one_or_none()
 
-    async def get_by_profile_id(self, profile_id: int) -> Optional[LikeModel]:
+    async def get_by_role_id(self, role_id: int) -> List[LikeModel]:
         result = await self.session.execute(
-            select(LikeModel).where(LikeModel.like_profile_id == profile_id)
+            select(LikeModel).where(LikeModel.role_id == role_id)
         )
-        return result.scalar_one_or_none()
+        return result.scalars().all()
+
+    async def get_mutual_likes(self) -> List[LikeModel]:
+        # Получаем лайки, где me_liked = True (я лайкнул)
+        result = await self.session.execute(
+            select(LikeModel).where(LikeModel.me_liked == True)
+        )
+        return result.scalars().all()
 
-    async def get_all(self, skip: int = 0, limit: int = 100) -> List[LikeModel]:
+    async def get_likes_by_me_liked(self, me_liked: bool) -> List[LikeModel]:
         result = await self.session.execute(
-            select(LikeModel).offset(skip).limit(limit)
+            select(LikeModel).where(LikeModel.me_liked == me_liked)
         )
         return result.scalars().all()
 
-    async def update(self, like_id: int, like_data: LikeUpdate) -> Optional[LikeModel]:
+
+class ProfileLikeRepository(BaseRepository[ProfileLikeModel]):
+    """Лайки между профилями (profile_likes) и мэтчи (matches)"""
+    model = ProfileLikeModel
+
+    async def create_like(self, liker_profile_id: int, liked_profile_id: int) -> ProfileLikeModel:
         stmt = (
-            update(LikeModel)
-            .where(LikeModel.id == like_id)
-            .values(**like_data.dict(exclude_unset=True))
-            .returning(LikeModel)
+            insert(ProfileLikeModel)
+            .values(liker_profile_id=liker_profile_id, liked_profile_id=liked_profile_id)
+            .returning(ProfileLikeModel)
         )
-        result = await self.session.execute(stmt)
-        await self.session.commit()
-        return result.scalar_one_or_none()
+        result = await self._execute_unique(stmt)
+        return result.scalar_one()
+
+    async def has_like(self, liker_profile_id: int, liked_profile_id: int) -> bool:
+        # Точечный поиск по первичному ключу (liker, liked)
+        query = select(ProfileLikeModel.liker_profile_id).where(
+            ProfileLikeModel.liker_profile_id == liker_profile_id,
+            ProfileLikeModel.liked_profile_id == liked_profile_id
+        )
+        result = await self.session.execute(select(query.exists()))
+        return bool(result.scalar())
 
-    async def delete(self, like_id: int) -> bool:
-        stmt = delete(LikeModel).where(LikeModel.id == like_id)
-        result = await self.session.execute(stmt)
-        await self.session.commit()
+    async def delete_like(self, liker_profile_id: int, liked_profile_id: int) -> bool:
+        result = await self.session.execute(
+            delete(ProfileLikeModel).where(
+                ProfileLikeModel.liker_profile_id == liker_profile_id,
+                ProfileLikeModel.liked_profile_id == liked_profile_id
+            )
+        )
         return result.rowcount > 0
 
-    async def get_by_role_id(self, role_id: int) -> List[LikeModel]:
+    async def create_match(self, profile_id: int, matched_profile_id: int) -> int:
+        """Мэтч пишется двумя строками, по одной на участника; возвращает ID строки profile_id"""
+        stmt = (
+            sqlite_insert(MatchModel)
+            .values([
+                {"profile_id": profile_id, "matched_profile_id": matched_profile_id},
+                {"profile_id": matched_profile_id, "matched_profile_id": profile_id},
+            ])
+            .on_conflict_do_nothing()
+        )
+        await self.session.execute(stmt)
         result = await self.session.execute(
-            select(LikeModel).where(LikeModel.role_id == role_id)
+            select(MatchModel.id).where(
+                MatchModel.profile_id == profile_id,
+                MatchModel.matched_profile_id == matched_profile_id
+            )
         )
-        return result.scalars().all()
+        return result.scalar_one()
 
-    async def get_mutual_likes(self) -> List[LikeModel]:
-        # Получаем лайки, где me_liked = True (я лайкнул)
+    async def delete_match(self, profile_id: int, matched_profile_id: int) -> None:
+        await self.session.execute(
+            delete(MatchModel).where(or_(
+                and_(MatchModel.profile_id == profile_id, MatchModel.matched_profile_id == matched_profile_id),
+                and_(MatchModel.profile_id == matched_profile_id, MatchModel.matched_profile_id == profile_id)
+            ))
+        )
+
+    async def get_matches(self, profile_id: int, limit: int = 100, after_id: Optional[int] = None) -> List[Row]:
+        """Страница мэтчей профиля по индексу (profile_id, id)"""
+        query = select(*MatchModel.__table__.columns).where(MatchModel.profile_id == profile_id)
+        if after_id is not None:
+            query = query.where(MatchModel.id > after_id)
+        result = await self.session.execute(query.order_by(MatchModel.id).limit(limit))
+        return result.all()
+
+    async def get_liker_ids(self, profile_id: int) -> List[int]:
+        """Кто лайкнул профиль, по индексу (liked_profile_id, liker_profile_id)"""
         result = await self.session.execute(
-            select(LikeModel).where(LikeModel.me_liked == True)
+            select(ProfileLikeModel.liker_profile_id).where(ProfileLikeModel.liked_profile_id == profile_id)
         )
         return result.scalars().all()
 
-    async def get_likes_by_me_liked(self, me_liked: bool) -> List[LikeModel]:
-        result = await self.session.execute(
-            select(LikeModel).where(LikeModel.me_liked == me_liked)
+    async def delete_profile(self, profile_id: int) -> None:
+        """Все лайки и мэтчи профиля (в обе стороны)"""
+        await self.session.execute(delete(ProfileLikeModel).where(ProfileLikeModel.liker_profile_id == profile_id))
+        await self.session.execute(delete(ProfileLikeModel).where(ProfileLikeModel.liked_profile_id == profile_id))
+        # Строки второй стороны находятся по уникальному индексу через собственные строки профиля
+        partners = select(MatchModel.matched_profile_id).where(MatchModel.profile_id == profile_id)
+        await self.session.execute(
+            delete(MatchModel).where(
+                MatchModel.profile_id.in_(partners),
+                MatchModel.matched_profile_id == profile_id
+            )
         )
-        return result.scalars().all()
\ No newline at end of file
+        await self.session.execute(delete(MatchModel).where(MatchModel.profile_id == profile_id))
@@ -1,26 +1,18 @@
-from typing import List, Optional
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete, update, and_, or_
-from app.models.profiles import ProfileModel
-from app.schemas.profiles import ProfileCreate, ProfileUpdate
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import select, func, table, column, literal_column, or_, text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from app.config import settings
+from app.models.profiles import ProfileModel, PROFILES_FTS_DDL
+from app.repositories.base import BaseRepository, UPSERT_CHUNK_SIZE
+from app.utils.search import build_match_query
 
+# Виртуальная таблица FTS5 (см. PROFILES_FTS_DDL), rowid = profiles.id
+profiles_fts = table("profiles_fts", column("rowid"))
+fts_match = literal_column("profiles_fts").op("MATCH")
 
-class ProfileRepository:
-    def __init__(self, session: AsyncSession):
-        self.session = session
 
-    async def create(self, profile_data: ProfileCreate) -> ProfileModel:
-        profile = ProfileModel(**profile_data.dict())
-        self.session.add(profile)
-        await self.session.commit()
-        await self.session.refresh(profile)
-        return profile
-
-    async def get_by_id(self, profile_id: int) -> Optional[ProfileModel]:
-        result = await self.session.execute(
-            select(ProfileModel).where(ProfileModel.id == profile_id)
-        )
-        return result.scalar_one_or_none()
+class ProfileRepository(BaseRepository[ProfileModel]):
+    model = ProfileModel
 
     async def get_by_user_id(self, user_id: int) -> Optional[ProfileModel]:
         result = await self.session.execute(
@@ -28,28 +20,45 @@ class ProfileRepository:
         )
         return result.scalar_one_or_none()
 
-    async def get_all(self, skip: int = 0, limit: int = 100) -> List[ProfileModel]:
+    async def create_bulk(self, rows: List[Dict[str, Any]]) -> List[Tuple[int, int, str, str]]:
+        """
+        Многострочный INSERT ... ON CONFLICT DO NOTHING RETURNING пачками.
+
+        Возвращает (id, user_id, username, tags) вставленных профилей; строки с занятым
+        user_id или username пропускаются.
+        """
+        created = []
+        for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+            stmt = (
+                sqlite_insert(ProfileModel)
+                .values(rows[start:start + UPSERT_CHUNK_SIZE])
+                .on_conflict_do_nothing()
+                .returning(ProfileModel.id, ProfileModel.user_id, ProfileModel.username, ProfileModel.tags)
+            )
+            result = await self.session.execute(stmt)
+            created.extend(tuple(row) for row in result.all())
+        return created
+
+    async def get_taken(self, user_ids: List[int], usernames: List[str]) -> Tuple[set, set]:
+        """Какие из user_id и username уже заняты"""
         result = await self.session.execute(
-            select(ProfileModel).offset(skip).limit(limit)
+            select(ProfileModel.user_id, ProfileModel.username)
+            .where(or_(ProfileModel.user_id.in_(user_ids), ProfileModel.username.in_(usernames)))
         )
-        return result.scalars().all()
+        rows = result.all()
+        return {row.user_id for row in rows}, {row.username for row in rows}
 
-    async def update(self, profile_id: int, profile_data: ProfileUpdate) -> Optional[ProfileModel]:
-        stmt = (
-            update(ProfileModel)
-            .where(ProfileModel.id == profile_id)
-            .values(**profile_data.dict(exclude_unset=True))
-            .returning(ProfileModel)
-        )
-        result = await self.session.execute(stmt)
-        await self.session.commit()
-        return result.scalar_one_or_none()
+    async def get_existing_ids(self, ids: List[int]) -> set:
+        """Какие из ID профилей существуют"""
+        result = await self.session.execute(select(ProfileModel.id).where(ProfileModel.id.in_(ids)))
+        return set(result.scalars().all())
 
-    async def delete(self, profile_id: int) -> bool:
-        stmt = delete(ProfileModel).where(ProfileModel.id == profile_id)
-        result = await self.session.execute(stmt)
-        await self.session.commit()
-        return result.rowcount > 0
+    async def get_matrix_rows(self) -> List[Tuple[int, int, str, str, str]]:
+        """(id, age, gender, city, tags) всех профилей для снимка ProfileMatrix"""
+        result = await self.session.execute(
+            select(ProfileModel.id, ProfileModel.age, ProfileModel.gender, ProfileModel.city, ProfileModel.tags)
+        )
+        return result.all()
 
     async def get_by_role_id(self, role_id: int) -> List[ProfileModel]:
         result = await self.session.execute(
@@ -65,10 +74,33 @@ class ProfileRepository:
         city: Optional[str] = None,
         tags: Optional[str] = None,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cities: Optional[List[str]] = None
     ) -> List[ProfileModel]:
-        query = select(ProfileModel)
-        
+        query = self._search_query(select(ProfileModel), min_age, max_age, gender, city, tags, cities)
+        query = query.offset(skip).limit(limit)
+        result = await self.session.execute(query)
+        return result.scalars().all()
+
+    async def search_profile_ids(
+        self,
+        min_age: Optional[int] = None,
+        max_age: Optional[int] = None,
+        gender: Optional[str] = None,
+        city: Optional[str] = None,
+        tags: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100,
+        cities: Optional[List[str]] = None
+    ) -> List[int]:
+        """ID из той же выдачи, что и search_profiles; индекс (gender, city, age) покрывает запрос"""
+        query = self._search_query(select(ProfileModel.id), min_age, max_age, gender, city, tags, cities)
+        query = query.offset(skip).limit(limit)
+        result = await self.session.execute(query)
+        return result.scalars().all()
+
+    @staticmethod
+    def _search_query(query, min_age, max_age, gender, city, tags, cities=None):
         if min_age is not None:
             query = query.where(ProfileModel.age >= min_age)
         if max_age is not None:
@@ -76,16 +108,47 @@ class ProfileRepository:
         if gender:
             query = query.where(ProfileModel.gender == gender)
         if city:
-            query = query.where(ProfileModel.city.ilike(f"%{city}%"))
+            # Точное совпадение, чтобы работал индекс (gender, city, age)
+            query = query.where(ProfileModel.city == city)
+        if cities is not None:
+            # Города из поиска по радиусу: IN по второй колонке того же индекса
+            query = query.where(ProfileModel.city.in_(cities))
         if tags:
-            query = query.where(ProfileModel.tags.ilike(f"%{tags}%"))
-        
-        query = query.offset(skip).limit(limit)
-        result = await self.session.execute(query)
-        return result.scalars().all()
+            match = build_match_query(tags, column="tags") if settings.SEARCH_USE_FTS else None
+            if match:
+                # Быстрый путь через FTS5 вместо сканирования по ilike
+                query = query.where(
+                    ProfileModel.id.in_(select(profiles_fts.c.rowid).where(fts_match(match)))
+                )
+            else:
+                query = query.where(ProfileModel.tags.ilike(f"%{tags}%"))
+        return query
 
     async def get_by_username(self, username: str) -> Optional[ProfileModel]:
         result = await self.session.execute(
             select(ProfileModel).where(ProfileModel.username == username)
         )
-        return result.scalar_one_or_none()
\ No newline at end of file
+        return result.scalar_one_or_none()
+
+    async def search_text(self, query: str, skip: int = 0, limit: int = 100) -> List[ProfileModel]:
+        match = build_match_query(query)
+        if match is None:
+            return []
+        stmt = (
+            select(ProfileModel)
+            .join(profiles_fts, profiles_fts.c.rowid == ProfileModel.id)
+            .where(fts_match(match))
+            .order_by(func.bm25(literal_column("profiles_fts")), ProfileModel.id)
+            .offset(skip)
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
+
+    async def rebuild_search_index(self) -> int:
+        """Создание (при необходимости) и полная пересборка индекса FTS5"""
+        for statement in PROFILES_FTS_DDL:
+            await self.session.execute(text(statement))
+        await self.session.execute(text("INSERT INTO profiles_fts(profiles_fts) VALUES ('rebuild')"))
+        result = await self.session.execute(select(func.count()).select_from(ProfileModel))
+        return result.scalar()
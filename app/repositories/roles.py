@@ -1,26 +1,12 @@
 from typing import List, Optional
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete, update
+from sqlalchemy import select, delete, func
 from app.models.roles import RoleModel
-from app.schemas.roles import RoleCreate, RoleUpdate
+from app.models.users import UserModel
+from app.repositories.base import BaseRepository
 
 
-class RoleRepository:
-    def __init__(self, session: AsyncSession):
-        self.session = session
-
-    async def create(self, role_data: RoleCreate) -> RoleModel:
-        role = RoleModel(**role_data.dict())
-        self.session.add(role)
-        await self.session.commit()
-        await self.session.refresh(role)
-        return role
-
-    async def get_by_id(self, role_id: int) -> Optional[RoleModel]:
-        result = await self.session.execute(
-            select(RoleModel).where(RoleModel.id == role_id)
-        )
-        return result.scalar_one_or_none()
+class RoleRepository(BaseRepository[RoleModel]):
+    model = RoleModel
 
     async def get_by_name(self, name: str) -> Optional[RoleModel]:
         result = await self.session.execute(
@@ -28,34 +14,24 @@ class RoleRepository:
         )
         return result.scalar_one_or_none()
 
-    async def get_all(self, skip: int = 0, limit: int = 100) -> List[RoleModel]:
-        result = await self.session.execute(
-            select(RoleModel).offset(skip).limit(limit)
-        )
-        return result.scalars().all()
-
-    async def update(self, role_id: int, role_data: RoleUpdate) -> Optional[RoleModel]:
-        stmt = (
-            update(RoleModel)
-            .where(RoleModel.id == role_id)
-            .values(**role_data.dict(exclude_unset=True))
-            .returning(RoleModel)
+    async def delete(self, role_id: int) -> bool:
+        # Нельзя удалить роль, если есть пользователи с этой ролью
+        has_users = await self.session.execute(
+            select(select(UserModel.id).where(UserModel.role_id == role_id).exists())
         )
-        result = await self.session.execute(stmt)
-        await self.session.commit()
-        return result.scalar_one_or_none()
+        if has_users.scalar():
+            return False
 
-    async def delete(self, role_id: int) -> bool:
-        # Проверяем, есть ли пользователи с этой ролью
-        role = await self.get_by_id(role_id)
-        if role and role.users:
-            return False  # Нельзя удалить роль, если есть пользователи
-        
         stmt = delete(RoleModel).where(RoleModel.id == role_id)
         result = await self.session.execute(stmt)
-        await self.session.commit()
         return result.rowcount > 0
 
+    async def count_users(self, role_id: int) -> int:
+        result = await self.session.execute(
+            select(func.count(UserModel.id)).where(UserModel.role_id == role_id)
+        )
+        return result.scalar()
+
     async def search_by_name(self, name: str, skip: int = 0, limit: int = 100) -> List[RoleModel]:
         result = await self.session.execute(
             select(RoleModel)
@@ -63,4 +39,4 @@ class RoleRepository:
             .offset(skip)
             .limit(limit)
         )
-        return result.scalars().all()
\ No newline at end of file
+        return result.scalars().all()
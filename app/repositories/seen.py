@@ -0,0 +1,48 @@
+from typing import Optional
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Row
+from app.models.seen import SeenProfilesModel
+from app.repositories.base import BaseRepository
+
+
+class SeenProfilesRepository(BaseRepository[SeenProfilesModel]):
+    """Множество просмотренных профилей - одна строка с BLOB на пользователя"""
+    model = SeenProfilesModel
+
+    async def get_ids(self, user_id: int) -> Optional[bytes]:
+        result = await self.session.execute(
+            select(SeenProfilesModel.ids).where(SeenProfilesModel.user_id == user_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_stats(self, user_id: int) -> Optional[Row]:
+        """(count, размер BLOB в байтах) без чтения самого BLOB"""
+        result = await self.session.execute(
+            select(SeenProfilesModel.count, func.length(SeenProfilesModel.ids))
+            .where(SeenProfilesModel.user_id == user_id)
+        )
+        return result.one_or_none()
+
+    async def lock(self, user_id: int) -> None:
+        """
+        Пустая строка, если ее еще нет. Запись берет блокировку записи SQLite,
+        поэтому следующее чтение и save в этой транзакции не пересекаются с
+        параллельным слиянием.
+        """
+        await self.session.execute(
+            sqlite_insert(SeenProfilesModel)
+            .values(user_id=user_id, ids=b"", count=0)
+            .on_conflict_do_nothing(index_elements=["user_id"])
+        )
+
+    async def save(self, user_id: int, ids: bytes, count: int) -> None:
+        await self.session.execute(
+            update(SeenProfilesModel).where(SeenProfilesModel.user_id == user_id).values(ids=ids, count=count)
+        )
+
+    async def delete_by_user_id(self, user_id: int) -> bool:
+        result = await self.session.execute(
+            delete(SeenProfilesModel).where(SeenProfilesModel.user_id == user_id)
+        )
+        return result.rowcount > 0
@@ -0,0 +1,53 @@
+from typing import Dict, Optional
+from sqlalchemy import select, text
+from app.models.stats import StatCounterModel, STATS_REBUILD_SQL
+from app.repositories.base import BaseRepository
+
+
+class StatCounterRepository(BaseRepository[StatCounterModel]):
+    """Счетчики из stat_counters: вместо агрегатов по всей таблице - чтение нескольких строк по PK"""
+    model = StatCounterModel
+
+    async def get_total(self, name: str) -> int:
+        result = await self.session.execute(
+            select(StatCounterModel.value).where(StatCounterModel.name == name, StatCounterModel.key == "")
+        )
+        return result.scalar() or 0
+
+    async def get_breakdown(self, name: str, limit: Optional[int] = None) -> Dict[str, int]:
+        """Ненулевые счетчики группы, самые большие первыми"""
+        query = (
+            select(StatCounterModel.key, StatCounterModel.value)
+            .where(StatCounterModel.name == name, StatCounterModel.value > 0)
+            .order_by(StatCounterModel.value.desc(), StatCounterModel.key)
+        )
+        if limit is not None:
+            query = query.limit(limit)
+        result = await self.session.execute(query)
+        return {key: value for key, value in result.all()}
+
+    async def increment(self, name: str, key: str = "", delta: int = 1) -> None:
+        await self.session.execute(
+            text(
+                "INSERT INTO stat_counters(name, key, value) VALUES (:name, :key, :delta) "
+                "ON CONFLICT(name, key) DO UPDATE SET value = value + excluded.value"
+            ),
+            {"name": name, "key": key, "delta": delta}
+        )
+
+    async def get_all_counters(self) -> Dict[tuple, int]:
+        result = await self.session.execute(
+            select(StatCounterModel.name, StatCounterModel.key, StatCounterModel.value)
+        )
+        return {(name, key): value for name, key, value in result.all()}
+
+    async def rebuild(self) -> int:
+        """
+        Пересчет всех счетчиков из users и user_filters.
+        Возвращает, сколько счетчиков расходилось с таблицами.
+        """
+        before = await self.get_all_counters()
+        for statement in STATS_REBUILD_SQL:
+            await self.session.execute(text(statement))
+        after = await self.get_all_counters()
+        return sum(1 for key in before.keys() | after.keys() if before.get(key, 0) != after.get(key, 0))
@@ -0,0 +1,73 @@
+from typing import Dict, List, Tuple
+from sqlalchemy import select, delete, insert
+from app.models.profiles import ProfileModel
+from app.models.tags import TagModel, ProfileTagModel
+from app.repositories.base import BaseRepository, UPSERT_CHUNK_SIZE
+from app.utils.tags import parse_tags
+
+
+class TagRepository(BaseRepository[TagModel]):
+    model = TagModel
+
+    async def get_or_create_ids(self, names: List[str]) -> Dict[str, int]:
+        await self.upsert_many([{"name": name} for name in names], index_elements=["name"])
+        tag_ids = {}
+        for start in range(0, len(names), UPSERT_CHUNK_SIZE):
+            rows = await self.get_columns(
+                (TagModel.name, TagModel.id),
+                TagModel.name.in_(names[start:start + UPSERT_CHUNK_SIZE])
+            )
+            tag_ids.update(rows)
+        return tag_ids
+
+    async def set_profile_tags(self, profile_id: int, names: List[str]) -> None:
+        tag_ids = await self.get_or_create_ids(names)
+        await self.session.execute(
+            delete(ProfileTagModel).where(ProfileTagModel.profile_id == profile_id)
+        )
+        if tag_ids:
+            await self.session.execute(
+                insert(ProfileTagModel).values(
+                    [{"profile_id": profile_id, "tag_id": tag_id} for tag_id in tag_ids.values()]
+                )
+            )
+
+    async def add_profiles_tags(self, profile_tags: List[Tuple[int, List[str]]]) -> None:
+        """Теги для новых профилей одним набором запросов (связей у них еще нет)"""
+        names = sorted({name for _, names in profile_tags for name in names})
+        tag_ids = await self.get_or_create_ids(names)
+        rows = [
+            {"profile_id": profile_id, "tag_id": tag_ids[name]}
+            for profile_id, names in profile_tags
+            for name in names
+        ]
+        if rows:
+            await self.session.execute(insert(ProfileTagModel), rows)
+
+    async def delete_profile_tags(self, profile_id: int) -> None:
+        await self.session.execute(
+            delete(ProfileTagModel).where(ProfileTagModel.profile_id == profile_id)
+        )
+
+    async def get_all_profile_tags(self) -> List[Tuple[int, str]]:
+        result = await self.session.execute(
+            select(ProfileTagModel.profile_id, TagModel.name)
+            .join(TagModel, TagModel.id == ProfileTagModel.tag_id)
+        )
+        return [tuple(row) for row in result.all()]
+
+    async def rebuild_from_profiles(self) -> int:
+        """Пересборка profile_tags из строковых тегов всех профилей"""
+        result = await self.session.execute(select(ProfileModel.id, ProfileModel.tags))
+        parsed = [(profile_id, parse_tags(tags)) for profile_id, tags in result.all()]
+        names = sorted({tag for _, tags in parsed for tag in tags})
+        tag_ids = await self.get_or_create_ids(names)
+        await self.session.execute(delete(ProfileTagModel))
+        rows = [
+            {"profile_id": profile_id, "tag_id": tag_ids[tag]}
+            for profile_id, tags in parsed
+            for tag in tags
+        ]
+        if rows:
+            await self.session.execute(insert(ProfileTagModel), rows)
+        return len(parsed)
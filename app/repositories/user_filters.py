@@ -1,34 +1,33 @@
-from typing import List, Optional, Dict, Any
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete, update, func, and_
+from typing import List, Optional, Dict, Any, Tuple
+from sqlalchemy import select, delete, and_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from app.models.user_filters import User_filterModel
-from app.schemas.user_filters import UserFilterCreate, UserFilterUpdate
-
-
-class UserFilterRepository:
-    def __init__(self, session: AsyncSession):
-        self.session = session
-
-    async def create(self, filter_data: UserFilterCreate) -> User_filterModel:
-        filter_obj = User_filterModel(**filter_data.dict())
-        self.session.add(filter_obj)
-        await self.session.commit()
-        await self.session.refresh(filter_obj)
-        return filter_obj
-
-    async def create_bulk(self, filters_data: List[UserFilterCreate]) -> List[User_filterModel]:
-        filters = [User_filterModel(**data.dict()) for data in filters_data]
-        self.session.add_all(filters)
-        await self.session.commit()
-        for filter_obj in filters:
-            await self.session.refresh(filter_obj)
-        return filters
-
-    async def get_by_id(self, filter_id: int) -> Optional[User_filterModel]:
-        result = await self.session.execute(
-            select(User_filterModel).where(User_filterModel.id == filter_id)
-        )
-        return result.scalar_one_or_none()
+from app.repositories.base import BaseRepository, UPSERT_CHUNK_SIZE
+from app.schemas.user_filters import UserFilterCreate
+
+
+class UserFilterRepository(BaseRepository[User_filterModel]):
+    model = User_filterModel
+
+    async def create_bulk(self, filters_data: List[UserFilterCreate]) -> List[Tuple[int, int]]:
+        """
+        Многострочный INSERT ... ON CONFLICT(user_id) DO NOTHING RETURNING пачками.
+
+        Возвращает (id, user_id) только вставленных строк: пользователи, у которых
+        фильтр уже есть, в результат не попадают.
+        """
+        created = []
+        for start in range(0, len(filters_data), UPSERT_CHUNK_SIZE):
+            rows = [data.model_dump() for data in filters_data[start:start + UPSERT_CHUNK_SIZE]]
+            stmt = (
+                sqlite_insert(User_filterModel)
+                .values(rows)
+                .on_conflict_do_nothing(index_elements=["user_id"])
+                .returning(User_filterModel.id, User_filterModel.user_id)
+            )
+            result = await self.session.execute(stmt)
+            created.extend(tuple(row) for row in result.all())
+        return created
 
     async def get_by_user_id(self, user_id: int) -> Optional[User_filterModel]:
         result = await self.session.execute(
@@ -36,33 +35,9 @@ class UserFilterRepository:
         )
         return result.scalar_one_or_none()
 
-    async def get_all(self, skip: int = 0, limit: int = 100) -> List[User_filterModel]:
-        result = await self.session.execute(
-            select(User_filterModel).offset(skip).limit(limit)
-        )
-        return result.scalars().all()
-
-    async def update(self, filter_id: int, filter_data: UserFilterUpdate) -> Optional[User_filterModel]:
-        stmt = (
-            update(User_filterModel)
-            .where(User_filterModel.id == filter_id)
-            .values(**filter_data.dict(exclude_unset=True))
-            .returning(User_filterModel)
-        )
-        result = await self.session.execute(stmt)
-        await self.session.commit()
-        return result.scalar_one_or_none()
-
-    async def delete(self, filter_id: int) -> bool:
-        stmt = delete(User_filterModel).where(User_filterModel.id == filter_id)
-        result = await self.session.execute(stmt)
-        await self.session.commit()
-        return result.rowcount > 0
-
     async def delete_by_user_id(self, user_id: int) -> bool:
         stmt = delete(User_filterModel).where(User_filterModel.user_id == user_id)
         result = await self.session.execute(stmt)
-        await self.session.commit()
         return result.rowcount > 0
 
     async def get_by_role_id(self, role_id: int) -> List[User_filterModel]:
@@ -83,7 +58,8 @@ class UserFilterRepository:
         if gender_filter:
             query = query.where(User_filterModel.gender_filter.ilike(f"%{gender_filter}%"))
         if city_filter:
-            query = query.where(User_filterModel.city_filter.ilike(f"%{city_filter}%"))
+            # Город уже приведен к каноническому названию - точное совпадение по индексу
+            query = query.where(User_filterModel.city_filter == city_filter)
         
         query = query.offset(skip).limit(limit)
         result = await self.session.execute(query)
@@ -97,51 +73,32 @@ class UserFilterRepository:
 
     async def get_filters_by_city(self, city: str) -> List[User_filterModel]:
         result = await self.session.execute(
-            select(User_filterModel).where(User_filterModel.city_filter.ilike(f"%{city}%"))
+            select(User_filterModel).where(User_filterModel.city_filter == city)
         )
         return result.scalars().all()
 
-    async def get_stats(self) -> Dict[str, Any]:
-        # Общее количество фильтров
-        total_result = await self.session.execute(
-            select(func.count()).select_from(User_filterModel)
-        )
-        total_filters = total_result.scalar()
-
-        # Статистика по гендерным фильтрам
-        gender_result = await self.session.execute(
-            select(
-                User_filterModel.gender_filter,
-                func.count(User_filterModel.id)
-            )
-            .group_by(User_filterModel.gender_filter)
-        )
-        gender_stats = {row[0]: row[1] for row in gender_result.all()}
-
-        # Статистика по городам (топ 10)
-        city_result = await self.session.execute(
-            select(
-                User_filterModel.city_filter,
-                func.count(User_filterModel.id)
+    async def get_user_ids_for_profile(self, genders: List[str], city: str) -> List[int]:
+        """
+        Обратный поиск: user_id, чьи фильтры пропускают профиль. genders - пол
+        профиля и значения "любой пол", city - канонический город профиля;
+        пустой city_filter означает фильтр без города. Все пары (пол, город)
+        читаются из индекса (gender_filter, city_filter, user_id) без обращения
+        к таблице.
+        """
+        result = await self.session.execute(
+            select(User_filterModel.user_id).where(
+                User_filterModel.gender_filter.in_(genders),
+                User_filterModel.city_filter.in_([city, ""])
             )
-            .group_by(User_filterModel.city_filter)
-            .order_by(func.count(User_filterModel.id).desc())
-            .limit(10)
         )
-        city_stats = {row[0]: row[1] for row in city_result.all()}
-
-        return {
-            "total_filters": total_filters,
-            "gender_stats": gender_stats,
-            "city_stats": city_stats
-        }
+        return sorted(result.scalars().all())
 
     async def get_users_by_filters(self, gender: str, city: str) -> List[User_filterModel]:
         result = await self.session.execute(
             select(User_filterModel).where(
                 and_(
                     User_filterModel.gender_filter == gender,
-                    User_filterModel.city_filter.ilike(f"%{city}%")
+                    User_filterModel.city_filter == city
                 )
             )
         )
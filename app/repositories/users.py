@@ -1,31 +1,26 @@
 from typing import List, Optional, Dict, Any
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete, update, func, and_
+from sqlalchemy import insert, select, update
 from app.models.users import UserModel
+from app.repositories.base import BaseRepository
 from app.schemas.users import UserCreate, UserUpdate
 
 
-class UserRepository:
-    def __init__(self, session: AsyncSession):
-        self.session = session
+class UserRepository(BaseRepository[UserModel]):
+    model = UserModel
 
-    async def create(self, user_data: UserCreate) -> UserModel:
-        user = UserModel(
-            email=user_data.email,
-            hashed_password=user_data.password,
-            is_active=user_data.is_active,
-            role_id=user_data.role_id
-        )
-        self.session.add(user)
-        await self.session.commit()
-        await self.session.refresh(user)
-        return user
-
-    async def get_by_id(self, user_id: int) -> Optional[UserModel]:
-        result = await self.session.execute(
-            select(UserModel).where(UserModel.id == user_id)
+    async def create(self, user_data: UserCreate, hashed_password: str) -> UserModel:
+        stmt = (
+            insert(UserModel)
+            .values(
+                email=user_data.email,
+                hashed_password=hashed_password,
+                is_active=user_data.is_active,
+                role_id=user_data.role_id
+            )
+            .returning(UserModel)
         )
-        return result.scalar_one_or_none()
+        result = await self._execute_unique(stmt)
+        return result.scalar_one()
 
     async def get_by_email(self, email: str) -> Optional[UserModel]:
         result = await self.session.execute(
@@ -33,17 +28,13 @@ class UserRepository:
         )
         return result.scalar_one_or_none()
 
-    async def get_all(self, skip: int = 0, limit: int = 100) -> List[UserModel]:
-        result = await self.session.execute(
-            select(UserModel).offset(skip).limit(limit)
-        )
-        return result.scalars().all()
-
     async def update(self, user_id: int, user_data: UserUpdate, hashed_password: Optional[str] = None) -> Optional[UserModel]:
-        update_data = user_data.dict(exclude_unset=True, exclude={"password"})
+        update_data = user_data.model_dump(exclude_unset=True, exclude={"password"})
         
         if hashed_password:
             update_data["hashed_password"] = hashed_password
+        if not update_data:
+            return await self.get_by_id(user_id)
         
         stmt = (
             update(UserModel)
@@ -51,16 +42,9 @@ class UserRepository:
             .values(**update_data)
             .returning(UserModel)
         )
-        result = await self.session.execute(stmt)
-        await self.session.commit()
+        result = await self._execute_unique(stmt)
         return result.scalar_one_or_none()
 
-    async def delete(self, user_id: int) -> bool:
-        stmt = delete(UserModel).where(UserModel.id == user_id)
-        result = await self.session.execute(stmt)
-        await self.session.commit()
-        return result.rowcount > 0
-
     async def get_by_role_id(self, role_id: int) -> List[UserModel]:
         result = await self.session.execute(
             select(UserModel).where(UserModel.role_id == role_id)
@@ -97,39 +81,6 @@ class UserRepository:
         )
         return result.scalars().all()
 
-    async def get_stats(self) -> Dict[str, Any]:
-        # Общее количество пользователей
-        total_result = await self.session.execute(
-            select(func.count()).select_from(UserModel)
-        )
-        total_users = total_result.scalar()
-
-        # Активные пользователи
-        active_result = await self.session.execute(
-            select(func.count()).where(UserModel.is_active == True)
-        )
-        active_users = active_result.scalar()
-
-        # Неактивные пользователи
-        inactive_users = total_users - active_users
-
-        # Пользователи по ролям
-        role_result = await self.session.execute(
-            select(
-                UserModel.role_id,
-                func.count(UserModel.id)
-            )
-            .group_by(UserModel.role_id)
-        )
-        users_by_role = {str(row[0]): row[1] for row in role_result.all()}
-
-        return {
-            "total_users": total_users or 0,
-            "active_users": active_users or 0,
-            "inactive_users": inactive_users or 0,
-            "users_by_role": users_by_role
-        }
-
     async def update_password(self, user_id: int, hashed_password: str) -> Optional[UserModel]:
         stmt = (
             update(UserModel)
@@ -138,7 +89,6 @@ class UserRepository:
             .returning(UserModel)
         )
         result = await self.session.execute(stmt)
-        await self.session.commit()
         return result.scalar_one_or_none()
 
     async def update_status(self, user_id: int, is_active: bool) -> Optional[UserModel]:
@@ -149,5 +99,4 @@ class UserRepository:
             .returning(UserModel)
         )
         result = await self.session.execute(stmt)
-        await self.session.commit()
         return result.scalar_one_or_none()
\ No newline at end of file
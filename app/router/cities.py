@@ -0,0 +1,7 @@
+from fastapi import APIRouter
+from app.api.cities import router as cities_router
+
+router = APIRouter()
+router.include_router(cities_router)
+
+# Можно добавить дополнительные маршруты или префиксы здесь
\ No newline at end of file
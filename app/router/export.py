@@ -0,0 +1,7 @@
+from fastapi import APIRouter
+from app.api.export import router as export_router
+
+router = APIRouter()
+router.include_router(export_router)
+
+# Можно добавить дополнительные маршруты или префиксы здесь
@@ -0,0 +1,7 @@
+from fastapi import APIRouter
+from app.api.feeds import router as feeds_router
+
+router = APIRouter()
+router.include_router(feeds_router)
+
+# Можно добавить дополнительные маршруты или префиксы здесь
\ No newline at end of file
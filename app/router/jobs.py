@@ -0,0 +1,7 @@
+from fastapi import APIRouter
+from app.api.jobs import router as jobs_router
+
+router = APIRouter()
+router.include_router(jobs_router)
+
+# Можно добавить дополнительные маршруты или префиксы здесь
\ No newline at end of file
@@ -0,0 +1,7 @@
+from fastapi import APIRouter
+from app.api.seen import router as seen_router
+
+router = APIRouter()
+router.include_router(seen_router)
+
+# Можно добавить дополнительные маршруты или префиксы здесь
\ No newline at end of file
@@ -0,0 +1,15 @@
+from pydantic import BaseModel, Field
+
+
+class CityResponse(BaseModel):
+    id: int
+    name: str = Field(..., description="Каноническое название")
+    latitude: float
+    longitude: float
+
+    class Config:
+        from_attributes = True
+
+
+class CityDistanceResponse(CityResponse):
+    distance_km: float = Field(..., description="Расстояние от точки поиска, км")
@@ -0,0 +1,15 @@
+from enum import Enum
+
+
+class ExportTable(str, Enum):
+    profiles = "profiles"
+    users = "users"
+    likes = "likes"
+    favorites = "favorites"
+    user_filters = "user-filters"
+    roles = "roles"
+
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
@@ -0,0 +1,32 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+from pydantic import BaseModel, Field
+
+
+class JobCreate(BaseModel):
+    type: str = Field(..., max_length=50, description="Тип задачи: stats.rebuild, search.rebuild, feeds.refill, ...")
+    payload: Dict[str, Any] = Field(default_factory=dict, description="Параметры обработчика")
+    key: Optional[str] = Field(
+        None, max_length=100, description="Ключ: задача с тем же типом и ключом не ставится повторно, пока ждет"
+    )
+    delay_seconds: float = Field(0, ge=0, le=7 * 24 * 3600, description="Отложить запуск на столько секунд")
+    max_attempts: Optional[int] = Field(None, ge=1, le=20, description="По умолчанию JOB_MAX_ATTEMPTS")
+
+
+class JobResponse(BaseModel):
+    id: int
+    type: str
+    key: Optional[str] = None
+    payload: Dict[str, Any]
+    status: str
+    attempts: int
+    max_attempts: int
+    run_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    result: Optional[Dict[str, Any]] = None
+    last_error: Optional[str] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -1,3 +1,4 @@
+from datetime import datetime
 from pydantic import BaseModel, Field
 from typing import Optional
 
@@ -22,4 +23,22 @@ class LikeResponse(LikeBase):
     role_id: int
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class ProfileLikeResponse(BaseModel):
+    liker_profile_id: int = Field(..., description="ID профиля, который поставил лайк")
+    liked_profile_id: int = Field(..., description="ID профиля, который лайкнули")
+    created_at: datetime
+    matched: bool = Field(..., description="Лайк оказался взаимным")
+    match_id: Optional[int] = Field(None, description="ID мэтча для профиля, поставившего лайк")
+
+
+class MatchResponse(BaseModel):
+    id: int
+    profile_id: int = Field(..., description="ID профиля")
+    matched_profile_id: int = Field(..., description="ID профиля, с которым взаимная симпатия")
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Literal, Optional
 
 
 class ProfileBase(BaseModel):
@@ -33,4 +33,22 @@ class ProfileResponse(ProfileBase):
     role_id: int
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class RankedProfileResponse(ProfileResponse):
+    score: float = Field(..., description="Оценка совместимости, больше - выше в выдаче")
+
+
+class ProfileImportRowResult(BaseModel):
+    index: int = Field(..., description="Номер записи во входных данных")
+    status: Literal["duplicate", "invalid"] = Field(..., description="Почему профиль не создан")
+    detail: str = Field(..., description="Описание ошибки")
+
+
+class ProfileImportReport(BaseModel):
+    total: int = Field(..., description="Обработано записей")
+    created: int = Field(..., description="Создано профилей")
+    skipped: int = Field(..., description="Пропущено записей")
+    checkpoint: int = Field(..., description="С какой записи продолжить импорт (resume_from)")
+    errors: List[ProfileImportRowResult] = Field(..., description="Пропущенные записи")
@@ -0,0 +1,19 @@
+from typing import List
+from pydantic import BaseModel, Field
+
+
+class SeenProfilesAdd(BaseModel):
+    profile_ids: List[int] = Field(..., min_length=1, max_length=1000, description="ID просмотренных профилей")
+
+
+class SeenProfilesResponse(BaseModel):
+    user_id: int
+    count: int = Field(..., description="Сколько профилей пользователь уже видел")
+    size_bytes: int = Field(..., description="Размер сжатого множества в байтах")
+    added: int = Field(0, description="Сколько ID из запроса оказались новыми")
+
+
+class SeenProfileCheck(BaseModel):
+    user_id: int
+    profile_id: int
+    seen: bool
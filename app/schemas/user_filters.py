@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, validator
-from typing import Optional, List
+from typing import Literal, Optional, List
 
 
 class UserFilterBase(BaseModel):
@@ -39,5 +39,25 @@ class FilterStatsResponse(BaseModel):
     city_stats: dict = Field(..., description="Статистика по городским фильтрам")
 
 
+class InterestedUsersResponse(BaseModel):
+    profile_id: int = Field(..., description="ID профиля")
+    user_ids: List[int] = Field(..., description="Пользователи, чьи фильтры пропускают профиль")
+
+
 class BulkFilterCreate(BaseModel):
-    filters: List[UserFilterCreate] = Field(..., description="Список фильтров для создания")
\ No newline at end of file
+    filters: List[UserFilterCreate] = Field(..., description="Список фильтров для создания")
+
+
+class BulkFilterRowResult(BaseModel):
+    index: int = Field(..., description="Номер строки во входных данных")
+    status: Literal["created", "exists", "duplicate", "invalid"] = Field(..., description="Результат для строки")
+    user_id: Optional[int] = Field(None, description="ID пользователя")
+    id: Optional[int] = Field(None, description="ID созданного фильтра")
+    detail: Optional[str] = Field(None, description="Причина, если фильтр не создан")
+
+
+class BulkFilterReport(BaseModel):
+    total: int = Field(..., description="Всего строк во входных данных")
+    created: int = Field(..., description="Создано фильтров")
+    skipped: int = Field(..., description="Пропущено строк")
+    results: List[BulkFilterRowResult] = Field(..., description="Результат по каждой строке")
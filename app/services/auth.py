@@ -1,5 +1,4 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from passlib.context import CryptContext
 from datetime import datetime, timedelta
 import jwt
 from typing import Optional
@@ -12,7 +11,12 @@ from app.schemas.users import (
     PasswordChange
 )
 from app.models.users import UserModel
+from app.config import settings
 from app.repositories.users import UserRepository
+from app.exceptions.base import ObjectAlreadyExistsError
+from app.utils.cache import TTLCache
+from app.utils.passwords import password_hasher
+from app.exceptions.auth import InvalidJWTTokenError, JWTTokenExpiredError
 from app.exceptions.users import (
     UserAlreadyExistsException,
     InvalidCredentialsException,
@@ -24,12 +28,14 @@ from app.exceptions.users import (
 SUserAdd = UserCreate
 
 # Настройки JWT
-SECRET_KEY = "your-secret-key-change-this-in-production"  # В продакшене используйте переменные окружения
-ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 30
+SECRET_KEY = settings.SECRET_KEY
+ALGORITHM = settings.ALGORITHM
+ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 
-# Контекст для хэширования паролей
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Проверенные claims по токену: живут до exp самого токена
+token_claims_cache = TTLCache(maxsize=settings.AUTH_TOKEN_CACHE_SIZE)
+# Текущие пользователи по ID: короткий TTL, сбрасываются при изменении
+current_user_cache = TTLCache(maxsize=settings.AUTH_USER_CACHE_SIZE, ttl=settings.AUTH_USER_CACHE_TTL)
 
 
 class AuthService:
@@ -37,13 +43,13 @@ class AuthService:
         self.session = session
         self.user_repository = UserRepository(session)
 
-    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        """Проверка пароля"""
-        return pwd_context.verify(plain_password, hashed_password)
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        """Проверка пароля (в пуле потоков, не блокирует event loop)"""
+        return await password_hasher.verify(plain_password, hashed_password)
 
-    def get_password_hash(self, password: str) -> str:
-        """Хэширование пароля"""
-        return pwd_context.hash(password)
+    async def get_password_hash(self, password: str) -> str:
+        """Хэширование пароля (в пуле потоков, не блокирует event loop)"""
+        return await password_hasher.hash(password)
 
     def create_access_token(self, data: dict, expires_delta: Optional[timedelta] = None) -> str:
         """Создание JWT токена"""
@@ -66,7 +72,7 @@ class AuthService:
             raise InvalidCredentialsException()
         
         # Проверяем пароль
-        if not self.verify_password(login_data.password, user.hashed_password):
+        if not await self.verify_password(login_data.password, user.hashed_password):
             raise InvalidCredentialsException()
         
         # Проверяем активен ли пользователь
@@ -88,18 +94,17 @@ class AuthService:
 
     async def register_user(self, user_data: UserCreate) -> UserResponse:
         """Регистрация нового пользователя"""
-        # Проверяем, существует ли пользователь с таким email
-        existing_user = await self.user_repository.get_by_email(user_data.email)
-        if existing_user:
-            raise UserAlreadyExistsException(user_data.email)
-        
         # Хэшируем пароль
-        hashed_password = self.get_password_hash(user_data.password)
-        
-        # Создаем пользователя
+        hashed_password = await self.get_password_hash(user_data.password)
         
-        user = await self.user_repository.create(user_data)
+        # Создаем пользователя, занятый email отсекает ограничение UNIQUE
+        try:
+            user = await self.user_repository.create(user_data, hashed_password)
+        except ObjectAlreadyExistsError as exc:
+            await self.session.rollback()
+            raise UserAlreadyExistsException(user_data.email) from exc
         
+        await self.session.commit()
         return UserResponse(
             id=user.id,
             email=user.email,
@@ -116,25 +121,23 @@ class AuthService:
             raise UserNotFoundException(user_id)
         
         # Проверяем текущий пароль
-        if not self.verify_password(password_data.current_password, user.hashed_password):
+        if not await self.verify_password(password_data.current_password, user.hashed_password):
             raise InvalidPasswordException("Current password is incorrect")
         
         # Хэшируем новый пароль
-        new_hashed_password = self.get_password_hash(password_data.new_password)
+        new_hashed_password = await self.get_password_hash(password_data.new_password)
         
         # Обновляем пароль
-        await self.user_repository.update(user_id, {
-            "hashed_password": new_hashed_password
-        })
+        await self.user_repository.update_password(user_id, new_hashed_password)
+        await self.session.commit()
+        self.invalidate_user(user_id)
         
         return {"message": "Password changed successfully"}
 
     async def refresh_token(self, user_id: int) -> Token:
         """Обновление токена"""
         # Получаем пользователя
-        user = await self.user_repository.get_by_id(user_id)
-        if not user:
-            raise UserNotFoundException(user_id)
+        user = await self.get_current_user(user_id)
         
         # Создаем новый токен
         access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -150,27 +153,60 @@ class AuthService:
         )
 
     async def get_current_user(self, user_id: int) -> UserResponse:
-        """Получение информации о текущем пользователе"""
+        """Получение информации о текущем пользователе (через кэш)"""
+        cached = current_user_cache.get(user_id)
+        if cached is not None:
+            return cached
+
         user = await self.user_repository.get_by_id(user_id)
         if not user:
             raise UserNotFoundException(user_id)
         
-        return UserResponse(
+        response = UserResponse(
             id=user.id,
             email=user.email,
             is_active=user.is_active,
             role_id=user.role_id,
             created_at=getattr(user, 'created_at', datetime.now())
         )
+        current_user_cache.set(user_id, response)
+        return response
+
+    @staticmethod
+    def decode_token(token: str) -> dict:
+        """
+        Проверка подписи и срока JWT. Токен без exp или sub не принимается:
+        без exp он был бы бессрочным.
+
+        Результат кэшируется до exp токена, поэтому повторные запросы с тем же
+        токеном не проверяют подпись заново.
+        """
+        claims = token_claims_cache.get(token)
+        if claims is not None:
+            return claims
+        try:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM], options={"require": ["exp", "sub"]})
+        except jwt.ExpiredSignatureError:
+            raise JWTTokenExpiredError
+        except jwt.PyJWTError:
+            raise InvalidJWTTokenError
+        try:
+            user_id = int(payload["sub"])
+        except (KeyError, TypeError, ValueError):
+            raise InvalidJWTTokenError
+        claims = {"user_id": user_id, "email": payload.get("email"), "exp": payload.get("exp")}
+        token_claims_cache.set(token, claims, expires_at=claims["exp"])
+        return claims
+
+    @staticmethod
+    def invalidate_user(user_id: int) -> None:
+        """Сброс кэша пользователя после изменения его данных"""
+        current_user_cache.delete(user_id)
 
     async def validate_token(self, token: str) -> dict:
         """Валидация токена"""
         try:
-            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-            user_id: str = payload.get("sub")
-            if user_id is None:
-                raise InvalidCredentialsException()
-            
-            return {"user_id": int(user_id), "email": payload.get("email")}
-        except jwt.PyJWTError:
-            raise InvalidCredentialsException()
\ No newline at end of file
+            claims = self.decode_token(token)
+        except (InvalidJWTTokenError, JWTTokenExpiredError):
+            raise InvalidCredentialsException()
+        return {"user_id": claims["user_id"], "email": claims["email"]}
\ No newline at end of file
@@ -0,0 +1,49 @@
+from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.exceptions import CityNotFoundException
+from app.repositories.cities import CityRepository
+from app.schemas.cities import CityDistanceResponse, CityResponse
+from app.utils.cities import City, CityDirectory, bounding_box, city_directory, distance_km
+
+
+class CityService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.repository = CityRepository(session)
+
+    async def get_directory(self) -> CityDirectory:
+        """Справочник в памяти процесса, при первом обращении загружается из БД"""
+        if not city_directory.loaded:
+            cities = [City(*row) for row in await self.repository.get_all_cities()]
+            city_directory.load(cities, await self.repository.get_all_aliases())
+        return city_directory
+
+    async def canonical(self, name: str) -> str:
+        """Название города для записи: вариант написания приводится к каноническому"""
+        return (await self.get_directory()).canonical(name)
+
+    async def get_cities(self) -> List[CityResponse]:
+        rows = await self.repository.get_all_cities()
+        return [CityResponse.model_validate(row, from_attributes=True) for row in rows]
+
+    async def resolve(self, name: str) -> CityResponse:
+        city = (await self.get_directory()).resolve(name)
+        if city is None:
+            raise CityNotFoundException(name)
+        return CityResponse.model_validate(city, from_attributes=True)
+
+    async def get_near(self, latitude: float, longitude: float, radius_km: float) -> List[CityDistanceResponse]:
+        """
+        Города в радиусе radius_km, ближайшие первыми. Кандидаты берутся из
+        R*Tree по описанному прямоугольнику, затем отсекаются по расстоянию.
+        """
+        nearby = []
+        for row in await self.repository.get_in_box(*bounding_box(latitude, longitude, radius_km)):
+            distance = distance_km(latitude, longitude, row.latitude, row.longitude)
+            if distance <= radius_km:
+                nearby.append(CityDistanceResponse(
+                    id=row.id, name=row.name, latitude=row.latitude, longitude=row.longitude,
+                    distance_km=round(distance, 1)
+                ))
+        nearby.sort(key=lambda city: (city.distance_km, city.id))
+        return nearby
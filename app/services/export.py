@@ -0,0 +1,89 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Tuple, Type
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database.database import read_session_maker
+from app.repositories.base import BaseRepository
+from app.repositories.favorites import FavoriteRepository
+from app.repositories.likes import LikeRepository
+from app.repositories.profiles import ProfileRepository
+from app.repositories.roles import RoleRepository
+from app.repositories.user_filters import UserFilterRepository
+from app.repositories.users import UserRepository
+from app.schemas.export import ExportFormat, ExportTable
+
+# Репозиторий и колонки, которые не попадают в выгрузку
+EXPORT_TABLES: Dict[ExportTable, Tuple[Type[BaseRepository], Tuple[str, ...]]] = {
+    ExportTable.profiles: (ProfileRepository, ()),
+    ExportTable.users: (UserRepository, ("hashed_password",)),
+    ExportTable.likes: (LikeRepository, ()),
+    ExportTable.favorites: (FavoriteRepository, ()),
+    ExportTable.user_filters: (UserFilterRepository, ()),
+    ExportTable.roles: (RoleRepository, ()),
+}
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class ExportService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def stream(self, table: ExportTable, export_format: ExportFormat) -> AsyncIterator[bytes]:
+        """
+        Выгрузка таблицы кусками байтов: одна пачка строк из курсора
+        кодируется целиком, ORM- и Pydantic-объекты не создаются.
+        """
+        repository_class, excluded = EXPORT_TABLES[table]
+        repository = repository_class(self.session)
+        columns = [
+            getattr(repository.model, column.key)
+            for column in repository.model.__table__.columns
+            if column.key not in excluded
+        ]
+        keys = [column.key for column in columns]
+
+        if export_format == ExportFormat.csv:
+            yield self._encode_csv([keys])
+        async for rows in repository.stream_columns(columns, settings.EXPORT_CHUNK_SIZE):
+            if export_format == ExportFormat.csv:
+                yield self._encode_csv(rows)
+            else:
+                yield self._encode_ndjson(keys, rows)
+
+    @staticmethod
+    def _encode_ndjson(keys: List[str], rows) -> bytes:
+        lines = [
+            json.dumps(dict(zip(keys, row)), ensure_ascii=False, default=_json_default)
+            for row in rows
+        ]
+        return ("\n".join(lines) + "\n").encode()
+
+    @staticmethod
+    def _encode_csv(rows) -> bytes:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerows(
+            [value.isoformat() if isinstance(value, datetime) else value for value in row]
+            for row in rows
+        )
+        return buffer.getvalue().encode()
+
+
+async def stream_export(table: ExportTable, export_format: ExportFormat) -> AsyncIterator[bytes]:
+    """
+    Выгрузка в отдельной сессии на чтение: StreamingResponse читает
+    генератор уже после выхода из обработчика.
+    """
+    async with read_session_maker() as session:
+        async for chunk in ExportService(session).stream(table, export_format):
+            yield chunk
@@ -1,21 +1,24 @@
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.repositories.favorites import FavoriteRepository
+from app.exceptions.base import ObjectAlreadyExistsError
 from app.schemas.favorites import FavoriteCreate, FavoriteUpdate, FavoriteResponse
+from app.utils.serialization import validate_rows
 from app.exceptions import FavoriteNotFoundException, FavoriteAlreadyExistsException
 
 
 class FavoriteService:
     def __init__(self, session: AsyncSession):
+        self.session = session
         self.repository = FavoriteRepository(session)
 
     async def create_favorite(self, favorite_data: FavoriteCreate) -> FavoriteResponse:
-        # Проверяем, существует ли уже запись с таким profile_id
-        existing = await self.repository.get_by_profile_id(favorite_data.favorite_profile_id)
-        if existing:
-            raise FavoriteAlreadyExistsException(favorite_data.favorite_profile_id)
-        
-        favorite = await self.repository.create(favorite_data)
+        try:
+            favorite = await self.repository.create(favorite_data)
+        except ObjectAlreadyExistsError as exc:
+            await self.session.rollback()
+            raise FavoriteAlreadyExistsException(favorite_data.favorite_profile_id) from exc
+        await self.session.commit()
         return FavoriteResponse.model_validate(favorite)
 
     async def get_favorite(self, favorite_id: int) -> FavoriteResponse:
@@ -30,20 +33,24 @@ class FavoriteService:
             raise FavoriteNotFoundException(profile_id, by_profile=True)
         return FavoriteResponse.model_validate(favorite)
 
-    async def get_all_favorites(self, skip: int = 0, limit: int = 100) -> List[FavoriteResponse]:
-        favorites = await self.repository.get_all(skip, limit)
-        return [FavoriteResponse.model_validate(fav) for fav in favorites]
+    async def get_all_favorites(
+        self, skip: int = 0, limit: int = 100, after_id: Optional[int] = None
+    ) -> List[FavoriteResponse]:
+        rows = await self.repository.get_all_rows(skip, limit, after_id)
+        return validate_rows(FavoriteResponse, rows)
 
     async def update_favorite(self, favorite_id: int, favorite_data: FavoriteUpdate) -> FavoriteResponse:
         favorite = await self.repository.update(favorite_id, favorite_data)
         if not favorite:
             raise FavoriteNotFoundException(favorite_id)
+        await self.session.commit()
         return FavoriteResponse.model_validate(favorite)
 
     async def delete_favorite(self, favorite_id: int) -> dict:
         success = await self.repository.delete(favorite_id)
         if not success:
             raise FavoriteNotFoundException(favorite_id)
+        await self.session.commit()
         return {"message": "Favorite deleted successfully"}
 
     async def get_favorites_by_role(self, role_id: int) -> List[FavoriteResponse]:
@@ -0,0 +1,179 @@
+from typing import List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.database.database import async_session_maker
+from app.models.feeds import FeedModel
+from app.repositories.feeds import FeedRepository
+from app.repositories.profiles import ProfileRepository
+from app.repositories.seen import SeenProfilesRepository
+from app.repositories.user_filters import UserFilterRepository
+from app.schemas.profiles import ProfileResponse
+from app.utils.id_arrays import pack_ids, unpack_ids, count_ids, slice_ids, unpack_id_set
+
+# Значения gender_filter, которые не ограничивают выдачу
+ANY_GENDER = ("any", "all", "любой")
+
+
+class FeedService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.repository = FeedRepository(session)
+        self.profile_repository = ProfileRepository(session)
+        self.filter_repository = UserFilterRepository(session)
+        self.seen_repository = SeenProfilesRepository(session)
+
+    async def get_cards(self, user_id: int, limit: int = 10) -> Tuple[List[ProfileResponse], bool]:
+        """
+        Выдает следующие limit карточек из сохраненной очереди.
+
+        Возвращает карточки и признак того, что очередь пора пополнить в фоне.
+        """
+        feed = await self.repository.get_by_user_id(user_id)
+        if feed is None or count_ids(feed.queue) <= feed.position:
+            # Холодный старт или пустая очередь: собираем одно окно синхронно
+            feed = await self.refill(user_id, max_windows=1)
+
+        ids: List[int] = []
+        remaining = 0
+        if count_ids(feed.queue) > feed.position:
+            # Позиция, прочитанная выше, могла устареть: срез берется из
+            # того, что вернул атомарный сдвиг
+            claimed = await self.repository.advance(feed.id, limit)
+            if claimed is not None:
+                position, queue = claimed
+                ids = slice_ids(queue, position - limit, position)
+                remaining = count_ids(queue) - position
+
+        await self.session.commit()
+        profiles = await self.profile_repository.get_many(ids)
+        by_id = {profile.id: profile for profile in profiles}
+        cards = [ProfileResponse.model_validate(by_id[i]) for i in ids if i in by_id]
+
+        return cards, remaining < settings.FEED_REFILL_THRESHOLD
+
+    async def refill(self, user_id: int, max_windows: Optional[int] = None) -> FeedModel:
+        """Пополнение очереди кандидатами по фильтру пользователя"""
+        if max_windows is None:
+            max_windows = settings.FEED_REFILL_WINDOWS
+
+        user_filter = await self.filter_repository.get_by_user_id(user_id)
+        gender = None
+        city = None
+        if user_filter:
+            if user_filter.gender_filter not in ANY_GENDER:
+                gender = user_filter.gender_filter
+            city = user_filter.city_filter or None
+        me = await self.profile_repository.get_by_user_id(user_id)
+        # Профили, пролистанные пользователем вне ленты (история свайпов)
+        swiped = unpack_id_set(await self.seen_repository.get_ids(user_id))
+
+        # Повторяем, если во время пересборки карточки успели выдать
+        for _ in range(3):
+            feed = await self.repository.get_by_user_id(user_id)
+            if feed is None:
+                feed = await self.repository.create(user_id)
+
+            queue = unpack_ids(feed.queue)
+            served = queue[:feed.position]
+            remaining = queue[feed.position:]
+            seen = set(unpack_ids(feed.seen))
+            seen.update(served)
+            excluded = seen | set(remaining)
+            excluded.update(swiped)
+
+            watermark = feed.watermark
+            for _ in range(max_windows):
+                need = settings.FEED_QUEUE_SIZE - len(remaining)
+                if need <= 0:
+                    break
+                candidates, new_watermark = await self.repository.get_candidates(
+                    user_id=user_id,
+                    watermark=watermark,
+                    window=settings.FEED_SCAN_WINDOW,
+                    limit=need,
+                    gender=gender,
+                    city=city,
+                    profile_id=me.id if me else None
+                )
+                fresh = [c for c in candidates if c[0] not in excluded]
+                fresh.sort(key=lambda c: self._rank(c, me))
+                remaining.extend(c[0] for c in fresh)
+                excluded.update(c[0] for c in fresh)
+                if new_watermark == watermark:
+                    break  # Дошли до конца таблицы
+                watermark = new_watermark
+
+            saved = await self.repository.save(
+                feed.id,
+                expected_position=feed.position,
+                queue=pack_ids(remaining),
+                seen=pack_ids(sorted(seen)),
+                watermark=watermark
+            )
+            if saved:
+                break
+
+        await self.session.commit()
+        return await self.repository.get_by_user_id(user_id)
+
+    async def reset(self, user_id: int) -> None:
+        """
+        Сброс очереди (например, после смены фильтра).
+
+        Показанные профили запоминаются, поэтому повторно в ленту не попадут.
+        """
+        feed = await self.repository.get_by_user_id(user_id)
+        if feed is None:
+            return
+        await self._clear(feed)
+        await self.session.commit()
+
+    async def reset_many(self, user_ids: List[int]) -> int:
+        """Сброс очередей нескольких пользователей: ленты читаются пачками. Возвращает число лент"""
+        feeds = await self.repository.get_by_user_ids(user_ids)
+        for feed in feeds:
+            await self._clear(feed)
+        await self.session.commit()
+        return len(feeds)
+
+    async def _clear(self, feed) -> None:
+        seen = set(unpack_ids(feed.seen))
+        seen.update(slice_ids(feed.queue, 0, feed.position))
+        await self.repository.save(
+            feed.id,
+            expected_position=feed.position,
+            queue=b"",
+            seen=pack_ids(sorted(seen)),
+            watermark=0
+        )
+
+    async def get_interested_user_ids(self, profile) -> List[int]:
+        """Пользователи, чьи фильтры пропускают профиль (кроме его владельца)"""
+        user_ids = await self.filter_repository.get_user_ids_for_profile([profile.gender, *ANY_GENDER], profile.city)
+        return [user_id for user_id in user_ids if user_id != profile.user_id]
+
+    async def push_new_profile(self, profile_id: int) -> int:
+        """
+        Новый профиль сразу попадает в очереди лент пользователей, чьи фильтры
+        его пропускают, не дожидаясь пополнения. Возвращает число лент.
+        """
+        profile = await self.profile_repository.get_by_id(profile_id)
+        if profile is None:
+            return 0
+        updated = await self.repository.push_profile(await self.get_interested_user_ids(profile), profile.id)
+        await self.session.commit()
+        return updated
+
+    @staticmethod
+    def _rank(candidate: Tuple[int, str, int], me) -> Tuple[int, int, int]:
+        # Сначала анкеты из того же города, затем ближайшие по возрасту
+        profile_id, city, age = candidate
+        if me is None:
+            return 0, 0, profile_id
+        return (0 if city == me.city else 1), abs(age - me.age), profile_id
+
+
+async def push_new_profile_task(profile_id: int) -> None:
+    """Фоновая раздача нового профиля по лентам в отдельной сессии"""
+    async with async_session_maker() as session:
+        await FeedService(session).push_new_profile(profile_id)
@@ -0,0 +1,322 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Set
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.database.database import async_session_maker
+from app.exceptions import JobNotFoundException, UnknownJobTypeException
+from app.repositories.jobs import JobRepository
+from app.repositories.profiles import ProfileRepository
+from app.repositories.seen import SeenProfilesRepository
+from app.repositories.stats import StatCounterRepository
+from app.repositories.users import UserRepository
+from app.schemas.jobs import JobCreate, JobResponse
+from app.services.auth import AuthService
+from app.services.feeds import FeedService
+from app.utils.id_arrays import count_ids
+
+logger = logging.getLogger(__name__)
+
+# Обработчик получает свою сессию и payload задачи; транзакцию фиксирует
+# исполнитель вместе с отметкой о выполнении. Результат сохраняется в jobs.result
+JobHandler = Callable[[AsyncSession, Dict[str, Any]], Awaitable[Optional[Dict[str, Any]]]]
+
+# Длина сохраняемого текста ошибки
+MAX_ERROR_LENGTH = 2000
+
+
+async def rebuild_stats_job(session: AsyncSession, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Пересчет stat_counters (как manage.py rebuild-stats)"""
+    return {"drifted": await StatCounterRepository(session).rebuild()}
+
+
+async def rebuild_search_index_job(session: AsyncSession, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Заполнение индекса FTS5 по всем профилям"""
+    return {"indexed": await ProfileRepository(session).rebuild_search_index()}
+
+
+async def refill_feed_job(session: AsyncSession, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Пополнение ленты пользователя payload["user_id"]"""
+    feed = await FeedService(session).refill(int(payload["user_id"]))
+    return {"queued": count_ids(feed.queue) - feed.position}
+
+
+async def cleanup_inactive_users_job(session: AsyncSession, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Удаление пользователей, неактивных дольше payload["days"] дней (по
+    умолчанию INACTIVE_USER_RETENTION_DAYS); время деактивации - updated_at.
+    """
+    days = int(payload.get("days", settings.INACTIVE_USER_RETENTION_DAYS))
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    repository = UserRepository(session)
+    seen_repository = SeenProfilesRepository(session)
+    users = await repository.get_inactive_users()
+    # Удаления фиксирует исполнитель одним commit вместе с отметкой о выполнении
+    deleted = 0
+    for user in users:
+        if user.updated_at < cutoff and await repository.delete(user.id):
+            await seen_repository.delete_by_user_id(user.id)
+            AuthService.invalidate_user(user.id)
+            deleted += 1
+    return {"inactive": len(users), "deleted": deleted}
+
+
+async def purge_jobs_job(session: AsyncSession, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Удаление задач, завершенных раньше JOB_RETENTION_HOURS часов назад"""
+    hours = int(payload.get("hours", settings.JOB_RETENTION_HOURS))
+    return {"purged": await JobRepository(session).purge_finished(datetime.utcnow() - timedelta(hours=hours))}
+
+
+# Типы задач; новый тип подключается добавлением обработчика в словарь
+JOB_HANDLERS: Dict[str, JobHandler] = {
+    "stats.rebuild": rebuild_stats_job,
+    "search.rebuild": rebuild_search_index_job,
+    "feeds.refill": refill_feed_job,
+    "users.cleanup_inactive": cleanup_inactive_users_job,
+    "jobs.purge": purge_jobs_job,
+}
+
+
+def parse_concurrency(spec: str) -> Dict[str, int]:
+    """Лимиты из строки вида "stats.rebuild:1,feeds.refill:4" """
+    limits = {}
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        name, _, limit = part.partition(":")
+        limits[name.strip()] = max(int(limit or 1), 1)
+    return limits
+
+
+class ClaimedJob(NamedTuple):
+    id: int
+    type: str
+    payload: Dict[str, Any]
+    attempts: int
+    max_attempts: int
+
+
+class JobRunner:
+    """
+    Исполнитель задач из таблицы jobs внутри event loop приложения.
+
+    Цикл берет готовые задачи (run_at наступил) каждого типа, пока не занят
+    его лимит одновременных задач, и выполняет каждую в отдельной сессии.
+    После ошибки задача возвращается в очередь с паузой retry_delay,
+    удваивающейся с каждой попыткой, а когда попытки кончились - получает
+    статус failed. Очередь опрашивается раз в poll_interval секунд и сразу
+    после постановки задачи или освобождения места (wake).
+
+    Рассчитан на один исполнитель на БД: лимиты считаются в памяти процесса,
+    а при запуске задачи в статусе running считаются прерванными. При
+    нескольких воркерах uvicorn исполнитель включается только в одном из них
+    или выносится в `python manage.py run-jobs` (JOB_RUNNER_ENABLED=false).
+    """
+
+    def __init__(
+        self,
+        handlers: Dict[str, JobHandler],
+        concurrency: Dict[str, int],
+        poll_interval: float,
+        retry_delay: float,
+        shutdown_timeout: float
+    ):
+        self.handlers = handlers
+        self.concurrency = {job_type: concurrency.get(job_type, 1) for job_type in handlers}
+        self.poll_interval = poll_interval
+        self.retry_delay = retry_delay
+        self.shutdown_timeout = shutdown_timeout
+        self._loop_task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self.running = {job_type: 0 for job_type in handlers}
+        self.completed = {job_type: 0 for job_type in handlers}
+        self.failed = {job_type: 0 for job_type in handlers}
+        self.retried = {job_type: 0 for job_type in handlers}
+        self.run_seconds_total = {job_type: 0.0 for job_type in handlers}
+
+    @property
+    def started(self) -> bool:
+        return self._loop_task is not None and not self._loop_task.done()
+
+    async def start(self) -> None:
+        """Возвращает в очередь задачи, прерванные прошлой остановкой, и запускает цикл"""
+        if self.started:
+            return
+        async with async_session_maker() as session:
+            await JobRepository(session).requeue_running()
+            await session.commit()
+        self._wake = asyncio.Event()
+        self._loop_task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        """
+        Останавливает цикл и ждет выполняемые задачи до shutdown_timeout
+        секунд; не успевшие прерываются и при следующем запуске вернутся в очередь.
+        """
+        if self._loop_task is not None:
+            self._loop_task.cancel()
+            await asyncio.gather(self._loop_task, return_exceptions=True)
+            self._loop_task = None
+        if self._tasks:
+            _, pending = await asyncio.wait(self._tasks, timeout=self.shutdown_timeout)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    def wake(self) -> None:
+        if self._wake is not None:
+            self._wake.set()
+
+    async def run_pending(self) -> int:
+        """Запускает готовые задачи на свободные места. Возвращает число запущенных"""
+        free = {
+            job_type: limit - self.running[job_type]
+            for job_type, limit in self.concurrency.items()
+            if limit > self.running[job_type]
+        }
+        if not free:
+            return 0
+        now = datetime.utcnow()
+        claimed: List[ClaimedJob] = []
+        async with async_session_maker() as session:
+            repository = JobRepository(session)
+            for job_type, slots in free.items():
+                for job in await repository.claim(job_type, slots, now):
+                    claimed.append(ClaimedJob(job.id, job.type, job.payload, job.attempts, job.max_attempts))
+            await session.commit()
+        for job in claimed:
+            self.running[job.type] += 1
+            task = asyncio.create_task(self._run(job))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return len(claimed)
+
+    async def run_until_idle(self) -> None:
+        """Выполняет задачи, пока есть готовые к запуску (manage.py run-jobs --until-idle)"""
+        while True:
+            started = await self.run_pending()
+            if not started and not self._tasks:
+                return
+            if self._tasks:
+                await asyncio.wait(self._tasks, return_when=asyncio.FIRST_COMPLETED)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "started": self.started,
+            "types": {
+                job_type: {
+                    "concurrency": limit,
+                    "running": self.running[job_type],
+                    "completed": self.completed[job_type],
+                    "failed": self.failed[job_type],
+                    "retried": self.retried[job_type],
+                    "avg_run_ms": self._avg_ms(job_type),
+                }
+                for job_type, limit in self.concurrency.items()
+            },
+        }
+
+    def _avg_ms(self, job_type: str) -> float:
+        finished = self.completed[job_type] + self.failed[job_type] + self.retried[job_type]
+        return round(self.run_seconds_total[job_type] / finished * 1000, 2) if finished else 0.0
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.run_pending()
+            except Exception:
+                # Ошибка БД при захвате не должна останавливать цикл
+                logger.exception("Job queue poll failed")
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    async def _run(self, job: ClaimedJob) -> None:
+        started = time.perf_counter()
+        try:
+            async with async_session_maker() as session:
+                result = await self.handlers[job.type](session, job.payload)
+                # Отметка о выполнении - в одной транзакции с работой обработчика
+                await JobRepository(session).complete(job.id, result)
+                await session.commit()
+            self.completed[job.type] += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await self._fail(job, f"{type(e).__name__}: {e}"[:MAX_ERROR_LENGTH])
+        finally:
+            self.run_seconds_total[job.type] += time.perf_counter() - started
+            self.running[job.type] -= 1
+            self.wake()
+
+    async def _fail(self, job: ClaimedJob, error: str) -> None:
+        retry_at = None
+        if job.attempts < job.max_attempts:
+            retry_at = datetime.utcnow() + timedelta(seconds=self.retry_delay * 2 ** (job.attempts - 1))
+            self.retried[job.type] += 1
+        else:
+            self.failed[job.type] += 1
+            logger.warning("Job %s (%s) failed after %s attempts: %s", job.id, job.type, job.attempts, error)
+        async with async_session_maker() as session:
+            await JobRepository(session).fail(job.id, error, retry_at)
+            await session.commit()
+
+
+# Исполнитель задач приложения (запускается в main.py или manage.py run-jobs)
+job_runner = JobRunner(
+    JOB_HANDLERS,
+    parse_concurrency(settings.JOB_CONCURRENCY),
+    poll_interval=settings.JOB_POLL_INTERVAL,
+    retry_delay=settings.JOB_RETRY_DELAY,
+    shutdown_timeout=settings.JOB_SHUTDOWN_TIMEOUT,
+)
+
+
+class JobService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.repository = JobRepository(session)
+
+    async def enqueue(self, job_data: JobCreate) -> JobResponse:
+        """
+        Ставит задачу в очередь. Если задача с тем же типом и key уже ждет,
+        новая не создается и возвращается ожидающая (или уже взятая в работу).
+        """
+        if job_data.type not in JOB_HANDLERS:
+            raise UnknownJobTypeException(job_data.type)
+        job = None
+        while job is None:
+            job_id = await self.repository.enqueue(
+                job_data.type,
+                job_data.payload,
+                run_at=datetime.utcnow() + timedelta(seconds=job_data.delay_seconds),
+                max_attempts=job_data.max_attempts or settings.JOB_MAX_ATTEMPTS,
+                key=job_data.key
+            )
+            if job_id is not None:
+                job = await self.repository.get_by_id(job_id)
+            else:
+                # Между конфликтом вставки и чтением задачу могли взять в работу
+                # или уже завершить; во втором случае ставим новую
+                job = await self.repository.get_pending_by_key(job_data.type, job_data.key)
+        await self.session.commit()
+        job_runner.wake()
+        return JobResponse.model_validate(job)
+
+    async def get_job(self, job_id: int) -> JobResponse:
+        job = await self.repository.get_by_id(job_id)
+        if not job:
+            raise JobNotFoundException(job_id)
+        return JobResponse.model_validate(job)
+
+    async def get_metrics(self) -> Dict[str, Any]:
+        """Глубина очереди по типам из БД и счетчики исполнителя этого процесса"""
+        return {
+            "queues": await self.repository.get_depth(datetime.utcnow()),
+            "runner": job_runner.stats(),
+        }
@@ -1,21 +1,34 @@
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.repositories.likes import LikeRepository
-from app.schemas.likes import LikeCreate, LikeUpdate, LikeResponse
-from app.exceptions import LikeNotFoundException, LikeAlreadyExistsException
+from app.repositories.likes import LikeRepository, ProfileLikeRepository
+from app.repositories.profiles import ProfileRepository
+from app.exceptions.base import ObjectAlreadyExistsError
+from app.schemas.likes import LikeCreate, LikeUpdate, LikeResponse, MatchResponse, ProfileLikeResponse
+from app.utils.serialization import validate_rows
+from app.exceptions import (
+    LikeNotFoundException,
+    LikeAlreadyExistsException,
+    ProfileLikeNotFoundException,
+    ProfileLikeAlreadyExistsException,
+    InvalidLikeException,
+    ProfileNotFoundException
+)
 
 
 class LikeService:
     def __init__(self, session: AsyncSession):
+        self.session = session
         self.repository = LikeRepository(session)
+        self.profile_like_repository = ProfileLikeRepository(session)
+        self.profile_repository = ProfileRepository(session)
 
     async def create_like(self, like_data: LikeCreate) -> LikeResponse:
-        # Проверяем, существует ли уже лайк с таким profile_id
-        existing = await self.repository.get_by_profile_id(like_data.like_profile_id)
-        if existing:
-            raise LikeAlreadyExistsException(like_data.like_profile_id)
-        
-        like = await self.repository.create(like_data)
+        try:
+            like = await self.repository.create(like_data)
+        except ObjectAlreadyExistsError as exc:
+            await self.session.rollback()
+            raise LikeAlreadyExistsException(like_data.like_profile_id) from exc
+        await self.session.commit()
         return LikeResponse.model_validate(like)
 
     async def get_like(self, like_id: int) -> LikeResponse:
@@ -30,20 +43,24 @@ class LikeService:
             raise LikeNotFoundException(profile_id, by_profile=True)
         return LikeResponse.model_validate(like)
 
-    async def get_all_likes(self, skip: int = 0, limit: int = 100) -> List[LikeResponse]:
-        likes = await self.repository.get_all(skip, limit)
-        return [LikeResponse.model_validate(like) for like in likes]
+    async def get_all_likes(
+        self, skip: int = 0, limit: int = 100, after_id: Optional[int] = None
+    ) -> List[LikeResponse]:
+        rows = await self.repository.get_all_rows(skip, limit, after_id)
+        return validate_rows(LikeResponse, rows)
 
     async def update_like(self, like_id: int, like_data: LikeUpdate) -> LikeResponse:
         like = await self.repository.update(like_id, like_data)
         if not like:
             raise LikeNotFoundException(like_id)
+        await self.session.commit()
         return LikeResponse.model_validate(like)
 
     async def delete_like(self, like_id: int) -> dict:
         success = await self.repository.delete(like_id)
         if not success:
             raise LikeNotFoundException(like_id)
+        await self.session.commit()
         return {"message": "Like deleted successfully"}
 
     async def get_likes_by_role(self, role_id: int) -> List[LikeResponse]:
@@ -66,4 +83,50 @@ class LikeService:
 
     async def get_likes_i_received(self) -> List[LikeResponse]:
         # Лайки, которые я получил (где me_liked = False)
-        return await self.get_likes_by_status(False)
\ No newline at end of file
+        return await self.get_likes_by_status(False)
+
+    async def like_profile(self, liker_profile_id: int, liked_profile_id: int) -> ProfileLikeResponse:
+        """
+        Лайк профиля с проверкой взаимности. INSERT идет первым и берет
+        блокировку записи, поэтому встречный лайк, поставленный одновременно,
+        виден одному из двух запросов и мэтч не теряется.
+        """
+        if liker_profile_id == liked_profile_id:
+            raise InvalidLikeException("Profile cannot like itself")
+        try:
+            like = await self.profile_like_repository.create_like(liker_profile_id, liked_profile_id)
+        except ObjectAlreadyExistsError as exc:
+            await self.session.rollback()
+            raise ProfileLikeAlreadyExistsException(liker_profile_id, liked_profile_id) from exc
+
+        existing = await self.profile_repository.get_existing_ids([liker_profile_id, liked_profile_id])
+        for profile_id in (liker_profile_id, liked_profile_id):
+            if profile_id not in existing:
+                await self.session.rollback()
+                raise ProfileNotFoundException(profile_id)
+
+        match_id = None
+        if await self.profile_like_repository.has_like(liked_profile_id, liker_profile_id):
+            match_id = await self.profile_like_repository.create_match(liker_profile_id, liked_profile_id)
+        await self.session.commit()
+        return ProfileLikeResponse(
+            liker_profile_id=like.liker_profile_id,
+            liked_profile_id=like.liked_profile_id,
+            created_at=like.created_at,
+            matched=match_id is not None,
+            match_id=match_id
+        )
+
+    async def unlike_profile(self, liker_profile_id: int, liked_profile_id: int) -> dict:
+        # Снятый лайк разрывает и мэтч
+        if not await self.profile_like_repository.delete_like(liker_profile_id, liked_profile_id):
+            raise ProfileLikeNotFoundException(liker_profile_id, liked_profile_id)
+        await self.profile_like_repository.delete_match(liker_profile_id, liked_profile_id)
+        await self.session.commit()
+        return {"message": "Like removed successfully"}
+
+    async def get_matches(
+        self, profile_id: int, limit: int = 100, after_id: Optional[int] = None
+    ) -> List[MatchResponse]:
+        rows = await self.profile_like_repository.get_matches(profile_id, limit, after_id)
+        return validate_rows(MatchResponse, rows)
@@ -0,0 +1,77 @@
+from typing import Any, Dict, NamedTuple, Optional
+
+from app.config import settings
+from app.schemas.profiles import ProfileResponse
+from app.utils.cache import CacheBackend, LocalCacheBackend
+from app.utils.http_cache import Version
+
+# Поля, по которым профиль ищется в кэше
+LOOKUP_FIELDS = ("id", "user_id", "username")
+
+
+class CachedProfile(NamedTuple):
+    profile: ProfileResponse
+    # Версия для ETag/Last-Modified, чтобы условный GET тоже обходился без БД
+    version: Version
+
+
+class ProfileCache:
+    """
+    Read-through кэш профилей по id, user_id и username.
+
+    Профиль хранится один раз под своим id, по user_id и username лежат
+    ссылки на id. Ссылка проверяется при чтении: после смены username или
+    удаления профиля устаревшая ссылка дает промах, а не чужой профиль.
+    """
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, field: str, value: Any) -> Optional[CachedProfile]:
+        cached = await self._lookup(field, value)
+        if cached is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return cached
+
+    async def set(self, cached: CachedProfile) -> None:
+        profile = cached.profile
+        await self.backend.set(("id", profile.id), cached)
+        await self.backend.set(("user_id", profile.user_id), profile.id)
+        await self.backend.set(("username", profile.username), profile.id)
+
+    async def invalidate(self, profile_id: int) -> None:
+        # Ссылки по user_id и username без профиля сами превращаются в промах
+        await self.backend.delete(("id", profile_id))
+
+    async def clear(self) -> None:
+        await self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            **self.backend.stats(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    async def _lookup(self, field: str, value: Any) -> Optional[CachedProfile]:
+        if field == "id":
+            return await self.backend.get(("id", value))
+        profile_id = await self.backend.get((field, value))
+        if profile_id is None:
+            return None
+        cached = await self.backend.get(("id", profile_id))
+        if cached is None or getattr(cached.profile, field) != value:
+            return None
+        return cached
+
+
+# Профиль и две ссылки на него - три записи в хранилище
+profile_cache = ProfileCache(
+    LocalCacheBackend(maxsize=settings.PROFILE_CACHE_SIZE * len(LOOKUP_FIELDS), ttl=settings.PROFILE_CACHE_TTL)
+)
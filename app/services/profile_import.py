@@ -0,0 +1,180 @@
+import csv
+import json
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.stats import PROFILES_VERSION
+from app.repositories.profiles import ProfileRepository
+from app.repositories.stats import StatCounterRepository
+from app.repositories.tags import TagRepository
+from app.schemas.profiles import ProfileCreate, ProfileImportReport
+from app.services.cities import CityService
+from app.utils.profile_matrix import profile_matrix
+from app.utils.tags import parse_tags, tag_index
+
+# Проверка пачки одним вызовом; по одной записи - только если в пачке есть ошибки
+PROFILES_ADAPTER = TypeAdapter(List[ProfileCreate])
+
+
+class InvalidRecord:
+    """Запись, которую не удалось разобрать (битый JSON, лишние колонки CSV)"""
+
+    def __init__(self, detail: str):
+        self.detail = detail
+
+
+def _error_detail(error: Dict[str, Any], skip: int = 0) -> str:
+    location = ".".join(str(part) for part in error["loc"][skip:])
+    return f"{location}: {error['msg']}" if location else error["msg"]
+
+
+class ProfileImportService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.repository = ProfileRepository(session)
+        self.tag_repository = TagRepository(session)
+        self.stat_repository = StatCounterRepository(session)
+        self.city_service = CityService(session)
+
+    async def import_profiles(
+        self,
+        lines: AsyncIterable[bytes],
+        csv_format: bool = False,
+        batch_size: Optional[int] = None,
+        resume_from: int = 0,
+        on_checkpoint: Optional[Callable[[int], Awaitable[None]]] = None
+    ) -> ProfileImportReport:
+        """
+        Импорт профилей из NDJSON или CSV (запись на строку, в CSV первая строка -
+        заголовок с именами полей ProfileCreate).
+
+        Каждая пачка из batch_size записей проверяется и вставляется в своей
+        транзакции. Первые resume_from записей пропускаются: это checkpoint из
+        отчета (или on_checkpoint) прерванного импорта. Записи с занятым user_id
+        или username не создаются и попадают в отчет.
+        """
+        batch_size = batch_size or settings.PROFILE_IMPORT_BATCH_SIZE
+        errors: List[Dict[str, Any]] = []
+        created = 0
+        index = 0
+        batch: List[Tuple[int, Any]] = []
+
+        async for record in self._records(lines, csv_format):
+            if index >= resume_from:
+                batch.append((index, record))
+            index += 1
+            if len(batch) >= batch_size:
+                created += await self._import_batch(batch, errors)
+                batch = []
+                if on_checkpoint is not None:
+                    await on_checkpoint(index)
+        if batch:
+            created += await self._import_batch(batch, errors)
+            if on_checkpoint is not None:
+                await on_checkpoint(index)
+
+        total = max(index - resume_from, 0)
+        return ProfileImportReport(
+            total=total,
+            created=created,
+            skipped=total - created,
+            checkpoint=max(index, resume_from),
+            errors=sorted(errors, key=lambda error: error["index"])
+        )
+
+    async def _import_batch(self, batch: List[Tuple[int, Any]], errors: List[Dict[str, Any]]) -> int:
+        records = []
+        for index, record in batch:
+            if isinstance(record, InvalidRecord):
+                errors.append({"index": index, "status": "invalid", "detail": record.detail})
+            else:
+                records.append((index, record))
+
+        profiles = self._validate(records, errors)
+        if not profiles:
+            return 0
+
+        cities = await self.city_service.get_directory()
+        rows = [{**profile.model_dump(), "city": cities.canonical(profile.city)} for _, profile in profiles]
+        inserted = await self.repository.create_bulk(rows)
+        new_ids = {(user_id, username): profile_id for profile_id, user_id, username, _ in inserted}
+        inserted_rows = {}
+        for row in rows:
+            profile_id = new_ids.get((row["user_id"], row["username"]))
+            if profile_id is not None:
+                inserted_rows.setdefault(profile_id, row)
+
+        # Из одинаковых записей вставлена первая, остальные - дубликаты
+        skipped = []
+        for index, profile in profiles:
+            if new_ids.pop((profile.user_id, profile.username), None) is None:
+                skipped.append((index, profile))
+        if skipped:
+            taken_user_ids, _ = await self.repository.get_taken(
+                [profile.user_id for _, profile in skipped],
+                [profile.username for _, profile in skipped]
+            )
+            for index, profile in skipped:
+                if profile.user_id in taken_user_ids:
+                    detail = f"Profile with user_id {profile.user_id} already exists"
+                else:
+                    detail = f"Profile with username {profile.username} already exists"
+                errors.append({"index": index, "status": "duplicate", "detail": detail})
+
+        profile_tags = [(profile_id, parse_tags(tags)) for profile_id, _, _, tags in inserted]
+        await self.tag_repository.add_profiles_tags(profile_tags)
+        version = await self.stat_repository.get_total(PROFILES_VERSION)
+        await self.session.commit()
+
+        if tag_index.advance(version, len(inserted)):
+            for profile_id, names in profile_tags:
+                tag_index.set_profile(profile_id, names)
+        if profile_matrix.advance(version, len(inserted)):
+            for profile_id, names in profile_tags:
+                row = inserted_rows[profile_id]
+                profile_matrix.set_profile(profile_id, row["age"], row["gender"], row["city"], names)
+        return len(inserted)
+
+    @staticmethod
+    def _validate(
+        records: List[Tuple[int, Any]], errors: List[Dict[str, Any]]
+    ) -> List[Tuple[int, ProfileCreate]]:
+        try:
+            profiles = PROFILES_ADAPTER.validate_python([record for _, record in records])
+        except ValidationError as exc:
+            invalid = {}
+            for error in exc.errors(include_url=False):
+                invalid.setdefault(error["loc"][0], _error_detail(error, skip=1))
+            for position, detail in sorted(invalid.items()):
+                errors.append({"index": records[position][0], "status": "invalid", "detail": detail})
+            records = [record for position, record in enumerate(records) if position not in invalid]
+            profiles = PROFILES_ADAPTER.validate_python([record for _, record in records])
+        return [(index, profile) for (index, _), profile in zip(records, profiles)]
+
+    @staticmethod
+    async def _records(lines: AsyncIterable[bytes], csv_format: bool) -> AsyncIterator[Any]:
+        header = None
+        async for line in lines:
+            try:
+                text = line.decode("utf-8-sig").rstrip("\r")
+            except UnicodeDecodeError:
+                yield InvalidRecord("Invalid UTF-8")
+                continue
+
+            if not csv_format:
+                try:
+                    yield json.loads(text)
+                except ValueError as exc:
+                    yield InvalidRecord(f"Invalid JSON: {exc}")
+                continue
+
+            values = next(csv.reader([text]))
+            if header is None:
+                header = [name.strip() for name in values]
+            elif len(values) != len(header):
+                yield InvalidRecord(f"Expected {len(header)} columns, got {len(values)}")
+            else:
+                yield dict(zip(header, values))
@@ -1,7 +1,24 @@
-from typing import List, Optional, Dict, Any
+from bisect import bisect_right
+from typing import List, Optional, Dict, Any, Sequence
+import numpy as np
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.stats import PROFILES_VERSION
+from app.repositories.likes import ProfileLikeRepository
 from app.repositories.profiles import ProfileRepository
-from app.schemas.profiles import ProfileCreate, ProfileUpdate, ProfileResponse
+from app.repositories.seen import SeenProfilesRepository
+from app.repositories.stats import StatCounterRepository
+from app.repositories.tags import TagRepository
+from app.services.cities import CityService
+from app.services.profile_cache import CachedProfile, profile_cache
+from app.exceptions.base import ObjectAlreadyExistsError
+from app.utils.profile_matrix import ProfileMatrix, profile_matrix
+from app.utils.scoring import Viewer, ranker
+from app.utils.tags import TagIndex, parse_tags, tag_index
+from app.schemas.profiles import ProfileCreate, ProfileUpdate, ProfileResponse, RankedProfileResponse
+from app.config import settings
+from app.utils.http_cache import Version, row_version
+from app.utils.id_arrays import unpack_id_set
+from app.utils.serialization import validate_rows
 from app.exceptions import (
     ProfileNotFoundException, 
     ProfileAlreadyExistsException,
@@ -11,65 +28,88 @@ from app.exceptions import (
 
 class ProfileService:
     def __init__(self, session: AsyncSession):
+        self.session = session
         self.repository = ProfileRepository(session)
+        self.tag_repository = TagRepository(session)
+        self.profile_like_repository = ProfileLikeRepository(session)
+        self.seen_repository = SeenProfilesRepository(session)
+        self.stat_repository = StatCounterRepository(session)
+        self.city_service = CityService(session)
 
     async def create_profile(self, profile_data: ProfileCreate) -> ProfileResponse:
-        # Проверяем, существует ли уже профиль с таким user_id
-        existing_by_user_id = await self.repository.get_by_user_id(profile_data.user_id)
-        if existing_by_user_id:
-            raise ProfileAlreadyExistsException(f"Profile with user_id {profile_data.user_id} already exists")
-        
-        # Проверяем, существует ли уже профиль с таким username
-        existing_by_username = await self.repository.get_by_username(profile_data.username)
-        if existing_by_username:
-            raise ProfileAlreadyExistsException(f"Profile with username {profile_data.username} already exists")
-        
-        profile = await self.repository.create(profile_data)
+        profile_data.city = await self.city_service.canonical(profile_data.city)
+        # Уникальность user_id и username проверяет сама БД одним INSERT
+        try:
+            profile = await self.repository.create(profile_data)
+        except ObjectAlreadyExistsError as exc:
+            await self.session.rollback()
+            raise self._already_exists(exc, profile_data) from exc
+        names = await self._sync_tags(profile.id, profile.tags)
+        version = await self._profiles_version()
+        await self.session.commit()
+        if tag_index.advance(version):
+            tag_index.set_profile(profile.id, names)
+        self._sync_matrix(profile, version)
         return ProfileResponse.model_validate(profile)
 
     async def get_profile(self, profile_id: int) -> ProfileResponse:
-        profile = await self.repository.get_by_id(profile_id)
-        if not profile:
-            raise ProfileNotFoundException(profile_id)
-        return ProfileResponse.model_validate(profile)
+        return (await self._get_cached("id", profile_id)).profile
+
+    async def get_profile_version(self, **filter_by) -> Version:
+        """Версия профиля для ETag/Last-Modified (filter_by: id, user_id или username)"""
+        (field, value), = filter_by.items()
+        cached = await profile_cache.get(field, value)
+        if cached is not None:
+            return cached.version
+        row = await self.repository.get_version(**filter_by)
+        if row is None:
+            raise self._not_found(field, value)
+        return row_version("profile", *row)
 
     async def get_profile_by_user_id(self, user_id: int) -> ProfileResponse:
-        profile = await self.repository.get_by_user_id(user_id)
-        if not profile:
-            raise ProfileNotFoundException(user_id, by_user_id=True)
-        return ProfileResponse.model_validate(profile)
+        return (await self._get_cached("user_id", user_id)).profile
 
-    async def get_all_profiles(self, skip: int = 0, limit: int = 100) -> List[ProfileResponse]:
-        profiles = await self.repository.get_all(skip, limit)
-        return [ProfileResponse.model_validate(profile) for profile in profiles]
+    async def get_all_profiles(
+        self, skip: int = 0, limit: int = 100, after_id: Optional[int] = None
+    ) -> List[ProfileResponse]:
+        rows = await self.repository.get_all_rows(skip, limit, after_id)
+        return validate_rows(ProfileResponse, rows)
 
     async def update_profile(self, profile_id: int, profile_data: ProfileUpdate) -> ProfileResponse:
-        # Проверяем существование профиля
-        existing_profile = await self.repository.get_by_id(profile_id)
-        if not existing_profile:
-            raise ProfileNotFoundException(profile_id)
-        
-        # Если обновляется username, проверяем его уникальность
-        if profile_data.username is not None:
-            profile_with_username = await self.repository.get_by_username(profile_data.username)
-            if profile_with_username and profile_with_username.id != profile_id:
-                raise ProfileAlreadyExistsException(f"Profile with username {profile_data.username} already exists")
-        
-        # Если обновляется user_id, проверяем его уникальность
-        if profile_data.user_id is not None:
-            profile_with_user_id = await self.repository.get_by_user_id(profile_data.user_id)
-            if profile_with_user_id and profile_with_user_id.id != profile_id:
-                raise ProfileAlreadyExistsException(f"Profile with user_id {profile_data.user_id} already exists")
-        
-        profile = await self.repository.update(profile_id, profile_data)
+        if profile_data.city is not None:
+            profile_data.city = await self.city_service.canonical(profile_data.city)
+        try:
+            profile = await self.repository.update(profile_id, profile_data)
+        except ObjectAlreadyExistsError as exc:
+            await self.session.rollback()
+            raise self._already_exists(exc, profile_data) from exc
         if not profile:
             raise ProfileNotFoundException(profile_id)
+        names = None
+        if profile_data.tags is not None:
+            names = await self._sync_tags(profile.id, profile.tags)
+        version = await self._profiles_version()
+        await self.session.commit()
+        await profile_cache.invalidate(profile_id)
+        if tag_index.advance(version) and names is not None:
+            tag_index.set_profile(profile.id, names)
+        self._sync_matrix(profile, version)
         return ProfileResponse.model_validate(profile)
 
     async def delete_profile(self, profile_id: int) -> Dict[str, Any]:
+        await self.tag_repository.delete_profile_tags(profile_id)
         success = await self.repository.delete(profile_id)
         if not success:
             raise ProfileNotFoundException(profile_id)
+        await self.profile_like_repository.delete_profile(profile_id)
+        version = await self._profiles_version()
+        await self.session.commit()
+        await profile_cache.invalidate(profile_id)
+        # Индекс меняется только после успешного commit
+        if tag_index.advance(version):
+            tag_index.remove_profile(profile_id)
+        if profile_matrix.advance(version):
+            profile_matrix.remove_profile(profile_id)
         return {"message": "Profile deleted successfully"}
 
     async def get_profiles_by_role(self, role_id: int) -> List[ProfileResponse]:
@@ -84,25 +124,227 @@ class ProfileService:
         city: Optional[str] = None,
         tags: Optional[str] = None,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        exclude_seen_by: Optional[int] = None,
+        radius_km: Optional[float] = None,
+        lat: Optional[float] = None,
+        lon: Optional[float] = None
     ) -> List[ProfileResponse]:
         # Валидация параметров поиска
         if min_age is not None and max_age is not None and min_age > max_age:
             raise InvalidProfileDataException("min_age cannot be greater than max_age")
         
-        profiles = await self.repository.search_profiles(
-            min_age=min_age,
-            max_age=max_age,
-            gender=gender,
-            city=city,
-            tags=tags,
-            skip=skip,
-            limit=limit
+        filters = dict(min_age=min_age, max_age=max_age, gender=gender, city=None, tags=tags)
+        if radius_km is not None:
+            filters["cities"] = await self._cities_within(radius_km, city, lat, lon)
+            if not filters["cities"]:
+                return []
+        elif city:
+            filters["city"] = await self.city_service.canonical(city)
+        if exclude_seen_by is not None:
+            return await self._search_unseen(filters, exclude_seen_by, skip, limit)
+        profiles = await self.repository.search_profiles(**filters, skip=skip, limit=limit)
+        return [ProfileResponse.model_validate(profile) for profile in profiles]
+
+    async def search_ranked(
+        self,
+        viewer_id: int,
+        min_age: Optional[int] = None,
+        max_age: Optional[int] = None,
+        gender: Optional[str] = None,
+        city: Optional[str] = None,
+        tags: Optional[str] = None,
+        radius_km: Optional[float] = None,
+        lat: Optional[float] = None,
+        lon: Optional[float] = None,
+        limit: int = 100,
+        after: Optional[Sequence] = None
+    ) -> List[RankedProfileResponse]:
+        """
+        Поиск, упорядоченный по совместимости с профилем viewer_id. Кандидаты
+        отбираются маской над снимком профилей, признаки считаются пачкой по
+        всем кандидатам (app.utils.scoring), из БД читается только страница.
+        tags - теги через запятую, нужны все; after - курсор (оценка, id).
+        """
+        if min_age is not None and max_age is not None and min_age > max_age:
+            raise InvalidProfileDataException("min_age cannot be greater than max_age")
+        viewer = await self.get_profile(viewer_id)
+        cities = None
+        if radius_km is not None:
+            cities = await self._cities_within(radius_km, city, lat, lon)
+        elif city:
+            cities = [await self.city_service.canonical(city)]
+
+        matrix = await self.get_profile_matrix()
+        rows = np.flatnonzero(matrix.mask(
+            gender=gender or None, cities=cities, min_age=min_age, max_age=max_age, tags_all=parse_tags(tags)
+        ))
+        rows = rows[matrix.ids_at(rows) != viewer_id]
+        liked_by = np.array(await self.profile_like_repository.get_liker_ids(viewer_id), dtype=np.int64)
+        page = ranker.top(
+            matrix, rows, Viewer(viewer.id, viewer.age, viewer.city, tuple(parse_tags(viewer.tags)), liked_by),
+            limit, after
         )
+        scores = {profile_id: score for score, profile_id in page}
+        profiles = await self._get_ordered(list(scores))
+        return [RankedProfileResponse(**profile.model_dump(), score=scores[profile.id]) for profile in profiles]
+
+    async def _cities_within(
+        self, radius_km: float, city: Optional[str], lat: Optional[float], lon: Optional[float]
+    ) -> List[str]:
+        """Города в радиусе от точки lat/lon или от города city (поиск по R*Tree справочника)"""
+        if lat is None or lon is None:
+            if not city:
+                raise InvalidProfileDataException("radius_km requires lat and lon or city")
+            center = (await self.city_service.get_directory()).resolve(city)
+            if center is None:
+                raise InvalidProfileDataException(f"Unknown city {city}")
+            lat, lon = center.latitude, center.longitude
+        return [nearby.name for nearby in await self.city_service.get_near(lat, lon, radius_km)]
+
+    async def _search_unseen(
+        self, filters: Dict[str, Any], user_id: int, skip: int, limit: int
+    ) -> List[ProfileResponse]:
+        """
+        Поиск без профилей, которые пользователь уже видел. ID выдачи
+        дочитываются пачками и фильтруются по множеству в памяти вместо NOT IN,
+        затем одним запросом загружается только страница; skip отсчитывается
+        по уже отфильтрованной выдаче.
+        """
+        seen = frozenset(unpack_id_set(await self.seen_repository.get_ids(user_id)))
+        wanted = skip + limit
+        # Первая пачка с запасом на просмотренные, дальше пачки растут вдвое
+        batch = wanted * 2
+        found = []
+        offset = 0
+        while True:
+            ids = await self.repository.search_profile_ids(**filters, skip=offset, limit=batch)
+            offset += len(ids)
+            found.extend(profile_id for profile_id in ids if profile_id not in seen)
+            if len(found) >= wanted or len(ids) < batch:
+                return await self._get_ordered(found[skip:wanted])
+            batch = min(batch * 2, max(wanted, settings.SEEN_SCAN_BATCH))
+
+    async def search_profiles_text(self, query: str, skip: int = 0, limit: int = 100) -> List[ProfileResponse]:
+        # Полнотекстовый поиск по описанию, тегам и городу с ранжированием bm25
+        profiles = await self.repository.search_text(query, skip, limit)
         return [ProfileResponse.model_validate(profile) for profile in profiles]
 
     async def get_profile_by_username(self, username: str) -> ProfileResponse:
-        profile = await self.repository.get_by_username(username)
+        return (await self._get_cached("username", username)).profile
+
+    async def search_by_tags(
+        self,
+        tags: str,
+        match_all: bool = True,
+        limit: int = 100,
+        after_id: Optional[int] = None
+    ) -> List[ProfileResponse]:
+        # AND/OR по тегам через инвертированный индекс, профили читаются по ID
+        names = parse_tags(tags)
+        if not names:
+            raise InvalidProfileDataException("At least one tag is required")
+        index = await self._get_tag_index()
+        ids = index.match_all(names) if match_all else index.match_any(names)
+        if after_id is not None:
+            ids = ids[bisect_right(ids, after_id):]
+        return await self._get_ordered(ids[:limit])
+
+    async def get_similar_by_tags(
+        self, profile_id: int, min_shared: int = 1, skip: int = 0, limit: int = 100
+    ) -> List[ProfileResponse]:
+        # Профили с не менее чем min_shared общими тегами, сначала самые похожие
+        index = await self._get_tag_index()
+        if not index.tags_of(profile_id) and not await self.repository.get_by_id(profile_id):
+            raise ProfileNotFoundException(profile_id)
+        matched = index.shared(index.tags_of(profile_id), min_shared)
+        ids = [other_id for other_id, _ in matched if other_id != profile_id]
+        return await self._get_ordered(ids[skip:skip + limit])
+
+    async def rebuild_tags(self) -> int:
+        count = await self.tag_repository.rebuild_from_profiles()
+        # profile_tags пересобраны без записи в profiles: версию поднимаем сами,
+        # чтобы индексы в других процессах перезагрузились
+        await self.stat_repository.increment(PROFILES_VERSION)
+        version = await self._profiles_version()
+        await self.session.commit()
+        tag_index.load(await self.tag_repository.get_all_profile_tags(), version)
+        return count
+
+    @staticmethod
+    def _already_exists(exc: ObjectAlreadyExistsError, profile_data) -> ProfileAlreadyExistsException:
+        if exc.field == "user_id":
+            return ProfileAlreadyExistsException(f"Profile with user_id {profile_data.user_id} already exists")
+        return ProfileAlreadyExistsException(f"Profile with username {profile_data.username} already exists")
+
+    @staticmethod
+    def _not_found(field: str, value) -> ProfileNotFoundException:
+        return ProfileNotFoundException(value, by_user_id=field == "user_id", by_username=field == "username")
+
+    async def _get_cached(self, field: str, value) -> CachedProfile:
+        """Профиль из кэша, при промахе - из БД с записью в кэш"""
+        cached = await profile_cache.get(field, value)
+        if cached is not None:
+            return cached
+        loaders = {
+            "id": self.repository.get_by_id,
+            "user_id": self.repository.get_by_user_id,
+            "username": self.repository.get_by_username,
+        }
+        profile = await loaders[field](value)
         if not profile:
-            raise ProfileNotFoundException(username, by_username=True)
-        return ProfileResponse.model_validate(profile)
\ No newline at end of file
+            raise self._not_found(field, value)
+        cached = CachedProfile(
+            ProfileResponse.model_validate(profile),
+            row_version("profile", profile.id, profile.revision, profile.updated_at)
+        )
+        await profile_cache.set(cached)
+        return cached
+
+    async def get_profile_matrix(self) -> ProfileMatrix:
+        """
+        Колоночный снимок профилей. Загружается из БД при первом обращении и
+        заново, если профили изменил другой процесс (версия в БД ушла вперед).
+        """
+        version = await self._profiles_version()
+        if not profile_matrix.loaded or profile_matrix.version != version:
+            rows = await self.repository.get_matrix_rows()
+            profile_matrix.load(
+                ((profile_id, age, gender, city, parse_tags(tags)) for profile_id, age, gender, city, tags in rows),
+                version
+            )
+        return profile_matrix
+
+    async def get_profiles_by_ids(self, ids: List[int]) -> List[ProfileResponse]:
+        """Профили в порядке ids; удаленные пропускаются"""
+        return await self._get_ordered(ids)
+
+    def _sync_matrix(self, profile, version: int) -> None:
+        """Строка профиля в снимке после commit записи, поднявшей версию до version"""
+        if profile_matrix.advance(version):
+            profile_matrix.set_profile(profile.id, profile.age, profile.gender, profile.city, parse_tags(profile.tags))
+
+    async def _profiles_version(self) -> int:
+        """Версия данных профилей (счетчик profiles.version, его ведут триггеры)"""
+        return await self.stat_repository.get_total(PROFILES_VERSION)
+
+    async def _get_tag_index(self) -> TagIndex:
+        """
+        Индекс тегов в памяти процесса. Загружается при первом обращении и
+        заново, если профили изменил другой процесс (версия в БД ушла вперед).
+        """
+        version = await self._profiles_version()
+        if not tag_index.loaded or tag_index.version != version:
+            tag_index.load(await self.tag_repository.get_all_profile_tags(), version)
+        return tag_index
+
+    async def _sync_tags(self, profile_id: int, tags: str) -> List[str]:
+        """Теги профиля в profile_tags; индекс в памяти обновляет вызывающий после commit"""
+        names = parse_tags(tags)
+        await self.tag_repository.set_profile_tags(profile_id, names)
+        return names
+
+    async def _get_ordered(self, ids: List[int]) -> List[ProfileResponse]:
+        profiles = await self.repository.get_many(ids)
+        by_id = {profile.id: profile for profile in profiles}
+        return [ProfileResponse.model_validate(by_id[i]) for i in ids if i in by_id]
@@ -1,7 +1,9 @@
 from typing import List, Optional, Dict, Any
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.repositories.roles import RoleRepository
+from app.exceptions.base import ObjectAlreadyExistsError
 from app.schemas.roles import RoleCreate, RoleUpdate, RoleResponse, RoleWithUsersResponse
+from app.utils.http_cache import Version, table_version
 from app.exceptions import (
     RoleNotFoundException, 
     RoleAlreadyExistsException,
@@ -11,15 +13,16 @@ from app.exceptions import (
 
 class RoleService:
     def __init__(self, session: AsyncSession):
+        self.session = session
         self.repository = RoleRepository(session)
 
     async def create_role(self, role_data: RoleCreate) -> RoleResponse:
-        # Проверяем, существует ли уже роль с таким именем
-        existing = await self.repository.get_by_name(role_data.name)
-        if existing:
-            raise RoleAlreadyExistsException(role_data.name)
-        
-        role = await self.repository.create(role_data)
+        try:
+            role = await self.repository.create(role_data)
+        except ObjectAlreadyExistsError as exc:
+            await self.session.rollback()
+            raise RoleAlreadyExistsException(role_data.name) from exc
+        await self.session.commit()
         return RoleResponse.model_validate(role)
 
     async def get_role(self, role_id: int, include_users: bool = False) -> RoleResponse | RoleWithUsersResponse:
@@ -43,39 +46,36 @@ class RoleService:
             raise RoleNotFoundException(name, by_name=True)
         return RoleResponse.model_validate(role)
 
-    async def get_all_roles(self, skip: int = 0, limit: int = 100) -> List[RoleResponse]:
-        roles = await self.repository.get_all(skip, limit)
+    async def get_all_roles(
+        self, skip: int = 0, limit: int = 100, after_id: Optional[int] = None
+    ) -> List[RoleResponse]:
+        roles = await self.repository.get_all(skip, limit, after_id)
         return [RoleResponse.model_validate(role) for role in roles]
 
+    async def get_roles_version(self) -> Version:
+        """Версия таблицы ролей для ETag/Last-Modified списка"""
+        return table_version("roles", *await self.repository.get_table_version())
+
     async def update_role(self, role_id: int, role_data: RoleUpdate) -> RoleResponse:
-        # Проверяем существование роли
-        existing_role = await self.repository.get_by_id(role_id)
-        if not existing_role:
-            raise RoleNotFoundException(role_id)
-        
-        # Если обновляется имя, проверяем его уникальность
-        if role_data.name is not None:
-            role_with_name = await self.repository.get_by_name(role_data.name)
-            if role_with_name and role_with_name.id != role_id:
-                raise RoleAlreadyExistsException(role_data.name)
-        
-        role = await self.repository.update(role_id, role_data)
+        try:
+            role = await self.repository.update(role_id, role_data)
+        except ObjectAlreadyExistsError as exc:
+            await self.session.rollback()
+            raise RoleAlreadyExistsException(role_data.name) from exc
         if not role:
             raise RoleNotFoundException(role_id)
+        await self.session.commit()
         return RoleResponse.model_validate(role)
 
     async def delete_role(self, role_id: int) -> Dict[str, Any]:
         success = await self.repository.delete(role_id)
         if not success:
             # Проверяем, почему не удалось удалить
-            role = await self.repository.get_by_id(role_id)
-            if not role:
-                raise RoleNotFoundException(role_id)
-            elif role.users:
-                raise RoleHasUsersException(role_id, len(role.users))
-            else:
+            if not await self.repository.exists(id=role_id):
                 raise RoleNotFoundException(role_id)
+            raise RoleHasUsersException(role_id, await self.repository.count_users(role_id))
         
+        await self.session.commit()
         return {"message": "Role deleted successfully"}
 
     async def search_roles(self, name: str, skip: int = 0, limit: int = 100) -> List[RoleResponse]:
@@ -0,0 +1,56 @@
+from typing import FrozenSet, Iterable
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.repositories.seen import SeenProfilesRepository
+from app.schemas.seen import SeenProfileCheck, SeenProfilesResponse
+from app.utils.id_arrays import id_set_contains, pack_id_set, unpack_id_set
+
+
+class SeenProfilesService:
+    """
+    История свайпов: какие профили пользователь уже видел.
+
+    Множество хранится одной строкой на пользователя в сжатом BLOB, поэтому
+    поиск и лента исключают просмотренные профили по множеству в памяти, а не
+    подзапросом NOT IN по большой таблице.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.repository = SeenProfilesRepository(session)
+
+    async def mark_seen(self, user_id: int, profile_ids: Iterable[int]) -> SeenProfilesResponse:
+        new_ids = set(profile_ids)
+        # Повторный свайп по уже известным профилям обходится без записи
+        blob = await self.repository.get_ids(user_id)
+        if blob is not None and new_ids.issubset(unpack_id_set(blob)):
+            return await self.get_stats(user_id)
+        await self.session.rollback()
+
+        # Блокировка до чтения: параллельные слияния идут по очереди и не теряют ID друг друга
+        await self.repository.lock(user_id)
+        current = unpack_id_set(await self.repository.get_ids(user_id))
+        merged = new_ids.union(current)
+        blob = pack_id_set(merged)
+        await self.repository.save(user_id, blob, len(merged))
+        await self.session.commit()
+        return SeenProfilesResponse(
+            user_id=user_id, count=len(merged), size_bytes=len(blob), added=len(merged) - len(current)
+        )
+
+    async def is_seen(self, user_id: int, profile_id: int) -> SeenProfileCheck:
+        seen = id_set_contains(await self.repository.get_ids(user_id), profile_id)
+        return SeenProfileCheck(user_id=user_id, profile_id=profile_id, seen=seen)
+
+    async def get_seen_ids(self, user_id: int) -> FrozenSet[int]:
+        """Множество для исключения просмотренных из выдачи"""
+        return frozenset(unpack_id_set(await self.repository.get_ids(user_id)))
+
+    async def get_stats(self, user_id: int) -> SeenProfilesResponse:
+        row = await self.repository.get_stats(user_id)
+        count, size = row if row else (0, 0)
+        return SeenProfilesResponse(user_id=user_id, count=count, size_bytes=size)
+
+    async def clear(self, user_id: int) -> dict:
+        await self.repository.delete_by_user_id(user_id)
+        await self.session.commit()
+        return {"message": "Seen profiles cleared successfully"}
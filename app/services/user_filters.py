@@ -1,13 +1,26 @@
-from typing import List, Optional, Dict, Any
+from typing import Any, AsyncIterable, Dict, List, Optional, Set, Tuple
+import numpy as np
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.repositories.base import UPSERT_CHUNK_SIZE
 from app.repositories.user_filters import UserFilterRepository
+from app.repositories.stats import StatCounterRepository
+from app.models.stats import FILTERS_BY_CITY, FILTERS_BY_GENDER, FILTERS_TOTAL
+from app.exceptions.base import ObjectAlreadyExistsError
+from app.services.cities import CityService
+from app.services.feeds import ANY_GENDER, FeedService
+from app.services.profiles import ProfileService
 from app.schemas.user_filters import (
     UserFilterCreate, 
     UserFilterUpdate, 
     UserFilterResponse,
     FilterStatsResponse,
-    BulkFilterCreate
+    BulkFilterReport,
+    InterestedUsersResponse
 )
+from app.schemas.profiles import ProfileResponse
+from app.utils.profile_matrix import ProfileMatrix, matched_after
+from app.utils.serialization import validate_rows
 from app.exceptions import (
     UserFilterNotFoundException,
     UserFilterAlreadyExistsException,
@@ -17,33 +30,94 @@ from app.exceptions import (
 
 class UserFilterService:
     def __init__(self, session: AsyncSession):
+        self.session = session
         self.repository = UserFilterRepository(session)
+        self.stats_repository = StatCounterRepository(session)
+        self.feed_service = FeedService(session)
+        self.city_service = CityService(session)
+        self.profile_service = ProfileService(session)
 
     async def create_filter(self, filter_data: UserFilterCreate) -> UserFilterResponse:
-        # Проверяем, существует ли уже фильтр для этого пользователя
-        existing = await self.repository.get_by_user_id(filter_data.user_id)
-        if existing:
-            raise UserFilterAlreadyExistsException(filter_data.user_id)
-        
-        filter_obj = await self.repository.create(filter_data)
+        filter_data.city_filter = await self.city_service.canonical(filter_data.city_filter)
+        try:
+            filter_obj = await self.repository.create(filter_data)
+        except ObjectAlreadyExistsError as exc:
+            await self.session.rollback()
+            raise UserFilterAlreadyExistsException(filter_data.user_id) from exc
+        # Лента собиралась без фильтра - пересобираем
+        await self.feed_service.reset(filter_obj.user_id)
+        await self.session.commit()
         return UserFilterResponse.model_validate(filter_obj)
 
-    async def create_filters_bulk(self, bulk_data: BulkFilterCreate) -> List[UserFilterResponse]:
-        # Проверяем дубликаты по user_id
-        user_ids = [f.user_id for f in bulk_data.filters]
-        existing_filters = []
-        for user_id in user_ids:
-            existing = await self.repository.get_by_user_id(user_id)
-            if existing:
-                existing_filters.append(user_id)
-        
-        if existing_filters:
-            raise UserFilterAlreadyExistsException(
-                f"Filters already exist for users: {existing_filters}"
-            )
-        
-        filters = await self.repository.create_bulk(bulk_data.filters)
-        return [UserFilterResponse.model_validate(f) for f in filters]
+    async def create_filters_bulk(self, rows: AsyncIterable[Any]) -> BulkFilterReport:
+        """
+        Массовое создание фильтров с отчетом по каждой строке.
+
+        rows - словари или строки NDJSON. Строки проверяются по одной и
+        вставляются пачками; занятые user_id и повторы внутри запроса
+        пропускаются, остальные фильтры создаются в одной транзакции.
+        """
+        results: List[Dict[str, Any]] = []
+        pending: List[Tuple[Dict[str, Any], UserFilterCreate]] = []
+        seen: Set[int] = set()
+        async for raw in rows:
+            row: Dict[str, Any] = {"index": len(results)}
+            results.append(row)
+            try:
+                if isinstance(raw, (bytes, str)):
+                    filter_data = UserFilterCreate.model_validate_json(raw)
+                else:
+                    filter_data = UserFilterCreate.model_validate(raw)
+            except ValidationError as exc:
+                error = exc.errors(include_url=False)[0]
+                location = ".".join(str(part) for part in error["loc"])
+                row["status"] = "invalid"
+                row["detail"] = f"{location}: {error['msg']}" if location else error["msg"]
+                continue
+
+            row["user_id"] = filter_data.user_id
+            if filter_data.user_id in seen:
+                row["status"] = "duplicate"
+                row["detail"] = "Duplicate user_id in request"
+                continue
+            seen.add(filter_data.user_id)
+            pending.append((row, filter_data))
+            if len(pending) >= UPSERT_CHUNK_SIZE:
+                await self._create_chunk(pending)
+                pending = []
+
+        if pending:
+            await self._create_chunk(pending)
+        await self.session.commit()
+
+        # Как и в create_filter: ленты, собранные без фильтра, пересобираются
+        created_user_ids = [row["user_id"] for row in results if row["status"] == "created"]
+        await self.feed_service.reset_many(created_user_ids)
+
+        created = len(created_user_ids)
+        return BulkFilterReport(
+            total=len(results),
+            created=created,
+            skipped=len(results) - created,
+            results=results
+        )
+
+    async def _create_chunk(self, pending: List[Tuple[Dict[str, Any], UserFilterCreate]]) -> None:
+        cities = await self.city_service.get_directory()
+        for _, data in pending:
+            data.city_filter = cities.canonical(data.city_filter)
+        created = {
+            user_id: filter_id
+            for filter_id, user_id in await self.repository.create_bulk([data for _, data in pending])
+        }
+        for row, data in pending:
+            filter_id = created.get(data.user_id)
+            if filter_id is None:
+                row["status"] = "exists"
+                row["detail"] = f"User filter for user_id {data.user_id} already exists"
+            else:
+                row["status"] = "created"
+                row["id"] = filter_id
 
     async def get_filter(self, filter_id: int) -> UserFilterResponse:
         filter_obj = await self.repository.get_by_id(filter_id)
@@ -57,37 +131,35 @@ class UserFilterService:
             raise UserFilterNotFoundException(user_id, by_user_id=True)
         return UserFilterResponse.model_validate(filter_obj)
 
-    async def get_all_filters(self, skip: int = 0, limit: int = 100) -> List[UserFilterResponse]:
-        filters = await self.repository.get_all(skip, limit)
-        return [UserFilterResponse.model_validate(f) for f in filters]
+    async def get_all_filters(
+        self, skip: int = 0, limit: int = 100, after_id: Optional[int] = None
+    ) -> List[UserFilterResponse]:
+        rows = await self.repository.get_all_rows(skip, limit, after_id)
+        return validate_rows(UserFilterResponse, rows)
 
     async def update_filter(self, filter_id: int, filter_data: UserFilterUpdate) -> UserFilterResponse:
-        # Проверяем существование фильтра
-        existing_filter = await self.repository.get_by_id(filter_id)
-        if not existing_filter:
-            raise UserFilterNotFoundException(filter_id)
-        
-        # Если обновляется user_id, проверяем его уникальность
-        if filter_data.user_id is not None:
-            filter_with_user_id = await self.repository.get_by_user_id(filter_data.user_id)
-            if filter_with_user_id and filter_with_user_id.id != filter_id:
-                raise UserFilterAlreadyExistsException(filter_data.user_id)
-        
+        if filter_data.city_filter is not None:
+            filter_data.city_filter = await self.city_service.canonical(filter_data.city_filter)
         filter_obj = await self.repository.update(filter_id, filter_data)
         if not filter_obj:
             raise UserFilterNotFoundException(filter_id)
+        # Очередь ленты собрана по старому фильтру
+        await self.feed_service.reset(filter_obj.user_id)
+        await self.session.commit()
         return UserFilterResponse.model_validate(filter_obj)
 
     async def delete_filter(self, filter_id: int) -> Dict[str, Any]:
         success = await self.repository.delete(filter_id)
         if not success:
             raise UserFilterNotFoundException(filter_id)
+        await self.session.commit()
         return {"message": "Filter deleted successfully"}
 
     async def delete_filter_by_user(self, user_id: int) -> Dict[str, Any]:
         success = await self.repository.delete_by_user_id(user_id)
         if not success:
             raise UserFilterNotFoundException(user_id, by_user_id=True)
+        await self.session.commit()
         return {"message": f"Filter for user {user_id} deleted successfully"}
 
     async def get_filters_by_role(self, role_id: int) -> List[UserFilterResponse]:
@@ -101,6 +173,8 @@ class UserFilterService:
         skip: int = 0,
         limit: int = 100
     ) -> List[UserFilterResponse]:
+        if city_filter:
+            city_filter = await self.city_service.canonical(city_filter)
         filters = await self.repository.search_filters(
             gender_filter=gender_filter,
             city_filter=city_filter,
@@ -114,39 +188,73 @@ class UserFilterService:
         return [UserFilterResponse.model_validate(f) for f in filters]
 
     async def get_filters_by_city(self, city: str) -> List[UserFilterResponse]:
-        filters = await self.repository.get_filters_by_city(city)
+        filters = await self.repository.get_filters_by_city(await self.city_service.canonical(city))
         return [UserFilterResponse.model_validate(f) for f in filters]
 
     async def get_filter_stats(self) -> FilterStatsResponse:
-        stats = await self.repository.get_stats()
-        return FilterStatsResponse(**stats)
+        # Счетчики stat_counters ведутся триггерами, таблица фильтров не сканируется
+        return FilterStatsResponse(
+            total_filters=await self.stats_repository.get_total(FILTERS_TOTAL),
+            gender_stats=await self.stats_repository.get_breakdown(FILTERS_BY_GENDER),
+            city_stats=await self.stats_repository.get_breakdown(FILTERS_BY_CITY, limit=10)
+        )
 
     async def get_users_by_filter_criteria(self, gender: str, city: str) -> List[UserFilterResponse]:
-        filters = await self.repository.get_users_by_filters(gender, city)
+        filters = await self.repository.get_users_by_filters(gender, await self.city_service.canonical(city))
         return [UserFilterResponse.model_validate(f) for f in filters]
 
+    async def get_interested_users(self, profile_id: int) -> InterestedUsersResponse:
+        """Обратный поиск: пользователи, чьи фильтры пропускают профиль"""
+        profile = await self.profile_service.get_profile(profile_id)
+        user_ids = await self.feed_service.get_interested_user_ids(profile)
+        return InterestedUsersResponse(profile_id=profile_id, user_ids=user_ids)
+
     async def apply_filters_to_profiles(
         self, 
         profiles: List[Dict[str, Any]], 
         user_id: int
     ) -> List[Dict[str, Any]]:
-        """Применяет фильтры пользователя к списку профилей"""
+        """
+        Применяет фильтры пользователя к списку профилей. Профили с id из
+        снимка ProfileMatrix проверяются одной маской фильтра, остальные
+        (без id или еще не в БД) - по полям словаря.
+        """
         filter_obj = await self.repository.get_by_user_id(user_id)
         if not filter_obj:
             return profiles  # Если фильтра нет, возвращаем все профили
-        
+        matrix = await self.profile_service.get_profile_matrix()
+        mask = self._filter_mask(matrix, filter_obj)
+        rows = matrix.rows_of(profile.get('id') for profile in profiles)
+        known = rows >= 0
+        matched = np.zeros(len(profiles), dtype=bool)
+        matched[known] = mask[rows[known]]
+
+        cities = await self.city_service.get_directory()
         filtered_profiles = []
-        for profile in profiles:
-            # Применяем гендерный фильтр
-            if filter_obj.gender_filter not in ['any', 'all', 'любой']:
-                if profile.get('gender') != filter_obj.gender_filter:
-                    continue
-            
-            # Применяем фильтр по городу
-            if filter_obj.city_filter:
-                if filter_obj.city_filter not in profile.get('city', ''):
-                    continue
-            
-            filtered_profiles.append(profile)
-        
-        return filtered_profiles
\ No newline at end of file
+        for profile, in_matrix, is_match in zip(profiles, known.tolist(), matched.tolist()):
+            if not in_matrix:
+                is_match = (
+                    (filter_obj.gender_filter in ANY_GENDER or profile.get('gender') == filter_obj.gender_filter)
+                    # Варианты написания одного города совпадают
+                    and (not filter_obj.city_filter or cities.canonical(profile.get('city', '')) == filter_obj.city_filter)
+                )
+            if is_match:
+                filtered_profiles.append(profile)
+        return filtered_profiles
+
+    async def get_matching_profiles(
+        self, user_id: int, limit: int = 100, after_id: Optional[int] = None
+    ) -> List[ProfileResponse]:
+        """Профили под фильтр пользователя по возрастанию id (маска над снимком профилей)"""
+        filter_obj = await self.repository.get_by_user_id(user_id)
+        if not filter_obj:
+            raise UserFilterNotFoundException(user_id, by_user_id=True)
+        matrix = await self.profile_service.get_profile_matrix()
+        ids = matrix.ids(self._filter_mask(matrix, filter_obj))
+        return await self.profile_service.get_profiles_by_ids(matched_after(ids, after_id, limit))
+
+    @staticmethod
+    def _filter_mask(matrix: ProfileMatrix, filter_obj) -> np.ndarray:
+        gender = None if filter_obj.gender_filter in ANY_GENDER else filter_obj.gender_filter
+        cities = [filter_obj.city_filter] if filter_obj.city_filter else None
+        return matrix.mask(gender=gender, cities=cities)
@@ -2,11 +2,17 @@
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from jose import jwt
 
 from app.repositories.users import UserRepository
 from app.repositories.roles import RoleRepository
+from app.repositories.seen import SeenProfilesRepository
+from app.repositories.stats import StatCounterRepository
+from app.models.stats import USERS_ACTIVE, USERS_BY_ROLE, USERS_TOTAL
+from app.exceptions.base import ObjectAlreadyExistsError
+from app.services.auth import AuthService
+from app.config import settings
+from app.utils.passwords import password_hasher
 from app.schemas.users import (
     UserCreate, 
     UserUpdate, 
@@ -24,27 +30,30 @@ from app.exceptions.users import (
     InvalidPasswordException,
     UnauthorizedException
 )
+from app.exceptions.auth import InvalidJWTTokenError, JWTTokenExpiredError
 
 # Настройки JWT
-SECRET_KEY = "your-secret-key-change-this-in-production"
-ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 30
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+SECRET_KEY = settings.SECRET_KEY
+ALGORITHM = settings.ALGORITHM
+ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 
 
 class UserService:
     def __init__(self, session: AsyncSession):
+        self.session = session
         self.repository = UserRepository(session)
         self.role_repository = RoleRepository(session)
+        self.stats_repository = StatCounterRepository(session)
+        self.seen_repository = SeenProfilesRepository(session)
+        self.auth_service = AuthService(session)
 
-    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        """Проверка пароля"""
-        return pwd_context.verify(plain_password, hashed_password)
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        """Проверка пароля (в пуле потоков, не блокирует event loop)"""
+        return await password_hasher.verify(plain_password, hashed_password)
 
-    def get_password_hash(self, password: str) -> str:
-        """Хэширование пароля"""
-        return pwd_context.hash(password)
+    async def get_password_hash(self, password: str) -> str:
+        """Хэширование пароля (в пуле потоков, не блокирует event loop)"""
+        return await password_hasher.hash(password)
 
     def create_access_token(self, data: dict, expires_delta: Optional[timedelta] = None) -> str:
         """Создание JWT токена"""
@@ -62,33 +71,28 @@ class UserService:
         user = await self.repository.get_by_email(email)
         if not user:
             return None
-        if not self.verify_password(password, user.hashed_password):
+        if not await self.verify_password(password, user.hashed_password):
             return None
         return user
 
     async def create_user(self, user_data: UserCreate) -> UserResponse:
         """Создание нового пользователя"""
-        # Проверяем, существует ли уже пользователь с таким email
-        existing = await self.repository.get_by_email(user_data.email)
-        if existing:
-            raise UserAlreadyExistsException(user_data.email)
-        
         # Проверяем существование роли
         role = await self.role_repository.get_by_id(user_data.role_id)
         if not role:
             raise ValueError(f"Role with id {user_data.role_id} does not exist")
         
         # Хэшируем пароль
-        hashed_password = self.get_password_hash(user_data.password)
+        hashed_password = await self.get_password_hash(user_data.password)
         
-        # Создаем пользователя
-        user = await self.repository.create({
-            "email": user_data.email,
-            "hashed_password": hashed_password,
-            "is_active": user_data.is_active,
-            "role_id": user_data.role_id
-        })
+        # Создаем пользователя, занятый email отсекает ограничение UNIQUE
+        try:
+            user = await self.repository.create(user_data, hashed_password)
+        except ObjectAlreadyExistsError as exc:
+            await self.session.rollback()
+            raise UserAlreadyExistsException(user_data.email) from exc
         
+        await self.session.commit()
         return UserResponse(
             id=user.id,
             email=user.email,
@@ -118,18 +122,16 @@ class UserService:
             role_id=user.role_id
         )
 
-    async def get_current_user(self, token: str) -> Any:
-        """Получение текущего пользователя из токена"""
+    async def get_current_user(self, token: str) -> UserResponse:
+        """Получение текущего пользователя из токена (через кэши токенов и пользователей)"""
         try:
-            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-            user_id: str = payload.get("sub")
-            if user_id is None:
-                raise UnauthorizedException("Could not validate credentials")
-        except JWTError:
+            claims = AuthService.decode_token(token)
+        except (InvalidJWTTokenError, JWTTokenExpiredError):
             raise UnauthorizedException("Could not validate credentials")
         
-        user = await self.repository.get_by_id(int(user_id))
-        if user is None:
+        try:
+            user = await self.auth_service.get_current_user(claims["user_id"])
+        except UserNotFoundException:
             raise UnauthorizedException("User not found")
         
         if not user.is_active:
@@ -177,9 +179,11 @@ class UserService:
             created_at=datetime.now()
         )
 
-    async def get_all_users(self, skip: int = 0, limit: int = 100) -> List[UserResponse]:
+    async def get_all_users(
+        self, skip: int = 0, limit: int = 100, after_id: Optional[int] = None
+    ) -> List[UserResponse]:
         """Получение всех пользователей"""
-        users = await self.repository.get_all(skip, limit)
+        users = await self.repository.get_all(skip, limit, after_id)
         return [
             UserResponse(
                 id=user.id,
@@ -193,31 +197,20 @@ class UserService:
 
     async def update_user(self, user_id: int, user_data: UserUpdate) -> UserResponse:
         """Обновление пользователя"""
-        # Проверяем существование пользователя
-        existing_user = await self.repository.get_by_id(user_id)
-        if not existing_user:
-            raise UserNotFoundException(user_id)
-        
-        # Если обновляется email, проверяем его уникальность
-        if user_data.email is not None:
-            user_with_email = await self.repository.get_by_email(user_data.email)
-            if user_with_email and user_with_email.id != user_id:
-                raise UserAlreadyExistsException(user_data.email)
-        
         # Если обновляется пароль, хэшируем его
-        update_data = {}
-        if user_data.email is not None:
-            update_data["email"] = user_data.email
+        hashed_password = None
         if user_data.password is not None:
-            update_data["hashed_password"] = self.get_password_hash(user_data.password)
-        if user_data.is_active is not None:
-            update_data["is_active"] = user_data.is_active
-        if user_data.role_id is not None:
-            update_data["role_id"] = user_data.role_id
+            hashed_password = await self.get_password_hash(user_data.password)
         
-        user = await self.repository.update(user_id, update_data)
+        try:
+            user = await self.repository.update(user_id, user_data, hashed_password)
+        except ObjectAlreadyExistsError as exc:
+            await self.session.rollback()
+            raise UserAlreadyExistsException(user_data.email) from exc
         if not user:
             raise UserNotFoundException(user_id)
+        await self.session.commit()
+        AuthService.invalidate_user(user_id)
         
         return UserResponse(
             id=user.id,
@@ -232,6 +225,9 @@ class UserService:
         success = await self.repository.delete(user_id)
         if not success:
             raise UserNotFoundException(user_id)
+        await self.seen_repository.delete_by_user_id(user_id)
+        await self.session.commit()
+        AuthService.invalidate_user(user_id)
         return {"message": "User deleted successfully"}
 
     async def change_password(self, user_id: int, password_data: PasswordChange) -> Dict[str, Any]:
@@ -241,17 +237,25 @@ class UserService:
             raise UserNotFoundException(user_id)
         
         # Проверяем текущий пароль
-        if not self.verify_password(password_data.current_password, user.hashed_password):
+        if not await self.verify_password(password_data.current_password, user.hashed_password):
             raise InvalidPasswordException("Current password is incorrect")
         
         # Хэшируем новый пароль
-        hashed_password = self.get_password_hash(password_data.new_password)
+        hashed_password = await self.get_password_hash(password_data.new_password)
         
         # Обновляем пароль
         await self.repository.update_password(user_id, hashed_password)
+        await self.session.commit()
+        AuthService.invalidate_user(user_id)
         return {"message": "Password changed successfully"}
 
     async def get_user_stats(self) -> UserStatsResponse:
-        """Получение статистики пользователей"""
-        stats = await self.repository.get_stats()
-        return UserStatsResponse(**stats)
\ No newline at end of file
+        """Получение статистики пользователей из счетчиков stat_counters"""
+        total_users = await self.stats_repository.get_total(USERS_TOTAL)
+        active_users = await self.stats_repository.get_total(USERS_ACTIVE)
+        return UserStatsResponse(
+            total_users=total_users,
+            active_users=active_users,
+            inactive_users=total_users - active_users,
+            users_by_role=await self.stats_repository.get_breakdown(USERS_BY_ROLE)
+        )
\ No newline at end of file
@@ -0,0 +1,109 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Protocol
+
+
+class TTLCache:
+    """
+    Ограниченный LRU-кэш в памяти процесса со сроком жизни записей.
+
+    Срок задается при записи: ttl в секундах или абсолютный expires_at
+    (время Unix, как exp в JWT). При переполнении вытесняется запись,
+    к которой дольше всех не обращались.
+    """
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.time():
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None, expires_at: Optional[float] = None) -> None:
+        if self.maxsize <= 0:
+            return
+        if expires_at is None:
+            ttl = self.ttl if ttl is None else ttl
+            expires_at = time.time() + ttl if ttl is not None else None
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        requests = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / requests, 4) if requests else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class CacheBackend(Protocol):
+    """
+    Хранилище для read-through кэшей сервисов. Методы асинхронные, чтобы
+    рядом с LocalCacheBackend можно было подключить общий кэш (Redis и т.п.).
+    """
+
+    async def get(self, key: Hashable) -> Any: ...
+
+    async def set(self, key: Hashable, value: Any) -> None: ...
+
+    async def delete(self, key: Hashable) -> None: ...
+
+    async def clear(self) -> None: ...
+
+    def stats(self) -> Dict[str, Any]: ...
+
+
+class LocalCacheBackend:
+    """CacheBackend в памяти процесса поверх TTLCache (каждый воркер держит свою копию)"""
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None):
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def get(self, key: Hashable) -> Any:
+        return self.cache.get(key)
+
+    async def set(self, key: Hashable, value: Any) -> None:
+        self.cache.set(key, value)
+
+    async def delete(self, key: Hashable) -> None:
+        self.cache.delete(key)
+
+    async def clear(self) -> None:
+        self.cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return self.cache.stats()
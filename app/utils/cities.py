@@ -0,0 +1,123 @@
+import math
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+EARTH_RADIUS_KM = 6371.0
+# Длина градуса широты, км
+KM_PER_DEGREE = 111.32
+
+# Справочник по умолчанию: (название, широта, долгота, варианты написания).
+# Каноническое название само тоже считается вариантом, регистр, "ё" и дефисы не важны.
+DEFAULT_CITIES: List[Tuple[str, float, float, Tuple[str, ...]]] = [
+    ("Москва", 55.7558, 37.6173, ("мск", "moscow", "moskva")),
+    ("Санкт-Петербург", 59.9343, 30.3351, ("спб", "питер", "петербург", "ленинград", "spb", "saint petersburg",
+                                          "st petersburg")),
+    ("Новосибирск", 55.0084, 82.9357, ("нск", "новосиб", "novosibirsk")),
+    ("Екатеринбург", 56.8389, 60.6057, ("екб", "екат", "ekaterinburg", "yekaterinburg")),
+    ("Казань", 55.7887, 49.1221, ("kazan",)),
+    ("Нижний Новгород", 56.2965, 43.9361, ("нн", "нижний", "н новгород", "nizhny novgorod")),
+    ("Челябинск", 55.1644, 61.4368, ("chelyabinsk",)),
+    ("Самара", 53.1959, 50.1002, ("samara",)),
+    ("Омск", 54.9885, 73.3242, ("omsk",)),
+    ("Ростов-на-Дону", 47.2357, 39.7015, ("ростов", "rostov", "rostov on don")),
+    ("Уфа", 54.7388, 55.9721, ("ufa",)),
+    ("Красноярск", 56.0153, 92.8932, ("krasnoyarsk",)),
+    ("Воронеж", 51.6720, 39.1843, ("voronezh",)),
+    ("Пермь", 58.0105, 56.2502, ("perm",)),
+    ("Волгоград", 48.7080, 44.5133, ("volgograd",)),
+    ("Краснодар", 45.0355, 38.9753, ("krasnodar",)),
+    ("Сочи", 43.5855, 39.7231, ("sochi",)),
+    ("Калининград", 54.7104, 20.4522, ("kaliningrad",)),
+    ("Тюмень", 57.1522, 65.5272, ("tyumen",)),
+    ("Иркутск", 52.2870, 104.3050, ("irkutsk",)),
+    ("Владивосток", 43.1198, 131.8869, ("vladivostok",)),
+    ("Ярославль", 57.6261, 39.8845, ("yaroslavl",)),
+    ("Тула", 54.1931, 37.6173, ("tula",)),
+    ("Химки", 55.8970, 37.4297, ()),
+    ("Балашиха", 55.7963, 37.9382, ()),
+    ("Мытищи", 55.9116, 37.7308, ()),
+    ("Королёв", 55.9162, 37.8545, ()),
+    ("Подольск", 55.4242, 37.5547, ()),
+    ("Люберцы", 55.6783, 37.8939, ()),
+    ("Зеленоград", 55.9825, 37.1814, ()),
+    ("Пушкин", 59.7230, 30.4158, ()),
+    ("Колпино", 59.7500, 30.6000, ()),
+    ("Гатчина", 59.5650, 30.1283, ()),
+    ("Зеленодольск", 55.8466, 48.5010, ()),
+]
+
+
+def city_key(name: str | None) -> str:
+    """Ключ для сравнения названий: регистр, "ё", дефисы, точки и лишние пробелы не важны"""
+    text = (name or "").casefold().replace("ё", "е").replace("-", " ").replace(".", " ")
+    return " ".join(text.split())
+
+
+def distance_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Расстояние по дуге большого круга (гаверсинус)"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(lat: float, lon: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """
+    Прямоугольник (min_lat, max_lat, min_lon, max_lon), содержащий круг радиуса
+    radius_km. Точная проверка расстояния - distance_km по найденным точкам.
+    """
+    d_lat = radius_km / KM_PER_DEGREE
+    min_lat, max_lat = max(-90.0, lat - d_lat), min(90.0, lat + d_lat)
+    cos_lat = math.cos(math.radians(lat))
+    if max_lat >= 90.0 or min_lat <= -90.0 or cos_lat <= 0:
+        return min_lat, max_lat, -180.0, 180.0
+    d_lon = radius_km / (KM_PER_DEGREE * cos_lat)
+    if d_lon >= 180.0 or lon - d_lon < -180.0 or lon + d_lon > 180.0:
+        # Круг пересекает 180-й меридиан - по долготе не ограничиваем
+        return min_lat, max_lat, -180.0, 180.0
+    return min_lat, max_lat, lon - d_lon, lon + d_lon
+
+
+class City(NamedTuple):
+    id: int
+    name: str
+    latitude: float
+    longitude: float
+
+
+class CityDirectory:
+    """
+    Справочник городов в памяти процесса: разбор произвольного написания
+    ("СПб", "питер", "санкт петербург") в канонический город без запросов к БД.
+    """
+
+    def __init__(self):
+        self._by_id: Dict[int, City] = {}
+        self._by_key: Dict[str, City] = {}
+        self.loaded = False
+
+    def load(self, cities: Iterable[City], aliases: Iterable[Tuple[str, int]]) -> None:
+        """Полная загрузка из городов и пар (ключ варианта, city_id)"""
+        self._by_id = {city.id: city for city in cities}
+        self._by_key = {city_key(city.name): city for city in self._by_id.values()}
+        for alias, city_id in aliases:
+            if city_id in self._by_id:
+                self._by_key.setdefault(alias, self._by_id[city_id])
+        self.loaded = True
+
+    def get(self, city_id: int) -> Optional[City]:
+        return self._by_id.get(city_id)
+
+    def resolve(self, name: str | None) -> Optional[City]:
+        return self._by_key.get(city_key(name))
+
+    def canonical(self, name: str | None) -> str:
+        """Каноническое название; незнакомый город остается как есть (без лишних пробелов)"""
+        city = self.resolve(name)
+        return city.name if city else " ".join((name or "").split())
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+
+city_directory = CityDirectory()
@@ -0,0 +1,90 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, NamedTuple, Optional
+
+from fastapi import Request, Response, status
+
+# Ответы, которые меняются: браузер хранит копию, но каждый раз сверяет ее с сервером
+REVALIDATE = "private, no-cache"
+
+
+class Version(NamedTuple):
+    """Версия ресурса для условного GET"""
+    etag: str
+    last_modified: Optional[datetime] = None
+
+
+def make_etag(*parts: Any) -> str:
+    """Непрозрачный ETag из частей версии (id, revision, ...)"""
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=8).hexdigest()
+    return f'"{digest}"'
+
+
+def row_version(prefix: str, obj_id: int, revision: int, updated_at: Optional[datetime]) -> Version:
+    """Версия одной строки по ее revision"""
+    return Version(make_etag(prefix, obj_id, revision), updated_at)
+
+
+def table_version(prefix: str, count: int, max_id: Optional[int], updated_at: Optional[datetime]) -> Version:
+    """
+    Версия всей таблицы: вставка и изменение сдвигают max(updated_at),
+    удаление меняет число строк.
+    """
+    return Version(make_etag(prefix, count, max_id, updated_at), updated_at)
+
+
+def _http_date(value: datetime) -> str:
+    # В БД время хранится в UTC без часового пояса
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # Сравнение слабое (RFC 9110, 13.1.2): префикс W/ не учитывается
+    candidates = [tag.strip() for tag in header.split(",")]
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def is_not_modified(request: Request, version: Version) -> bool:
+    """Есть ли у клиента актуальная копия (If-None-Match, затем If-Modified-Since)"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, version.etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or version.last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    last_modified = version.last_modified
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    # Last-Modified передается с точностью до секунды
+    return last_modified.replace(microsecond=0) <= since
+
+
+def set_cache_headers(response: Response, version: Version, cache_control: str = REVALIDATE) -> None:
+    response.headers["ETag"] = version.etag
+    response.headers["Cache-Control"] = cache_control
+    if version.last_modified is not None:
+        response.headers["Last-Modified"] = _http_date(version.last_modified)
+
+
+def not_modified_response(request: Request, version: Version, cache_control: str = REVALIDATE) -> Optional[Response]:
+    """
+    Ответ 304 без тела, если копия клиента актуальна, иначе None -
+    тогда обработчик загружает объект и отдает его с set_cache_headers.
+    """
+    if not is_not_modified(request, version):
+        return None
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_cache_headers(response, version, cache_control)
+    return response
@@ -0,0 +1,94 @@
+import struct
+from array import array
+from bisect import bisect_left
+from itertools import accumulate
+from typing import Iterable, Iterator, List, Tuple
+
+# Размер одного ID в упакованном виде (uint32)
+ID_SIZE = array("I").itemsize
+
+
+def pack_ids(ids: Iterable[int]) -> bytes:
+    """Упаковка списка ID в компактный BLOB (uint32)"""
+    return array("I", ids).tobytes()
+
+
+def unpack_ids(blob: bytes | None) -> List[int]:
+    """Распаковка BLOB обратно в список ID"""
+    if not blob:
+        return []
+    ids = array("I")
+    ids.frombytes(blob)
+    return ids.tolist()
+
+
+def count_ids(blob: bytes | None) -> int:
+    """Количество ID в упакованном BLOB без распаковки"""
+    return len(blob or b"") // ID_SIZE
+
+
+def slice_ids(blob: bytes | None, start: int, stop: int) -> List[int]:
+    """Распаковка только среза [start:stop] без распаковки всего BLOB"""
+    return unpack_ids((blob or b"")[start * ID_SIZE:stop * ID_SIZE])
+
+
+# Сжатое множество ID (отсортированные без повторов) - блоки по ID_SET_BLOCK ID.
+# Заголовок блока: первый ID (uint32), ширина дельт в байтах (1, 2 или 4) и их
+# число (uint16), затем дельты между соседними ID. В плотном множестве дельты
+# помещаются в байт, и ID занимает ~1 байт вместо 4; распаковка идет через
+# array без цикла в Python, а проверка одного ID распаковывает только его блок.
+ID_SET_BLOCK = 128
+_BLOCK_HEADER = struct.Struct("<IBH")
+_DELTA_TYPES = {1: "B", 2: "H", 4: "I"}
+
+
+def pack_id_set(ids: Iterable[int]) -> bytes:
+    """Упаковка множества ID в сжатый BLOB (порядок и повторы во входе не важны)"""
+    values = sorted(set(ids))
+    blocks = []
+    for start in range(0, len(values), ID_SET_BLOCK):
+        block = values[start:start + ID_SET_BLOCK]
+        deltas = [b - a for a, b in zip(block, block[1:])]
+        largest = max(deltas, default=0)
+        width = 1 if largest < 1 << 8 else 2 if largest < 1 << 16 else 4
+        blocks.append(_BLOCK_HEADER.pack(block[0], width, len(deltas)))
+        blocks.append(array(_DELTA_TYPES[width], deltas).tobytes())
+    return b"".join(blocks)
+
+
+def _id_set_blocks(blob: bytes) -> Iterator[Tuple[int, int, int, int]]:
+    # (первый ID, ширина дельт, число дельт, смещение дельт) для каждого блока
+    offset = 0
+    while offset < len(blob):
+        first, width, count = _BLOCK_HEADER.unpack_from(blob, offset)
+        offset += _BLOCK_HEADER.size
+        yield first, width, count, offset
+        offset += width * count
+
+
+def _unpack_block(blob: bytes, first: int, width: int, count: int, offset: int) -> List[int]:
+    deltas = array(_DELTA_TYPES[width])
+    deltas.frombytes(blob[offset:offset + width * count])
+    return list(accumulate(deltas, initial=first))
+
+
+def unpack_id_set(blob: bytes | None) -> List[int]:
+    """Распаковка сжатого множества в отсортированный список ID"""
+    ids = []
+    for block in _id_set_blocks(blob or b""):
+        ids.extend(_unpack_block(blob, *block))
+    return ids
+
+
+def id_set_contains(blob: bytes | None, value: int) -> bool:
+    """Проверка одного ID: по заголовкам находится блок, распаковывается только он"""
+    candidate = None
+    for block in _id_set_blocks(blob or b""):
+        if block[0] > value:
+            break
+        candidate = block
+    if candidate is None:
+        return False
+    ids = _unpack_block(blob, *candidate)
+    position = bisect_left(ids, value)
+    return position < len(ids) and ids[position] == value
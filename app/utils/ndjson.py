@@ -0,0 +1,17 @@
+from typing import AsyncIterable, AsyncIterator
+
+# Тип содержимого для потоков JSON-объектов по одному на строку
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    """Строки NDJSON из потока байтов (пустые строки пропускаются)"""
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield line
+    if buffer.strip():
+        yield buffer
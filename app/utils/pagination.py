@@ -0,0 +1,44 @@
+import base64
+import binascii
+import json
+from typing import Any, Callable, List, Optional, Sequence
+
+from fastapi import Response
+
+# Заголовок, в котором возвращается курсор следующей страницы
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(*key: Any) -> str:
+    """Непрозрачный курсор из ключа сортировки последней записи страницы"""
+    raw = json.dumps(list(key), separators=(",", ":"), ensure_ascii=False).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """Разбор курсора обратно в ключ сортировки"""
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        key = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, binascii.Error):
+        raise ValueError("Invalid cursor")
+    if not isinstance(key, list) or not key:
+        raise ValueError("Invalid cursor")
+    return key
+
+
+def next_cursor(
+    items: Sequence[Any],
+    limit: int,
+    key: Callable[[Any], tuple] = lambda item: (item.id,)
+) -> Optional[str]:
+    """Курсор следующей страницы или None, если страница последняя"""
+    if len(items) < limit or not items:
+        return None
+    return encode_cursor(*key(items[-1]))
+
+
+def set_next_cursor(response: Response, items: Sequence[Any], limit: int, **kwargs) -> None:
+    cursor = next_cursor(items, limit, **kwargs)
+    if cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
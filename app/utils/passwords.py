@@ -0,0 +1,128 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from passlib.context import CryptContext
+
+from app.config import settings
+from app.exceptions.users import PasswordHashingBusyException
+
+# Контекст для хэширования паролей
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+class PasswordHasher:
+    """
+    Хэширование и проверка паролей bcrypt в отдельном пуле потоков.
+
+    bcrypt занимает сотни миллисекунд CPU и отпускает GIL, поэтому в пуле
+    потоков не блокирует event loop. Одновременно выполняется не больше
+    workers операций, еще queue_size ждут своей очереди; если очередь
+    занята дольше queue_timeout секунд, запрос отклоняется с
+    PasswordHashingBusyException. При workers=0 хэширование выполняется
+    прямо в event loop (прежнее поведение, для сравнения в бенчмарках).
+    """
+
+    def __init__(self, workers: int, queue_size: int, queue_timeout: float):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_loop: Optional[asyncio.AbstractEventLoop] = None
+        self.in_flight = 0
+        self.waiting = 0
+        self.completed = 0
+        self.rejected = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.hash_seconds_total = 0.0
+
+    async def hash(self, password: str) -> str:
+        return await self._run(pwd_context.hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(pwd_context.verify, plain_password, hashed_password)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "in_flight": self.in_flight,
+            "queued": max(self.in_flight - self.workers, 0) + self.waiting,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_wait_ms": self._avg_ms(self.wait_seconds_total),
+            "max_wait_ms": round(self.wait_seconds_max * 1000, 2),
+            "avg_hash_ms": self._avg_ms(self.hash_seconds_total),
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def _run(self, func: Callable, *args) -> Any:
+        if self.workers <= 0:
+            return self._record(*_timed(func, *args))
+
+        slots = self._get_slots()
+        queued_at = time.perf_counter()
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise PasswordHashingBusyException()
+        finally:
+            self.waiting -= 1
+
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result, elapsed = await loop.run_in_executor(self._get_executor(), _timed, func, *args)
+            # Ожидание: семафор плюс очередь пула до начала работы потока
+            wait = time.perf_counter() - queued_at - elapsed
+            self.wait_seconds_total += wait
+            self.wait_seconds_max = max(self.wait_seconds_max, wait)
+            return self._record(result, elapsed)
+        finally:
+            self.in_flight -= 1
+            slots.release()
+
+    def _record(self, result: Any, elapsed: float) -> Any:
+        self.completed += 1
+        self.hash_seconds_total += elapsed
+        return result
+
+    def _avg_ms(self, total: float) -> float:
+        return round(total / self.completed * 1000, 2) if self.completed else 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hasher")
+        return self._executor
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        # Семафор привязан к event loop, поэтому создается заново для нового цикла
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(self.workers + self.queue_size)
+            self._slots_loop = loop
+        return self._slots
+
+
+def _timed(func: Callable, *args) -> Tuple[Any, float]:
+    # Выполняется в потоке пула: счетчики обновляет только event loop
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+# Общий для процесса пул хэширования паролей
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    queue_size=settings.PASSWORD_HASH_QUEUE_SIZE,
+    queue_timeout=settings.PASSWORD_HASH_QUEUE_TIMEOUT,
+)
@@ -0,0 +1,296 @@
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from app.config import settings
+
+# Строка снимка: (profile_id, age, gender, city, теги после parse_tags)
+ProfileRow = Tuple[int, int, str, str, Sequence[str]]
+
+# Код значения, которого нет в словаре снимка: ни одна строка с ним не совпадет
+MISSING_CODE = -1
+
+
+class ProfileMatrix:
+    """
+    Колоночный снимок профилей в памяти процесса для фильтров по полу, городу,
+    возрасту и тегам.
+
+    Каждое поле - массив NumPy, строка массива - профиль; фильтр вычисляется
+    как булева маска над всеми строками сразу. Пол и город кодируются
+    числами по словарям снимка, теги - битами в наборе слов uint64 на строку
+    (слова хранятся по столбцам, одно слово всех профилей - непрерывный массив).
+    Биты получают tag_bits самых частых тегов, редкие теги хранятся
+    множествами ID профилей. Строки плотные: при удалении на место профиля
+    переносится последняя строка. version - версия данных профилей в БД
+    (счетчик profiles.version), с которой совпадает снимок.
+    """
+
+    def __init__(self, tag_bits: int = 256):
+        self.tag_words = max(1, (tag_bits + 63) // 64)
+        self.tag_bits = self.tag_words * 64
+        self._genders: Dict[str, int] = {}
+        self._cities: Dict[str, int] = {}
+        self._tag_bit: Dict[str, int] = {}
+        self._overflow: Dict[str, Set[int]] = {}
+        self._overflow_of: Dict[int, Tuple[str, ...]] = {}
+        self._rows: Dict[int, int] = {}
+        self._allocate(0)
+        self.loaded = False
+        self.version = 0
+
+    def _allocate(self, capacity: int) -> None:
+        self._ids = np.zeros(capacity, dtype=np.int64)
+        self._ages = np.zeros(capacity, dtype=np.int16)
+        self._gender_codes = np.zeros(capacity, dtype=np.int32)
+        self._city_codes = np.zeros(capacity, dtype=np.int32)
+        self._tags = np.zeros((self.tag_words, capacity), dtype=np.uint64)
+        self.size = 0
+
+    def _grow(self, needed: int) -> None:
+        capacity = len(self._ids)
+        if needed <= capacity:
+            return
+        capacity = max(needed, capacity * 2, 1024)
+        size = self.size
+        old = self._ids, self._ages, self._gender_codes, self._city_codes, self._tags
+        self._allocate(capacity)
+        for new, previous in zip((self._ids, self._ages, self._gender_codes, self._city_codes, self._tags), old):
+            new[..., :size] = previous[..., :size]
+        self.size = size
+
+    @staticmethod
+    def _code(vocabulary: Dict[str, int], value: str) -> int:
+        return vocabulary.setdefault(value, len(vocabulary))
+
+    def load(self, rows: Iterable[ProfileRow], version: int = 0) -> None:
+        """Полная загрузка снимка из строк, прочитанных при версии version"""
+        rows = list(rows)
+        self.version = version
+        self._genders, self._cities, self._overflow, self._overflow_of = {}, {}, {}, {}
+        frequency = Counter(tag for *_, tags in rows for tag in tags)
+        self._tag_bit = {tag: bit for bit, (tag, _) in enumerate(frequency.most_common(self.tag_bits))}
+        self._allocate(len(rows))
+        self.size = len(rows)
+        self._rows = {row[0]: i for i, row in enumerate(rows)}
+        if not rows:
+            self.loaded = True
+            return
+
+        self._ids[:] = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+        self._ages[:] = np.fromiter((row[1] for row in rows), dtype=np.int16, count=len(rows))
+        self._gender_codes[:] = np.fromiter(
+            (self._code(self._genders, row[2]) for row in rows), dtype=np.int32, count=len(rows)
+        )
+        self._city_codes[:] = np.fromiter(
+            (self._code(self._cities, row[3]) for row in rows), dtype=np.int32, count=len(rows)
+        )
+        # Биты тегов собираются парами (строка, бит) и проставляются одной операцией
+        positions: List[int] = []
+        bits: List[int] = []
+        for i, (profile_id, _, _, _, tags) in enumerate(rows):
+            rare = []
+            for tag in tags:
+                bit = self._tag_bit.get(tag)
+                if bit is None:
+                    rare.append(tag)
+                else:
+                    positions.append(i)
+                    bits.append(bit)
+            if rare:
+                self._add_overflow(profile_id, rare)
+        if bits:
+            bits = np.asarray(bits, dtype=np.uint64)
+            np.bitwise_or.at(
+                self._tags,
+                ((bits >> np.uint64(6)).astype(np.intp), np.asarray(positions)),
+                np.left_shift(np.uint64(1), bits & np.uint64(63))
+            )
+        self.loaded = True
+
+    def advance(self, version: int, changes: int = 1) -> bool:
+        """
+        Переход к версии после своей записи из changes строк profiles. True -
+        снимок был актуален до нее, и изменения нужно применить точечно;
+        False - между ними писал кто-то еще, снимок перезагрузится при чтении.
+        """
+        if not self.loaded or self.version != version - changes:
+            return False
+        self.version = version
+        return True
+
+    def set_profile(
+        self, profile_id: int, age: int, gender: str, city: str, tags: Iterable[str]
+    ) -> None:
+        """Добавление или замена строки профиля"""
+        row = self._rows.get(profile_id)
+        if row is None:
+            self._grow(self.size + 1)
+            row = self.size
+            self.size += 1
+            self._rows[profile_id] = row
+        self._remove_overflow(profile_id)
+        self._ids[row] = profile_id
+        self._ages[row] = age
+        self._gender_codes[row] = self._code(self._genders, gender)
+        self._city_codes[row] = self._code(self._cities, city)
+        words = np.zeros(self.tag_words, dtype=np.uint64)
+        rare = []
+        for tag in tags:
+            bit = self._tag_bit.get(tag)
+            if bit is None and len(self._tag_bit) < self.tag_bits:
+                bit = self._tag_bit[tag] = len(self._tag_bit)
+            if bit is None:
+                rare.append(tag)
+            else:
+                words[bit >> 6] |= np.uint64(1 << (bit & 63))
+        self._tags[:, row] = words
+        if rare:
+            self._add_overflow(profile_id, rare)
+
+    def remove_profile(self, profile_id: int) -> None:
+        row = self._rows.pop(profile_id, None)
+        if row is None:
+            return
+        self._remove_overflow(profile_id)
+        last = self.size - 1
+        if row != last:
+            for column in (self._ids, self._ages, self._gender_codes, self._city_codes, self._tags):
+                column[..., row] = column[..., last]
+            self._rows[int(self._ids[row])] = row
+        self.size = last
+
+    def _add_overflow(self, profile_id: int, tags: List[str]) -> None:
+        self._overflow_of[profile_id] = tuple(tags)
+        for tag in tags:
+            self._overflow.setdefault(tag, set()).add(profile_id)
+
+    def _remove_overflow(self, profile_id: int) -> None:
+        for tag in self._overflow_of.pop(profile_id, ()):
+            ids = self._overflow[tag]
+            ids.discard(profile_id)
+            if not ids:
+                del self._overflow[tag]
+
+    def mask(
+        self,
+        gender: Optional[str] = None,
+        cities: Optional[Iterable[str]] = None,
+        min_age: Optional[int] = None,
+        max_age: Optional[int] = None,
+        tags_all: Iterable[str] = (),
+        tags_any: Iterable[str] = ()
+    ) -> np.ndarray:
+        """
+        Булева маска строк снимка, подходящих под все условия; None и пустые
+        списки тегов условие не накладывают.
+        """
+        n = self.size
+        mask = np.ones(n, dtype=bool)
+        if gender is not None:
+            mask &= self._gender_codes[:n] == self._genders.get(gender, MISSING_CODE)
+        if cities is not None:
+            codes = [self._cities[city] for city in cities if city in self._cities]
+            mask &= self._code_mask(self._city_codes[:n], codes, len(self._cities))
+        if min_age is not None:
+            mask &= self._ages[:n] >= min_age
+        if max_age is not None:
+            mask &= self._ages[:n] <= max_age
+
+        tags_all, tags_any = set(tags_all), set(tags_any)
+        if tags_all or tags_any:
+            # Теги проверяются только у строк, прошедших остальные условия
+            rows = np.flatnonzero(mask)
+            keep = np.ones(len(rows), dtype=bool)
+            if tags_all:
+                required, rare = self._tag_words(tags_all)
+                for word in np.flatnonzero(required):
+                    keep &= (self._tags[word, rows] & required[word]) == required[word]
+                for tag in rare:
+                    keep &= self._has_rare(tag, rows)
+            if tags_any:
+                wanted, rare = self._tag_words(tags_any)
+                any_match = np.zeros(len(rows), dtype=bool)
+                for word in np.flatnonzero(wanted):
+                    any_match |= (self._tags[word, rows] & wanted[word]) != 0
+                for tag in rare:
+                    any_match |= self._has_rare(tag, rows)
+                keep &= any_match
+            mask[rows[~keep]] = False
+        return mask
+
+    @staticmethod
+    def _code_mask(column: np.ndarray, codes: List[int], vocabulary_size: int) -> np.ndarray:
+        """column IN codes: для коротких списков сравнения дешевле np.isin, для длинных - таблица"""
+        if len(codes) <= 8:
+            mask = np.zeros(len(column), dtype=bool)
+            for code in codes:
+                mask |= column == code
+            return mask
+        allowed = np.zeros(vocabulary_size, dtype=bool)
+        allowed[codes] = True
+        return allowed[column]
+
+    def _tag_words(self, tags: Set[str]) -> Tuple[np.ndarray, List[str]]:
+        """Слова с битами тегов и список тегов без бита"""
+        words = np.zeros(self.tag_words, dtype=np.uint64)
+        rare = []
+        for tag in tags:
+            bit = self._tag_bit.get(tag)
+            if bit is None:
+                rare.append(tag)
+            else:
+                words[bit >> 6] |= np.uint64(1 << (bit & 63))
+        return words, rare
+
+    def _has_rare(self, tag: str, rows: np.ndarray) -> np.ndarray:
+        """Есть ли у строк rows тег без бита"""
+        ids = self._overflow.get(tag)
+        if not ids:
+            return np.zeros(len(rows), dtype=bool)
+        return np.isin(self._ids[rows], np.fromiter(ids, dtype=np.int64, count=len(ids)))
+
+    def ids(self, mask: np.ndarray) -> np.ndarray:
+        """ID профилей по маске, по возрастанию"""
+        return np.sort(self._ids[:self.size][mask])
+
+    def ids_at(self, rows: np.ndarray) -> np.ndarray:
+        return self._ids[rows]
+
+    def ages_at(self, rows: np.ndarray) -> np.ndarray:
+        return self._ages[rows]
+
+    def in_city_at(self, rows: np.ndarray, city: str) -> np.ndarray:
+        return self._city_codes[rows] == self._cities.get(city, MISSING_CODE)
+
+    def shared_tag_counts(self, rows: np.ndarray, tags: Iterable[str]) -> np.ndarray:
+        """Число тегов из tags у каждой из строк rows (popcount по словам битов)"""
+        words, rare = self._tag_words(set(tags))
+        counts = np.zeros(len(rows), dtype=np.int32)
+        for word in np.flatnonzero(words):
+            counts += np.bitwise_count(self._tags[word, rows] & words[word])
+        for tag in rare:
+            counts += self._has_rare(tag, rows)
+        return counts
+
+    def max_id(self) -> int:
+        return int(self._ids[:self.size].max()) if self.size else 0
+
+    def rows_of(self, profile_ids: Iterable[int]) -> np.ndarray:
+        """Номера строк профилей, MISSING_CODE для профилей не из снимка"""
+        rows = self._rows
+        return np.fromiter((rows.get(profile_id, MISSING_CODE) for profile_id in profile_ids), dtype=np.intp)
+
+    def __len__(self) -> int:
+        return self.size
+
+
+def matched_after(ids: np.ndarray, after_id: Optional[int], limit: int) -> List[int]:
+    """Страница отсортированных ID после курсора after_id"""
+    start = 0 if after_id is None else int(np.searchsorted(ids, after_id, side="right"))
+    return ids[start:start + limit].tolist()
+
+
+# Общий для процесса снимок, загружается при первом применении фильтра
+profile_matrix = ProfileMatrix(tag_bits=settings.PROFILE_MATRIX_TAG_BITS)
@@ -0,0 +1,132 @@
+import heapq
+from typing import Dict, List, NamedTuple, Optional, Protocol, Sequence, Tuple
+
+import numpy as np
+
+from app.config import settings
+from app.utils.profile_matrix import ProfileMatrix
+
+# Разница в возрасте (лет), при которой близость по возрасту падает вдвое
+AGE_HALF_DISTANCE = 5
+# Знаков после запятой в итоговой оценке: одинаковые профили получают
+# одинаковую оценку при каждом пересчете, поэтому курсор (оценка, id) стабилен
+SCORE_DIGITS = 6
+
+
+class Viewer(NamedTuple):
+    """Профиль, для которого ранжируются кандидаты"""
+    profile_id: int
+    age: int
+    city: str
+    tags: Tuple[str, ...]
+    # ID профилей, которые уже лайкнули этот профиль
+    liked_by: np.ndarray
+
+
+class Scorer(Protocol):
+    """
+    Признак совместимости. Вызывается один раз на весь набор кандидатов
+    (строки rows снимка ProfileMatrix) и возвращает оценки от 0 до 1.
+    """
+
+    def __call__(self, matrix: ProfileMatrix, rows: np.ndarray, viewer: Viewer) -> np.ndarray: ...
+
+
+def tag_overlap(matrix: ProfileMatrix, rows: np.ndarray, viewer: Viewer) -> np.ndarray:
+    """Доля тегов зрителя, которые есть у кандидата"""
+    if not viewer.tags:
+        return np.zeros(len(rows))
+    return matrix.shared_tag_counts(rows, viewer.tags) / len(viewer.tags)
+
+
+def age_proximity(matrix: ProfileMatrix, rows: np.ndarray, viewer: Viewer) -> np.ndarray:
+    distance = np.abs(matrix.ages_at(rows).astype(np.float64) - viewer.age)
+    return AGE_HALF_DISTANCE / (AGE_HALF_DISTANCE + distance)
+
+
+def same_city(matrix: ProfileMatrix, rows: np.ndarray, viewer: Viewer) -> np.ndarray:
+    return matrix.in_city_at(rows, viewer.city).astype(np.float64)
+
+
+def recency(matrix: ProfileMatrix, rows: np.ndarray, viewer: Viewer) -> np.ndarray:
+    """Новизна анкеты: ID растут в порядке создания, самая новая получает 1"""
+    return matrix.ids_at(rows) / max(matrix.max_id(), 1)
+
+
+def reciprocal_like(matrix: ProfileMatrix, rows: np.ndarray, viewer: Viewer) -> np.ndarray:
+    """Взаимность вероятна, если кандидат уже лайкнул зрителя"""
+    return np.isin(matrix.ids_at(rows), viewer.liked_by).astype(np.float64)
+
+
+# Встроенные признаки; свой признак подключается добавлением в словарь и в веса
+SCORERS: Dict[str, Scorer] = {
+    "tags": tag_overlap,
+    "age": age_proximity,
+    "city": same_city,
+    "recency": recency,
+    "reciprocal": reciprocal_like,
+}
+
+
+def parse_weights(spec: str) -> Dict[str, float]:
+    """Веса признаков из строки вида "tags:3,age:2,city:2" """
+    weights = {}
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition(":")
+        weights[name.strip()] = float(weight or 1)
+    return weights
+
+
+class Ranker:
+    """
+    Ранжирование кандидатов: взвешенная сумма признаков, вычисленных пачкой
+    над снимком профилей, и отбор страницы без полной сортировки.
+
+    Порядок - по убыванию оценки, при равенстве по возрастанию id; страница
+    продолжается с курсора (оценка, id) последнего профиля предыдущей.
+    """
+
+    def __init__(self, weights: Dict[str, float], scorers: Optional[Dict[str, Scorer]] = None):
+        scorers = SCORERS if scorers is None else scorers
+        unknown = set(weights) - set(scorers)
+        if unknown:
+            raise ValueError(f"Unknown scorers: {', '.join(sorted(unknown))}")
+        self.stages: List[Tuple[Scorer, float]] = [
+            (scorers[name], weight) for name, weight in weights.items() if weight
+        ]
+
+    def score(self, matrix: ProfileMatrix, rows: np.ndarray, viewer: Viewer) -> np.ndarray:
+        total = np.zeros(len(rows))
+        for scorer, weight in self.stages:
+            total += weight * scorer(matrix, rows, viewer)
+        return np.round(total, SCORE_DIGITS)
+
+    def top(
+        self,
+        matrix: ProfileMatrix,
+        rows: np.ndarray,
+        viewer: Viewer,
+        limit: int,
+        after: Optional[Sequence] = None
+    ) -> List[Tuple[float, int]]:
+        """Страница (оценка, profile_id) из limit лучших кандидатов после курсора after"""
+        scores = self.score(matrix, rows, viewer)
+        ids = matrix.ids_at(rows)
+        if after is not None:
+            after_score, after_id = after
+            rest = (scores < after_score) | ((scores == after_score) & (ids > after_id))
+            scores, ids = scores[rest], ids[rest]
+        if len(scores) > limit:
+            # argpartition за O(n) находит порог limit-й оценки; в кучу идут
+            # только кандидаты не ниже порога (с равными ему - для порядка по id)
+            threshold = scores[np.argpartition(-scores, limit - 1)[limit - 1]]
+            best = scores >= threshold
+            scores, ids = scores[best], ids[best]
+        page = heapq.nsmallest(limit, zip((-scores).tolist(), ids.tolist()))
+        return [(-negative, profile_id) for negative, profile_id in page]
+
+
+# Ранжирование с весами из настроек (RANKING_WEIGHTS)
+ranker = Ranker(parse_weights(settings.RANKING_WEIGHTS))
@@ -0,0 +1,21 @@
+import re
+from typing import Optional
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def build_match_query(text: str, column: Optional[str] = None) -> Optional[str]:
+    """
+    Безопасный запрос для FTS5 MATCH из пользовательского ввода.
+
+    Каждое слово берется в кавычки (спецсимволы FTS5 не интерпретируются)
+    и ищется по префиксу; слова объединяются через AND.
+    Возвращает None, если в тексте нет ни одного слова.
+    """
+    tokens = _TOKEN_RE.findall(text or "")
+    if not tokens:
+        return None
+    query = " ".join(f'"{token}"*' for token in tokens)
+    if column:
+        return f"{column} : ({query})"
+    return query
@@ -0,0 +1,32 @@
+from functools import lru_cache
+from typing import List, Optional, Sequence, Type, TypeVar
+
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy.engine import Row
+
+from app.utils.pagination import set_next_cursor
+
+SchemaT = TypeVar("SchemaT", bound=BaseModel)
+
+
+@lru_cache(maxsize=None)
+def list_adapter(schema: Type[SchemaT]) -> TypeAdapter:
+    """TypeAdapter(List[schema]) создается один раз на схему"""
+    return TypeAdapter(List[schema])
+
+
+def validate_rows(schema: Type[SchemaT], rows: Sequence[Row]) -> List[SchemaT]:
+    """Строки-кортежи из БД в список схем одной проверкой, без ORM-объектов"""
+    return list_adapter(schema).validate_python([row._mapping for row in rows])
+
+
+def list_response(schema: Type[SchemaT], items: List[SchemaT], limit: Optional[int] = None) -> ORJSONResponse:
+    """
+    Готовый ответ со списком: сериализация через orjson без повторной
+    проверки по response_model (эндпоинт возвращает Response напрямую).
+    """
+    response = ORJSONResponse(list_adapter(schema).dump_python(items))
+    if limit is not None:
+        set_next_cursor(response, items, limit)
+    return response
@@ -0,0 +1,122 @@
+import heapq
+from array import array
+from bisect import bisect_left, insort
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Tuple
+
+# Разделитель тегов в ProfileModel.tags ("путешествия, кофе, фотография")
+TAG_SEPARATOR = ","
+MAX_TAG_LENGTH = 50
+
+
+def parse_tags(raw: str | None) -> List[str]:
+    """Разбор строки тегов в список нормализованных тегов без повторов"""
+    tags = []
+    for part in (raw or "").split(TAG_SEPARATOR):
+        tag = " ".join(part.split()).lower()[:MAX_TAG_LENGTH]
+        if tag and tag not in tags:
+            tags.append(tag)
+    return tags
+
+
+class TagIndex:
+    """
+    Инвертированный индекс тегов в памяти процесса.
+
+    Для каждого тега хранится отсортированный массив ID профилей (uint32),
+    поэтому пересечение и объединение тегов не требуют запросов к БД.
+    version - версия данных профилей в БД (счетчик profiles.version), с
+    которой индекс совпадает.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, array] = {}
+        self._profile_tags: Dict[int, Tuple[str, ...]] = {}
+        self.loaded = False
+        self.version = 0
+
+    def load(self, pairs: Iterable[Tuple[int, str]], version: int = 0) -> None:
+        """Полная загрузка из пар (profile_id, tag), прочитанных при версии version"""
+        grouped: Dict[str, List[int]] = defaultdict(list)
+        profile_tags: Dict[int, List[str]] = defaultdict(list)
+        for profile_id, tag in pairs:
+            grouped[tag].append(profile_id)
+            profile_tags[profile_id].append(tag)
+        self._postings = {tag: array("I", sorted(ids)) for tag, ids in grouped.items()}
+        self._profile_tags = {profile_id: tuple(tags) for profile_id, tags in profile_tags.items()}
+        self.loaded = True
+        self.version = version
+
+    def advance(self, version: int, changes: int = 1) -> bool:
+        """
+        Переход к версии после своей записи из changes строк profiles. True -
+        индекс был актуален до нее, и изменения нужно применить точечно;
+        False - между ними писал кто-то еще, индекс перезагрузится при чтении.
+        """
+        if not self.loaded or self.version != version - changes:
+            return False
+        self.version = version
+        return True
+
+    def set_profile(self, profile_id: int, tags: Iterable[str]) -> None:
+        self.remove_profile(profile_id)
+        tags = tuple(tags)
+        for tag in tags:
+            insort(self._postings.setdefault(tag, array("I")), profile_id)
+        if tags:
+            self._profile_tags[profile_id] = tags
+
+    def remove_profile(self, profile_id: int) -> None:
+        for tag in self._profile_tags.pop(profile_id, ()):
+            ids = self._postings[tag]
+            del ids[bisect_left(ids, profile_id)]
+            if not ids:
+                del self._postings[tag]
+
+    def tags_of(self, profile_id: int) -> Tuple[str, ...]:
+        return self._profile_tags.get(profile_id, ())
+
+    def match_all(self, tags: Iterable[str]) -> List[int]:
+        """ID профилей, у которых есть все теги (AND)"""
+        postings = [self._postings.get(tag) for tag in set(tags)]
+        if not postings or not all(postings):
+            return []
+        # Начинаем с самого короткого списка и проверяем остальные бинарным поиском
+        postings.sort(key=len)
+        result = postings[0].tolist()
+        for ids in postings[1:]:
+            result = [profile_id for profile_id in result if _contains(ids, profile_id)]
+            if not result:
+                break
+        return result
+
+    def match_any(self, tags: Iterable[str]) -> List[int]:
+        """ID профилей, у которых есть хотя бы один из тегов (OR)"""
+        postings = [self._postings[tag] for tag in set(tags) if tag in self._postings]
+        result = []
+        for profile_id in heapq.merge(*postings):
+            if not result or result[-1] != profile_id:
+                result.append(profile_id)
+        return result
+
+    def shared(self, tags: Iterable[str], min_shared: int = 1) -> List[Tuple[int, int]]:
+        """
+        Профили, у которых не меньше min_shared общих тегов с заданными.
+
+        Возвращает пары (profile_id, число общих тегов): сначала больше общих.
+        """
+        counts = Counter()
+        for tag in set(tags):
+            counts.update(self._postings.get(tag, ()))
+        matched = [(profile_id, count) for profile_id, count in counts.items() if count >= min_shared]
+        matched.sort(key=lambda item: (-item[1], item[0]))
+        return matched
+
+
+def _contains(ids: array, profile_id: int) -> bool:
+    i = bisect_left(ids, profile_id)
+    return i < len(ids) and ids[i] == profile_id
+
+
+# Общий для процесса индекс, загружается при первом запросе по тегам
+tag_index = TagIndex()
@@ -0,0 +1,68 @@
+# benchmarks/auth_overhead.py
+"""
+Накладные расходы аутентификации на один запрос.
+
+Запуск: python -m benchmarks.auth_overhead [--requests 2000]
+
+Приложение запускается в процессе на временной БД. Сравниваются:
+/auth/health без аутентификации, /auth/me с прогретыми кэшами токенов и
+пользователей и /auth/me с очисткой кэшей перед каждым запросом (проверка
+подписи JWT и чтение пользователя из БД на каждый запрос, как без кэшей).
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+import warnings
+
+
+def _measure(client, path: str, requests: int, headers: dict, before=None) -> float:
+    timings = []
+    for _ in range(requests):
+        if before is not None:
+            before()
+        started = time.perf_counter()
+        response = client.get(path, headers=headers)
+        timings.append(time.perf_counter() - started)
+        assert response.status_code == 200, response.text
+    return statistics.median(timings) * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}"
+        os.environ["DB_PROFILE"] = "production"
+
+        from fastapi.testclient import TestClient
+        import main as app_main
+        from app.services.auth import current_user_cache, token_claims_cache
+
+        def clear_caches() -> None:
+            token_claims_cache.clear()
+            current_user_cache.clear()
+
+        with TestClient(app_main.app) as client:
+            client.post("/roles/", json={"name": "user"})
+            client.post("/auth/register", json={"email": "bench@example.com", "password": "bench-pass-1", "role_id": 1})
+            token = client.post(
+                "/auth/login-json", json={"email": "bench@example.com", "password": "bench-pass-1"}
+            ).json()["access_token"]
+            headers = {"Authorization": f"Bearer {token}"}
+
+            baseline = _measure(client, "/auth/health", args.requests, {})
+            cold = _measure(client, "/auth/me", args.requests, headers, before=clear_caches)
+            warm = _measure(client, "/auth/me", args.requests, headers)
+
+    print(f"без аутентификации:  {baseline:8.1f} мкс")
+    print(f"без кэшей:           {cold:8.1f} мкс (аутентификация +{cold - baseline:.1f} мкс)")
+    print(f"с кэшами:            {warm:8.1f} мкс (аутентификация +{warm - baseline:.1f} мкс)")
+
+
+if __name__ == "__main__":
+    main()
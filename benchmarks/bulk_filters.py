@@ -0,0 +1,106 @@
+# benchmarks/bulk_filters.py
+"""
+Массовое создание фильтров через /user-filters/bulk.
+
+Запуск: python -m benchmarks.bulk_filters [--sizes 1000 10000 100000]
+
+Приложение запускается в процессе на временной БД. Для каждого размера
+замеряются: прежний способ (запрос get_by_user_id на каждую строку, затем
+add_all - только до 10k строк), /bulk с телом JSON, /bulk с потоком NDJSON и
+повторная загрузка тех же строк (все строки - конфликты).
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import warnings
+
+
+def _rows(count: int, offset: int) -> list:
+    genders = ["male", "female", "any"]
+    cities = ["Москва", "Казань", ""]
+    return [
+        {"user_id": offset + i, "gender_filter": genders[i % 3], "city_filter": cities[i % 3], "role_id": 1}
+        for i in range(1, count + 1)
+    ]
+
+
+async def _legacy(rows: list) -> None:
+    # Логика create_filters_bulk до перехода на пакетную вставку
+    from app.database.database import async_session_maker
+    from app.models.user_filters import User_filterModel
+    from app.repositories.user_filters import UserFilterRepository
+
+    async with async_session_maker() as session:
+        repository = UserFilterRepository(session)
+        for row in rows:
+            if await repository.get_by_user_id(row["user_id"]):
+                raise RuntimeError("conflict")
+        filters = [User_filterModel(**row) for row in rows]
+        session.add_all(filters)
+        await session.commit()
+        for item in filters:
+            await session.refresh(item)
+
+
+def _post(client, rows: list, ndjson: bool) -> dict:
+    if ndjson:
+        body = "\n".join(json.dumps(row, ensure_ascii=False) for row in rows).encode()
+        response = client.post("/user-filters/bulk", content=body, headers={"Content-Type": "application/x-ndjson"})
+    else:
+        response = client.post("/user-filters/bulk", json={"filters": rows})
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def _timed(func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - started, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}"
+        os.environ["DB_PROFILE"] = "production"
+
+        from fastapi.testclient import TestClient
+        import main as app_main
+
+        with TestClient(app_main.app) as client:
+            client.post("/roles/", json={"name": "user"})
+            offset = 0
+            for size in args.sizes:
+                line = f"{size:>7} строк:"
+                if size <= 10000:
+                    rows = _rows(size, offset)
+                    offset += size
+                    elapsed, _ = _timed(client.portal.call, _legacy, rows)
+                    line += f" прежний способ {elapsed:7.2f} с,"
+
+                rows = _rows(size, offset)
+                offset += size
+                elapsed, report = _timed(_post, client, rows, False)
+                assert report["created"] == size
+                line += f" JSON {elapsed:6.2f} с,"
+
+                rows = _rows(size, offset)
+                offset += size
+                elapsed, report = _timed(_post, client, rows, True)
+                assert report["created"] == size
+                line += f" NDJSON {elapsed:6.2f} с,"
+
+                elapsed, report = _timed(_post, client, rows, True)
+                assert report["created"] == 0 and report["skipped"] == size
+                line += f" повтор (конфликты) {elapsed:6.2f} с"
+                print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# benchmarks/filter_matching.py
+"""
+Применение фильтра пользователя к профилям: цикл по словарям против маски
+над колоночным снимком ProfileMatrix.
+
+Запуск: python -m benchmarks.filter_matching [--profiles 1000000]
+
+Профили генерируются в памяти (БД не нужна). Для снимка отдельно замеряются
+загрузка, маска фильтра (пол + город), маска с возрастом и тегами и
+точечное обновление одного профиля.
+"""
+import argparse
+import random
+import time
+import warnings
+
+
+def _timed(fn, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--profiles", type=int, default=1000000)
+    parser.add_argument("--tags", type=int, default=500, help="размер словаря тегов")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    from app.utils.cities import DEFAULT_CITIES
+    from app.utils.profile_matrix import ProfileMatrix
+
+    rnd = random.Random(42)
+    cities = [name for name, *_ in DEFAULT_CITIES]
+    vocabulary = [f"тег{i}" for i in range(args.tags)]
+    # Частота тегов убывает, как у реальных интересов
+    weights = [1 / (i + 1) for i in range(args.tags)]
+    rows = [
+        (i, rnd.randint(18, 60), rnd.choice(("male", "female")), rnd.choice(cities),
+         list(dict.fromkeys(rnd.choices(vocabulary, weights, k=3))))
+        for i in range(1, args.profiles + 1)
+    ]
+    profiles = [{"id": i, "age": age, "gender": gender, "city": city} for i, age, gender, city, _ in rows]
+
+    def python_loop():
+        return [p for p in profiles if p["gender"] == "female" and p["city"] == "Казань"]
+
+    matrix = ProfileMatrix()
+    started = time.perf_counter()
+    matrix.load(rows)
+    print(f"{'загрузка снимка':>24}: {(time.perf_counter() - started) * 1000:8.1f} мс, {len(matrix)} профилей")
+
+    expected = len(python_loop())
+    found = len(matrix.ids(matrix.mask(gender="female", cities=["Казань"])))
+    assert found == expected, (found, expected)
+    print(f"{'цикл по словарям':>24}: {_timed(python_loop, max(1, args.repeat // 10)):8.2f} мс, найдено {expected}")
+    print(f"{'маска пол + город':>24}: "
+          f"{_timed(lambda: matrix.ids(matrix.mask(gender='female', cities=['Казань'])), args.repeat):8.2f} мс")
+    full = lambda: matrix.ids(matrix.mask(  # noqa: E731
+        gender="female", cities=["Москва", "Химки"], min_age=25, max_age=35,
+        tags_all=[vocabulary[0]], tags_any=[vocabulary[1], vocabulary[args.tags - 1]]
+    ))
+    print(f"{'+ возраст и теги':>24}: {_timed(full, args.repeat):8.2f} мс, найдено {len(full())}")
+    update = lambda: matrix.set_profile(1, 30, "female", "Казань", [vocabulary[0]])  # noqa: E731
+    print(f"{'обновление профиля':>24}: {_timed(update, args.repeat) * 1000:8.1f} мкс")
+
+
+if __name__ == "__main__":
+    main()
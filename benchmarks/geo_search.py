@@ -0,0 +1,91 @@
+# benchmarks/geo_search.py
+"""
+Поиск профилей по городу и радиусу.
+
+Запуск: python -m benchmarks.geo_search [--profiles 100000] [--radius 50]
+
+Временная БД с --profiles профилями в городах справочника. Сравниваются
+прежний поиск подстрокой (city ILIKE '%...%', полное сканирование profiles) и
+поиск по радиусу: города из R*Tree cities_rtree, затем IN по индексу
+(gender, city, age), страница из 100 профилей через ProfileService.
+Встроенный lower() SQLite не меняет регистр кириллицы, поэтому прежний поиск
+"москва" не находит "Москва" вовсе.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import warnings
+
+
+def _fill(path: str, profiles: int) -> None:
+    import sqlite3
+
+    from app.utils.cities import DEFAULT_CITIES
+
+    names = [name for name, *_ in DEFAULT_CITIES]
+    db = sqlite3.connect(path)
+    db.execute("INSERT INTO roles(id, name, revision, updated_at) VALUES (1, 'user', 1, '2026-01-01')")
+    db.executemany(
+        "INSERT INTO profiles(id, user_id, username, age, gender, city, description, tags, photo, role_id, "
+        "revision, updated_at) VALUES (?, ?, ?, ?, ?, ?, '', '', '', 1, 1, '2026-01-01')",
+        ((i, i, f"user{i}", 18 + i % 40, "female" if i % 2 else "male", names[i % len(names)])
+         for i in range(1, profiles + 1))
+    )
+    db.commit()
+    db.close()
+
+
+async def _run(args) -> None:
+    from sqlalchemy import select
+
+    from app.database.database import async_session_maker, create_tables, dispose_engines
+    from app.models import cities, favorites, feeds, likes, profiles, roles, seen, stats, tags, user_filters, users  # noqa: F401
+    from app.models.profiles import ProfileModel
+    from app.schemas.profiles import ProfileResponse
+    from app.services.profiles import ProfileService
+
+    await create_tables()
+    _fill(os.environ["DATABASE_URL"].split("///", 1)[1], args.profiles)
+
+    async with async_session_maker() as session:
+        service = ProfileService(session)
+
+        async def substring():
+            result = await session.execute(
+                select(ProfileModel)
+                .where(ProfileModel.gender == "female", ProfileModel.city.ilike("%москва%"))
+                .limit(100)
+            )
+            return [ProfileResponse.model_validate(profile) for profile in result.scalars().all()]
+
+        async def radius():
+            return await service.search_profiles(gender="female", city="мск", radius_km=args.radius, limit=100)
+
+        for name, search in (("ILIKE по подстроке", substring), (f"радиус {args.radius:g} км", radius)):
+            found = await search()
+            started = time.perf_counter()
+            for _ in range(args.repeat):
+                await search()
+            elapsed = (time.perf_counter() - started) / args.repeat * 1000
+            print(f"{name:>20}: {elapsed:6.2f} мс, найдено {len(found)}, города: {sorted({p.city for p in found})}")
+    await dispose_engines()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--profiles", type=int, default=100000)
+    parser.add_argument("--radius", type=float, default=50)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}"
+        os.environ["DB_PROFILE"] = "production"
+        asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
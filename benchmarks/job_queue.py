@@ -0,0 +1,107 @@
+# benchmarks/job_queue.py
+"""
+Очередь фоновых задач jobs и исполнитель JobRunner.
+
+Запуск: python -m benchmarks.job_queue [--users 200000] [--jobs 2000]
+
+Временная БД с --users пользователями и --backlog уже выполненными задачами.
+Сравниваются время ответа при пересчете stat_counters прямо в обработчике
+запроса и при постановке задачи stats.rebuild в очередь, затем замеряются
+пропускная способность исполнителя на --jobs пустых задачах и запрос
+глубины очереди для /jobs/metrics.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import warnings
+
+
+def _fill(path: str, users: int, backlog: int) -> None:
+    import sqlite3
+
+    db = sqlite3.connect(path)
+    db.execute("INSERT INTO roles(id, name, revision, updated_at) VALUES (1, 'user', 1, '2026-01-01')")
+    db.executemany(
+        "INSERT INTO users(id, email, hashed_password, is_active, created_at, updated_at, role_id) "
+        "VALUES (?, ?, 'x', ?, '2026-01-01', '2026-01-01', 1)",
+        ((i, f"user{i}@example.com", i % 10 != 0) for i in range(1, users + 1))
+    )
+    db.executemany(
+        "INSERT INTO jobs(type, payload, status, attempts, max_attempts, run_at, finished_at, created_at) "
+        "VALUES ('feeds.refill', '{}', 'done', 1, 3, '2026-01-01', '2026-01-01', '2026-01-01')",
+        (() for _ in range(backlog))
+    )
+    db.commit()
+    db.close()
+
+
+async def _run(args) -> None:
+    from datetime import datetime
+
+    from app.database.database import async_session_maker, create_tables, dispose_engines
+    from app.models import cities, favorites, feeds, jobs, likes, profiles, roles, seen, stats, tags, user_filters, users  # noqa: F401
+    from app.repositories.jobs import JobRepository
+    from app.repositories.stats import StatCounterRepository
+    from app.schemas.jobs import JobCreate
+    from app.services.jobs import JOB_HANDLERS, JobRunner, JobService
+
+    await create_tables()
+    _fill(os.environ["DATABASE_URL"].split("///", 1)[1], args.users, args.backlog)
+
+    async with async_session_maker() as session:
+        started = time.perf_counter()
+        await StatCounterRepository(session).rebuild()
+        await session.commit()
+        inline = (time.perf_counter() - started) * 1000
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            await JobService(session).enqueue(JobCreate(type="stats.rebuild", key="bench"))
+        queued = (time.perf_counter() - started) / args.repeat * 1000
+    print(f"{'пересчет в запросе':>22}: {inline:8.2f} мс")
+    print(f"{'постановка в очередь':>22}: {queued:8.2f} мс")
+
+    async def noop(session, payload):
+        return None
+
+    handlers = dict(JOB_HANDLERS, noop=noop)
+    for concurrency in (1, 4, 16):
+        runner = JobRunner(handlers, {"noop": concurrency}, poll_interval=1, retry_delay=1, shutdown_timeout=1)
+        async with async_session_maker() as session:
+            repository = JobRepository(session)
+            for _ in range(args.jobs):
+                await repository.enqueue("noop", {}, run_at=datetime.utcnow(), max_attempts=1)
+            await session.commit()
+        started = time.perf_counter()
+        await runner.run_until_idle()
+        elapsed = time.perf_counter() - started
+        print(f"{f'исполнитель x{concurrency}':>22}: {args.jobs / elapsed:8.0f} задач/с")
+
+    async with async_session_maker() as session:
+        repository = JobRepository(session)
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            await repository.get_depth(datetime.utcnow())
+        depth = (time.perf_counter() - started) / args.repeat * 1000
+    print(f"{'глубина очереди':>22}: {depth:8.2f} мс, выполненных задач в таблице {args.backlog + 3 * args.jobs}")
+    await dispose_engines()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=200000)
+    parser.add_argument("--jobs", type=int, default=2000)
+    parser.add_argument("--backlog", type=int, default=500000, help="выполненных задач в таблице")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}"
+        os.environ["DB_PROFILE"] = "production"
+        asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
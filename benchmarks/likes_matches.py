@@ -0,0 +1,138 @@
+# benchmarks/likes_matches.py
+"""
+Лайки с определением взаимности на миллионах строк.
+
+Запуск: python -m benchmarks.likes_matches [--profiles 100000] [--likes 2000000] [--reciprocal 0.01]
+
+Временная БД заполняется напрямую через sqlite3: у каждого профиля около
+likes/profiles исходящих лайков, у профиля 1 - --hub лайков, на долю
+--reciprocal из них ответили взаимностью. Замеряются лайк через
+LikeService.like_profile (INSERT, проверка профилей, поиск встречного лайка
+по PK, запись мэтча) и страница мэтчей профиля 1 по индексу (profile_id, id)
+в сравнении с поиском тех же мэтчей самосоединением profile_likes.
+"""
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import tempfile
+import time
+import warnings
+
+SELF_JOIN_MATCHES = """
+    SELECT a.liked_profile_id FROM profile_likes a
+    JOIN profile_likes b ON b.liker_profile_id = a.liked_profile_id AND b.liked_profile_id = a.liker_profile_id
+    WHERE a.liker_profile_id = :profile_id
+    ORDER BY a.liked_profile_id
+    LIMIT :limit
+"""
+
+
+def _fill(path: str, profiles: int, likes: int, hub: int, reciprocal: float, rng: random.Random) -> int:
+    db = sqlite3.connect(path)
+    db.execute("INSERT INTO roles(id, name, revision, updated_at) VALUES (1, 'user', 1, '2026-01-01')")
+    db.executemany(
+        "INSERT INTO profiles(id, user_id, username, age, gender, city, description, tags, photo, role_id, "
+        "revision, updated_at) VALUES (?, ?, ?, 25, 'female', 'Москва', '', '', '', 1, 1, '2026-01-01')",
+        ((i, i, f"user{i}") for i in range(1, profiles + 1))
+    )
+
+    def rows():
+        per_profile = likes // profiles
+        hub_targets = rng.sample(range(2, profiles + 1), hub)
+        back = set(hub_targets[:int(hub * reciprocal)])
+        for liker in range(1, profiles + 1):
+            targets = set(hub_targets) if liker == 1 else set(rng.sample(range(1, profiles + 1), per_profile))
+            if liker in back:
+                targets.add(1)
+            targets.discard(liker)
+            for liked in sorted(targets):
+                yield liker, liked
+
+    db.executemany(
+        "INSERT OR IGNORE INTO profile_likes(liker_profile_id, liked_profile_id, created_at) "
+        "VALUES (?, ?, '2026-01-01')",
+        rows()
+    )
+    # Мэтчи для уже взаимных пар: каждая пара попадает в выборку дважды, по строке на участника
+    db.execute("""
+        INSERT INTO matches(profile_id, matched_profile_id, created_at)
+        SELECT a.liker_profile_id, a.liked_profile_id, '2026-01-01' FROM profile_likes a
+        JOIN profile_likes b ON b.liker_profile_id = a.liked_profile_id AND b.liked_profile_id = a.liker_profile_id
+    """)
+    db.commit()
+    total = db.execute("SELECT count(*) FROM profile_likes").fetchone()[0]
+    db.close()
+    return total
+
+
+async def _run(args, rng: random.Random) -> None:
+    from sqlalchemy import text
+
+    from app.database.database import async_session_maker, create_tables, dispose_engines
+    from app.models import favorites, feeds, likes, profiles, roles, stats, tags, user_filters, users  # noqa: F401
+    from app.services.likes import LikeService
+
+    await create_tables()
+    path = os.environ["DATABASE_URL"].split("///", 1)[1]
+    started = time.perf_counter()
+    total = _fill(path, args.profiles, args.likes, args.hub, args.reciprocal, rng)
+    print(f"Лайков: {total:,}, профилей: {args.profiles:,} (заполнение {time.perf_counter() - started:.1f} с)")
+
+    # Половина лайков - ответ на уже существующий, чтобы создавался мэтч
+    pairs = []
+    while len(pairs) < args.requests:
+        a, b = rng.randint(2, args.profiles), rng.randint(2, args.profiles)
+        if a != b:
+            pairs.append((a, b))
+            if len(pairs) < args.requests:
+                pairs.append((b, a))
+
+    matched = 0
+    started = time.perf_counter()
+    for liker, liked in pairs:
+        async with async_session_maker() as session:
+            try:
+                result = await LikeService(session).like_profile(liker, liked)
+            except Exception:
+                continue
+            matched += result.matched
+    elapsed = time.perf_counter() - started
+    print(f"like_profile: {elapsed / len(pairs) * 1000:.2f} мс на лайк, мэтчей: {matched} из {len(pairs)}")
+
+    async with async_session_maker() as session:
+        service = LikeService(session)
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            page = await service.get_matches(1, limit=100)
+        index_ms = (time.perf_counter() - started) / args.repeat * 1000
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            joined = (await session.execute(text(SELF_JOIN_MATCHES), {"profile_id": 1, "limit": 100})).all()
+        join_ms = (time.perf_counter() - started) / args.repeat * 1000
+        assert len(page) == len(joined) == 100
+    print(f"Страница из 100 мэтчей профиля с {args.hub} лайками ({args.reciprocal:.0%} взаимных): "
+          f"matches {index_ms:.2f} мс, самосоединение {join_ms:.2f} мс")
+    await dispose_engines()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--profiles", type=int, default=100000)
+    parser.add_argument("--likes", type=int, default=2000000)
+    parser.add_argument("--hub", type=int, default=20000)
+    parser.add_argument("--reciprocal", type=float, default=0.01)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}"
+        os.environ["DB_PROFILE"] = "production"
+        asyncio.run(_run(args, random.Random(42)))
+
+
+if __name__ == "__main__":
+    main()
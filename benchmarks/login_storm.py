@@ -0,0 +1,125 @@
+# benchmarks/login_storm.py
+"""
+Задержка /profiles/ во время волны логинов: bcrypt в event loop и в пуле потоков.
+
+Запуск: python -m benchmarks.login_storm [--logins 16] [--duration 10] [--workers N]
+
+Для каждого режима поднимается uvicorn на временной БД (PASSWORD_HASH_WORKERS=0 -
+хэширование прямо в event loop, как раньше; иначе - в пуле потоков). Затем
+--logins клиентов непрерывно входят через /auth/login-json, а один клиент
+последовательно запрашивает /profiles/. Выводятся p50/p99 /profiles/,
+число успешных логинов и ответов 503 (переполнение очереди).
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from app.config import settings
+
+EMAIL = "storm@example.com"
+PASSWORD = "storm-password-1"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _wait_ready(client: httpx.AsyncClient, timeout: float = 30) -> None:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            await client.get("/auth/health")
+            return
+        except httpx.TransportError:
+            await asyncio.sleep(0.2)
+    raise RuntimeError("Сервер не запустился")
+
+
+async def _login_loop(client: httpx.AsyncClient, stop: asyncio.Event, result: dict) -> None:
+    while not stop.is_set():
+        response = await client.post("/auth/login-json", json={"email": EMAIL, "password": PASSWORD})
+        key = "ok" if response.status_code == 200 else str(response.status_code)
+        result[key] = result.get(key, 0) + 1
+
+
+async def _probe_loop(client: httpx.AsyncClient, stop: asyncio.Event, latencies: list) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await client.get("/profiles/", params={"limit": 20})
+        latencies.append(time.perf_counter() - started)
+        await asyncio.sleep(0.01)
+
+
+async def run_mode(workers: int, logins: int, duration: float) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        port = _free_port()
+        env = dict(
+            os.environ,
+            DATABASE_URL=f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}",
+            DB_PROFILE="production",
+            PASSWORD_HASH_WORKERS=str(workers),
+        )
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+            env=env,
+            stdout=subprocess.DEVNULL,
+        )
+        try:
+            limits = httpx.Limits(max_connections=logins + 4)
+            async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=60, limits=limits) as client:
+                await _wait_ready(client)
+                await client.post("/roles/", json={"name": "user"})
+                await client.post("/auth/register", json={"email": EMAIL, "password": PASSWORD, "role_id": 1})
+
+                stop = asyncio.Event()
+                logins_result: dict = {}
+                latencies: list = []
+                tasks = [asyncio.create_task(_login_loop(client, stop, logins_result)) for _ in range(logins)]
+                tasks.append(asyncio.create_task(_probe_loop(client, stop, latencies)))
+                await asyncio.sleep(duration)
+                stop.set()
+                await asyncio.gather(*tasks)
+                metrics = (await client.get("/auth/metrics/password-hashing")).json()
+        finally:
+            server.terminate()
+            server.wait()
+
+    latencies.sort()
+    return {
+        "mode": f"pool({workers})" if workers else "inline",
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else 0.0,
+        "p99_ms": latencies[max(int(len(latencies) * 0.99) - 1, 0)] * 1000 if latencies else 0.0,
+        "probes": len(latencies),
+        "logins": logins_result,
+        "metrics": metrics,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--workers", type=int, default=settings.PASSWORD_HASH_WORKERS or 1)
+    args = parser.parse_args()
+
+    for workers in (0, args.workers):
+        result = await run_mode(workers, args.logins, args.duration)
+        print(
+            f"{result['mode']:>8}: /profiles/ p50 {result['p50_ms']:.1f} мс, p99 {result['p99_ms']:.1f} мс "
+            f"({result['probes']} запросов), логины: {result['logins']}, "
+            f"ожидание в очереди max {result['metrics']['max_wait_ms']} мс"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,87 @@
+# benchmarks/ranking.py
+"""
+Ранжирование кандидатов по совместимости (app/utils/scoring.py).
+
+Запуск: python -m benchmarks.ranking [--candidates 100000] [--limit 50]
+
+Профили генерируются в памяти (БД не нужна). Замеряются время каждого
+признака на всем наборе кандидатов, первая и десятая страница через
+Ranker.top и для сравнения полная сортировка всех кандидатов: оценка
+каждого профиля в Python и sorted().
+"""
+import argparse
+import random
+import time
+import warnings
+
+
+def _timed(fn, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--candidates", type=int, default=100000)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    import numpy as np
+
+    from app.utils.cities import DEFAULT_CITIES
+    from app.utils.profile_matrix import ProfileMatrix
+    from app.utils.scoring import SCORERS, Ranker, Viewer, parse_weights
+    from app.config import settings
+
+    rnd = random.Random(42)
+    cities = [name for name, *_ in DEFAULT_CITIES]
+    vocabulary = [f"тег{i}" for i in range(300)]
+    rows = [
+        (i, rnd.randint(18, 60), "female", rnd.choice(cities), rnd.sample(vocabulary, 3))
+        for i in range(1, args.candidates + 1)
+    ]
+    matrix = ProfileMatrix()
+    matrix.load(rows)
+    viewer = Viewer(0, 30, "Москва", tuple(vocabulary[:5]), np.array(rnd.sample(range(1, args.candidates), 500)))
+    weights = parse_weights(settings.RANKING_WEIGHTS)
+    ranker = Ranker(weights)
+    candidates = np.flatnonzero(matrix.mask(gender="female"))
+
+    for name in weights:
+        elapsed = _timed(lambda: SCORERS[name](matrix, candidates, viewer), args.repeat)
+        print(f"{'признак ' + name:>22}: {elapsed:7.2f} мс")
+    print(f"{'первая страница':>22}: {_timed(lambda: ranker.top(matrix, candidates, viewer, args.limit), args.repeat):7.2f} мс")
+    cursor = None
+    for _ in range(9):
+        cursor = ranker.top(matrix, candidates, viewer, args.limit, cursor)[-1]
+    tenth = _timed(lambda: ranker.top(matrix, candidates, viewer, args.limit, cursor), args.repeat)
+    print(f"{'десятая страница':>22}: {tenth:7.2f} мс")
+
+    liked_by = set(viewer.liked_by.tolist())
+    viewer_tags = set(viewer.tags)
+
+    def python_sort():
+        scored = []
+        for profile_id, age, _, city, tags in rows:
+            score = (
+                weights["tags"] * len(viewer_tags.intersection(tags)) / len(viewer_tags)
+                + weights["age"] * 5 / (5 + abs(age - viewer.age))
+                + weights["city"] * (city == viewer.city)
+                + weights["recency"] * profile_id / args.candidates
+                + weights["reciprocal"] * (profile_id in liked_by)
+            )
+            scored.append((-round(score, 6), profile_id))
+        return sorted(scored)[:args.limit]
+
+    expected = [(-score, profile_id) for score, profile_id in python_sort()]
+    assert [profile_id for _, profile_id in ranker.top(matrix, candidates, viewer, args.limit)] == \
+        [profile_id for _, profile_id in expected]
+    print(f"{'Python + sorted()':>22}: {_timed(python_sort, max(1, args.repeat // 10)):7.2f} мс")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# benchmarks/reverse_match.py
+"""
+Обратный поиск: пользователи, чьи фильтры пропускают новый профиль.
+
+Запуск: python -m benchmarks.reverse_match [--filters 500000]
+
+Временная БД с --filters фильтрами по городам справочника. Сравниваются
+чтение всех фильтров с проверкой в Python (как пришлось бы без индекса) и
+UserFilterRepository.get_user_ids_for_profile - поиск по покрывающему
+индексу (gender_filter, city_filter, user_id).
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+import warnings
+
+
+def _fill(path: str, filters: int) -> None:
+    import sqlite3
+
+    from app.utils.cities import DEFAULT_CITIES
+
+    rnd = random.Random(7)
+    cities = [name for name, *_ in DEFAULT_CITIES] + [""]
+    genders = ["male", "female", "any"]
+    db = sqlite3.connect(path)
+    db.execute("INSERT INTO roles(id, name, revision, updated_at) VALUES (1, 'user', 1, '2026-01-01')")
+    db.executemany(
+        "INSERT INTO user_filters(id, user_id, gender_filter, city_filter, role_id) VALUES (?, ?, ?, ?, 1)",
+        ((i, i, rnd.choice(genders), rnd.choice(cities)) for i in range(1, filters + 1))
+    )
+    db.commit()
+    db.close()
+
+
+async def _run(args) -> None:
+    from sqlalchemy import select
+
+    from app.database.database import async_session_maker, create_tables, dispose_engines
+    from app.models import cities, favorites, feeds, likes, profiles, roles, seen, stats, tags, user_filters, users  # noqa: F401
+    from app.models.user_filters import User_filterModel
+    from app.repositories.user_filters import UserFilterRepository
+    from app.services.feeds import ANY_GENDER
+
+    await create_tables()
+    _fill(os.environ["DATABASE_URL"].split("///", 1)[1], args.filters)
+    gender, city = "female", "Казань"
+
+    async with async_session_maker() as session:
+        repository = UserFilterRepository(session)
+
+        async def scan():
+            result = await session.execute(
+                select(User_filterModel.user_id, User_filterModel.gender_filter, User_filterModel.city_filter)
+            )
+            return sorted(
+                user_id for user_id, gender_filter, city_filter in result.all()
+                if (gender_filter in ANY_GENDER or gender_filter == gender) and city_filter in ("", city)
+            )
+
+        async def lookup():
+            return await repository.get_user_ids_for_profile([gender, *ANY_GENDER], city)
+
+        expected = await scan()
+        assert await lookup() == expected
+        for name, search, repeat in (("скан user_filters", scan, 3), ("индекс", lookup, args.repeat)):
+            started = time.perf_counter()
+            for _ in range(repeat):
+                await search()
+            elapsed = (time.perf_counter() - started) / repeat * 1000
+            print(f"{name:>18}: {elapsed:8.2f} мс, пользователей {len(expected)}")
+    await dispose_engines()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--filters", type=int, default=500000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}"
+        os.environ["DB_PROFILE"] = "production"
+        asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
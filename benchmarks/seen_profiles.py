@@ -0,0 +1,114 @@
+# benchmarks/seen_profiles.py
+"""
+Поиск без уже просмотренных профилей.
+
+Запуск: python -m benchmarks.seen_profiles [--profiles 100000] [--seen 1000 10000 50000]
+
+Временная БД с --profiles профилями. Для каждого размера истории замеряется
+страница /profiles/search/ (gender + city, 100 строк) через
+ProfileService.search_profiles(exclude_seen_by=...) и тот же поиск с
+подзапросом NOT IN по нормализованной таблице свайпов (user_id, profile_id),
+а также размер истории: сжатый BLOB против массива uint32.
+"""
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import tempfile
+import time
+import warnings
+
+
+def _fill(path: str, profiles: int) -> None:
+    cities = ["Москва", "Санкт-Петербург", "Казань"]
+    db = sqlite3.connect(path)
+    db.execute("INSERT INTO roles(id, name, revision, updated_at) VALUES (1, 'user', 1, '2026-01-01')")
+    db.executemany(
+        "INSERT INTO profiles(id, user_id, username, age, gender, city, description, tags, photo, role_id, "
+        "revision, updated_at) VALUES (?, ?, ?, ?, ?, ?, '', '', '', 1, 1, '2026-01-01')",
+        ((i, i, f"user{i}", 18 + i % 40, "female" if i % 2 else "male", cities[i % 3])
+         for i in range(1, profiles + 1))
+    )
+    db.execute("CREATE TABLE swipes (user_id INTEGER, profile_id INTEGER, PRIMARY KEY (user_id, profile_id)) "
+               "WITHOUT ROWID")
+    db.commit()
+    db.close()
+
+
+async def _run(args) -> None:
+    from sqlalchemy import column, select, table
+
+    from app.database.database import async_session_maker, create_tables, dispose_engines
+    from app.models import favorites, feeds, likes, profiles, roles, seen, stats, tags, user_filters, users  # noqa: F401
+    from app.models.profiles import ProfileModel
+    from app.schemas.profiles import ProfileResponse
+    from app.services.profiles import ProfileService
+    from app.services.seen import SeenProfilesService
+    from app.utils.id_arrays import pack_ids
+
+    await create_tables()
+    path = os.environ["DATABASE_URL"].split("///", 1)[1]
+    _fill(path, args.profiles)
+    rng = random.Random(42)
+
+    for user_id, size in enumerate(args.seen, start=1):
+        # Просмотренные - в основном из той же выдачи, что и поиск
+        matching = [i for i in range(1, args.profiles + 1) if i % 2 and i % 3 == 1]
+        seen_ids = rng.sample(matching, min(size, len(matching) - 200))
+        db = sqlite3.connect(path)
+        db.executemany("INSERT INTO swipes VALUES (?, ?)", ((user_id, i) for i in sorted(seen_ids)))
+        db.commit()
+        db.close()
+
+        async with async_session_maker() as session:
+            stats = await SeenProfilesService(session).mark_seen(user_id, seen_ids)
+        async with async_session_maker() as session:
+            service = ProfileService(session)
+
+            async def search():
+                return await service.search_profiles(gender="female", city="Москва", exclude_seen_by=user_id)
+
+            swipes = table("swipes", column("user_id"), column("profile_id"))
+            query = (
+                select(ProfileModel)
+                .where(ProfileModel.gender == "female", ProfileModel.city == "Москва")
+                .where(ProfileModel.id.not_in(select(swipes.c.profile_id).where(swipes.c.user_id == user_id)))
+                .limit(100)
+            )
+
+            async def not_in():
+                result = await session.execute(query)
+                return [ProfileResponse.model_validate(profile) for profile in result.scalars().all()]
+
+            started = time.perf_counter()
+            for _ in range(args.repeat):
+                found = await search()
+            blob_ms = (time.perf_counter() - started) / args.repeat * 1000
+            started = time.perf_counter()
+            for _ in range(args.repeat):
+                rows = await not_in()
+            not_in_ms = (time.perf_counter() - started) / args.repeat * 1000
+            assert [p.id for p in found] == [p.id for p in rows]
+
+        print(f"{size:>6} просмотренных: BLOB {stats.size_bytes:,} байт (uint32 {len(pack_ids(seen_ids)):,}), "
+              f"поиск {blob_ms:.2f} мс, NOT IN {not_in_ms:.2f} мс")
+    await dispose_engines()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--profiles", type=int, default=100000)
+    parser.add_argument("--seen", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}"
+        os.environ["DB_PROFILE"] = "production"
+        asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# benchmarks/serialization.py
+"""
+Стоимость сериализации списка из 1000 строк для ответов GET-списков.
+
+Запуск: python -m benchmarks.serialization [--rows 1000] [--repeat 50]
+
+Сравниваются прежний путь (ORM-объекты -> model_validate в цикле -> повторная
+проверка по response_model -> jsonable_encoder -> json.dumps) и быстрый путь
+(строки-кортежи -> кэшированный TypeAdapter(List[...]) -> orjson) на данных
+профилей, лайков и фильтров в SQLite в памяти.
+"""
+import argparse
+import json
+import timeit
+import warnings
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.database.database import Base
+from app.models import favorites, feeds, likes, profiles, roles, tags, user_filters, users  # noqa: F401
+from app.schemas.likes import LikeResponse
+from app.schemas.profiles import ProfileResponse
+from app.schemas.user_filters import UserFilterResponse
+from app.utils.serialization import list_response, validate_rows
+
+
+def _fixtures(count: int) -> list:
+    return [
+        (profiles.ProfileModel, ProfileResponse, [
+            dict(user_id=i, username=f"user{i}", age=18 + i % 40, gender="female", city="Москва",
+                 description="Люблю кофе и путешествия " * 3, tags="кофе, путешествия", photo="https://x/p.jpg",
+                 role_id=1)
+            for i in range(1, count + 1)
+        ]),
+        (likes.LikeModel, LikeResponse, [
+            dict(like_profile_id=i, contact="@user", me_liked=True, role_id=1) for i in range(1, count + 1)
+        ]),
+        (user_filters.User_filterModel, UserFilterResponse, [
+            dict(user_id=i, gender_filter="any", city_filter="Москва", role_id=1) for i in range(1, count + 1)
+        ]),
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        for model, schema, rows in _fixtures(args.rows):
+            session.execute(model.__table__.insert(), rows)
+            objects = session.execute(select(model)).scalars().all()
+            tuples = session.execute(select(*model.__table__.columns)).all()
+            response_adapter = TypeAdapter(List[schema])
+
+            def legacy():
+                items = [schema.model_validate(obj) for obj in objects]
+                validated = response_adapter.validate_python(items)
+                content = jsonable_encoder(response_adapter.dump_python(validated, mode="json"))
+                return json.dumps(content, ensure_ascii=False).encode()
+
+            def fast():
+                return list_response(schema, validate_rows(schema, tuples)).body
+
+            assert json.loads(legacy()) == json.loads(fast())
+            old = timeit.timeit(legacy, number=args.repeat) / args.repeat * 1000
+            new = timeit.timeit(fast, number=args.repeat) / args.repeat * 1000
+            print(f"{schema.__name__:>20}: прежний путь {old:6.2f} мс, быстрый путь {new:6.2f} мс (x{old / new:.1f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+# benchmarks/sqlite_profiles.py
+"""
+Сравнение профилей движка SQLite: default и production.
+
+Запуск: python -m benchmarks.sqlite_profiles [--writers 8] [--writes 200] [--readers 8]
+
+Для каждого профиля создается временная БД, затем одновременно работают
+писатели (лайки и профили, по одному коммиту на запись, как в сервисах)
+и читатели (выборка профиля по id). Выводится пропускная способность
+записи и задержки чтения p50/p99.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.database.database import Base, make_engine
+from app.models.likes import LikeModel
+from app.models.profiles import ProfileModel
+from app.models.roles import RoleModel
+# Модели, на которые ссылаются relationship у RoleModel
+import app.models.favorites  # noqa: F401
+import app.models.user_filters  # noqa: F401
+import app.models.users  # noqa: F401
+
+
+async def _writer(session_maker, writer_id: int, writes: int, errors: list) -> None:
+    for i in range(writes):
+        key = writer_id * 1_000_000 + i
+        async with session_maker() as session:
+            if i % 2:
+                session.add(LikeModel(like_profile_id=key, contact="bench", me_liked=True, role_id=1))
+            else:
+                session.add(ProfileModel(
+                    user_id=key, username=f"bench{key}", age=18 + i % 50, gender="female",
+                    city="Москва", description="bench", tags="bench", photo="bench", role_id=1
+                ))
+            try:
+                await session.commit()
+            except OperationalError:
+                # database is locked: писатель не дождался блокировки
+                errors.append(key)
+
+
+async def _reader(session_maker, stop: asyncio.Event, latencies: list, errors: list) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        async with session_maker() as session:
+            try:
+                await session.execute(
+                    select(ProfileModel).where(ProfileModel.id == random.randint(1, 1000))
+                )
+            except OperationalError:
+                errors.append(None)
+                continue
+        latencies.append(time.perf_counter() - started)
+        await asyncio.sleep(0)
+
+
+async def run_profile(profile: str, writers: int, writes: int, readers: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}"
+        engine = make_engine(url, profile=profile, echo=False)
+        session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with session_maker() as session:
+            session.add(RoleModel(name="user"))
+            await session.commit()
+
+        stop = asyncio.Event()
+        latencies: list = []
+        errors: list = []
+        read_errors: list = []
+        reader_tasks = [asyncio.create_task(_reader(session_maker, stop, latencies, read_errors)) for _ in range(readers)]
+
+        started = time.perf_counter()
+        await asyncio.gather(*(_writer(session_maker, w, writes, errors) for w in range(writers)))
+        elapsed = time.perf_counter() - started
+
+        stop.set()
+        await asyncio.gather(*reader_tasks)
+        await engine.dispose()
+
+    latencies.sort()
+    return {
+        "profile": profile,
+        "writes_per_sec": (writers * writes - len(errors)) / elapsed,
+        "errors": len(errors),
+        "read_errors": len(read_errors),
+        "read_p50_ms": statistics.median(latencies) * 1000 if latencies else 0.0,
+        "read_p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000 if latencies else 0.0,
+        "reads": len(latencies),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--writes", type=int, default=200)
+    parser.add_argument("--readers", type=int, default=8)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)  # профиль default включает echo
+    for profile in ("default", "production"):
+        result = await run_profile(profile, args.writers, args.writes, args.readers)
+        print(
+            f"{result['profile']:>10}: {result['writes_per_sec']:8.1f} записей/с, "
+            f"чтение p50 {result['read_p50_ms']:.2f} мс, p99 {result['read_p99_ms']:.2f} мс "
+            f"({result['reads']} чтений, ошибок записи: {result['errors']}, чтения: {result['read_errors']})"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
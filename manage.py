@@ -0,0 +1,186 @@
+# manage.py
+"""
+Служебные команды обслуживания базы данных.
+
+Использование:
+    python manage.py rebuild-search-index
+    python manage.py rebuild-tags
+    python manage.py rebuild-stats
+    python manage.py import-profiles profiles.ndjson [--batch-size 1000] [--restart]
+    python manage.py enqueue-job users.cleanup_inactive [--payload '{"days": 30}'] [--delay 0]
+    python manage.py run-jobs [--until-idle]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+# Добавляем путь к проекту в sys.path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def rebuild_search_index(args) -> None:
+    """Создание и заполнение полнотекстового индекса профилей"""
+    from app.database.database import async_session_maker
+    from app.repositories.profiles import ProfileRepository
+
+    print("🔄 Пересборка индекса FTS5 по профилям...")
+    async with async_session_maker() as session:
+        count = await ProfileRepository(session).rebuild_search_index()
+        await session.commit()
+    print(f"✅ Проиндексировано профилей: {count}")
+
+
+async def rebuild_tags(args) -> None:
+    """Пересборка нормализованных тегов из строковых тегов профилей"""
+    from app.database.database import async_session_maker
+    from app.services.profiles import ProfileService
+
+    print("🔄 Пересборка таблиц tags и profile_tags...")
+    async with async_session_maker() as session:
+        count = await ProfileService(session).rebuild_tags()
+    print(f"✅ Обработано профилей: {count}")
+
+
+async def rebuild_stats(args) -> None:
+    """Пересчет счетчиков статистики пользователей и фильтров"""
+    from app.database.database import async_session_maker
+    from app.repositories.stats import StatCounterRepository
+
+    print("🔄 Пересчет счетчиков stat_counters...")
+    async with async_session_maker() as session:
+        drifted = await StatCounterRepository(session).rebuild()
+        await session.commit()
+    print(f"✅ Исправлено расходившихся счетчиков: {drifted}")
+
+
+async def _read_file(path: str, chunk_size: int = 1024 * 1024):
+    with open(path, "rb") as file:
+        while chunk := file.read(chunk_size):
+            yield chunk
+
+
+async def import_profiles(args) -> None:
+    """Импорт профилей из NDJSON или CSV с продолжением с последней пачки"""
+    from app.database.database import async_session_maker
+    from app.services.profile_import import ProfileImportService
+    from app.utils.ndjson import iter_lines
+
+    checkpoint_path = args.path + ".checkpoint"
+    resume_from = 0
+    if os.path.exists(checkpoint_path) and not args.restart:
+        with open(checkpoint_path) as file:
+            resume_from = json.load(file)["checkpoint"]
+        print(f"↪️ Продолжение импорта с записи {resume_from}")
+
+    async def save_checkpoint(checkpoint: int) -> None:
+        with open(checkpoint_path, "w") as file:
+            json.dump({"checkpoint": checkpoint}, file)
+
+    print(f"🔄 Импорт профилей из {args.path}...")
+    started = time.perf_counter()
+    async with async_session_maker() as session:
+        report = await ProfileImportService(session).import_profiles(
+            iter_lines(_read_file(args.path)),
+            csv_format=args.path.lower().endswith(".csv"),
+            batch_size=args.batch_size,
+            resume_from=resume_from,
+            on_checkpoint=save_checkpoint
+        )
+    elapsed = time.perf_counter() - started
+
+    for error in report.errors[:20]:
+        print(f"  #{error.index} {error.status}: {error.detail}")
+    if len(report.errors) > 20:
+        print(f"  ... и еще {len(report.errors) - 20}")
+    rate = report.total / elapsed * 60 if elapsed else 0
+    print(
+        f"✅ Обработано записей: {report.total}, создано: {report.created}, "
+        f"пропущено: {report.skipped} ({elapsed:.1f} с, {rate:,.0f} записей/мин)"
+    )
+    # Импорт дошел до конца - checkpoint больше не нужен
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+
+
+async def enqueue_job(args) -> None:
+    """Постановка задачи в очередь jobs"""
+    from app.database.database import async_session_maker
+    from app.schemas.jobs import JobCreate
+    from app.services.jobs import JobService
+
+    job_data = JobCreate(type=args.type, payload=json.loads(args.payload), key=args.key, delay_seconds=args.delay)
+    async with async_session_maker() as session:
+        job = await JobService(session).enqueue(job_data)
+    print(f"✅ Задача {job.id} ({job.type}) в очереди, запуск не раньше {job.run_at:%Y-%m-%d %H:%M:%S} UTC")
+
+
+async def run_jobs(args) -> None:
+    """Исполнитель задач вне веб-процесса (для запуска с JOB_RUNNER_ENABLED=false)"""
+    from app.database.database import dispose_engines
+    from app.services.jobs import job_runner
+
+    if args.until_idle:
+        print("🔄 Выполнение готовых задач...")
+        await job_runner.run_until_idle()
+    else:
+        print("🔄 Исполнитель задач запущен, Ctrl+C - остановка")
+        await job_runner.start()
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await job_runner.stop()
+    for job_type, stats in job_runner.stats()["types"].items():
+        if stats["completed"] or stats["failed"] or stats["retried"]:
+            print(f"  {job_type}: выполнено {stats['completed']}, ошибок {stats['failed']}, повторов {stats['retried']}")
+    await dispose_engines()
+
+
+COMMANDS = {
+    "rebuild-search-index": rebuild_search_index,
+    "rebuild-tags": rebuild_tags,
+    "rebuild-stats": rebuild_stats,
+    "import-profiles": import_profiles,
+    "enqueue-job": enqueue_job,
+    "run-jobs": run_jobs,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Служебные команды Dating App")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("rebuild-search-index", help="Заполнить индекс FTS5 для существующих профилей")
+    subparsers.add_parser("rebuild-tags", help="Заполнить tags и profile_tags из строковых тегов профилей")
+    subparsers.add_parser("rebuild-stats", help="Пересчитать счетчики статистики из users и user_filters")
+    import_parser = subparsers.add_parser("import-profiles", help="Импорт профилей из файла NDJSON или CSV")
+    import_parser.add_argument("path", help="Файл .ndjson/.jsonl или .csv (первая строка - заголовок)")
+    import_parser.add_argument("--batch-size", type=int, default=None, help="Записей в одной транзакции")
+    import_parser.add_argument("--restart", action="store_true", help="Начать заново, игнорируя checkpoint")
+    enqueue_parser = subparsers.add_parser("enqueue-job", help="Поставить задачу в очередь jobs")
+    enqueue_parser.add_argument("type", help="stats.rebuild, search.rebuild, feeds.refill, users.cleanup_inactive, jobs.purge")
+    enqueue_parser.add_argument("--payload", default="{}", help="Параметры задачи в JSON")
+    enqueue_parser.add_argument("--key", default=None, help="Не ставить, если задача с этим ключом уже ждет")
+    enqueue_parser.add_argument("--delay", type=float, default=0, help="Отложить запуск на столько секунд")
+    run_parser = subparsers.add_parser("run-jobs", help="Выполнять задачи из очереди jobs")
+    run_parser.add_argument("--until-idle", action="store_true", help="Выйти, когда готовых задач не останется")
+
+    args = parser.parse_args()
+
+    # Регистрируем все модели, чтобы связи между ними разрешались
+    from app.models import cities, favorites, feeds, jobs, likes, profiles, roles, seen, stats, tags, user_filters, users  # noqa: F401
+
+    # SQL-лог профиля default здесь только мешает
+    from app.database.database import engine
+    engine.sync_engine.echo = False
+
+    # Для Windows может потребоваться специальная настройка event loop
+    if sys.platform == 'win32':
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+    asyncio.run(COMMANDS[args.command](args))
+
+
+if __name__ == "__main__":
+    main()
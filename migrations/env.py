@@ -3,18 +3,23 @@ from logging.config import fileConfig
 
 from sqlalchemy import pool
 from sqlalchemy.engine import Connection
-from sqlalchemy.ext.asyncio import async_engine_from_config
 
 from alembic import context
-from app.database.database import Base
+from app.database.database import Base, make_engine
 from app.config import settings
 
 # TODO Добавить сюда импорт созданных моделей
 # Пример:
+from app.models.cities import CityModel, CityAliasModel
 from app.models.favorites import FavoriteModel
+from app.models.feeds import FeedModel
+from app.models.jobs import JobModel
 from app.models.likes import LikeModel
 from app.models.profiles import ProfileModel
 from app.models.roles import RoleModel
+from app.models.seen import SeenProfilesModel
+from app.models.stats import StatCounterModel
+from app.models.tags import TagModel, ProfileTagModel
 from app.models.user_filters import User_filterModel
 from app.models.users import UserModel
 
@@ -37,6 +42,17 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = Base.metadata
 
+# Виртуальные таблицы (FTS5) и их служебные таблицы создаются миграциями
+# вручную, autogenerate не должен предлагать их удалить
+VIRTUAL_TABLE_PREFIXES = ("profiles_fts", "cities_rtree")
+
+
+def include_name(name, type_, parent_names):
+    if type_ == "table":
+        return not name.startswith(VIRTUAL_TABLE_PREFIXES)
+    return True
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -59,6 +75,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_name=include_name,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -68,7 +85,11 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_name=include_name,
+    )
 
     with context.begin_transaction():
         context.run_migrations()
@@ -80,9 +101,9 @@ async def run_async_migrations() -> None:
 
     """
 
-    connectable = async_engine_from_config(
-        config.get_section(config.config_ini_section, {}),
-        prefix="sqlalchemy.",
+    connectable = make_engine(
+        config.get_main_option("sqlalchemy.url"),
+        echo=False,
         poolclass=pool.NullPool,
     )
 
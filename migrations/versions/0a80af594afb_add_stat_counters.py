@@ -0,0 +1,108 @@
+"""Add stat_counters maintained by triggers
+
+Revision ID: 0a80af594afb
+Revises: fe0b884191ef
+Create Date: 2026-10-18 17:20:09.538214
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0a80af594afb'
+down_revision: Union[str, Sequence[str], None] = 'fe0b884191ef'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGGERS_DDL = [
+    """
+    CREATE TRIGGER IF NOT EXISTS users_stats_ai AFTER INSERT ON users BEGIN
+        INSERT INTO stat_counters(name, key, value)
+        VALUES ('users.total', '', 1), ('users.active', '', new.is_active), ('users.by_role', new.role_id, 1)
+        ON CONFLICT(name, key) DO UPDATE SET value = value + excluded.value;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS users_stats_ad AFTER DELETE ON users BEGIN
+        INSERT INTO stat_counters(name, key, value)
+        VALUES ('users.total', '', -1), ('users.active', '', -old.is_active), ('users.by_role', old.role_id, -1)
+        ON CONFLICT(name, key) DO UPDATE SET value = value + excluded.value;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS users_stats_au AFTER UPDATE OF is_active, role_id ON users BEGIN
+        INSERT INTO stat_counters(name, key, value)
+        VALUES ('users.active', '', new.is_active - old.is_active),
+               ('users.by_role', old.role_id, -1), ('users.by_role', new.role_id, 1)
+        ON CONFLICT(name, key) DO UPDATE SET value = value + excluded.value;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS user_filters_stats_ai AFTER INSERT ON user_filters BEGIN
+        INSERT INTO stat_counters(name, key, value)
+        VALUES ('filters.total', '', 1), ('filters.by_gender', new.gender_filter, 1),
+               ('filters.by_city', new.city_filter, 1)
+        ON CONFLICT(name, key) DO UPDATE SET value = value + excluded.value;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS user_filters_stats_ad AFTER DELETE ON user_filters BEGIN
+        INSERT INTO stat_counters(name, key, value)
+        VALUES ('filters.total', '', -1), ('filters.by_gender', old.gender_filter, -1),
+               ('filters.by_city', old.city_filter, -1)
+        ON CONFLICT(name, key) DO UPDATE SET value = value + excluded.value;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS user_filters_stats_au AFTER UPDATE OF gender_filter, city_filter ON user_filters BEGIN
+        INSERT INTO stat_counters(name, key, value)
+        VALUES ('filters.by_gender', old.gender_filter, -1), ('filters.by_gender', new.gender_filter, 1),
+               ('filters.by_city', old.city_filter, -1), ('filters.by_city', new.city_filter, 1)
+        ON CONFLICT(name, key) DO UPDATE SET value = value + excluded.value;
+    END
+    """,
+]
+
+REBUILD_SQL = [
+    "DELETE FROM stat_counters",
+    "INSERT INTO stat_counters(name, key, value) SELECT 'users.total', '', count(*) FROM users",
+    "INSERT INTO stat_counters(name, key, value) SELECT 'users.active', '', count(*) FROM users WHERE is_active = 1",
+    "INSERT INTO stat_counters(name, key, value) SELECT 'users.by_role', role_id, count(*) FROM users GROUP BY role_id",
+    "INSERT INTO stat_counters(name, key, value) SELECT 'filters.total', '', count(*) FROM user_filters",
+    "INSERT INTO stat_counters(name, key, value) SELECT 'filters.by_gender', gender_filter, count(*) "
+    "FROM user_filters GROUP BY gender_filter",
+    "INSERT INTO stat_counters(name, key, value) SELECT 'filters.by_city', city_filter, count(*) "
+    "FROM user_filters GROUP BY city_filter",
+]
+
+TRIGGERS = (
+    'users_stats_ai', 'users_stats_ad', 'users_stats_au',
+    'user_filters_stats_ai', 'user_filters_stats_ad', 'user_filters_stats_au',
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.create_table('stat_counters',
+    sa.Column('name', sa.String(length=30), nullable=False),
+    sa.Column('key', sa.String(length=50), nullable=False),
+    sa.Column('value', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('name', 'key')
+    )
+    # ### end Alembic commands ###
+    for statement in TRIGGERS_DDL:
+        op.execute(statement)
+    # Начальные значения из уже существующих строк
+    for statement in REBUILD_SQL:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for trigger in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.drop_table('stat_counters')
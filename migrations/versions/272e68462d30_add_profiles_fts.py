@@ -0,0 +1,59 @@
+"""Add profiles_fts full-text index
+
+Revision ID: 272e68462d30
+Revises: f0f3f23dcf30
+Create Date: 2026-10-18 11:48:05.902214
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '272e68462d30'
+down_revision: Union[str, Sequence[str], None] = 'f0f3f23dcf30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS profiles_fts USING fts5(
+            description, tags, city,
+            content='profiles', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+    """)
+    op.execute("""
+        CREATE TRIGGER IF NOT EXISTS profiles_fts_ai AFTER INSERT ON profiles BEGIN
+            INSERT INTO profiles_fts(rowid, description, tags, city)
+            VALUES (new.id, new.description, new.tags, new.city);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER IF NOT EXISTS profiles_fts_ad AFTER DELETE ON profiles BEGIN
+            INSERT INTO profiles_fts(profiles_fts, rowid, description, tags, city)
+            VALUES ('delete', old.id, old.description, old.tags, old.city);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER IF NOT EXISTS profiles_fts_au AFTER UPDATE OF description, tags, city ON profiles BEGIN
+            INSERT INTO profiles_fts(profiles_fts, rowid, description, tags, city)
+            VALUES ('delete', old.id, old.description, old.tags, old.city);
+            INSERT INTO profiles_fts(rowid, description, tags, city)
+            VALUES (new.id, new.description, new.tags, new.city);
+        END
+    """)
+    # Индексируем уже существующие профили
+    op.execute("INSERT INTO profiles_fts(profiles_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS profiles_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS profiles_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS profiles_fts_ai")
+    op.execute("DROP TABLE IF EXISTS profiles_fts")
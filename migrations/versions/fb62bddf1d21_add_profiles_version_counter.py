@@ -0,0 +1,59 @@
+"""Add profiles.version counter maintained by triggers
+
+Revision ID: fb62bddf1d21
+Revises: b309119d761e
+Create Date: 2026-10-18 19:02:41.175320
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'fb62bddf1d21'
+down_revision: Union[str, Sequence[str], None] = 'b309119d761e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGGERS_DDL = [
+    """
+    CREATE TRIGGER IF NOT EXISTS profiles_version_ai AFTER INSERT ON profiles BEGIN
+        INSERT INTO stat_counters(name, key, value) VALUES ('profiles.version', '', 1)
+        ON CONFLICT(name, key) DO UPDATE SET value = value + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS profiles_version_au AFTER UPDATE ON profiles BEGIN
+        INSERT INTO stat_counters(name, key, value) VALUES ('profiles.version', '', 1)
+        ON CONFLICT(name, key) DO UPDATE SET value = value + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS profiles_version_ad AFTER DELETE ON profiles BEGIN
+        INSERT INTO stat_counters(name, key, value) VALUES ('profiles.version', '', 1)
+        ON CONFLICT(name, key) DO UPDATE SET value = value + 1;
+    END
+    """,
+]
+
+TRIGGERS = ('profiles_version_ai', 'profiles_version_au', 'profiles_version_ad')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for statement in TRIGGERS_DDL:
+        op.execute(statement)
+    # Начальная версия: снимки, загруженные до миграции, перезагрузятся
+    op.execute(
+        "INSERT INTO stat_counters(name, key, value) VALUES ('profiles.version', '', 1) "
+        "ON CONFLICT(name, key) DO UPDATE SET value = value + 1"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for trigger in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute("DELETE FROM stat_counters WHERE name = 'profiles.version'")
@@ -0,0 +1,39 @@
+"""Add revision and updated_at to profiles and roles
+
+Revision ID: fe0b884191ef
+Revises: c9b46cb91ce6
+Create Date: 2026-10-18 16:05:42.117503
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'fe0b884191ef'
+down_revision: Union[str, Sequence[str], None] = 'c9b46cb91ce6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('profiles', 'roles')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        op.add_column(table, sa.Column('revision', sa.Integer(), server_default='1', nullable=False))
+        # SQLite не добавляет NOT NULL колонку без константы по умолчанию;
+        # существующие строки получают время миграции
+        op.add_column(table, sa.Column(
+            'updated_at', sa.DateTime(), server_default='1970-01-01 00:00:00', nullable=False
+        ))
+        op.execute(f"UPDATE {table} SET updated_at = strftime('%Y-%m-%d %H:%M:%f', 'now')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in reversed(TABLES):
+        op.drop_column(table, 'updated_at')
+        op.drop_column(table, 'revision')
@@ -1,12 +1,14 @@
 # test_db.py
 import asyncio
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import declarative_base, sessionmaker
 from sqlalchemy import Column, Integer, String
 
-# Создаем движок для SQLite
+from app.database.database import make_engine
+
+# Создаем движок для SQLite через общую фабрику
 DATABASE_URL = "sqlite+aiosqlite:///./test.db"
-engine = create_async_engine(DATABASE_URL, echo=True)
+engine = make_engine(DATABASE_URL)
 Base = declarative_base()
 
 # Простая модель
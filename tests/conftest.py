@@ -0,0 +1,89 @@
+# tests/conftest.py
+"""
+Общая обвязка тестов приложения.
+
+Движки БД создаются при импорте app.database по settings.DATABASE_URL,
+поэтому временная БД подставляется в окружение до импорта приложения: так
+и запросы, и фоновые задачи (BackgroundTasks, JobRunner) пишут в нее, а не
+в dating_app.db. Профиль production - WAL и busy_timeout, как на сервере.
+"""
+import asyncio
+import os
+import sqlite3
+import tempfile
+from typing import Any, Awaitable, Callable
+
+_DB_DIR = tempfile.mkdtemp(prefix="dating-tests-")
+DB_PATH = os.path.join(_DB_DIR, "app.db")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{DB_PATH}"
+os.environ["DB_PROFILE"] = "production"
+os.environ["JOB_RUNNER_ENABLED"] = "false"
+
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+
+from app.database.database import create_tables, dispose_engines  # noqa: E402
+from app.services.auth import current_user_cache, token_claims_cache  # noqa: E402
+from app.services.profile_cache import profile_cache  # noqa: E402
+from app.utils.cities import city_directory  # noqa: E402
+from app.utils.profile_matrix import profile_matrix  # noqa: E402
+from app.utils.tags import tag_index  # noqa: E402
+from main import app  # noqa: E402
+
+Scenario = Callable[[httpx.AsyncClient], Awaitable[Any]]
+
+
+async def _recreate_database() -> None:
+    await dispose_engines()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(DB_PATH + suffix):
+            os.remove(DB_PATH + suffix)
+    await create_tables()
+    await dispose_engines()
+    # Снимки и кэши в памяти процесса относятся к прежней БД
+    tag_index.loaded = False
+    profile_matrix.loaded = False
+    city_directory.loaded = False
+    await profile_cache.clear()
+    token_claims_cache.clear()
+    current_user_cache.clear()
+
+
+@pytest.fixture
+def app_db() -> str:
+    """Пустая БД приложения со схемой из моделей и ролью user (id 1); возвращает путь к файлу"""
+    asyncio.run(_recreate_database())
+    db = sqlite3.connect(DB_PATH)
+    db.execute("INSERT INTO roles(id, name, revision, updated_at) VALUES (1, 'user', 1, '2026-01-01')")
+    db.commit()
+    db.close()
+    return DB_PATH
+
+
+@pytest.fixture
+def run_async(app_db: str) -> Callable[[Awaitable[Any]], Any]:
+    """Выполняет корутину в новом event loop и закрывает соединения, привязанные к нему"""
+    def run(coroutine: Awaitable[Any]) -> Any:
+        async def wrapper() -> Any:
+            try:
+                return await coroutine
+            finally:
+                await dispose_engines()
+
+        return asyncio.run(wrapper())
+
+    return run
+
+
+@pytest.fixture
+def call_api(run_async) -> Callable[[Scenario], Any]:
+    """Выполняет scenario(client) с HTTP-клиентом, отправляющим запросы прямо в ASGI-приложение"""
+    def call(scenario: Scenario) -> Any:
+        async def with_client() -> Any:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await scenario(client)
+
+        return run_async(with_client())
+
+    return call
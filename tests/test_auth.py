@@ -0,0 +1,39 @@
+# tests/test_auth.py
+"""Проверка JWT: подпись, срок и обязательные claims exp и sub"""
+from datetime import datetime, timedelta
+from typing import Any, Dict
+
+import httpx
+import jwt
+import pytest
+
+from app.config import settings
+from tests.utils import auth_headers
+
+
+def bearer(claims: Dict[str, Any], key: str = settings.SECRET_KEY) -> Dict[str, str]:
+    return {"Authorization": f"Bearer {jwt.encode(claims, key, algorithm=settings.ALGORITHM)}"}
+
+
+def test_valid_token(call_api) -> None:
+    async def scenario(client: httpx.AsyncClient):
+        return await client.get("/auth/me", headers=await auth_headers(client))
+
+    response = call_api(scenario)
+    assert response.status_code == 200, response.text
+    assert response.json()["email"] == "admin@example.com"
+
+
+@pytest.mark.parametrize("claims, key", [
+    # Без exp токен был бы бессрочным
+    ({"sub": "1", "email": "admin@example.com"}, settings.SECRET_KEY),
+    ({"email": "admin@example.com", "exp": datetime.utcnow() + timedelta(hours=1)}, settings.SECRET_KEY),
+    ({"sub": "1", "exp": datetime.utcnow() - timedelta(minutes=1)}, settings.SECRET_KEY),
+    ({"sub": "1", "exp": datetime.utcnow() + timedelta(hours=1)}, "other-secret-key-of-32-bytes-or-more"),
+], ids=["no exp", "no sub", "expired", "wrong key"])
+def test_rejected_tokens(call_api, claims: Dict[str, Any], key: str) -> None:
+    async def scenario(client: httpx.AsyncClient):
+        await auth_headers(client)
+        return await client.get("/auth/me", headers=bearer(claims, key))
+
+    assert call_api(scenario).status_code == 401
@@ -0,0 +1,92 @@
+# tests/test_cities.py
+"""Справочник городов: канонические названия и поиск в радиусе по R*Tree"""
+import httpx
+import pytest
+
+from app.utils.cities import DEFAULT_CITIES, city_key, distance_km
+from tests.utils import create_profiles, profile_body
+
+MOSCOW = (55.7558, 37.6173)
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("СПб", "Санкт-Петербург"),
+    ("питер", "Санкт-Петербург"),
+    ("  санкт-петербург ", "Санкт-Петербург"),
+    ("St. Petersburg", "Санкт-Петербург"),
+    ("КОРОЛЕВ", "Королёв"),
+    ("Ростов на Дону", "Ростов-на-Дону"),
+])
+def test_resolve_spelling_variants(call_api, name: str, expected: str) -> None:
+    async def scenario(client: httpx.AsyncClient):
+        return await client.get("/cities/resolve", params={"name": name})
+
+    response = call_api(scenario)
+    assert response.status_code == 200, response.text
+    assert response.json()["name"] == expected
+
+
+def test_resolve_unknown_city(call_api) -> None:
+    async def scenario(client: httpx.AsyncClient):
+        return await client.get("/cities/resolve", params={"name": "Атлантида"})
+
+    assert call_api(scenario).status_code == 404
+
+
+def test_city_key() -> None:
+    assert city_key(" Нижний  Новгород ") == city_key("нижний-новгород") == "нижний новгород"
+    assert city_key("Королёв") == city_key("королев")
+
+
+@pytest.mark.parametrize("radius_km", [10, 30, 60, 200, 700])
+def test_near_matches_brute_force(call_api, radius_km: float) -> None:
+    async def scenario(client: httpx.AsyncClient):
+        return await client.get("/cities/near", params={"lat": MOSCOW[0], "lon": MOSCOW[1], "radius_km": radius_km})
+
+    response = call_api(scenario)
+    assert response.status_code == 200, response.text
+    # Перебор всего справочника; порядок - по расстоянию в ответе (до 0.1 км), затем по id
+    expected = sorted(
+        (round(distance_km(*MOSCOW, latitude, longitude), 1), city_id, name)
+        for city_id, (name, latitude, longitude, _) in enumerate(DEFAULT_CITIES, start=1)
+        if distance_km(*MOSCOW, latitude, longitude) <= radius_km
+    )
+    assert [(city["distance_km"], city["id"], city["name"]) for city in response.json()] == expected
+
+
+def test_profiles_and_filters_store_canonical_city(call_api) -> None:
+    async def scenario(client: httpx.AsyncClient):
+        profiles = await create_profiles(client, [
+            profile_body(1, city="мск"), profile_body(2, city=" питер"), profile_body(3, city="Урюпинск  "),
+        ])
+        response = await client.post(
+            "/user-filters/", json={"user_id": 1, "gender_filter": "any", "city_filter": "SPB", "role_id": 1}
+        )
+        assert response.status_code == 201, response.text
+        return profiles, response.json()
+
+    profiles, user_filter = call_api(scenario)
+    assert [profile["city"] for profile in profiles] == ["Москва", "Санкт-Петербург", "Урюпинск"]
+    assert user_filter["city_filter"] == "Санкт-Петербург"
+
+
+def test_search_by_radius(call_api) -> None:
+    cities = ["Москва", "Химки", "Подольск", "Тула", "Пушкин", "Колпино", "Санкт-Петербург"]
+
+    async def scenario(client: httpx.AsyncClient):
+        await create_profiles(client, [profile_body(i, city=city) for i, city in enumerate(cities, start=1)])
+        by_city = await client.get("/profiles/search/", params={"city": "питер", "radius_km": 40})
+        by_point = await client.get(
+            "/profiles/search/", params={"lat": MOSCOW[0], "lon": MOSCOW[1], "radius_km": 50}
+        )
+        exact = await client.get("/profiles/search/", params={"city": "мск"})
+        no_center = await client.get("/profiles/search/", params={"radius_km": 40})
+        unknown = await client.get("/profiles/search/", params={"city": "Атлантида", "radius_km": 40})
+        return by_city, by_point, exact, no_center, unknown
+
+    by_city, by_point, exact, no_center, unknown = call_api(scenario)
+    assert sorted(profile["city"] for profile in by_city.json()) == ["Колпино", "Пушкин", "Санкт-Петербург"]
+    assert sorted(profile["city"] for profile in by_point.json()) == ["Москва", "Подольск", "Химки"]
+    assert [profile["city"] for profile in exact.json()] == ["Москва"]
+    assert no_center.status_code == 400
+    assert unknown.status_code == 400
@@ -0,0 +1,33 @@
+# tests/test_database.py
+"""Движки БД профиля production: сессия чтения не пишет и видит зафиксированные записи"""
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.database.database import async_session_maker, get_read_db
+
+INSERT_ROLE = text("INSERT INTO roles(name, revision, updated_at) VALUES (:name, 1, '2026-01-01')")
+
+
+def test_read_session_is_query_only(run_async) -> None:
+    async def scenario():
+        async for session in get_read_db():
+            with pytest.raises(OperationalError, match="readonly"):
+                await session.execute(INSERT_ROLE, {"name": "admin"})
+            await session.rollback()
+
+    run_async(scenario())
+
+
+def test_read_session_sees_committed_writes(run_async) -> None:
+    async def scenario():
+        async for session in get_read_db():
+            before = (await session.execute(text("SELECT count(*) FROM roles"))).scalar()
+            await session.rollback()
+            async with async_session_maker() as writer:
+                await writer.execute(INSERT_ROLE, {"name": "admin"})
+                await writer.commit()
+            after = (await session.execute(text("SELECT count(*) FROM roles"))).scalar()
+        return before, after
+
+    assert run_async(scenario()) == (1, 2)
@@ -0,0 +1,79 @@
+# tests/test_export.py
+"""Потоковая выгрузка таблиц в NDJSON и CSV"""
+import csv
+import io
+import json
+
+import httpx
+
+from app.config import settings
+from app.database.database import read_session_maker
+from app.schemas.export import ExportFormat, ExportTable
+from app.services.export import ExportService
+from tests.utils import auth_headers, create_profiles, profile_body
+
+PROFILES = 10
+
+
+def test_export_requires_token(call_api) -> None:
+    async def scenario(client: httpx.AsyncClient):
+        return await client.get("/export/profiles")
+
+    assert call_api(scenario).status_code == 401
+
+
+def test_export_profiles_ndjson_and_csv(call_api) -> None:
+    async def scenario(client: httpx.AsyncClient):
+        profiles = await create_profiles(client, [profile_body(i) for i in range(1, PROFILES + 1)])
+        headers = await auth_headers(client)
+        ndjson = await client.get("/export/profiles", headers=headers)
+        csv_response = await client.get("/export/profiles", params={"format": "csv"}, headers=headers)
+        return profiles, ndjson, csv_response
+
+    profiles, ndjson, csv_response = call_api(scenario)
+    assert ndjson.status_code == 200
+    assert ndjson.headers["content-type"].startswith("application/x-ndjson")
+    assert ndjson.headers["content-disposition"] == 'attachment; filename="profiles.ndjson"'
+    rows = [json.loads(line) for line in ndjson.text.splitlines()]
+    assert [row["id"] for row in rows] == [profile["id"] for profile in profiles]
+    assert rows[0]["username"] == "user1" and rows[0]["city"] == "Москва"
+
+    assert csv_response.status_code == 200
+    assert csv_response.headers["content-type"].startswith("text/csv")
+    table = list(csv.DictReader(io.StringIO(csv_response.text)))
+    assert [int(row["id"]) for row in table] == [row["id"] for row in rows]
+    assert [row["description"] for row in table] == [row["description"] for row in rows]
+
+
+def test_export_users_without_password_hash(call_api) -> None:
+    async def scenario(client: httpx.AsyncClient):
+        headers = await auth_headers(client)
+        return (
+            await client.get("/export/users", headers=headers),
+            await client.get("/export/users", params={"format": "csv"}, headers=headers),
+        )
+
+    ndjson, csv_response = call_api(scenario)
+    [row] = [json.loads(line) for line in ndjson.text.splitlines()]
+    assert row["email"] == "admin@example.com"
+    assert "hashed_password" not in row
+    header = csv_response.text.splitlines()[0].split(",")
+    assert "email" in header and "hashed_password" not in header
+
+
+def test_export_streams_in_chunks(call_api, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "EXPORT_CHUNK_SIZE", 4)
+
+    async def scenario(client: httpx.AsyncClient):
+        await create_profiles(client, [profile_body(i) for i in range(1, PROFILES + 1)])
+        async with read_session_maker() as session:
+            service = ExportService(session)
+            ndjson = [chunk async for chunk in service.stream(ExportTable.profiles, ExportFormat.ndjson)]
+            csv_chunks = [chunk async for chunk in service.stream(ExportTable.profiles, ExportFormat.csv)]
+        return ndjson, csv_chunks
+
+    ndjson, csv_chunks = call_api(scenario)
+    # Пачки по 4 строки; в CSV первым идет заголовок
+    assert [chunk.count(b"\n") for chunk in ndjson] == [4, 4, 2]
+    assert len(csv_chunks) == 4
+    assert len(list(csv.reader(io.StringIO(b"".join(csv_chunks).decode())))) == PROFILES + 1
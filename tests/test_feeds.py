@@ -0,0 +1,83 @@
+# tests/test_feeds.py
+"""
+Лента: карточки забираются атомарным сдвигом позиции (UPDATE ... RETURNING),
+поэтому одновременные запросы получают разные срезы очереди, а пополнение
+не возвращает уже выданные карточки.
+"""
+import asyncio
+import sqlite3
+from typing import List, Tuple
+
+import httpx
+
+from app.database.database import async_session_maker
+from app.repositories.feeds import FeedRepository
+from app.services.feeds import FeedService
+from app.utils.id_arrays import pack_ids, slice_ids
+from tests.utils import create_profiles, profile_body
+
+VIEWER_ID = 100
+CANDIDATES = 40
+
+
+def test_concurrent_feed_requests_get_disjoint_cards(app_db: str, call_api) -> None:
+    async def scenario(client: httpx.AsyncClient):
+        profiles = await create_profiles(
+            client, [profile_body(i) for i in range(1, CANDIDATES + 1)] + [profile_body(VIEWER_ID)]
+        )
+        # Холодный старт собирает очередь синхронно
+        first = await client.get(f"/feed/{VIEWER_ID}", params={"limit": 1})
+        responses = await asyncio.gather(
+            *(client.get(f"/feed/{VIEWER_ID}", params={"limit": 4}) for _ in range(9))
+        )
+        served = [card["id"] for response in [first, *responses] for card in response.json()]
+        # Пополнение после выдачи: в очереди только то, что еще не выдано
+        async with async_session_maker() as session:
+            service = FeedService(session)
+            await service.refill(VIEWER_ID)
+            rest, needs_refill = await service.get_cards(VIEWER_ID, 50)
+        return profiles, served, [card.id for card in rest], needs_refill
+
+    profiles, served, rest, needs_refill = call_api(scenario)
+    candidates = {profile["id"] for profile in profiles if profile["user_id"] != VIEWER_ID}
+    assert len(served) == 37
+    assert len(set(served)) == len(served)
+    assert set(served) <= candidates
+    assert sorted(rest) == sorted(candidates - set(served))
+    assert needs_refill
+    db = sqlite3.connect(app_db)
+    jobs = db.execute("SELECT type, key FROM jobs").fetchall()
+    db.close()
+    # Пополнение в фоне поставлено одной задачей на пользователя
+    assert jobs == [("feeds.refill", str(VIEWER_ID))]
+
+
+async def claim(feed_id: int, count: int) -> Tuple[int, bytes]:
+    async with async_session_maker() as session:
+        claimed = await FeedRepository(session).advance(feed_id, count)
+        await session.commit()
+    return claimed
+
+
+def test_advance_returns_position_and_queue_of_claimed_slice(run_async) -> None:
+    queue = pack_ids(range(1, 11))
+
+    async def scenario():
+        async with async_session_maker() as session:
+            repository = FeedRepository(session)
+            feed = await repository.create(VIEWER_ID)
+            await repository.save(feed.id, expected_position=0, queue=queue, seen=b"", watermark=0)
+            await session.commit()
+            feed_id = feed.id
+        concurrent = await asyncio.gather(*(claim(feed_id, 4) for _ in range(2)))
+        return concurrent, await claim(feed_id, 4), await claim(feed_id + 1, 4)
+
+    concurrent, tail, missing = run_async(scenario())
+    assert sorted(position for position, _ in concurrent) == [4, 8]
+    slices: List[List[int]] = [slice_ids(blob, position - 4, position) for position, blob in concurrent]
+    assert sorted(slices) == [[1, 2, 3, 4], [5, 6, 7, 8]]
+    # Позиция может уйти за конец очереди: срез короче запрошенного
+    position, blob = tail
+    assert position == 12 and blob == queue
+    assert slice_ids(blob, position - 4, position) == [9, 10]
+    assert missing is None
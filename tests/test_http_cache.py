@@ -0,0 +1,67 @@
+# tests/test_http_cache.py
+"""Условный GET: ETag и Last-Modified профиля и списка ролей, 304 до изменения и 200 после"""
+import httpx
+
+from tests.utils import create_profiles, profile_body
+
+
+def test_profile_etag_changes_after_update(call_api) -> None:
+    async def scenario(client: httpx.AsyncClient):
+        [profile] = await create_profiles(client, [profile_body(1)])
+        url = f"/profiles/{profile['id']}"
+        first = await client.get(url)
+        etag = first.headers["etag"]
+        cached = await client.get(url, headers={"If-None-Match": etag})
+        weak = await client.get(url, headers={"If-None-Match": f'"other", W/{etag}'})
+        since = await client.get(url, headers={"If-Modified-Since": first.headers["last-modified"]})
+        by_user_id = await client.get("/profiles/user/1", headers={"If-None-Match": etag})
+        updated = await client.put(url, json={"description": "Новое описание"})
+        assert updated.status_code == 200, updated.text
+        after = await client.get(url, headers={"If-None-Match": etag})
+        return first, cached, weak, since, by_user_id, after
+
+    first, cached, weak, since, by_user_id, after = call_api(scenario)
+    assert first.status_code == 200
+    assert first.headers["cache-control"] == "private, no-cache"
+    assert cached.status_code == 304 and cached.content == b""
+    assert cached.headers["etag"] == first.headers["etag"]
+    assert weak.status_code == 304
+    assert since.status_code == 304
+    # ETag строки один для всех способов чтения профиля
+    assert by_user_id.status_code == 304
+    assert after.status_code == 200
+    assert after.headers["etag"] != first.headers["etag"]
+    assert after.json()["description"] == "Новое описание"
+
+
+def test_username_etag_after_rename(call_api) -> None:
+    async def scenario(client: httpx.AsyncClient):
+        [profile] = await create_profiles(client, [profile_body(1)])
+        etag = (await client.get("/profiles/username/user1")).headers["etag"]
+        response = await client.put(f"/profiles/{profile['id']}", json={"username": "renamed"})
+        assert response.status_code == 200, response.text
+        return (
+            await client.get("/profiles/username/user1", headers={"If-None-Match": etag}),
+            await client.get("/profiles/username/renamed", headers={"If-None-Match": etag}),
+        )
+
+    old_name, new_name = call_api(scenario)
+    assert old_name.status_code == 404
+    assert new_name.status_code == 200 and new_name.json()["username"] == "renamed"
+
+
+def test_roles_list_etag_changes_after_insert(call_api) -> None:
+    async def scenario(client: httpx.AsyncClient):
+        first = await client.get("/roles/")
+        etag = first.headers["etag"]
+        cached = await client.get("/roles/", headers={"If-None-Match": etag})
+        created = await client.post("/roles/", json={"name": "admin"})
+        assert created.status_code == 201, created.text
+        after = await client.get("/roles/", headers={"If-None-Match": etag})
+        return first, cached, after
+
+    first, cached, after = call_api(scenario)
+    assert [role["name"] for role in first.json()] == ["user"]
+    assert cached.status_code == 304
+    assert after.status_code == 200
+    assert [role["name"] for role in after.json()] == ["user", "admin"]
@@ -0,0 +1,120 @@
+# tests/test_id_arrays.py
+"""Упакованные списки ID и сжатое множество ID (история свайпов)"""
+import asyncio
+import random
+from typing import List
+
+import httpx
+import pytest
+
+from app.utils.id_arrays import (
+    ID_SET_BLOCK,
+    count_ids,
+    id_set_contains,
+    pack_id_set,
+    pack_ids,
+    slice_ids,
+    unpack_id_set,
+    unpack_ids,
+)
+
+MAX_ID = 2 ** 32 - 1
+
+ID_SETS = {
+    "empty": [],
+    "single": [7],
+    "single max": [MAX_ID],
+    "dense": list(range(1, 1001)),
+    "sparse": sorted(random.Random(1).sample(range(1, 10 ** 9), 1000)),
+    # Дельты всех трех ширин: 1, 2 и 4 байта
+    "mixed widths": [1, 2, 300, 70000, 70001, 10 ** 9, MAX_ID - 1, MAX_ID],
+    # Ровно на границах блоков: последний ID блока и первый следующего
+    "block boundary": list(range(10, 10 + 2 * ID_SET_BLOCK)),
+    "one past block": list(range(10, 10 + ID_SET_BLOCK + 1)),
+    "near 2^32": list(range(MAX_ID - 3 * ID_SET_BLOCK, MAX_ID + 1)),
+}
+
+
+@pytest.mark.parametrize("name", list(ID_SETS))
+def test_id_set_round_trip(name: str) -> None:
+    ids = sorted(set(ID_SETS[name]))
+    assert unpack_id_set(pack_id_set(ids)) == ids
+
+
+def test_id_set_ignores_order_and_duplicates() -> None:
+    assert unpack_id_set(pack_id_set([5, 3, 5, 1, 3])) == [1, 3, 5]
+
+
+def test_dense_id_set_is_about_a_byte_per_id() -> None:
+    assert len(pack_id_set(range(1, 10001))) < 10001 * 1.1
+
+
+def test_empty_blob() -> None:
+    assert pack_id_set([]) == b""
+    assert unpack_id_set(None) == [] and unpack_id_set(b"") == []
+    assert not id_set_contains(None, 1) and not id_set_contains(b"", 0)
+
+
+@pytest.mark.parametrize("name", list(ID_SETS))
+def test_id_set_contains(name: str) -> None:
+    ids = sorted(set(ID_SETS[name]))
+    blob = pack_id_set(ids)
+    present = set(ids)
+    # Каждый элемент и соседи каждого элемента, включая края блоков и диапазона
+    probes = {0, 1, MAX_ID} | {value + step for value in ids for step in (-1, 0, 1) if 0 <= value + step <= MAX_ID}
+    for value in probes:
+        assert id_set_contains(blob, value) == (value in present), value
+
+
+def test_first_ids_of_blocks() -> None:
+    ids = list(range(0, 10 * ID_SET_BLOCK, 3))
+    blob = pack_id_set(ids)
+    for start in range(0, len(ids), ID_SET_BLOCK):
+        assert id_set_contains(blob, ids[start])
+        assert id_set_contains(blob, ids[min(start + ID_SET_BLOCK, len(ids)) - 1])
+
+
+def test_id_list_helpers() -> None:
+    ids = [5, 1, MAX_ID, 3]
+    blob = pack_ids(ids)
+    assert unpack_ids(blob) == ids
+    assert count_ids(blob) == 4
+    assert slice_ids(blob, 1, 3) == [1, MAX_ID]
+    assert slice_ids(blob, 3, 10) == [3]
+    assert unpack_ids(None) == [] and count_ids(None) == 0
+
+
+def test_mark_seen_merges_with_stored_set(call_api) -> None:
+    first = list(range(1, 300))
+    second = list(range(250, 600, 2)) + [MAX_ID]
+
+    async def scenario(client: httpx.AsyncClient):
+        added = []
+        for ids in (first, second, second):
+            response = await client.post("/seen/1", json={"profile_ids": ids})
+            assert response.status_code == 200, response.text
+            added.append(response.json())
+        checks = {
+            value: (await client.get(f"/seen/1/{value}")).json()["seen"]
+            for value in (1, 299, 300, 301, 598, 599, MAX_ID, MAX_ID - 1)
+        }
+        return added, checks
+
+    added, checks = call_api(scenario)
+    merged = set(first) | set(second)
+    assert [row["added"] for row in added] == [len(first), len(merged) - len(first), 0]
+    assert added[-1]["count"] == len(merged)
+    assert checks == {value: value in merged for value in checks}
+
+
+def test_concurrent_mark_seen_keeps_every_id(call_api) -> None:
+    batches: List[List[int]] = [list(range(start, start + 50)) for start in range(1, 1001, 50)]
+
+    async def scenario(client: httpx.AsyncClient):
+        responses = await asyncio.gather(
+            *(client.post("/seen/1", json={"profile_ids": batch}) for batch in batches)
+        )
+        assert all(response.status_code == 200 for response in responses)
+        return (await client.get("/seen/1")).json()
+
+    assert call_api(scenario)["count"] == 1000
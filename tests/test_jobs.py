@@ -0,0 +1,227 @@
+# tests/test_jobs.py
+"""
+Очередь фоновых задач: захват, повторы, лимиты одновременных задач,
+возврат прерванных задач, дедупликация по key и API /jobs.
+
+Исполнитель гоняется через run_until_idle() с тестовыми обработчиками.
+"""
+import asyncio
+import sqlite3
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+import httpx
+
+from app.database.database import async_session_maker
+from app.models.jobs import JOB_DONE, JOB_FAILED, JOB_QUEUED, JOB_RUNNING, JobModel
+from app.repositories.jobs import JobRepository
+from app.schemas.jobs import JobCreate, JobResponse
+from app.services.jobs import JobHandler, JobRunner, JobService
+from tests.utils import auth_headers
+
+
+def test_metrics_require_token(call_api) -> None:
+    async def scenario(client: httpx.AsyncClient):
+        anonymous = await client.get("/jobs/metrics")
+        authorized = await client.get("/jobs/metrics", headers=await auth_headers(client))
+        return anonymous, authorized
+
+    anonymous, authorized = call_api(scenario)
+    assert anonymous.status_code == 401
+    assert authorized.status_code == 200
+    assert set(authorized.json()) == {"queues", "runner"}
+
+
+def make_runner(handlers: Dict[str, JobHandler], concurrency: Dict[str, int], retry_delay: float = 0) -> JobRunner:
+    return JobRunner(handlers, concurrency, poll_interval=0.05, retry_delay=retry_delay, shutdown_timeout=1)
+
+
+async def enqueue(job_type: str, count: int = 1, max_attempts: int = 3) -> List[int]:
+    async with async_session_maker() as session:
+        repository = JobRepository(session)
+        ids = [
+            await repository.enqueue(job_type, {}, run_at=datetime.utcnow(), max_attempts=max_attempts)
+            for _ in range(count)
+        ]
+        await session.commit()
+    return ids
+
+
+async def get_job(job_id: int) -> JobModel:
+    async with async_session_maker() as session:
+        return await JobRepository(session).get_by_id(job_id)
+
+
+async def noop(session, payload):
+    return None
+
+
+async def broken(session, payload):
+    raise RuntimeError("boom")
+
+
+def test_claim_gives_each_job_to_one_caller(run_async) -> None:
+    async def scenario():
+        ids = await enqueue("noop", 10)
+
+        async def claim() -> List[int]:
+            async with async_session_maker() as session:
+                jobs = await JobRepository(session).claim("noop", 10, datetime.utcnow())
+                await session.commit()
+                return [job.id for job in jobs]
+
+        claimed = await asyncio.gather(*(claim() for _ in range(4)))
+        return ids, claimed, [await get_job(job_id) for job_id in ids]
+
+    ids, claimed, jobs = run_async(scenario())
+    flat = [job_id for batch in claimed for job_id in batch]
+    assert sorted(flat) == sorted(ids)
+    assert all(job.status == JOB_RUNNING and job.attempts == 1 for job in jobs)
+
+
+def test_failing_job_retries_then_fails(run_async) -> None:
+    async def scenario():
+        runner = make_runner({"broken": broken}, {"broken": 1})
+        [job_id] = await enqueue("broken", max_attempts=3)
+        await runner.run_until_idle()
+        return runner, await get_job(job_id)
+
+    runner, job = run_async(scenario())
+    assert job.status == JOB_FAILED
+    assert job.attempts == 3
+    assert job.last_error == "RuntimeError: boom"
+    assert job.finished_at is not None
+    assert runner.retried["broken"] == 2 and runner.failed["broken"] == 1
+
+
+def test_retry_delay_doubles(app_db: str, run_async) -> None:
+    async def run_once(runner: JobRunner, job_id: int) -> JobModel:
+        # Наступление run_at: переносим повтор в прошлое
+        db = sqlite3.connect(app_db)
+        db.execute("UPDATE jobs SET run_at = '2000-01-01' WHERE id = ?", (job_id,))
+        db.commit()
+        db.close()
+        await runner.run_until_idle()
+        return await get_job(job_id)
+
+    async def scenario():
+        runner = make_runner({"broken": broken}, {"broken": 1}, retry_delay=60)
+        [job_id] = await enqueue("broken", max_attempts=3)
+        delays = []
+        for _ in range(2):
+            started = datetime.utcnow()
+            job = await run_once(runner, job_id)
+            assert job.status == JOB_QUEUED
+            delays.append((job.run_at - started).total_seconds())
+        return delays, await run_once(runner, job_id)
+
+    delays, job = run_async(scenario())
+    assert 60 <= delays[0] < 65
+    assert 120 <= delays[1] < 125
+    assert job.status == JOB_FAILED and job.attempts == 3
+
+
+def test_concurrency_limit_per_type(run_async) -> None:
+    active = {"slow": 0, "fast": 0}
+    peak = {"slow": 0, "fast": 0}
+
+    def handler(job_type: str) -> JobHandler:
+        async def run(session, payload):
+            active[job_type] += 1
+            peak[job_type] = max(peak[job_type], active[job_type])
+            await asyncio.sleep(0.05)
+            active[job_type] -= 1
+            return {"ok": True}
+        return run
+
+    async def scenario():
+        runner = make_runner({"slow": handler("slow"), "fast": handler("fast")}, {"slow": 2, "fast": 4})
+        ids = await enqueue("slow", 6) + await enqueue("fast", 8)
+        await runner.run_until_idle()
+        return runner, [await get_job(job_id) for job_id in ids]
+
+    runner, jobs = run_async(scenario())
+    assert peak == {"slow": 2, "fast": 4}
+    assert all(job.status == JOB_DONE and job.result == {"ok": True} for job in jobs)
+    assert runner.completed == {"slow": 6, "fast": 8}
+
+
+def test_start_requeues_interrupted_jobs(run_async) -> None:
+    async def scenario():
+        [job_id] = await enqueue("noop")
+        # Задачу взял исполнитель, процесс которого остановился
+        async with async_session_maker() as session:
+            await JobRepository(session).claim("noop", 1, datetime.utcnow())
+            await session.commit()
+        runner = make_runner({"noop": noop}, {"noop": 1})
+        await runner.start()
+        for _ in range(50):
+            if runner.completed["noop"]:
+                break
+            await asyncio.sleep(0.02)
+        await runner.stop()
+        return await get_job(job_id)
+
+    job = run_async(scenario())
+    assert job.status == JOB_DONE
+    # Попытка прерванного запуска не возвращается
+    assert job.attempts == 2
+
+
+def test_enqueue_deduplicates_by_key(run_async) -> None:
+    async def scenario():
+        async with async_session_maker() as session:
+            service = JobService(session)
+            first = await service.enqueue(JobCreate(type="stats.rebuild", key="k"))
+            second = await service.enqueue(JobCreate(type="stats.rebuild", key="k"))
+            other = await service.enqueue(JobCreate(type="stats.rebuild", key="other"))
+        return first, second, other
+
+    first, second, other = run_async(scenario())
+    assert first.id == second.id
+    assert other.id != first.id
+
+
+async def enqueue_after_conflict(job_data: JobCreate) -> Tuple[JobResponse, int]:
+    """enqueue, у которого первая вставка пропущена из-за ожидающей задачи, взятой в работу до чтения"""
+    async with async_session_maker() as session:
+        service = JobService(session)
+        insert = service.repository.enqueue
+        calls = []
+
+        async def conflict_once(*args, **kwargs):
+            calls.append(args)
+            return None if len(calls) == 1 else await insert(*args, **kwargs)
+
+        service.repository.enqueue = conflict_once
+        return await service.enqueue(job_data), len(calls)
+
+
+def test_enqueue_conflict_returns_running_job(run_async) -> None:
+    async def scenario():
+        async with async_session_maker() as session:
+            queued = await JobService(session).enqueue(JobCreate(type="stats.rebuild", key="k"))
+            await JobRepository(session).claim("stats.rebuild", 1, datetime.utcnow())
+            await session.commit()
+        job, inserts = await enqueue_after_conflict(JobCreate(type="stats.rebuild", key="k"))
+        return queued, job, inserts
+
+    queued, job, inserts = run_async(scenario())
+    assert job.id == queued.id and job.status == JOB_RUNNING
+    assert inserts == 1
+
+
+def test_enqueue_conflict_with_finished_job_inserts_new(run_async) -> None:
+    async def scenario():
+        async with async_session_maker() as session:
+            finished = await JobService(session).enqueue(JobCreate(type="stats.rebuild", key="k"))
+            repository = JobRepository(session)
+            await repository.claim("stats.rebuild", 1, datetime.utcnow())
+            await repository.complete(finished.id, None)
+            await session.commit()
+        job, inserts = await enqueue_after_conflict(JobCreate(type="stats.rebuild", key="k"))
+        return finished, job, inserts
+
+    finished, job, inserts = run_async(scenario())
+    assert job.id != finished.id and job.status == JOB_QUEUED
+    assert inserts == 2
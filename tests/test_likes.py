@@ -0,0 +1,111 @@
+# tests/test_likes.py
+"""
+Лайки профилей и мэтчи: встречный лайк пишет пару строк мэтча в той же
+транзакции, снятый лайк удаляет обе строки, мэтчи листаются по курсору.
+"""
+import asyncio
+import sqlite3
+from typing import List, Tuple
+
+import httpx
+
+from tests.utils import create_profiles, profile_body
+
+PAIRS = 20
+
+
+def match_rows(path: str) -> List[Tuple[int, int]]:
+    db = sqlite3.connect(path)
+    try:
+        return db.execute("SELECT profile_id, matched_profile_id FROM matches ORDER BY id").fetchall()
+    finally:
+        db.close()
+
+
+def test_concurrent_opposite_likes_create_one_match_each(app_db: str, call_api) -> None:
+    async def scenario(client: httpx.AsyncClient):
+        profiles = await create_profiles(client, [profile_body(i) for i in range(1, 2 * PAIRS + 1)])
+        ids = [profile["id"] for profile in profiles]
+        pairs = list(zip(ids[::2], ids[1::2]))
+        requests = []
+        for first, second in pairs:
+            requests.append(client.post(f"/likes/{first}/{second}"))
+            requests.append(client.post(f"/likes/{second}/{first}"))
+        return pairs, await asyncio.gather(*requests)
+
+    pairs, responses = call_api(scenario)
+    assert all(response.status_code == 201 for response in responses)
+    # Из двух встречных лайков мэтч видит ровно один
+    assert sum(response.json()["matched"] for response in responses) == PAIRS
+    expected = {(first, second) for first, second in pairs} | {(second, first) for first, second in pairs}
+    rows = match_rows(app_db)
+    assert len(rows) == 2 * PAIRS
+    assert set(rows) == expected
+
+
+def test_unlike_removes_both_match_rows(app_db: str, call_api) -> None:
+    async def scenario(client: httpx.AsyncClient):
+        first, second, third = [profile["id"] for profile in await create_profiles(
+            client, [profile_body(i) for i in range(1, 4)]
+        )]
+        for liker, liked in ((first, second), (second, first), (first, third), (third, first)):
+            response = await client.post(f"/likes/{liker}/{liked}")
+            assert response.status_code == 201, response.text
+        unliked = await client.delete(f"/likes/{second}/{first}")
+        missing = await client.delete(f"/likes/{second}/{first}")
+        return first, third, unliked, missing
+
+    first, third, unliked, missing = call_api(scenario)
+    assert unliked.status_code == 200
+    assert missing.status_code == 404
+    # Мэтч с третьим профилем не задет
+    assert sorted(match_rows(app_db)) == sorted([(first, third), (third, first)])
+
+
+def test_self_like_and_duplicate_like(call_api) -> None:
+    async def scenario(client: httpx.AsyncClient):
+        first, second = [profile["id"] for profile in await create_profiles(
+            client, [profile_body(1), profile_body(2)]
+        )]
+        return (
+            await client.post(f"/likes/{first}/{first}"),
+            await client.post(f"/likes/{first}/{second}"),
+            await client.post(f"/likes/{first}/{second}"),
+            await client.post(f"/likes/{first}/999999"),
+        )
+
+    self_like, like, duplicate, unknown = call_api(scenario)
+    assert self_like.status_code == 400
+    assert like.status_code == 201 and like.json()["matched"] is False
+    assert duplicate.status_code == 409
+    assert unknown.status_code == 404
+
+
+def test_matches_keyset_paging(call_api) -> None:
+    async def scenario(client: httpx.AsyncClient):
+        ids = [profile["id"] for profile in await create_profiles(
+            client, [profile_body(i) for i in range(1, 13)]
+        )]
+        hub, others = ids[0], ids[1:]
+        for other in others:
+            assert (await client.post(f"/likes/{hub}/{other}")).status_code == 201
+            assert (await client.post(f"/likes/{other}/{hub}")).status_code == 201
+
+        pages = []
+        params = {"limit": 5}
+        while True:
+            response = await client.get(f"/likes/matches/{hub}", params=params)
+            assert response.status_code == 200, response.text
+            pages.append(response.json())
+            cursor = response.headers.get("x-next-cursor")
+            if not cursor:
+                break
+            params = {"limit": 5, "cursor": cursor}
+        return others, pages
+
+    others, pages = call_api(scenario)
+    assert [len(page) for page in pages] == [5, 5, 1]
+    matched = [row["matched_profile_id"] for page in pages for row in page]
+    assert matched == others
+    match_ids = [row["id"] for page in pages for row in page]
+    assert match_ids == sorted(set(match_ids))
@@ -0,0 +1,62 @@
+# tests/test_profile_cache.py
+"""
+Кэш профилей: ссылки по user_id и username после смены username и удаления
+профиля дают промах, а не устаревший или чужой профиль.
+"""
+import httpx
+
+from app.services.profile_cache import profile_cache
+from tests.utils import create_profiles, profile_body
+
+
+def test_username_pointer_after_rename(call_api) -> None:
+    async def scenario(client: httpx.AsyncClient):
+        first, second = await create_profiles(client, [profile_body(1), profile_body(2)])
+        warm = await client.get("/profiles/username/user1")
+        assert warm.json()["id"] == first["id"]
+        response = await client.put(f"/profiles/{first['id']}", json={"username": "renamed"})
+        assert response.status_code == 200, response.text
+        # Профиль снова в кэше, уже с новым username; ссылка по старому осталась
+        renamed = await client.get(f"/profiles/{first['id']}")
+        stale_pointer = await profile_cache.backend.get(("username", "user1"))
+        old_name = await client.get("/profiles/username/user1")
+        new_name = await client.get("/profiles/username/renamed")
+
+        # Старый username занял другой профиль
+        response = await client.put(f"/profiles/{second['id']}", json={"username": "user1"})
+        assert response.status_code == 200, response.text
+        taken = await client.get("/profiles/username/user1")
+        return first, second, renamed, stale_pointer, old_name, new_name, taken
+
+    first, second, renamed, stale_pointer, old_name, new_name, taken = call_api(scenario)
+    assert renamed.json()["username"] == "renamed"
+    assert stale_pointer == first["id"]
+    assert old_name.status_code == 404
+    assert new_name.status_code == 200 and new_name.json()["id"] == first["id"]
+    assert taken.status_code == 200 and taken.json()["id"] == second["id"]
+
+
+def test_cache_hits_and_delete(call_api) -> None:
+    async def scenario(client: httpx.AsyncClient):
+        [profile] = await create_profiles(client, [profile_body(1)])
+        before = (await client.get("/profiles/metrics/cache")).json()
+        reads = [
+            await client.get(url)
+            for url in (f"/profiles/{profile['id']}", "/profiles/user/1", "/profiles/username/user1")
+        ]
+        after = (await client.get("/profiles/metrics/cache")).json()
+        response = await client.delete(f"/profiles/{profile['id']}")
+        assert response.status_code == 200, response.text
+        deleted = [
+            await client.get(url)
+            for url in (f"/profiles/{profile['id']}", "/profiles/user/1", "/profiles/username/user1")
+        ]
+        return before, reads, after, deleted
+
+    before, reads, after, deleted = call_api(scenario)
+    assert all(response.status_code == 200 for response in reads)
+    # Чтение смотрит в кэш дважды: версия для ETag и сам профиль. Первое
+    # чтение кладет профиль в кэш, чтения по другим полям - попадания
+    assert after["misses"] - before["misses"] == 2
+    assert after["hits"] - before["hits"] == 4
+    assert [response.status_code for response in deleted] == [404, 404, 404]
@@ -0,0 +1,129 @@
+# tests/test_profile_import.py
+"""Импорт профилей пачками: отчет о дубликатах и ошибках, продолжение с checkpoint"""
+import csv
+import io
+import json
+import sqlite3
+from typing import Any, AsyncIterator, Dict, List
+
+import httpx
+
+from app.database.database import async_session_maker
+from app.services.profile_import import ProfileImportService
+from app.utils.ndjson import NDJSON_MEDIA_TYPE
+from tests.utils import create_profiles, profile_body
+
+
+def ndjson(records: List[Any]) -> bytes:
+    """Строки как есть, остальные записи - в JSON"""
+    encoded = [record if isinstance(record, str) else json.dumps(record, ensure_ascii=False) for record in records]
+    return ("\n".join(encoded) + "\n").encode()
+
+
+def profile_count(path: str) -> int:
+    db = sqlite3.connect(path)
+    try:
+        return db.execute("SELECT count(*) FROM profiles").fetchone()[0]
+    finally:
+        db.close()
+
+
+def test_import_reports_duplicates_and_invalid_records(app_db: str, call_api) -> None:
+    records = [
+        profile_body(1, tags="кофе,горы"),
+        profile_body(2),
+        "{not json",
+        profile_body(3, age=10),
+        profile_body(4, username="user2"),      # username занят записью 1 этого же файла
+        profile_body(2, username="other"),      # user_id занят
+        profile_body(5, username="existing"),   # username занят профилем в БД
+        profile_body(6),
+    ]
+
+    async def scenario(client: httpx.AsyncClient):
+        await create_profiles(client, [profile_body(100, username="existing")])
+        response = await client.post(
+            "/profiles/import", params={"batch_size": 3},
+            content=ndjson(records), headers={"content-type": NDJSON_MEDIA_TYPE}
+        )
+        search = await client.get("/profiles/tags/search", params={"tags": "горы"})
+        return response, search
+
+    response, search = call_api(scenario)
+    assert response.status_code == 201, response.text
+    report = response.json()
+    assert (report["total"], report["created"], report["skipped"], report["checkpoint"]) == (8, 3, 5, 8)
+    errors: Dict[int, Dict[str, str]] = {error["index"]: error for error in report["errors"]}
+    assert sorted(errors) == [2, 3, 4, 5, 6]
+    assert errors[2]["status"] == "invalid" and errors[2]["detail"].startswith("Invalid JSON")
+    assert errors[3]["status"] == "invalid" and errors[3]["detail"].startswith("age:")
+    assert errors[4] == {"index": 4, "status": "duplicate", "detail": "Profile with username user2 already exists"}
+    assert errors[5] == {"index": 5, "status": "duplicate", "detail": "Profile with user_id 2 already exists"}
+    assert errors[6]["detail"] == "Profile with username existing already exists"
+    assert profile_count(app_db) == 4
+    # Импортированные профили сразу видны в индексе тегов
+    assert [profile["username"] for profile in search.json()] == ["user1"]
+
+
+def test_import_csv(app_db: str, call_api) -> None:
+    fields = list(profile_body(1))
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields)
+    writer.writeheader()
+    for user_id in range(1, 5):
+        writer.writerow(profile_body(user_id, description=f"Анкета, {user_id}"))
+
+    async def scenario(client: httpx.AsyncClient):
+        response = await client.post(
+            "/profiles/import", content=buffer.getvalue().encode(), headers={"content-type": "text/csv"}
+        )
+        profiles = await client.get("/profiles/")
+        return response, profiles
+
+    response, profiles = call_api(scenario)
+    assert response.status_code == 201, response.text
+    assert response.json()["created"] == 4 and response.json()["errors"] == []
+    assert [profile["description"] for profile in profiles.json()] == [f"Анкета, {i}" for i in range(1, 5)]
+
+
+class Interrupted(Exception):
+    """Остановка импорта после сохранения checkpoint"""
+
+
+async def lines(data: bytes) -> AsyncIterator[bytes]:
+    for line in data.splitlines():
+        yield line
+
+
+def test_import_resumes_from_checkpoint(app_db: str, run_async) -> None:
+    data = ndjson([profile_body(user_id) for user_id in range(1, 11)])
+
+    async def scenario():
+        checkpoints = []
+
+        async def interrupt(checkpoint: int) -> None:
+            checkpoints.append(checkpoint)
+            if checkpoint == 4:
+                raise Interrupted
+
+        async with async_session_maker() as session:
+            try:
+                await ProfileImportService(session).import_profiles(
+                    lines(data), batch_size=4, on_checkpoint=interrupt
+                )
+            except Interrupted:
+                pass
+        interrupted_count = profile_count(app_db)
+        async with async_session_maker() as session:
+            report = await ProfileImportService(session).import_profiles(
+                lines(data), batch_size=4, resume_from=checkpoints[-1]
+            )
+        return checkpoints, interrupted_count, report
+
+    checkpoints, interrupted_count, report = run_async(scenario())
+    assert checkpoints == [4]
+    assert interrupted_count == 4
+    # Продолжение не повторяет уже вставленные записи
+    assert (report.total, report.created, report.skipped, report.checkpoint) == (6, 6, 0, 10)
+    assert report.errors == []
+    assert profile_count(app_db) == 10
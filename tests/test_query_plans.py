@@ -0,0 +1,173 @@
+# tests/test_query_plans.py
+"""
+Планы горячих запросов через EXPLAIN QUERY PLAN.
+
+Каждый случай вызывает настоящий метод репозитория на временной БД со
+схемой из моделей. SQL, который метод отправил в SQLite, перехватывается
+событием before_cursor_execute и объясняется на том же соединении; полное
+сканирование таблицы (SCAN без USING INDEX) - ошибка. Так проверяется
+именно тот запрос, который строит репозиторий, а не его копия.
+"""
+import asyncio
+import re
+import sqlite3
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Tuple
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.database.database import Base, make_engine
+from app.models import cities, favorites, feeds, jobs, likes, profiles, roles, seen, stats, tags, user_filters, users  # noqa: F401
+from app.repositories.cities import CityRepository
+from app.repositories.favorites import FavoriteRepository
+from app.repositories.feeds import FeedRepository
+from app.repositories.jobs import JobRepository
+from app.repositories.likes import LikeRepository, ProfileLikeRepository
+from app.repositories.profiles import ProfileRepository
+from app.repositories.seen import SeenProfilesRepository
+from app.repositories.tags import TagRepository
+from app.repositories.user_filters import UserFilterRepository
+from app.repositories.users import UserRepository
+
+VIRTUAL_INDEX = re.compile(r"VIRTUAL TABLE INDEX (\d+):(\S*)")
+SCAN = re.compile(r"^SCAN (\S+)")
+
+ANY_GENDERS = ["female", "any", "all", "любой"]
+NOW = datetime(2026, 1, 1)
+
+Case = Callable[[AsyncSession], Awaitable[object]]
+
+# Горячие методы репозиториев с типичными аргументами
+HOT_QUERIES: Dict[str, Case] = {
+    "profiles.search_profiles": lambda s: ProfileRepository(s).search_profiles(
+        min_age=20, max_age=30, gender="female", city="Москва"
+    ),
+    "profiles.search_profiles(gender)": lambda s: ProfileRepository(s).search_profiles(min_age=20, gender="female"),
+    "profiles.search_profiles(tags)": lambda s: ProfileRepository(s).search_profiles(tags="кофе"),
+    "profiles.search_profile_ids(radius)": lambda s: ProfileRepository(s).search_profile_ids(
+        gender="female", cities=["Москва", "Химки", "Подольск"]
+    ),
+    "profiles.get_by_user_id": lambda s: ProfileRepository(s).get_by_user_id(1),
+    "profiles.get_by_username": lambda s: ProfileRepository(s).get_by_username("anna"),
+    "profiles.get_by_role_id": lambda s: ProfileRepository(s).get_by_role_id(1),
+    "users.get_by_email": lambda s: UserRepository(s).get_by_email("a@example.com"),
+    "users.get_by_role_id": lambda s: UserRepository(s).get_by_role_id(1),
+    "users.get_active_users": lambda s: UserRepository(s).get_active_users(),
+    "likes.get_likes_by_me_liked": lambda s: LikeRepository(s).get_likes_by_me_liked(True),
+    "likes.get_by_role_id": lambda s: LikeRepository(s).get_by_role_id(1),
+    "favorites.get_by_role_id": lambda s: FavoriteRepository(s).get_by_role_id(1),
+    "user_filters.get_by_user_id": lambda s: UserFilterRepository(s).get_by_user_id(1),
+    "user_filters.get_users_by_filters": lambda s: UserFilterRepository(s).get_users_by_filters("female", "Москва"),
+    "user_filters.get_user_ids_for_profile": lambda s: UserFilterRepository(s).get_user_ids_for_profile(
+        ANY_GENDERS, "Москва"
+    ),
+    "user_filters.get_filters_by_gender": lambda s: UserFilterRepository(s).get_filters_by_gender("female"),
+    "user_filters.get_filters_by_city": lambda s: UserFilterRepository(s).get_filters_by_city("Москва"),
+    "user_filters.get_by_role_id": lambda s: UserFilterRepository(s).get_by_role_id(1),
+    "profile_likes.has_like": lambda s: ProfileLikeRepository(s).has_like(2, 1),
+    "profile_likes.get_liker_ids": lambda s: ProfileLikeRepository(s).get_liker_ids(1),
+    "matches.get_matches": lambda s: ProfileLikeRepository(s).get_matches(1, limit=100, after_id=10),
+    "feeds.get_by_user_id": lambda s: FeedRepository(s).get_by_user_id(1),
+    "feeds.get_by_user_ids": lambda s: FeedRepository(s).get_by_user_ids([1, 2, 3]),
+    "feeds.advance": lambda s: FeedRepository(s).advance(1, 10),
+    "feeds.push_profile": lambda s: FeedRepository(s).push_profile([1, 2], 5),
+    "feeds.get_candidates": lambda s: FeedRepository(s).get_candidates(
+        user_id=2, watermark=0, window=2000, limit=100, gender="female", city="Москва", profile_id=2
+    ),
+    "cities.get_in_box": lambda s: CityRepository(s).get_in_box(55.0, 56.5, 37.0, 38.2),
+    "seen_profiles.get_ids": lambda s: SeenProfilesRepository(s).get_ids(1),
+    "tags.get_or_create_ids": lambda s: TagRepository(s).get_or_create_ids(["кофе"]),
+    "tags.delete_profile_tags": lambda s: TagRepository(s).delete_profile_tags(1),
+    "jobs.get_pending_by_key": lambda s: JobRepository(s).get_pending_by_key("feeds.refill", "1"),
+    "jobs.claim": lambda s: JobRepository(s).claim("feeds.refill", 4, NOW),
+    "jobs.get_depth": lambda s: JobRepository(s).get_depth(NOW),
+}
+
+
+def is_full_scan(detail: str) -> bool:
+    # "SCAN profiles" - полное сканирование, "SCAN profiles USING INDEX ..." - нет
+    virtual = VIRTUAL_INDEX.search(detail)
+    if virtual:
+        # Виртуальные таблицы (R*Tree, FTS5): после двоеточия - условия, по которым
+        # идет поиск в индексе; пусто - перебор всей таблицы (у R*Tree 1: - поиск по id)
+        number, constraints = virtual.groups()
+        return not constraints and number != "1"
+    scan = SCAN.match(detail)
+    if scan is None or "USING" in detail:
+        return False
+    # Перебор результата подзапроса (anon_1) или константы - не чтение таблицы
+    return not scan.group(1).startswith("anon_") and scan.group(1) != "CONSTANT"
+
+
+@pytest.fixture(scope="module")
+def database_url(tmp_path_factory) -> str:
+    """Схема из моделей и по строке в таблицах, без которых методы не доходят до запроса"""
+    path = tmp_path_factory.mktemp("plans") / "plans.db"
+    url = f"sqlite+aiosqlite:///{path}"
+
+    async def create() -> None:
+        engine = make_engine(url, echo=False)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        await engine.dispose()
+
+    asyncio.run(create())
+    db = sqlite3.connect(path)
+    db.execute("INSERT INTO roles(id, name, revision, updated_at) VALUES (1, 'user', 1, '2026-01-01')")
+    db.execute(
+        "INSERT INTO profiles(id, user_id, username, age, gender, city, description, tags, photo, role_id, "
+        "revision, updated_at) VALUES (1, 1, 'anna', 25, 'female', 'Москва', 'd', 'кофе', 'x', 1, 1, '2026-01-01')"
+    )
+    db.execute(
+        "INSERT INTO feeds(id, user_id, queue, position, seen, watermark, updated_at) "
+        "VALUES (1, 1, x'', 0, x'', 0, '2026-01-01')"
+    )
+    db.commit()
+    db.close()
+    return url
+
+
+async def explain_calls(url: str, call: Case) -> List[Tuple[str, List[str]]]:
+    """Выполняет call и возвращает план каждого SQL-запроса, который он отправил"""
+    engine = make_engine(url, echo=False)
+    statements: List[Tuple[str, object]] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and not statement.startswith("EXPLAIN"):
+            statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    plans = []
+    try:
+        async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+            await call(session)
+            conn = await session.connection()
+            for statement, parameters in statements:
+                result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+                plans.append((statement, [row[-1] for row in result.all()]))
+            await session.rollback()
+    finally:
+        await engine.dispose()
+    return plans
+
+
+@pytest.mark.parametrize("name", list(HOT_QUERIES))
+def test_hot_query_uses_index(database_url: str, name: str) -> None:
+    plans = asyncio.run(explain_calls(database_url, HOT_QUERIES[name]))
+    assert plans, f"{name} не выполнил ни одного запроса"
+    for statement, plan in plans:
+        assert not any(is_full_scan(detail) for detail in plan), f"{statement}\n{' | '.join(plan)}"
+
+
+@pytest.mark.parametrize("detail, expected", [
+    ("SCAN profiles", True),
+    ("SCAN profiles USING INDEX ix_profiles_gender_city_age", False),
+    ("SEARCH users USING INTEGER PRIMARY KEY (rowid=?)", False),
+    ("SCAN anon_1", False),
+    ("SCAN profiles_fts VIRTUAL TABLE INDEX 0:", True),
+    ("SCAN profiles_fts VIRTUAL TABLE INDEX 0:M1", False),
+])
+def test_is_full_scan(detail: str, expected: bool) -> None:
+    assert is_full_scan(detail) == expected
@@ -0,0 +1,60 @@
+# tests/test_ranked_search.py
+"""Ранжированный поиск: обход всех страниц по курсору (оценка, id) из X-Next-Cursor"""
+from typing import List
+
+import httpx
+import pytest
+
+from app.utils.scoring import Ranker, parse_weights
+from tests.utils import create_profiles, profile_body
+
+CANDIDATES = 30
+AGES = (25, 30, 35)
+TAGS = ("кофе", "кофе,кино", "книги")
+
+
+async def walk_pages(client: httpx.AsyncClient, viewer_id: int, limit: int) -> List[List[dict]]:
+    pages = []
+    params = {"viewer_id": viewer_id, "limit": limit}
+    # Страниц не больше, чем кандидатов, плюс пустая последняя: курсор, который
+    # не продвигается, не зацикливает тест
+    for _ in range(CANDIDATES + 2):
+        response = await client.get("/profiles/search/ranked", params=params)
+        assert response.status_code == 200, response.text
+        pages.append(response.json())
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            break
+        params = {"viewer_id": viewer_id, "limit": limit, "cursor": cursor}
+    return pages
+
+
+@pytest.mark.parametrize("weights", [
+    # Без новизны у профилей с одинаковыми возрастом и тегами равные оценки
+    "tags:3,age:2,city:2",
+    "tags:3,age:2,city:2,recency:1,reciprocal:4",
+])
+@pytest.mark.parametrize("limit", [1, 4, 7])
+def test_ranked_pages_have_no_duplicates_or_gaps(call_api, monkeypatch, weights: str, limit: int) -> None:
+    monkeypatch.setattr("app.services.profiles.ranker", Ranker(parse_weights(weights)))
+
+    async def scenario(client: httpx.AsyncClient):
+        bodies = [profile_body(1, age=25, tags="кофе,кино")] + [
+            profile_body(i, age=AGES[i % 3], tags=TAGS[i // 3 % 3]) for i in range(2, CANDIDATES + 2)
+        ]
+        viewer_id = (await create_profiles(client, bodies))[0]["id"]
+        # Встречный лайк меняет оценку одного кандидата
+        assert (await client.post(f"/likes/{viewer_id + 5}/{viewer_id}")).status_code == 201
+        full = await client.get("/profiles/search/ranked", params={"viewer_id": viewer_id, "limit": 1000})
+        return full.json(), await walk_pages(client, viewer_id, limit)
+
+    full, pages = call_api(scenario)
+    assert len(full) == CANDIDATES
+    keys = [(-item["score"], item["id"]) for item in full]
+    assert keys == sorted(keys)
+    if "recency" not in weights:
+        assert len({item["score"] for item in full}) < CANDIDATES / 2
+    walked = [item["id"] for page in pages for item in page]
+    assert len(walked) == len(set(walked))
+    assert walked == [item["id"] for item in full]
+    assert all(len(page) == limit for page in pages[:-1])
@@ -0,0 +1,83 @@
+# tests/test_stats.py
+"""
+Счетчики stat_counters, которые ведут триггеры, после вставок, изменений и
+удалений совпадают с пересчетом из таблиц (STATS_REBUILD_SQL).
+"""
+import asyncio
+
+import httpx
+
+from app.database.database import async_session_maker
+from app.repositories.stats import StatCounterRepository
+from tests.utils import PASSWORD
+
+
+async def rebuild_stats() -> int:
+    async with async_session_maker() as session:
+        drift = await StatCounterRepository(session).rebuild()
+        await session.commit()
+    return drift
+
+
+async def read_stats(client: httpx.AsyncClient) -> tuple:
+    return (await client.get("/users/stats/")).json(), (await client.get("/user-filters/stats/")).json()
+
+
+def test_trigger_counters_match_rebuild(call_api) -> None:
+    async def scenario(client: httpx.AsyncClient):
+        response = await client.post("/roles/", json={"name": "admin"})
+        assert response.status_code == 201, response.text
+        admin_role = response.json()["id"]
+        responses = await asyncio.gather(*(
+            client.post("/users/register", json={"email": f"user{i}@example.com", "password": PASSWORD, "role_id": 1})
+            for i in range(10)
+        ))
+        assert all(response.status_code == 201 for response in responses)
+        user_ids = [response.json()["id"] for response in responses]
+
+        updates = [
+            (user_ids[0], {"is_active": False}),
+            (user_ids[1], {"role_id": admin_role}),
+            (user_ids[2], {"is_active": False, "role_id": admin_role}),
+            (user_ids[2], {"is_active": True}),
+            # Изменение без затронутых колонок счетчики не трогает
+            (user_ids[3], {"email": "renamed@example.com"}),
+        ]
+        for user_id, body in updates:
+            response = await client.put(f"/users/{user_id}", json=body)
+            assert response.status_code == 200, response.text
+        for user_id in user_ids[4:6]:
+            assert (await client.delete(f"/users/{user_id}")).status_code == 200
+
+        filters = []
+        for i, (gender, city) in enumerate([("male", "Москва"), ("female", "Москва"), ("any", "Казань")]):
+            response = await client.post(
+                "/user-filters/", json={"user_id": i + 1, "gender_filter": gender, "city_filter": city, "role_id": 1}
+            )
+            assert response.status_code == 201, response.text
+            filters.append(response.json()["id"])
+        response = await client.post("/user-filters/bulk", json={"filters": [
+            {"user_id": user_id, "gender_filter": "female", "city_filter": "Казань", "role_id": 1}
+            for user_id in (1, 10, 11, 12)
+        ]})
+        assert response.json()["created"] == 3
+        response = await client.put(f"/user-filters/{filters[0]}", json={"gender_filter": "female"})
+        assert response.status_code == 200, response.text
+        response = await client.put(f"/user-filters/{filters[1]}", json={"city_filter": "Казань", "role_id": 1})
+        assert response.status_code == 200, response.text
+        assert (await client.delete(f"/user-filters/{filters[2]}")).status_code == 200
+        assert (await client.delete("/user-filters/user/10")).status_code == 200
+
+        counted = await read_stats(client)
+        drift = await rebuild_stats()
+        return admin_role, counted, drift, await read_stats(client)
+
+    admin_role, (users, filters), drift, rebuilt = call_api(scenario)
+    assert drift == 0
+    assert (users, filters) == rebuilt
+    assert users == {
+        "total_users": 8, "active_users": 7, "inactive_users": 1, "users_by_role": {"1": 6, str(admin_role): 2},
+    }
+    assert filters["total_filters"] == 4
+    assert filters["gender_stats"] == {"female": 4}
+    assert filters["city_stats"] == {"Казань": 3, "Москва": 1}
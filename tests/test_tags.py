@@ -0,0 +1,105 @@
+# tests/test_tags.py
+"""
+Индекс тегов в памяти: после создания, изменения и удаления профиля поиск
+по тегам (all/any) совпадает с profile_tags в БД, без полной перезагрузки.
+"""
+import sqlite3
+from typing import Dict, List, Set
+
+import httpx
+
+from app.utils.tags import tag_index
+from tests.utils import create_profiles, profile_body
+
+QUERIES = ["кофе", "кино", "книги", "горы", "кофе,кино", "кофе,книги", "кофе,горы", "кино,книги,горы"]
+
+
+def db_tags(path: str) -> Dict[int, Set[str]]:
+    db = sqlite3.connect(path)
+    try:
+        rows = db.execute(
+            "SELECT profile_tags.profile_id, tags.name FROM profile_tags JOIN tags ON tags.id = profile_tags.tag_id"
+        ).fetchall()
+    finally:
+        db.close()
+    tags: Dict[int, Set[str]] = {}
+    for profile_id, name in rows:
+        tags.setdefault(profile_id, set()).add(name)
+    return tags
+
+
+def expected(tags: Dict[int, Set[str]], query: str, mode: str) -> List[int]:
+    names = set(query.split(","))
+    if mode == "all":
+        return sorted(profile_id for profile_id, own in tags.items() if names <= own)
+    return sorted(profile_id for profile_id, own in tags.items() if names & own)
+
+
+async def search_all(client: httpx.AsyncClient) -> Dict[tuple, List[int]]:
+    results = {}
+    for query in QUERIES:
+        for mode in ("all", "any"):
+            response = await client.get("/profiles/tags/search", params={"tags": query, "mode": mode})
+            assert response.status_code == 200, response.text
+            results[query, mode] = [profile["id"] for profile in response.json()]
+    return results
+
+
+def test_tag_search_follows_create_update_delete(app_db: str, call_api, monkeypatch) -> None:
+    loads = []
+    load = tag_index.load
+    monkeypatch.setattr(tag_index, "load", lambda *args, **kwargs: (loads.append(1), load(*args, **kwargs)))
+
+    async def scenario(client: httpx.AsyncClient):
+        profiles = await create_profiles(client, [
+            profile_body(1, tags="кофе, кино"),
+            profile_body(2, tags="Кофе,книги"),
+            profile_body(3, tags="кино,книги,горы"),
+            profile_body(4, tags="горы"),
+        ])
+        ids = [profile["id"] for profile in profiles]
+        # После каждого шага: выдача поиска и теги профилей в БД
+        snapshots = [(await search_all(client), db_tags(app_db))]
+
+        [created] = await create_profiles(client, [profile_body(5, tags="кофе,кино,книги")])
+        snapshots.append((await search_all(client), db_tags(app_db)))
+        response = await client.put(f"/profiles/{ids[0]}", json={"tags": "горы, книги"})
+        assert response.status_code == 200, response.text
+        snapshots.append((await search_all(client), db_tags(app_db)))
+        response = await client.delete(f"/profiles/{ids[2]}")
+        assert response.status_code == 200, response.text
+        snapshots.append((await search_all(client), db_tags(app_db)))
+        return ids, created["id"], snapshots
+
+    ids, created_id, snapshots = call_api(scenario)
+    final_tags = snapshots[-1][1]
+    assert final_tags[created_id] == {"кофе", "кино", "книги"}
+    assert final_tags[ids[0]] == {"горы", "книги"}
+    assert ids[2] not in final_tags
+    for results, tags in snapshots:
+        for query in QUERIES:
+            for mode in ("all", "any"):
+                assert results[query, mode] == expected(tags, query, mode), (query, mode)
+    # Индекс загружен один раз, дальше изменения применялись точечно
+    assert len(loads) == 1
+
+
+def test_tag_index_reloads_after_write_from_another_process(app_db: str, call_api) -> None:
+    async def scenario(client: httpx.AsyncClient):
+        [profile] = await create_profiles(client, [profile_body(1, tags="кофе")])
+        before = await search_all(client)
+        # Запись мимо приложения: триггер сдвигает profiles.version
+        db = sqlite3.connect(app_db)
+        db.execute("INSERT INTO tags(name) VALUES ('горы')")
+        db.execute(
+            "INSERT INTO profile_tags(profile_id, tag_id) SELECT ?, id FROM tags WHERE name = 'горы'", (profile["id"],)
+        )
+        db.execute("UPDATE profiles SET tags = 'кофе,горы' WHERE id = ?", (profile["id"],))
+        db.commit()
+        db.close()
+        return profile["id"], before, await search_all(client)
+
+    profile_id, before, after = call_api(scenario)
+    assert before["горы", "any"] == []
+    assert after["горы", "any"] == [profile_id]
+    assert after["кофе,горы", "all"] == [profile_id]
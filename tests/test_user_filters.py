@@ -0,0 +1,169 @@
+# tests/test_user_filters.py
+"""Фильтры пользователей: массовое создание и сброс ленты, профили под фильтр и обратный поиск"""
+import sqlite3
+from typing import Any, Dict, List
+
+import httpx
+
+from app.database.database import async_session_maker
+from app.services.feeds import FeedService
+from app.utils.id_arrays import unpack_ids
+from app.utils.profile_matrix import profile_matrix
+from tests.utils import create_profiles, profile_body
+
+VIEWER_ID = 100
+
+
+async def refill(user_id: int) -> None:
+    async with async_session_maker() as session:
+        await FeedService(session).refill(user_id)
+
+
+async def card_ids(user_id: int) -> list:
+    async with async_session_maker() as session:
+        service = FeedService(session)
+        await service.refill(user_id)
+        cards, _ = await service.get_cards(user_id, 50)
+    return [card.id for card in cards]
+
+
+def test_bulk_create_resets_existing_feed(app_db: str, call_api) -> None:
+    async def scenario(client: httpx.AsyncClient):
+        profiles = await create_profiles(client, [profile_body(i) for i in range(1, 7)])
+        # Лента собрана, пока фильтра не было: в ней профили обоих полов
+        await refill(VIEWER_ID)
+        response = await client.post("/user-filters/bulk", json={"filters": [
+            {"user_id": VIEWER_ID, "gender_filter": "male", "city_filter": "Москва", "role_id": 1},
+            {"user_id": VIEWER_ID + 1, "gender_filter": "female", "city_filter": "Москва", "role_id": 1},
+        ]})
+        assert response.status_code == 201, response.text
+        assert response.json()["created"] == 2
+        db = sqlite3.connect(app_db)
+        queue = db.execute("SELECT queue, position FROM feeds WHERE user_id = ?", (VIEWER_ID,)).fetchone()
+        db.close()
+        male = {profile["id"] for profile in profiles if profile["gender"] == "male"}
+        return queue, male, await card_ids(VIEWER_ID)
+
+    queue, male, cards = call_api(scenario)
+    assert queue == (b"", 0)
+    assert sorted(cards) == sorted(male)
+
+
+CITIES = ["Москва", "Казань", "Санкт-Петербург"]
+# user_id -> (gender_filter, city_filter); пустой город - фильтр без города
+FILTERS = {
+    101: ("male", "Москва"),
+    102: ("female", ""),
+    103: ("any", "Казань"),
+    104: ("all", ""),
+    105: ("female", "Санкт-Петербург"),
+}
+
+
+def passes(user_filter: tuple, profile: Dict[str, Any]) -> bool:
+    gender, city = user_filter
+    return gender in ("any", "all", profile["gender"]) and city in ("", profile["city"])
+
+
+async def create_filters(client: httpx.AsyncClient) -> None:
+    for user_id, (gender, city) in FILTERS.items():
+        response = await client.post(
+            "/user-filters/", json={"user_id": user_id, "gender_filter": gender, "city_filter": city, "role_id": 1}
+        )
+        assert response.status_code == 201, response.text
+
+
+async def matching_ids(client: httpx.AsyncClient, user_id: int) -> List[int]:
+    """Все страницы /user-filters/user/{user_id}/profiles по курсору"""
+    ids = []
+    params = {"limit": 4}
+    for _ in range(20):
+        response = await client.get(f"/user-filters/user/{user_id}/profiles", params=params)
+        assert response.status_code == 200, response.text
+        ids.extend(profile["id"] for profile in response.json())
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            break
+        params = {"limit": 4, "cursor": cursor}
+    return ids
+
+
+async def all_profiles(client: httpx.AsyncClient) -> List[Dict[str, Any]]:
+    return (await client.get("/profiles/", params={"limit": 1000})).json()
+
+
+def test_matching_profiles_follow_profile_changes(app_db: str, call_api, monkeypatch) -> None:
+    loads = []
+    load = profile_matrix.load
+    monkeypatch.setattr(profile_matrix, "load", lambda *args, **kwargs: (loads.append(1), load(*args, **kwargs)))
+
+    async def snapshot(client: httpx.AsyncClient):
+        return await all_profiles(client), {user_id: await matching_ids(client, user_id) for user_id in FILTERS}
+
+    async def scenario(client: httpx.AsyncClient):
+        profiles = await create_profiles(
+            client, [profile_body(i, city=CITIES[i % 3]) for i in range(1, 19)]
+        )
+        await create_filters(client)
+        snapshots = [await snapshot(client)]
+
+        response = await client.put(f"/profiles/{profiles[0]['id']}", json={"city": "мск", "gender": "male"})
+        assert response.status_code == 200, response.text
+        assert (await client.delete(f"/profiles/{profiles[1]['id']}")).status_code == 200
+        await create_profiles(client, [profile_body(20, city="Казань")])
+        snapshots.append(await snapshot(client))
+        # Свои записи применены к снимку точечно
+        assert len(loads) == 1
+
+        # Запись мимо приложения: снимок профилей перезагрузится по версии
+        db = sqlite3.connect(app_db)
+        db.execute("UPDATE profiles SET city = 'Казань' WHERE id = ?", (profiles[2]["id"],))
+        db.commit()
+        db.close()
+        snapshots.append(await snapshot(client))
+        missing = await client.get("/user-filters/user/999/profiles")
+        return profiles, snapshots, missing
+
+    profiles, snapshots, missing = call_api(scenario)
+    for current, matched in snapshots:
+        for user_id, user_filter in FILTERS.items():
+            expected = [profile["id"] for profile in current if passes(user_filter, profile)]
+            assert matched[user_id] == expected, user_id
+    # Изменения действительно меняют выдачу
+    assert profiles[0]["id"] in snapshots[1][1][101]
+    assert profiles[1]["id"] in snapshots[0][1][104] and profiles[1]["id"] not in snapshots[1][1][104]
+    assert profiles[2]["id"] not in snapshots[1][1][103] and profiles[2]["id"] in snapshots[2][1][103]
+    assert missing.status_code == 404
+    assert len(loads) == 2
+
+
+def test_interested_users_match_filters(app_db: str, call_api) -> None:
+    async def scenario(client: httpx.AsyncClient):
+        await create_filters(client)
+        # Лента, собранная до появления профилей, пополняется новым профилем сразу
+        for user_id in FILTERS:
+            await refill(user_id)
+        profiles = await create_profiles(
+            client, [profile_body(i, city=CITIES[i % 3]) for i in range(1, 10)]
+            # Владелец профиля со своим подходящим фильтром в ответ не попадает
+            + [profile_body(104, city="Казань")]
+        )
+        interested = {
+            profile["id"]: (await client.get(f"/user-filters/interested/{profile['id']}")).json()["user_ids"]
+            for profile in profiles
+        }
+        missing = await client.get("/user-filters/interested/999")
+        return profiles, interested, missing
+
+    profiles, interested, missing = call_api(scenario)
+    db = sqlite3.connect(app_db)
+    queues = {user_id: unpack_ids(queue) for user_id, queue in db.execute("SELECT user_id, queue FROM feeds")}
+    db.close()
+    for profile in profiles:
+        expected = [
+            user_id for user_id, user_filter in FILTERS.items()
+            if passes(user_filter, profile) and user_id != profile["user_id"]
+        ]
+        assert interested[profile["id"]] == expected, profile
+        assert [user_id for user_id in FILTERS if profile["id"] in queues[user_id]] == expected
+    assert missing.status_code == 404
@@ -0,0 +1,98 @@
+# tests/test_users_concurrency.py
+"""
+Одновременные записи с одним и тем же уникальным значением.
+
+Уникальность email пользователя, username и user_id профиля держат только
+ограничения UNIQUE в БД (без проверки перед записью), поэтому из N
+одновременных запросов ровно один проходит, остальные получают 409, а не
+500 и не дубликат.
+"""
+import asyncio
+import sqlite3
+from collections import Counter
+from typing import Any, Dict, List
+
+import httpx
+
+N = 8
+PASSWORD = "password1"
+
+
+def profile_body(user_id: int, username: str) -> Dict[str, Any]:
+    return {
+        "user_id": user_id, "username": username, "age": 25, "gender": "female", "city": "Москва",
+        "description": "d", "tags": "кофе", "photo": "x", "role_id": 1
+    }
+
+
+def statuses(responses: List[httpx.Response]) -> Counter:
+    return Counter(response.status_code for response in responses)
+
+
+def count_rows(path: str, query: str) -> int:
+    db = sqlite3.connect(path)
+    try:
+        return db.execute(query).fetchone()[0]
+    finally:
+        db.close()
+
+
+def test_concurrent_register_same_email(app_db: str, call_api) -> None:
+    async def scenario(client: httpx.AsyncClient) -> List[httpx.Response]:
+        body = {"email": "same@example.com", "password": PASSWORD, "role_id": 1}
+        return await asyncio.gather(*(client.post("/users/register", json=body) for _ in range(N)))
+
+    assert statuses(call_api(scenario)) == {201: 1, 409: N - 1}
+    assert count_rows(app_db, "SELECT count(*) FROM users WHERE email = 'same@example.com'") == 1
+
+
+def test_concurrent_update_to_same_email(app_db: str, call_api) -> None:
+    async def scenario(client: httpx.AsyncClient) -> List[httpx.Response]:
+        user_ids = []
+        for i in range(N):
+            response = await client.post(
+                "/users/register", json={"email": f"user{i}@example.com", "password": PASSWORD, "role_id": 1}
+            )
+            assert response.status_code == 201, response.text
+            user_ids.append(response.json()["id"])
+        body = {"email": "same@example.com"}
+        return await asyncio.gather(*(client.put(f"/users/{user_id}", json=body) for user_id in user_ids))
+
+    assert statuses(call_api(scenario)) == {200: 1, 409: N - 1}
+    assert count_rows(app_db, "SELECT count(*) FROM users WHERE email = 'same@example.com'") == 1
+
+
+def test_concurrent_create_profile_same_username(app_db: str, call_api) -> None:
+    async def scenario(client: httpx.AsyncClient) -> List[httpx.Response]:
+        return await asyncio.gather(
+            *(client.post("/profiles/", json=profile_body(i, "same")) for i in range(1, N + 1))
+        )
+
+    assert statuses(call_api(scenario)) == {201: 1, 409: N - 1}
+    assert count_rows(app_db, "SELECT count(*) FROM profiles WHERE username = 'same'") == 1
+
+
+def test_concurrent_create_profile_same_user_id(app_db: str, call_api) -> None:
+    async def scenario(client: httpx.AsyncClient) -> List[httpx.Response]:
+        return await asyncio.gather(
+            *(client.post("/profiles/", json=profile_body(1, f"user{i}")) for i in range(N))
+        )
+
+    assert statuses(call_api(scenario)) == {201: 1, 409: N - 1}
+    assert count_rows(app_db, "SELECT count(*) FROM profiles WHERE user_id = 1") == 1
+
+
+def test_concurrent_update_profile_to_same_username(app_db: str, call_api) -> None:
+    async def scenario(client: httpx.AsyncClient) -> List[httpx.Response]:
+        profile_ids = []
+        for i in range(1, N + 1):
+            response = await client.post("/profiles/", json=profile_body(i, f"user{i}"))
+            assert response.status_code == 201, response.text
+            profile_ids.append(response.json()["id"])
+        body = {"username": "same"}
+        return await asyncio.gather(
+            *(client.put(f"/profiles/{profile_id}", json=body) for profile_id in profile_ids)
+        )
+
+    assert statuses(call_api(scenario)) == {200: 1, 409: N - 1}
+    assert count_rows(app_db, "SELECT count(*) FROM profiles WHERE username = 'same'") == 1
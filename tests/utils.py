@@ -0,0 +1,36 @@
+# tests/utils.py
+"""Данные и запросы, общие для тестов API"""
+from typing import Any, Dict, List
+
+import httpx
+
+PASSWORD = "password1"
+
+
+def profile_body(user_id: int, **fields: Any) -> Dict[str, Any]:
+    """Тело POST /profiles/; user_id нечетный - female, четный - male"""
+    body = {
+        "user_id": user_id, "username": f"user{user_id}", "age": 25,
+        "gender": "female" if user_id % 2 else "male", "city": "Москва",
+        "description": f"Анкета {user_id}", "tags": "кофе", "photo": "x", "role_id": 1,
+    }
+    body.update(fields)
+    return body
+
+
+async def create_profiles(client: httpx.AsyncClient, bodies: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    profiles = []
+    for body in bodies:
+        response = await client.post("/profiles/", json=body)
+        assert response.status_code == 201, response.text
+        profiles.append(response.json())
+    return profiles
+
+
+async def auth_headers(client: httpx.AsyncClient, email: str = "admin@example.com") -> Dict[str, str]:
+    """Регистрация пользователя и заголовок Authorization с его токеном"""
+    response = await client.post("/users/register", json={"email": email, "password": PASSWORD, "role_id": 1})
+    assert response.status_code == 201, response.text
+    response = await client.post("/auth/login-json", json={"email": email, "password": PASSWORD})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}